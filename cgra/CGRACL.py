@@ -14,12 +14,14 @@ from ..noc.ChannelRTL     import ChannelRTL
 from ..tile.TileCL        import TileCL
 from ..lib.opt_type       import *
 from ..mem.data.DataMemCL import DataMemCL
+from ..lib.data_helper    import load_npy, dump_npy
 
 class CGRACL( Component ):
 
   def construct( s, FunctionUnit, FuList, DataType, PredicateType,
                  CtrlType, width, height, ctrl_mem_size, data_mem_size,
-                 num_ctrl, preload_ctrl, preload_data, preload_const ):
+                 num_ctrl, preload_ctrl, preload_data, preload_const,
+                 mem_tiles = None, Tile = TileCL, DataMem = DataMemCL ):
 
     # Constant
     NORTH = 0
@@ -30,18 +32,41 @@ class CGRACL( Component ):
     s.num_mesh_ports = 4
     AddrType = mk_bits( clog2( ctrl_mem_size ) )
 
+    # Interfaces
+    s.recv_waddr = [ RecvIfcRTL( AddrType )  for _ in range( s.num_tiles ) ]
+    s.recv_wopt  = [ RecvIfcRTL( CtrlType )  for _ in range( s.num_tiles ) ]
+
+    # FuList can be either one list for all the tiles or a list per tile.
+    # The tiles in mem_tiles are connected to the ports of the data
+    # memory. Tile is TileCL or the faster TileNativeCL. DataMem is
+    # DataMemCL or another memory with the same constructor.
+    if not isinstance( FuList[0], list ):
+      FuList = [ FuList for _ in range( s.num_tiles ) ]
+    assert len( FuList ) == s.num_tiles
+    if mem_tiles == None:
+      mem_tiles = [ i * width for i in range( height ) ]
+    s.mem_tiles = mem_tiles
+
     # Components
 
-    s.tile = [ TileCL( FunctionUnit, FuList, DataType, PredicateType,
-                       CtrlType, ctrl_mem_size, data_mem_size,
-                       num_ctrl, preload_const[i], preload_ctrl[i], i )
-                       for i in range( s.num_tiles ) ]
-    s.data_mem = DataMemCL( DataType, data_mem_size, height, height,
-                            preload_data )
+    s.tile = [ Tile( FunctionUnit, FuList[i], DataType, PredicateType,
+                     CtrlType, ctrl_mem_size, data_mem_size,
+                     num_ctrl, preload_const[i], preload_ctrl[i], i )
+                     for i in range( s.num_tiles ) ]
+    s.data_mem = DataMem( DataType, data_mem_size, len( mem_tiles ),
+                          len( mem_tiles ), preload_data )
 
     # Connections
 
     for i in range( s.num_tiles):
+      s.recv_waddr[i] //= s.tile[i].recv_waddr
+      s.recv_wopt[i]  //= s.tile[i].recv_wopt
+
+      # The constants are rewritten between two ticks with load_consts().
+      s.tile[i].recv_const_waddr.en  //= 0
+      s.tile[i].recv_const_waddr.msg //= 0
+      s.tile[i].recv_const.en        //= 0
+      s.tile[i].recv_const.msg       //= DataType( 0, 0 )
 
       if i // width > 0:
         s.tile[i].send_data[SOUTH] //= s.tile[i-width].recv_data[NORTH]
@@ -75,11 +100,12 @@ class CGRACL( Component ):
         s.tile[i].recv_data[EAST].en   //= 0
         s.tile[i].recv_data[EAST].msg  //= DataType( 0, 0 )
 
-      if i % width == 0:
-        s.tile[i].to_mem_raddr   //= s.data_mem.recv_raddr[i // width]
-        s.tile[i].from_mem_rdata //= s.data_mem.send_rdata[i // width]
-        s.tile[i].to_mem_waddr   //= s.data_mem.recv_waddr[i // width]
-        s.tile[i].to_mem_wdata   //= s.data_mem.recv_wdata[i // width]
+      if i in mem_tiles:
+        port = mem_tiles.index( i )
+        s.tile[i].to_mem_raddr   //= s.data_mem.recv_raddr[port]
+        s.tile[i].from_mem_rdata //= s.data_mem.send_rdata[port]
+        s.tile[i].to_mem_waddr   //= s.data_mem.recv_waddr[port]
+        s.tile[i].to_mem_wdata   //= s.data_mem.recv_wdata[port]
       else:
         s.tile[i].to_mem_raddr.rdy //= 0
         s.tile[i].from_mem_rdata.en //= 0
@@ -87,10 +113,41 @@ class CGRACL( Component ):
         s.tile[i].to_mem_waddr.rdy //= 0
         s.tile[i].to_mem_wdata.rdy //= 0
 
+  # Reload between two ticks, see CGRARTL.
+  def load_data( s, data, base = 0 ):
+    s.data_mem.load_data( data, base )
+
+  def load_consts( s, preload_const ):
+    for tile, consts in zip( s.tile, preload_const ):
+      if consts != None:
+        tile.load_consts( consts )
+
+  def load_ctrl( s, preload_ctrl ):
+    for tile, opt_list in zip( s.tile, preload_ctrl ):
+      if opt_list != None:
+        tile.load_ctrl( opt_list )
+
+  # Bulk data memory images, see data_helper.py.
+  def load_array( s, payload, predicate = None, base = 0 ):
+    s.data_mem.load_array( payload, predicate, base )
+
+  def dump_array( s, base = 0, size = None ):
+    return s.data_mem.dump_array( base, size )
+
+  def load_npy( s, payload_file, predicate_file = None, base = 0 ):
+    load_npy( s.data_mem, payload_file, predicate_file, base )
+
+  def dump_npy( s, payload_file, predicate_file, base = 0, size = None ):
+    dump_npy( s.data_mem, payload_file, predicate_file, base, size )
+
   # Line trace
   def line_trace( s ):
-    res = "||\n".join([ (("[tile"+str(i)+"]: ") + x.line_trace() + x.ctrl_mem.line_trace())
+    res = "||\n".join([ (("[tile"+str(i)+"]: ") + x.line_trace() + ( x.ctrl_mem.line_trace() if hasattr( x, "ctrl_mem" ) else "" ))
                       for (i,x) in enumerate(s.tile) ]) 
     res += "\n :: [" + s.data_mem.line_trace() + "]    \n"
     return res
 
+  # Performance counters
+  def perf_snapshot( s ):
+    return { 'tiles'    : [ x.perf_snapshot() for x in s.tile ],
+             'data_mem' : s.data_mem.perf_snapshot() }
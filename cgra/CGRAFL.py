@@ -129,3 +129,134 @@ def CGRAFL( FuDFG, DataType, CtrlType, src_const ):#, data_spm ):
   print( "final live_out: ", live_out_val )
   return live_out_val.payload, data_spm
 
+
+#------------------------------------------------------------------------
+# Fast FL model
+#------------------------------------------------------------------------
+# The DFG is lowered once into a flat list of instructions over Python
+# ints, and the loop runs without allocating messages or printing. The
+# nodes are executed in the same order and with the same semantics as
+# CGRAFL (the payloads wrap around at the bitwidth of DataType), but the
+# state of the DFG is left untouched.
+
+FL_NAH = 0
+FL_ADD = 1
+FL_SUB = 2
+FL_MUL = 3
+FL_PHI = 4
+FL_LD  = 5
+FL_EQ  = 6
+FL_BRH = 7
+
+fl_opt_map = {
+  int( OPT_ADD ) : FL_ADD,
+  int( OPT_SUB ) : FL_SUB,
+  int( OPT_MUL ) : FL_MUL,
+  int( OPT_PHI ) : FL_PHI,
+  int( OPT_LD  ) : FL_LD,
+  int( OPT_EQ  ) : FL_EQ,
+  int( OPT_BRH ) : FL_BRH,
+}
+
+def compile_dfg( FuDFG, src_const ):
+  # Each instruction is ( id, opt, consts, opt_predicate, live_out_ctrl,
+  # live_out_val, outputs ), where consts are ( payload, predicate ) pairs
+  # and outputs lists, for each result, the positions of the successors.
+  position = { node.id : i for i, node in enumerate( FuDFG.nodes ) }
+  insts = []
+  for node in FuDFG.nodes:
+    consts  = [ ( int( src_const[i].payload ), int( src_const[i].predicate ) )
+                for i in node.const_index ]
+    outputs = [ [ position[ FuDFG.get_node( succ ).id ] for succ in array ]
+                for array in node.output_node ]
+    insts.append( ( node.id, fl_opt_map.get( int( node.opt ), FL_NAH ),
+                    consts, int( node.opt_predicate ), node.live_out_ctrl,
+                    node.live_out_val, outputs ) )
+  return insts
+
+def CGRAFastFL( FuDFG, DataType, CtrlType, src_const, trace = False,
+                max_iterations = None ):
+
+  insts    = compile_dfg( FuDFG, src_const )
+  mask     = ( 1 << DataType().payload.nbits ) - 1
+  data_spm = FuDFG.data_spm
+
+  # Inputs of every node (payload, predicate), the index of the next
+  # input to be written and the predicate set by branches.
+  in_payload   = [ [ int( v.payload )   for v in node.input_value ]
+                   for node in FuDFG.nodes ]
+  in_predicate = [ [ int( v.predicate ) for v in node.input_value ]
+                   for node in FuDFG.nodes ]
+  in_index     = [ node.current_input_index for node in FuDFG.nodes ]
+  predicate    = [ int( node.input_predicate ) for node in FuDFG.nodes ]
+
+  live_out_payload   = 0
+  live_out_predicate = 0
+  live_out_ctrl      = 0
+  iterations         = 0
+
+  while live_out_ctrl == 0:
+    if max_iterations != None and iterations == max_iterations:
+      break
+    iterations += 1
+    for pos, ( node_id, opt, consts, opt_predicate, is_live_out_ctrl,
+               is_live_out_val, outputs ) in enumerate( insts ):
+      payloads   = [ p for p, _ in consts ] + in_payload[ pos ]
+      cur_pred   = predicate[ pos ] if opt_predicate == 1 else 0
+      res_pay    = [ 0 ] * len( outputs )
+      res_pred   = [ 1 ] * len( outputs )
+
+      if opt == FL_ADD:
+        res_pay[0] = ( payloads[0] + payloads[1] ) & mask
+      elif opt == FL_MUL:
+        res_pay[0] = ( payloads[0] * payloads[1] ) & mask
+      elif opt == FL_PHI:
+        preds = [ q for _, q in consts ] + in_predicate[ pos ]
+        res_pay[0] = payloads[1] if preds[1] == 1 else payloads[0]
+      elif opt == FL_LD:
+        res_pay[0] = data_spm[ payloads[0] ] & mask
+      elif opt == FL_SUB:
+        res_pay[0] = ( payloads[0] - payloads[1] ) & mask
+      elif opt == FL_EQ:
+        res_pay[0] = 1 if payloads[0] == payloads[1] else 0
+      elif opt == FL_BRH:
+        taken = 1 if payloads[0] == 0 else 0
+        res_pred[0] = taken
+        for succ in outputs[0]:
+          predicate[ succ ] = taken
+        if len( outputs ) > 1:
+          for succ in outputs[1]:
+            predicate[ succ ] = 1 - taken
+
+      if is_live_out_ctrl != 0:
+        if opt_predicate == 1:
+          res_pred = [ q & cur_pred for q in res_pred ]
+        live_out_ctrl = 0 if res_pred[0] == 1 else 1
+        if opt_predicate == 1:
+          live_out_ctrl &= cur_pred
+
+      if is_live_out_val != 0:
+        live_out_payload   = res_pay[0]
+        live_out_predicate = res_pred[0]
+
+      if opt_predicate == 1:
+        res_pred = [ q & cur_pred for q in res_pred ]
+
+      if opt != FL_BRH:
+        for i, succs in enumerate( outputs ):
+          for succ in succs:
+            k = in_index[ succ ]
+            in_payload  [ succ ][ k ] = res_pay [i]
+            in_predicate[ succ ][ k ] = res_pred[i]
+            in_index[ succ ] = k + 1 if k + 1 < len( in_payload[ succ ] ) else 0
+
+      if trace:
+        print( "id: ", node_id, " current output: ",
+               list( zip( res_pay, res_pred ) ) )
+      if live_out_ctrl == 1:
+        break
+
+    if trace:
+      print( "[ current iteration live_out_val: ", live_out_payload, " ]" )
+
+  return DataType( live_out_payload, live_out_predicate ).payload, data_spm
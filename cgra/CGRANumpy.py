@@ -0,0 +1,1096 @@
+"""
+==========================================================================
+CGRANumpy.py
+==========================================================================
+Cycle-level CGRA simulation engine that keeps the whole mesh in flat
+NumPy arrays. It models the same hardware as CGRARTL (TileRTL crossbar
+routing, ChannelRTL queues, FlexibleFuRTL opcodes, CtrlMemRTL sequencing
+and DataMemRTL) but updates every tile together once per cycle instead
+of going through the PyMTL update blocks.
+
+The combinational part of a cycle is evaluated as a sweep over all the
+tiles that is repeated until no signal changes, which is what the PyMTL
+simulator does for the (mesh-wide) combinational loop of CGRARTL. The
+signals that the RTL leaves unassigned in some branches keep their last
+value, and the messages that the RTL shares by reference (e.g., the
+FlexibleFu output that still refers to the message of one of its FUs)
+are kept in an object table so that predicate updates through those
+references are also reproduced.
+
+Every array carries a leading lane axis: load_batch() maps a stack of
+data memory images onto lanes that run the same control stream in
+lockstep, so one engine simulates a whole batch of datasets.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+import numpy as np
+
+from pymtl3                 import *
+from ..lib.opt_type         import *
+from ..lib.map_helper       import default_fu_list
+from ..fu.single.AdderRTL   import AdderRTL
+from ..fu.single.BranchRTL  import BranchRTL
+from ..fu.single.CompRTL    import CompRTL
+from ..fu.single.LogicRTL   import LogicRTL
+from ..fu.single.MemUnitRTL import MemUnitRTL
+from ..fu.single.MulRTL     import MulRTL
+from ..fu.single.PhiRTL     import PhiRTL
+from ..fu.single.RetRTL     import RetRTL
+from ..fu.single.SelRTL     import SelRTL
+from ..fu.single.ShifterRTL import ShifterRTL
+
+# Same directions as CGRARTL.
+NORTH = 0
+SOUTH = 1
+WEST  = 2
+EAST  = 3
+
+# Functional units that can be mapped onto the engine.
+fu_kind = {
+  AdderRTL   : 'Adder',
+  BranchRTL  : 'Branch',
+  CompRTL    : 'Comp',
+  LogicRTL   : 'Logic',
+  MemUnitRTL : 'MemUnit',
+  MulRTL     : 'Mul',
+  PhiRTL     : 'Phi',
+  RetRTL     : 'Ret',
+  SelRTL     : 'Sel',
+  ShifterRTL : 'Shifter',
+}
+
+# The functional units that create a new output message whenever they
+# execute the given opcodes (the previously sent message is left as is),
+# None for every cycle.
+fu_creating_opts = {
+  'Branch'  : [ OPT_BRH, OPT_BRH_START ],
+  'Ret'     : [ OPT_RET ],
+  'Sel'     : [ OPT_SEL ],
+  'MemUnit' : None,
+}
+
+class CGRANumpy:
+
+  def __init__( s, DataType, PredicateType, CtrlType, width, height,
+                ctrl_mem_size, data_mem_size, num_ctrl, FunctionUnit,
+                FuList, preload_data = None, preload_const = None,
+                mem_tiles = None ):
+
+    # Constant
+    s.DataType       = DataType
+    s.PredicateType  = PredicateType
+    s.CtrlType       = CtrlType
+    s.width          = width
+    s.height         = height
+    s.num_tiles      = width * height
+    s.ctrl_mem_size  = ctrl_mem_size
+    s.data_mem_size  = data_mem_size
+    s.num_ctrl       = num_ctrl
+    s.num_mesh_ports = 4
+    s.num_fu_inports = 4
+    s.num_fu_outports = 2
+    s.num_xbar_inports  = s.num_fu_outports + s.num_mesh_ports
+    s.num_xbar_outports = s.num_fu_inports + s.num_mesh_ports
+    s.num_lanes      = 1
+
+    s.payload_nbits  = DataType().payload.nbits
+    s.payload_mask   = ( 1 << s.payload_nbits ) - 1
+    s.addr_mask      = ( 1 << clog2( data_mem_size ) ) - 1
+
+    ctrl_proto       = CtrlType()
+    s.num_fu_in      = len( ctrl_proto.fu_in )
+
+    # FuList can be either one list for all the tiles or a list per tile,
+    # as in CGRARTL.
+    if FuList == None:
+      FuList = default_fu_list
+    if not isinstance( FuList[0], list ):
+      FuList = [ FuList for _ in range( s.num_tiles ) ]
+    assert len( FuList ) == s.num_tiles
+    s.fu_list = [ [ fu_kind[ fu ] for fu in FuList[t] ]
+                  for t in range( s.num_tiles ) ]
+    for fus in s.fu_list:
+      assert fus.count( 'MemUnit' ) <= 1
+    s.max_fus = max( [ len( fus ) for fus in s.fu_list ] )
+
+    # Data memory ports are connected to the tiles in mem_tiles, by
+    # default the tiles in the left column.
+    if mem_tiles == None:
+      mem_tiles = [ r * width for r in range( height ) ]
+    s.mem_tiles     = np.array( mem_tiles )
+    s.num_mem_ports = len( mem_tiles )
+
+    # Const queues.
+    if preload_const == None:
+      preload_const = [ [ DataType( 0, 0 ) ] for _ in range( s.num_tiles ) ]
+    max_const = max( [ len( c ) for c in preload_const ] )
+    s.num_const   = np.array( [ len( c ) for c in preload_const ] )
+    s.const_value = np.zeros( ( 3, s.num_tiles, max_const ), dtype=np.int64 )
+    for t in range( s.num_tiles ):
+      for i, c in enumerate( preload_const[t] ):
+        s.const_value[:, t, i] = s._fields( c )
+
+    s.grids = {}
+    s._init_topology()
+    s._init_fu_instances()
+    s._load_image( preload_data )
+    s.set_ctrl_stream( [ [] for _ in range( s.num_tiles ) ],
+                       [ [] for _ in range( s.num_tiles ) ] )
+
+  #-----------------------------------------------------------------------
+  # Elaboration helpers
+  #-----------------------------------------------------------------------
+
+  def _fields( s, msg ):
+    return ( int( msg.payload ), int( msg.predicate ), int( msg.bypass ) )
+
+  def _init_topology( s ):
+    # For each tile and mesh port, the neighbouring tile on that side and
+    # whether the port is connected at all (boundary ports are tied off).
+    T = s.num_tiles
+    s.nbr_tile  = np.zeros( ( T, s.num_mesh_ports ), dtype=np.int64 )
+    s.nbr_valid = np.zeros( ( T, s.num_mesh_ports ), dtype=np.int64 )
+    for i in range( T ):
+      for d, ( dst, ok ) in enumerate( [
+          ( i + s.width, i // s.width < s.height - 1 ),
+          ( i - s.width, i // s.width > 0            ),
+          ( i - 1,       i % s.width > 0             ),
+          ( i + 1,       i % s.width < s.width - 1   ) ] ):
+        s.nbr_tile [i][d] = dst if ok else i
+        s.nbr_valid[i][d] = 1 if ok else 0
+    # The port on the neighbouring tile facing this one.
+    s.nbr_port = np.array( [ SOUTH, NORTH, EAST, WEST ] )
+
+  def _init_fu_instances( s ):
+    T = s.num_tiles
+    K = s.max_fus
+    s.fu_valid = np.zeros( ( T, K ), dtype=np.int64 )
+    instances = {}
+    for t in range( T ):
+      for k, kind in enumerate( s.fu_list[t] ):
+        s.fu_valid[t][k] = 1
+        instances.setdefault( kind, [] ).append( ( t, k ) )
+    s.fu_instances = {}
+    for kind, insts in instances.items():
+      s.fu_instances[ kind ] = ( np.array( [ t for t, _ in insts ] ),
+                                 np.array( [ k for _, k in insts ] ) )
+    s.has_mem_unit = np.array( [ 'MemUnit' in fus for fus in s.fu_list ],
+                               dtype=np.int64 )
+
+  #-----------------------------------------------------------------------
+  # Object table
+  #-----------------------------------------------------------------------
+  # All the messages that can be referenced by the output port of a
+  # FlexibleFu are kept in one table (per lane): the preloaded data memory
+  # entries, the data memory registers, the constant message of the
+  # memory port tied off for the tiles outside the left column, the
+  # output messages of each functional unit, the constant one/zero of
+  # each CompRTL and one snapshot per FlexibleFu output.
+
+  def _init_objects( s, num_pool ):
+    T = s.num_tiles
+    K = s.max_fus
+    s.POOL  = 0
+    s.REGS  = s.POOL  + num_pool
+    s.TIE   = s.REGS  + s.data_mem_size
+    s.PORT  = s.TIE   + T
+    s.CONST = s.PORT  + T * K * s.num_fu_outports
+    s.SNAP  = s.CONST + T * K * 2
+    s.num_objs = s.SNAP + T * s.num_fu_outports
+
+  def _port_obj( s, ti, ki, j ):
+    return s.PORT + ( ti * s.max_fus + ki ) * s.num_fu_outports + j
+
+  def _const_obj( s, ti, ki, one ):
+    return s.CONST + ( ti * s.max_fus + ki ) * 2 + ( 0 if one else 1 )
+
+  def _read( s, V, ptr ):
+    return V[ s._grid( ptr.shape )[0], ptr ]
+
+  def _grid( s, shape ):
+    if shape not in s.grids:
+      s.grids[ shape ] = tuple( np.ogrid[ tuple( slice( 0, n ) for n in shape ) ] )
+    return s.grids[ shape ]
+
+  def _take( s, arr, idx ):
+    # arr[..., idx] taken element-wise over the leading axes.
+    return arr[ s._grid( idx.shape ) + ( idx, ) ]
+
+  def _put( s, arr, idx, value ):
+    arr[ s._grid( idx.shape ) + ( idx, ) ] = value
+
+  def _write( s, V, ptr, value, mask = None ):
+    lanes = s._grid( ptr.shape )[0]
+    if mask is not None:
+      lanes, ptr, value = np.broadcast_arrays( lanes, ptr, value )
+      mask = np.broadcast_to( mask, ptr.shape ).astype( bool )
+      lanes, ptr, value = lanes[ mask ], ptr[ mask ], value[ mask ]
+    V[ lanes, ptr ] = value
+
+  #-----------------------------------------------------------------------
+  # Preload
+  #-----------------------------------------------------------------------
+
+  def _load_image( s, preload_data ):
+    # A single data memory image (or none) is simulated on one lane.
+    if preload_data == None:
+      s.num_lanes     = 1
+      s.has_preload   = False
+      s.preload_batch = None
+      s.pool_of       = np.zeros( ( 1, s.data_mem_size ), dtype=np.int64 )
+      s.pool_init     = np.zeros( ( 1, 0, 3 ), dtype=np.int64 )
+      s._init_objects( 0 )
+    else:
+      s.load_batch( [ preload_data ] )
+
+  # Writes data from address base into the data memory of every lane,
+  # like the load_data() of CGRARTL and CGRACL. Before sim_reset() the
+  # words become part of the preloaded images, afterwards they are
+  # written into the data memory registers between two ticks.
+  def load_data( s, data, base = 0 ):
+    D = s.data_mem_size
+    assert base + len( data ) <= D
+    if not hasattr( s, 'dm_regs' ):
+      images = s.preload_batch
+      if images == None:
+        images = [ [] ]
+      batch = []
+      for image in images:
+        image = list( image ) + [ s.DataType( 0, 0 )
+                                  for _ in range( D - len( image ) ) ]
+        image[ base : base + len( data ) ] = data
+        batch.append( image )
+      s.load_batch( batch )
+    else:
+      for i in range( len( data ) ):
+        value = np.array( s._fields( data[i] ) )[:, None]
+        s.dm_regs[:, :, base + i] = value
+        s.dm_init[:, base + i]    = 1
+        s.V[:, :, s.REGS + base + i] = value
+
+  def load_batch( s, preload_batch ):
+    # Each data memory image of the batch is simulated on its own lane,
+    # all the lanes share the control memory and go through the same
+    # cycles. The entries of one image that refer to the same DataType
+    # object share one slot in the object table, just like in DataMemRTL.
+    D = s.data_mem_size
+    L = len( preload_batch )
+    assert L > 0
+    s.num_lanes     = L
+    s.has_preload   = True
+    s.preload_batch = [ list( image ) for image in preload_batch ]
+    s.pool_of = np.zeros( ( L, D ), dtype=np.int64 )
+    pools = []
+    for l, preload_data in enumerate( preload_batch ):
+      pool    = []
+      pool_id = {}
+      for a in range( D ):
+        if a < len( preload_data ):
+          key = id( preload_data[a] )
+          if key not in pool_id:
+            pool_id[ key ] = len( pool )
+            pool.append( s._fields( preload_data[a] ) )
+          s.pool_of[l][a] = pool_id[ key ]
+        else:
+          s.pool_of[l][a] = len( pool )
+          pool.append( ( 0, 0, 0 ) )
+      pools.append( pool )
+    # Lanes with fewer distinct entries leave the rest of the pool unused.
+    num_pool = max( [ len( pool ) for pool in pools ] )
+    s.pool_init = np.zeros( ( L, num_pool, 3 ), dtype=np.int64 )
+    for l, pool in enumerate( pools ):
+      if len( pool ) > 0:
+        s.pool_init[l, :len( pool )] = pool
+    s._init_objects( num_pool )
+
+  def set_ctrl_stream( s, src_opt, ctrl_waddr ):
+    # Control words are streamed into the control memory of each tile
+    # through recv_wopt/recv_waddr at one word per cycle, exactly like
+    # the TestSrcRTL sources used in the CGRARTL test harnesses.
+    s.src_opt    = [ [ s._ctrl_fields( c ) for c in opts ] for opts in src_opt ]
+    s.ctrl_waddr = [ [ int( a ) for a in addrs ] for addrs in ctrl_waddr ]
+
+  def _ctrl_fields( s, ctrl ):
+    return ( int( ctrl.ctrl ), int( ctrl.predicate ),
+             [ int( x ) for x in ctrl.fu_in ],
+             [ int( x ) for x in ctrl.outport ],
+             [ int( x ) for x in ctrl.predicate_in ] )
+
+  #-----------------------------------------------------------------------
+  # Simulation
+  #-----------------------------------------------------------------------
+
+  def sim_reset( s ):
+    L = s.num_lanes
+    T = s.num_tiles
+    K = s.max_fus
+    M = s.ctrl_mem_size
+    D = s.data_mem_size
+    H = s.num_mem_ports
+    C = s.num_xbar_outports
+    I = s.num_xbar_inports
+    J = s.num_fu_outports
+    z = lambda *shape: np.zeros( shape, dtype=np.int64 )
+
+    s.ncycles = 0
+
+    # Control memory (identical for all the lanes).
+    s.ctrl_op   = z( T, M )
+    s.ctrl_pred = z( T, M )
+    s.ctrl_fuin = z( T, M, s.num_fu_in )
+    s.ctrl_out  = z( T, M, C )
+    s.ctrl_pin  = z( T, M, I )
+    s.ctrl_raddr = z( T )
+    s.ctrl_times = z( T )
+
+    # Object table.
+    s.V = z( 3, L, s.num_objs )
+    s.V[:, :, s.POOL:s.REGS] = np.moveaxis( s.pool_init, 2, 0 )
+    for t in range( T ):
+      for k, kind in enumerate( s.fu_list[t] ):
+        if kind == 'Comp':
+          s.V[0, :, s._const_obj( t, k, True )] = 1
+
+    # Data memory.
+    s.dm_regs  = z( 3, L, D )
+    s.dm_init  = z( L, D ) + ( 0 if s.has_preload else 1 )
+    s.dm_waddr = z( L, H )
+    s.dm_wchan = z( L, H )
+    s.dm_wslot = z( L, H )
+    s.dm_wen   = z( L, H )
+
+    # Channels (8 per tile) and the predicate register.
+    s.ch_regs  = z( 3, L, T, C, 2 )
+    s.ch_head  = z( L, T, C )
+    s.ch_tail  = z( L, T, C )
+    s.ch_count = z( L, T, C )
+    s.rp_regs  = z( 2, L, T, 2 )
+    s.rp_head  = z( L, T )
+    s.rp_tail  = z( L, T )
+    s.rp_count = z( L, T )
+
+    # Const queue and branch state.
+    s.cq_cur   = z( L, T )
+    s.br_first = z( L, T, K ) + 1
+
+    # Combinational signals (these keep their value when not assigned).
+    s.ctrl_en   = z( L, T )
+    s.ctrl_rdy  = z( L, T )
+    s.ch_send   = z( 3, L, T, C )
+    s.ch_send_en  = z( L, T, C )
+    s.ch_send_rdy = z( L, T, C )
+    s.ch_enq_en = z( L, T, C )
+    s.ch_deq_en = z( L, T, C )
+    s.ch_recv_rdy = z( L, T, C )
+    s.rp_send    = [ z( L, T ), z( L, T ) ]
+    s.rp_send_en = z( L, T )
+    s.rp_enq_en = z( L, T )
+    s.rp_deq_en = z( L, T )
+    s.fu_en     = z( L, T, K, J )
+    s.fu_ptr    = z( L, T, K, J )
+    s.fu_rin_rdy  = z( L, T, K, s.num_fu_inports )
+    s.fu_pred_rdy = z( L, T, K )
+    s.fu_opt_rdy  = z( L, T, K )
+    s.fu_const_rdy = z( L, T, K )
+    s.mu_en       = z( L, T, J )
+    s.mu_raddr    = z( L, T )
+    s.mu_raddr_en = z( L, T )
+    s.mu_from_rdy = z( L, T )
+    s.mu_waddr    = z( L, T )
+    s.mu_waddr_en = z( L, T )
+    s.mu_wchan    = z( L, T )
+    s.mu_wslot    = z( L, T )
+    s.mu_wdata_en = z( L, T )
+    s.mu_hold     = z( L, T )
+    s.el_out_en   = z( L, T, J )
+    s.el_out_ptr  = z( L, T, J )
+    s.el_rin_rdy  = z( L, T, s.num_fu_inports )
+    s.el_opt_rdy  = z( L, T )
+    s.el_const_rdy = z( L, T )
+    s.el_pred_rdy = z( L, T )
+    s.xb_out      = z( 3, L, T, C )
+    s.xb_out_en   = z( L, T, C )
+    s.xb_in_rdy   = z( L, T, I )
+    s.xb_pred     = z( 2, L, T )
+    s.xb_pred_en  = z( L, T )
+    s.xb_opt_rdy  = z( L, T )
+
+    for t in range( T ):
+      for k in range( s.max_fus ):
+        for j in range( J ):
+          s.fu_ptr[:, t, k, j] = s._port_obj( t, k, j )
+      for j in range( J ):
+        s.el_out_ptr[:, t, j] = s._port_obj( t, 0, j )
+
+  def _comb_state( s ):
+    return [ s.V, s.ctrl_en, s.ctrl_rdy, s.ch_send, s.ch_send_en,
+             s.ch_send_rdy, s.ch_enq_en, s.ch_deq_en, s.rp_send_en,
+             s.rp_enq_en, s.rp_deq_en, s.fu_en, s.fu_ptr, s.fu_rin_rdy,
+             s.fu_pred_rdy, s.fu_opt_rdy, s.fu_const_rdy, s.mu_en,
+             s.mu_raddr, s.mu_raddr_en, s.mu_from_rdy, s.mu_waddr,
+             s.mu_waddr_en, s.mu_wchan, s.mu_wslot, s.mu_wdata_en, s.mu_hold,
+             s.dm_waddr, s.dm_wchan, s.dm_wslot, s.dm_wen, s.el_out_en,
+             s.el_out_ptr, s.el_rin_rdy, s.el_opt_rdy, s.el_const_rdy,
+             s.el_pred_rdy, s.xb_out, s.xb_out_en, s.xb_in_rdy, s.xb_pred,
+             s.xb_pred_en, s.xb_opt_rdy ]
+
+  def tick( s ):
+    s._tick_ff()
+    s.ncycles += 1
+    s._load_ctrl()
+    s._freeze_outputs()
+    for _ in range( 100 ):
+      prev = [ x.copy() for x in s._comb_state() ]
+      s._sweep()
+      if all( [ np.array_equal( x, y )
+                for x, y in zip( prev, s._comb_state() ) ] ):
+        break
+    else:
+      raise Exception( "Combinational loop does not settle in CGRANumpy!" )
+
+  #-----------------------------------------------------------------------
+  # Sequential logic
+  #-----------------------------------------------------------------------
+
+  def _tick_ff( s ):
+    L = s.num_lanes
+    T = s.num_tiles
+    lanes = np.arange( L )[:, None]
+    tiles = np.arange( T )
+
+    # Control memory sequencing. A word held by the MemUnit stays, all
+    # the lanes share the control memory so they must hold it together.
+    if s.ncycles > 0:
+      hold = s.mu_hold.max( axis=0 )
+      if ( s.mu_hold != hold ).any():
+        raise Exception( "CGRANumpy lanes hold different control words!" )
+      running = ( s.w_op != OPT_START ) & ( hold == 0 )
+      s.ctrl_times = np.where( running & ( s.ctrl_times < s.num_ctrl ),
+                               s.ctrl_times + 1, s.ctrl_times )
+      s.ctrl_raddr = np.where( running,
+                               np.where( s.ctrl_raddr < s.ctrl_mem_size - 1,
+                                         s.ctrl_raddr + 1, 0 ),
+                               s.ctrl_raddr )
+    # The control word sent in the previous cycle is written now.
+    k = s.ncycles - 1
+    for t in range( T ):
+      if 0 <= k < len( s.ctrl_waddr[t] ):
+        addr = s.ctrl_waddr[t][k]
+        if k < len( s.src_opt[t] ):
+          op, pred, fuin, out, pin = s.src_opt[t][k]
+        else:
+          op, pred, fuin, out, pin = 0, 0, [ 0 ] * s.num_fu_in, \
+                                     [ 0 ] * s.num_xbar_outports, \
+                                     [ 0 ] * s.num_xbar_inports
+        s.ctrl_op  [t][addr] = op
+        s.ctrl_pred[t][addr] = pred
+        s.ctrl_fuin[t][addr] = fuin
+        s.ctrl_out [t][addr] = out
+        s.ctrl_pin [t][addr] = pin
+
+    # Data memory: the write ports go first and then the ports that copy
+    # the preloaded entries into the registers.
+    V = s.V
+    rows = s.mem_tiles
+    regs = s.dm_regs.copy()
+    wvalue = s.ch_regs[ :, lanes, rows, s.dm_wchan, s.dm_wslot ]
+    for r in range( s.num_mem_ports ):
+      wen = s.dm_wen[:, r] == 1
+      addr = s.dm_waddr[:, r]
+      regs[ :, np.arange( L )[ wen ], addr[ wen ] ] = wvalue[ :, wen, r ]
+    raddr = s.mu_raddr[:, rows]
+    if s.has_preload:
+      for r in range( s.num_mem_ports ):
+        addr = raddr[:, r]
+        wen = s.dm_init[ np.arange( L ), addr ] == 0
+        obj = s.pool_of[ np.arange( L ), addr ]
+        regs[ :, np.arange( L )[ wen ], addr[ wen ] ] = \
+          V[ :, np.arange( L )[ wen ], obj[ wen ] ]
+    init = s.dm_init.copy()
+    for r in range( s.num_mem_ports ):
+      ren = s.mu_raddr_en[:, rows[r]] == 1
+      init[ np.arange( L )[ ren ], raddr[ ren, r ] ] = 1
+      wen = s.mu_waddr_en[:, rows[r]] == 1
+      init[ np.arange( L )[ wen ], s.mu_waddr[ wen, rows[r] ] ] = 1
+    s.dm_regs = regs
+    s.dm_init = init
+    V[:, :, s.REGS:s.TIE] = regs
+
+    # Channels.
+    enq = s.ch_enq_en & ( s.ch_count < 2 )
+    deq = s.ch_deq_en & ( s.ch_count > 0 )
+    for f in range( 3 ):
+      slot = s.ch_regs[f]
+      cur  = s._take( slot, s.ch_tail )
+      s._put( slot, s.ch_tail, np.where( enq, s.xb_out[f], cur ) )
+    s.ch_head  = np.where( deq, 1 - s.ch_head, s.ch_head )
+    s.ch_tail  = np.where( enq, 1 - s.ch_tail, s.ch_tail )
+    s.ch_count = s.ch_count + ( enq & ( 1 - deq ) ) - ( deq & ( 1 - enq ) )
+
+    # Predicate register.
+    enq = s.rp_enq_en & ( s.rp_count < 2 )
+    deq = s.rp_deq_en & ( s.rp_count > 0 )
+    for f in range( 2 ):
+      slot = s.rp_regs[f]
+      cur  = s._take( slot, s.rp_tail )
+      s._put( slot, s.rp_tail, np.where( enq, s.xb_pred[f], cur ) )
+    s.rp_head  = np.where( deq, 1 - s.rp_head, s.rp_head )
+    s.rp_tail  = np.where( enq, 1 - s.rp_tail, s.rp_tail )
+    s.rp_count = s.rp_count + ( enq & ( 1 - deq ) ) - ( deq & ( 1 - enq ) )
+
+    # Const queue.
+    nxt = s.cq_cur + 1
+    s.cq_cur = np.where( s.el_const_rdy == 1,
+                         np.where( nxt >= s.num_const, 0, nxt ), s.cq_cur )
+
+    # Branch.
+    if s.ncycles > 0 and 'Branch' in s.fu_instances:
+      ti, ki = s.fu_instances['Branch']
+      start = s.w_op[ti] == OPT_BRH_START
+      s.br_first[:, ti, ki] = np.where( start, 0, s.br_first[:, ti, ki] )
+
+  def _load_ctrl( s ):
+    tiles = np.arange( s.num_tiles )
+    s.w_op   = s.ctrl_op  [ tiles, s.ctrl_raddr ]
+    s.w_pred = s.ctrl_pred[ tiles, s.ctrl_raddr ]
+    s.w_fuin = s.ctrl_fuin[ tiles, s.ctrl_raddr ]
+    s.w_out  = s.ctrl_out [ tiles, s.ctrl_raddr ]
+    s.w_pin  = s.ctrl_pin [ tiles, s.ctrl_raddr ]
+    s.w_valid = ( ( s.ctrl_times != s.num_ctrl ) &
+                  ( s.w_op != OPT_START ) ).astype( np.int64 )
+
+  def _freeze_outputs( s ):
+    # Functional units like BranchRTL send a new message object every
+    # time they execute. The FlexibleFu output still referencing the old
+    # one keeps its value, so the old message is copied into a snapshot.
+    creating = np.zeros( s.num_objs, dtype=np.int64 )
+    for kind, opts in fu_creating_opts.items():
+      if kind in s.fu_instances:
+        ti, ki = s.fu_instances[ kind ]
+        if opts is None:
+          hit = np.ones( s.w_op[ti].shape, dtype=bool )
+        else:
+          hit = np.isin( s.w_op[ti], opts )
+        for j in range( s.num_fu_outports ):
+          creating[ s._port_obj( ti[ hit ], ki[ hit ], j ) ] = 1
+    if not creating.any():
+      return
+    tiles = np.arange( s.num_tiles )
+    for j in range( s.num_fu_outports ):
+      ptr  = s.el_out_ptr[:, :, j]
+      hit  = creating[ ptr ] == 1
+      snap = np.broadcast_to( s.SNAP + tiles * s.num_fu_outports + j,
+                              ptr.shape )
+      for f in range( 3 ):
+        s._write( s.V[f], np.where( hit, snap, ptr ),
+                  s._read( s.V[f], ptr ) )
+      s.el_out_ptr[:, :, j] = np.where( hit, snap, ptr )
+
+  #-----------------------------------------------------------------------
+  # Combinational logic
+  #-----------------------------------------------------------------------
+
+  def _sweep( s ):
+    # The routing and the handshake of the channels are evaluated before
+    # the functional units so that a control word whose routes are not
+    # ready does not leak into the latched crossbar outputs.
+    s._comb_channels()
+    s._comb_crossbar()
+    s.ctrl_rdy = s.el_opt_rdy & s.xb_opt_rdy
+    s.ctrl_en  = s.w_valid & s.ctrl_rdy
+    s._comb_predicate_reg()
+    s._comb_fus()
+    s._comb_flexible_fu()
+    s._comb_data_mem()
+
+  def _comb_channels( s ):
+    C = s.num_xbar_outports
+    M = s.num_mesh_ports
+    # Mesh channels are drained by the crossbar of the neighbouring tile,
+    # the others by the FU inports of their own tile.
+    nbr_rdy = s.xb_in_rdy[:, s.nbr_tile, s.nbr_port] * s.nbr_valid
+    s.ch_send_rdy = np.concatenate( [ nbr_rdy, s.el_rin_rdy ], axis=2 )
+    bypass = s.xb_out[2] == 1
+    head = [ s._take( s.ch_regs[f], s.ch_head )
+             for f in range( 3 ) ]
+    enq_rdy = ( s.ch_count < 2 ).astype( np.int64 )
+    deq_rdy = ( s.ch_count > 0 ).astype( np.int64 )
+    s.ch_send = np.stack( [ np.where( bypass, s.xb_out[0], head[0] ),
+                            np.where( bypass, s.xb_out[1], head[1] ),
+                            np.where( bypass, 0,           head[2] ) ] )
+    s.ch_send_en = np.where( bypass, s.ch_send_rdy & s.xb_out_en,
+                             s.ch_send_rdy & deq_rdy )
+    s.ch_deq_en = np.where( bypass, s.ch_deq_en, s.ch_send_en )
+    s.ch_enq_en = np.where( bypass, s.ch_enq_en, s.xb_out_en & enq_rdy )
+    s.ch_recv_rdy = np.where( bypass, s.ch_send_rdy, enq_rdy )
+
+  def _comb_predicate_reg( s ):
+    s.rp_send = [ s._take( s.rp_regs[f], s.rp_head )
+                  for f in range( 2 ) ]
+    s.rp_send_en = s.el_pred_rdy & ( s.rp_count > 0 )
+    s.rp_deq_en = s.rp_send_en
+    s.rp_enq_en = s.xb_pred_en & ( s.rp_count < 2 )
+
+  def _comb_fus( s ):
+    tiles = np.arange( s.num_tiles )
+    # Inputs of the FUs.
+    F = s.num_xbar_outports - s.num_fu_inports
+    s.in_msg   = s.ch_send[:, :, :, F:]
+    s.in_en    = s.ch_send_en[:, :, F:]
+    s.in_count = s.ch_count[:, :, F:]
+    cur = s.cq_cur
+    s.const = [ s.const_value[f][ tiles, cur ] for f in range( 3 ) ]
+    out_rdy = s.xb_in_rdy[:, :, s.num_mesh_ports:].max( axis=2 )
+    s.fu_opt_rdy   = s.fu_opt_rdy   | ( out_rdy[:, :, None] * s.fu_valid )
+    s.fu_const_rdy = s.fu_const_rdy | ( out_rdy[:, :, None] * s.fu_valid )
+    # Memory ports seen by the MemUnit of each tile.
+    s._comb_mem_read()
+    for kind, ( ti, ki ) in s.fu_instances.items():
+      getattr( s, '_fu_' + kind )( ti, ki )
+
+  def _comb_mem_read( s ):
+    L = s.num_lanes
+    T = s.num_tiles
+    rows = s.mem_tiles
+    lanes = np.arange( L )[:, None]
+    s.from_obj = np.zeros( ( L, T ), dtype=np.int64 ) + s.TIE + np.arange( T )
+    s.from_en  = np.zeros( ( L, T ), dtype=np.int64 )
+    s.mem_rdy  = np.zeros( ( L, T ), dtype=np.int64 )
+    raddr = s.mu_raddr[:, rows]
+    init  = s.dm_init[ lanes, raddr ]
+    obj   = np.where( init == 1, s.REGS + raddr, s.pool_of[ lanes, raddr ] )
+    s.from_obj[:, rows] = obj
+    s.from_en [:, rows] = s.mu_raddr_en[:, rows]
+    s.mem_rdy [:, rows] = 1
+
+  #-----------------------------------------------------------------------
+  # Functional units
+  #-----------------------------------------------------------------------
+
+  def _fu_prologue( s, ti, ki, num_in ):
+    # Picks the operands selected by fu_in and raises their rdy.
+    L = s.num_lanes
+    opt_en = s.ctrl_en[:, ti]
+    rin_rdy = np.zeros( ( L, len( ti ), s.num_fu_inports ), dtype=np.int64 )
+    ins = []
+    for x in range( num_in ):
+      fuin = s.w_fuin[ti, x]
+      sel  = opt_en & ( fuin != 0 )
+      idx  = np.where( sel == 1, fuin - 1, 0 )
+      cur  = s._take( rin_rdy, idx )
+      s._put( rin_rdy, idx, ( cur | sel ) )
+      ins.append( idx )
+    pred_rdy = opt_en & s.w_pred[ti]
+    return opt_en, ins, rin_rdy, pred_rdy
+
+  def _pick( s, ti, idx ):
+    # ( payload, predicate, bypass, en, count ) of FU inport idx.
+    msg = [ s._take( s.in_msg[f][:, ti], idx )
+            for f in range( 3 ) ]
+    en  = s._take( s.in_en[:, ti], idx )
+    cnt = s._take( s.in_count[:, ti], idx )
+    return msg[0], msg[1], msg[2], en, cnt
+
+  def _set_rdy( s, rin_rdy, idx, cond, value ):
+    cur = s._take( rin_rdy, idx )
+    s._put( rin_rdy, idx, np.where( cond, value, cur ) )
+
+  def _fu_epilogue( s, ti, ki, en, ptr, rin_rdy, pred_rdy ):
+    for j in range( s.num_fu_outports ):
+      s.fu_en [:, ti, ki, j] = en[j]
+      s.fu_ptr[:, ti, ki, j] = ptr[j]
+    s.fu_rin_rdy [:, ti, ki] = rin_rdy
+    s.fu_pred_rdy[:, ti, ki] = pred_rdy
+
+  def _fu_arith( s, ti, ki, results, count_check ):
+    # Shared by AdderRTL, MulRTL, LogicRTL and ShifterRTL: results maps an
+    # opcode to ( payload, predicate ), count_check lists the opcodes that
+    # wait for both operands.
+    opt_en, ( in0, in1 ), rin_rdy, pred_rdy = s._fu_prologue( ti, ki, 2 )
+    op = s.w_op[ti]
+    p0, q0, _, e0, c0 = s._pick( ti, in0 )
+    p1, q1, _, e1, c1 = s._pick( ti, in1 )
+    obj = np.broadcast_to( s._port_obj( ti, ki, 0 ), opt_en.shape )
+    payload = s._read( s.V[0], obj )
+    pred = q0 & q1
+    handled = np.zeros( op.shape, dtype=np.int64 )
+    for opt, ( res_payload, res_pred ) in results( p0, q0, p1, q1 ).items():
+      hit = op == opt
+      handled = handled | hit
+      payload = np.where( hit, res_payload, payload )
+      if res_pred is not None:
+        pred = np.where( hit, res_pred, pred )
+    blocked = np.isin( op, count_check ) & opt_en & ( ( c0 == 0 ) | ( c1 == 0 ) )
+    s._set_rdy( rin_rdy, in0, blocked, 0 )
+    s._set_rdy( rin_rdy, in1, blocked, 0 )
+    pred = np.where( blocked, 0, pred )
+    pred = np.where( s.w_pred[ti] == 1, pred & s.rp_send[1][:, ti], pred )
+    s._write( s.V[0], obj, payload & s.payload_mask )
+    s._write( s.V[1], obj, pred )
+    en = opt_en & handled
+    s._fu_epilogue( ti, ki, [ en, en ],
+                    [ obj, s._port_obj( ti, ki, 1 ) + 0 * obj ],
+                    rin_rdy, pred_rdy )
+
+  def _fu_Adder( s, ti, ki ):
+    cp = s.const[0][:, ti]
+    s._fu_arith( ti, ki, lambda p0, q0, p1, q1: {
+      OPT_ADD       : ( p0 + p1, q0 & q1 ),
+      OPT_ADD_CONST : ( p0 + cp, q0      ),
+      OPT_INC       : ( p0 + 1,  q0      ),
+      OPT_SUB       : ( p0 - p1, q0      ),
+      OPT_PAS       : ( p0,      q0      ),
+    }, [ OPT_ADD, OPT_SUB ] )
+
+  def _fu_Mul( s, ti, ki ):
+    cp = s.const[0][:, ti]
+    s._fu_arith( ti, ki, lambda p0, q0, p1, q1: {
+      OPT_MUL       : ( p0 * p1, None ),
+      OPT_MUL_CONST : ( p0 * cp, q0   ),
+      OPT_DIV       : ( np.where( p1 == 0, 0, p0 // np.maximum( p1, 1 ) ),
+                        None ),
+    }, [ OPT_MUL, OPT_DIV ] )
+
+  def _fu_Logic( s, ti, ki ):
+    s._fu_arith( ti, ki, lambda p0, q0, p1, q1: {
+      OPT_OR  : ( p0 | p1, None ),
+      OPT_AND : ( p0 & p1, None ),
+      OPT_NOT : ( ~p0,     None ),
+      OPT_XOR : ( p0 ^ p1, None ),
+    }, [ OPT_OR, OPT_AND, OPT_XOR ] )
+
+  def _fu_Shifter( s, ti, ki ):
+    nbits = s.payload_nbits
+    s._fu_arith( ti, ki, lambda p0, q0, p1, q1: {
+      OPT_LLS : ( np.where( p1 >= nbits, 0, p0 << np.minimum( p1, nbits ) ),
+                  None ),
+      OPT_LRS : ( np.where( p1 >= nbits, 0, p0 >> np.minimum( p1, nbits ) ),
+                  None ),
+    }, [ OPT_LLS, OPT_LRS ] )
+
+  def _fu_Phi( s, ti, ki ):
+    opt_en, ( in0, in1 ), rin_rdy, pred_rdy = s._fu_prologue( ti, ki, 2 )
+    op = s.w_op[ti]
+    p0, q0, _, e0, c0 = s._pick( ti, in0 )
+    p1, q1, _, e1, c1 = s._pick( ti, in1 )
+    rp_payload = s.rp_send[0][:, ti]
+    rp_pred    = s.rp_send[1][:, ti]
+    obj = np.broadcast_to( s._port_obj( ti, ki, 0 ), opt_en.shape )
+    payload = s._read( s.V[0], obj )
+    pred    = s._read( s.V[1], obj )
+    phi       = op == OPT_PHI
+    phi_const = op == OPT_PHI_CONST
+    # OPT_PHI
+    payload = np.where( phi, np.where( q0 == 1, p0,
+                                       np.where( q1 == 1, p1, p0 ) ), payload )
+    pred    = np.where( phi, ( q0 | q1 ), pred )
+    blocked = phi & opt_en & ( ( c0 == 0 ) | ( c1 == 0 ) )
+    s._set_rdy( rin_rdy, in0, blocked, 0 )
+    s._set_rdy( rin_rdy, in1, blocked, 0 )
+    pred_rdy = np.where( blocked, 0, pred_rdy )
+    pred     = np.where( blocked, 0, pred )
+    off = phi & ( s.w_pred[ti] == 1 ) & ( rp_payload == 0 )
+    pred_rdy = np.where( off, 0, pred_rdy )
+    s._set_rdy( rin_rdy, in0, off, 0 )
+    s._set_rdy( rin_rdy, in1, off, 0 )
+    # OPT_PHI_CONST
+    pred    = np.where( phi_const, 1, pred )
+    payload = np.where( phi_const, np.where( q0 == 1, p0, s.const[0][:, ti] ),
+                        payload )
+    off = phi_const & ( s.w_pred[ti] == 1 ) & ( rp_payload == 0 )
+    s._set_rdy( rin_rdy, in0, off, 0 )
+    # Predication
+    pred = np.where( s.w_pred[ti] == 1, pred & rp_pred, pred )
+    pred = np.where( off, 1, pred )
+    s._write( s.V[0], obj, payload )
+    s._write( s.V[1], obj, pred )
+    en = opt_en & ( phi | phi_const )
+    s._fu_epilogue( ti, ki, [ en, en ],
+                    [ obj, s._port_obj( ti, ki, 1 ) + 0 * obj ],
+                    rin_rdy, pred_rdy )
+
+  def _fu_Comp( s, ti, ki ):
+    # The output refers to either the const one or the const zero of the
+    # unit, whose predicate is overwritten in place.
+    opt_en, ( in0, in1 ), rin_rdy, pred_rdy = s._fu_prologue( ti, ki, 2 )
+    op = s.w_op[ti]
+    p0, q0, _, e0, c0 = s._pick( ti, in0 )
+    p1, q1, _, e1, c1 = s._pick( ti, in1 )
+    one  = np.broadcast_to( s._const_obj( ti, ki, True  ), opt_en.shape )
+    zero = np.broadcast_to( s._const_obj( ti, ki, False ), opt_en.shape )
+    eq       = op == OPT_EQ
+    eq_const = op == OPT_EQ_CONST
+    le       = op == OPT_LE
+    truth = np.where( eq, p0 == p1,
+            np.where( eq_const, p0 == s.const[0][:, ti], p0 < p1 ) )
+    obj  = np.where( ( eq | eq_const | le ) & ( truth == 0 ), zero, one )
+    pred = s._read( s.V[1], obj )
+    pred = np.where( eq | le, q0 & q1, np.where( eq_const, 1, pred ) )
+    blocked = ( eq | le ) & opt_en & ( ( c0 == 0 ) | ( c1 == 0 ) )
+    s._set_rdy( rin_rdy, in0, blocked, 0 )
+    s._set_rdy( rin_rdy, in1, blocked, 0 )
+    pred = np.where( blocked & eq, 0, pred )
+    pred = np.where( s.w_pred[ti] == 1, pred & s.rp_send[1][:, ti], pred )
+    s._write( s.V[1], obj, pred )
+    en = opt_en & ( eq | eq_const | le )
+    s._fu_epilogue( ti, ki, [ en, en ],
+                    [ obj, s._port_obj( ti, ki, 1 ) + 0 * obj ],
+                    rin_rdy, pred_rdy )
+
+  def _fu_Branch( s, ti, ki ):
+    opt_en, ( in0, ), rin_rdy, pred_rdy = s._fu_prologue( ti, ki, 1 )
+    op = s.w_op[ti]
+    p0, q0, _, e0, c0 = s._pick( ti, in0 )
+    brh       = op == OPT_BRH
+    brh_start = op == OPT_BRH_START
+    first = s.br_first[:, ti, ki]
+    taken = np.where( brh, p0 == 0, first == 1 ).astype( np.int64 )
+    pred_on = ( s.w_pred[ti] == 1 ) & ( op != OPT_BRH_START )
+    objs = []
+    for j, value in enumerate( [ taken, 1 - taken ] ):
+      obj = np.broadcast_to( s._port_obj( ti, ki, j ), opt_en.shape )
+      create = brh | brh_start
+      for f in range( 3 ):
+        cur = s._read( s.V[f], obj )
+        new = value if f == 1 else 0
+        s._write( s.V[f], obj, np.where( create, new, cur ) )
+      pred = s._read( s.V[1], obj )
+      s._write( s.V[1], obj, np.where( pred_on, pred & s.rp_send[1][:, ti],
+                                        pred ) )
+      objs.append( obj )
+    en = opt_en & ( brh | brh_start )
+    s._fu_epilogue( ti, ki, [ en, en ], objs, rin_rdy, pred_rdy )
+
+  def _fu_Ret( s, ti, ki ):
+    opt_en, ( in0, ), rin_rdy, pred_rdy = s._fu_prologue( ti, ki, 1 )
+    op = s.w_op[ti]
+    p0, q0, _, e0, c0 = s._pick( ti, in0 )
+    ret = op == OPT_RET
+    obj = np.broadcast_to( s._port_obj( ti, ki, 0 ), opt_en.shape )
+    for f, value in enumerate( [ p0, ( q0 != 0 ).astype( np.int64 ), 0 ] ):
+      s._write( s.V[f], obj, np.where( ret, value, s._read( s.V[f], obj ) ) )
+    pred = s._read( s.V[1], obj )
+    s._write( s.V[1], obj, np.where( s.w_pred[ti] == 1,
+                                      pred & s.rp_send[1][:, ti], pred ) )
+    en = opt_en & ret
+    s._fu_epilogue( ti, ki, [ en, en ],
+                    [ obj, s._port_obj( ti, ki, 1 ) + 0 * obj ],
+                    rin_rdy, pred_rdy )
+
+  def _fu_Sel( s, ti, ki ):
+    opt_en, ( in0, in1, in2 ), rin_rdy, pred_rdy = s._fu_prologue( ti, ki, 3 )
+    op = s.w_op[ti]
+    p0, q0, b0, e0, c0 = s._pick( ti, in0 )
+    p1, q1, b1, e1, c1 = s._pick( ti, in1 )
+    p2, q2, b2, e2, c2 = s._pick( ti, in2 )
+    sel = op == OPT_SEL
+    obj = np.broadcast_to( s._port_obj( ti, ki, 0 ), opt_en.shape )
+    first = p0 == 1
+    for f, ( v1, v2 ) in enumerate( [ ( p1, p2 ), ( q1, q2 ), ( b1, b2 ) ] ):
+      s._write( s.V[f], obj, np.where( sel, np.where( first, v1, v2 ),
+                                       s._read( s.V[f], obj ) ) )
+    blocked = sel & opt_en & ( ( c0 == 0 ) | ( c1 == 0 ) | ( c2 == 0 ) )
+    for idx in [ in0, in1, in2 ]:
+      s._set_rdy( rin_rdy, idx, blocked, 0 )
+    pred = s._read( s.V[1], obj )
+    pred = np.where( blocked, 0, pred )
+    pred = np.where( s.w_pred[ti] == 1, pred & s.rp_send[1][:, ti], pred )
+    s._write( s.V[1], obj, pred )
+    en = opt_en & sel
+    s._fu_epilogue( ti, ki, [ en, en ],
+                    [ obj, s._port_obj( ti, ki, 1 ) + 0 * obj ],
+                    rin_rdy, pred_rdy )
+
+  def _fu_MemUnit( s, ti, ki ):
+    opt_en, ( in0, in1 ), rin_rdy, pred_rdy = s._fu_prologue( ti, ki, 2 )
+    op = s.w_op[ti]
+    p0, q0, _, e0, c0 = s._pick( ti, in0 )
+    p1, q1, _, e1, c1 = s._pick( ti, in1 )
+    out_rdy = s.xb_in_rdy[:, ti, s.num_mesh_ports]
+    mem_rdy = s.mem_rdy[:, ti]
+    ld       = op == OPT_LD
+    ld_const = op == OPT_LD_CONST
+    st       = op == OPT_STR
+    # The output en of a MemUnit accumulates the en of its inports.
+    any_en = s.in_en[:, ti].max( axis=2 )
+    en = [ ( any_en | s.mu_en[:, ti, j] ) & opt_en
+           for j in range( s.num_fu_outports ) ]
+    # OPT_LD
+    raddr_rdy = mem_rdy & s.mu_from_rdy[:, ti]
+    s._set_rdy( rin_rdy, in0, ld, raddr_rdy )
+    s._set_rdy( rin_rdy, in1, ld, s.mu_from_rdy[:, ti] )
+    # OPT_LD_CONST
+    rin_rdy = np.where( ld_const[None, :, None], 0, rin_rdy )
+    s.fu_const_rdy[:, ti, ki] = np.where( ld_const, raddr_rdy,
+                                          s.fu_const_rdy[:, ti, ki] )
+    raddr = np.where( ld, p0, np.where( ld_const, s.const[0][:, ti],
+                                        s.mu_raddr[:, ti] ) ) & s.addr_mask
+    raddr_en = np.where( ld, e0, np.where( ld_const, s.el_const_rdy[:, ti],
+                                           s.mu_raddr_en[:, ti] ) )
+    from_rdy = np.where( ld | ld_const, out_rdy, s.mu_from_rdy[:, ti] )
+    en[0] = np.where( ld | ld_const, opt_en, en[0] )
+    # A load whose address is held back by the data memory waits with
+    # its control word.
+    fuin = s.w_fuin[ti, 0]
+    held = np.where( fuin != 0, fuin - 1, 0 ) + 0 * opt_en
+    hold = ( ld & ( fuin != 0 ) & ( s._take( s.in_count[:, ti], held ) != 0 )
+             | ld_const ) & ( 1 - raddr_rdy )
+    s._set_rdy( rin_rdy, held, ld & hold, 0 )
+    en[0] = np.where( hold, 0, en[0] )
+    # OPT_STR
+    s._set_rdy( rin_rdy, in0, st, mem_rdy )
+    s._set_rdy( rin_rdy, in1, st, mem_rdy )
+    s.mu_waddr[:, ti] = np.where( st, s.in_msg[0][:, ti, 0] & s.addr_mask,
+                                  s.mu_waddr[:, ti] )
+    s.mu_waddr_en[:, ti] = np.where( st, e0, 0 )
+    F = s.num_xbar_outports - s.num_fu_inports
+    head = s._take( s.ch_head[:, ti], F + in1 )
+    s.mu_wchan[:, ti] = np.where( st, F + in1, s.mu_wchan[:, ti] )
+    s.mu_wslot[:, ti] = np.where( st, head, s.mu_wslot[:, ti] )
+    s.mu_wdata_en[:, ti] = np.where( st, e1, 0 )
+    en[0] = np.where( st, 0, en[0] )
+    blocked = st & opt_en & ( ( c0 == 0 ) | ( c1 == 0 ) )
+    s._set_rdy( rin_rdy, in0, blocked, 0 )
+    s._set_rdy( rin_rdy, in1, blocked, 0 )
+    # So does a store whose address and word are not both taken.
+    fuin = s.w_fuin[ti, :2]
+    st_held = [ np.where( fuin[:, x] != 0, fuin[:, x] - 1, 0 ) + 0 * opt_en
+                for x in range( 2 ) ]
+    st_hold = st & ( fuin[:, 0] != 0 ) & ( fuin[:, 1] != 0 ) & \
+              ( s._take( s.in_count[:, ti], st_held[0] ) != 0 ) & \
+              ( s._take( s.in_count[:, ti], st_held[1] ) != 0 ) & \
+              ( 1 - mem_rdy )
+    s._set_rdy( rin_rdy, st_held[0], st_hold, 0 )
+    s._set_rdy( rin_rdy, st_held[1], st_hold, 0 )
+    hold = hold | st_hold
+    s.fu_opt_rdy[:, ti, ki] = np.where( hold, 0, s.fu_opt_rdy[:, ti, ki] )
+    s.mu_hold[:, ti] = hold
+    # Other opcodes
+    mem_op = ld | ld_const | st
+    en = [ np.where( mem_op, x, 0 ) for x in en ]
+    # The output message is a new copy of the data memory entry, whose
+    # predicate is then updated.
+    src = s.from_obj[:, ti]
+    obj = np.broadcast_to( s._port_obj( ti, ki, 0 ), src.shape )
+    pred = s._read( s.V[1], src )
+    pred = np.where( ld, q0, np.where( ld_const, 1,
+           np.where( st, np.where( blocked, 0, q0 & q1 ), pred ) ) )
+    pred = np.where( s.w_pred[ti] == 1, pred & s.rp_send[1][:, ti], pred )
+    s._write( s.V[0], obj, s._read( s.V[0], src ) )
+    s._write( s.V[1], obj, pred )
+    s._write( s.V[2], obj, s._read( s.V[2], src ) )
+    s.mu_raddr   [:, ti] = raddr
+    s.mu_raddr_en[:, ti] = raddr_en
+    s.mu_from_rdy[:, ti] = from_rdy
+    for j in range( s.num_fu_outports ):
+      s.mu_en[:, ti, j] = en[j]
+    s._fu_epilogue( ti, ki, en, [ obj, s._port_obj( ti, ki, 1 ) + 0 * obj ],
+                    rin_rdy, pred_rdy )
+
+  #-----------------------------------------------------------------------
+  # FlexibleFu, data memory and crossbar
+  #-----------------------------------------------------------------------
+
+  def _comb_flexible_fu( s ):
+    K = s.max_fus
+    valid = s.fu_valid[None, :, :]
+    for j in range( s.num_fu_outports ):
+      en = s.fu_en[:, :, :, j] * valid
+      any_en = en.max( axis=2 )
+      # The last FU in the list that sends wins.
+      last = K - 1 - np.argmax( en[:, :, ::-1], axis=2 )
+      ptr = s._take( s.fu_ptr[:, :, :, j], last )
+      s.el_out_en [:, :, j] = any_en
+      s.el_out_ptr[:, :, j] = np.where( any_en == 1, ptr, s.el_out_ptr[:, :, j] )
+    s.el_rin_rdy   = ( s.fu_rin_rdy * valid[..., None] ).max( axis=2 )
+    s.el_opt_rdy   = s.el_opt_rdy   | ( s.fu_opt_rdy   * valid ).max( axis=2 )
+    s.el_const_rdy = s.el_const_rdy | ( s.fu_const_rdy * valid ).max( axis=2 )
+    s.el_pred_rdy  = s.el_pred_rdy  | ( s.fu_pred_rdy  * valid ).max( axis=2 )
+    if 'MemUnit' in s.fu_instances:
+      ti, ki = s.fu_instances['MemUnit']
+      s.el_opt_rdy[:, ti] = s.el_opt_rdy[:, ti] & s.fu_opt_rdy[:, ti, ki]
+
+  def _comb_data_mem( s ):
+    # The address and data of a write are only latched into the register
+    # file when the waddr is valid, its wen is cleared otherwise.
+    rows = s.mem_tiles
+    wen = s.mu_waddr_en[:, rows] == 1
+    s.dm_waddr = np.where( wen, s.mu_waddr[:, rows], s.dm_waddr )
+    s.dm_wchan = np.where( wen, s.mu_wchan[:, rows], s.dm_wchan )
+    s.dm_wslot = np.where( wen, s.mu_wslot[:, rows], s.dm_wslot )
+    s.dm_wen   = np.where( wen, s.mu_wdata_en[:, rows] & s.mu_waddr_en[:, rows],
+                           0 )
+
+  def _comb_crossbar( s ):
+    L = s.num_lanes
+    T = s.num_tiles
+    M = s.num_mesh_ports
+    # Inports: the mesh channels of the neighbours and the FU outports.
+    mesh_msg = s.ch_send[:, :, s.nbr_tile, s.nbr_port] * s.nbr_valid
+    mesh_en  = s.ch_send_en[:, s.nbr_tile, s.nbr_port] * s.nbr_valid
+    fu_msg   = np.stack( [ s._read( s.V[f], s.el_out_ptr ) for f in range( 3 ) ] )
+    in_msg = np.concatenate( [ mesh_msg, fu_msg ], axis=3 )
+    in_en  = np.concatenate( [ mesh_en, s.el_out_en ], axis=2 )
+    active = ( s.w_op != OPT_START )[None, :]
+    # Predicate register update.
+    s.xb_pred = np.where( s.w_pred[None, None, :] == 1, 0, s.xb_pred )
+    hit = active[..., None] & ( s.w_pin[None, :, :] == 1 ) & ( in_en == 1 )
+    s.xb_pred_en = hit.max( axis=2 ).astype( np.int64 )
+    s.xb_pred[0] = np.where( s.xb_pred_en == 1, 1, s.xb_pred[0] )
+    s.xb_pred[1] = s.xb_pred[1] | ( hit * in_msg[1] ).max( axis=2 )
+    # Routing.
+    out_rdy = s.ch_recv_rdy
+    lanes = np.arange( L )[:, None]
+    tiles = np.arange( T )[None, :]
+    for i in range( s.num_xbar_outports ):
+      in_dir = np.broadcast_to( s.w_out[:, i][None, :], ( L, T ) )
+      k = np.maximum( in_dir - 1, 0 )
+      routed = active & ( in_dir > 0 ) & ( out_rdy[:, :, i] == 1 )
+      s.xb_in_rdy[ lanes, tiles, k ] = s.xb_in_rdy[ lanes, tiles, k ] | routed
+      en = s._take( in_en, k )
+      s.xb_out_en[:, :, i] = np.where( routed, en, 0 )
+      copy = routed & ( en == 1 )
+      for f in range( 3 ):
+        value = s._take( in_msg[f], k )
+        s.xb_out[f, :, :, i] = np.where( copy, value, s.xb_out[f, :, :, i] )
+      bypass = 1 if i < M else 0
+      s.xb_out[2, :, :, i] = np.where( routed, np.where( k >= M, bypass, 0 ),
+                                       s.xb_out[2, :, :, i] )
+    s.xb_opt_rdy = np.where( active, out_rdy.max( axis=2 ), 0 )
+
+  #-----------------------------------------------------------------------
+  # Results
+  #-----------------------------------------------------------------------
+
+  def _msg( s, V, lane, obj ):
+    return s.DataType( int( V[0][lane][obj] ), int( V[1][lane][obj] ),
+                       int( V[2][lane][obj] ) )
+
+  def get_fu_out( s, tile_id, port = 0, lane = 0 ):
+    return s._msg( s.V, lane, s.el_out_ptr[lane][tile_id][port] )
+
+  def get_data_mem( s, lane = 0 ):
+    res = []
+    for a in range( s.data_mem_size ):
+      if s.dm_init[lane][a]:
+        res.append( s._msg( s.V, lane, s.REGS + a ) )
+      else:
+        res.append( s._msg( s.V, lane, s.pool_of[lane][a] ) )
+    return res
+
+  def get_live_out( s, tile_id, port = 0 ):
+    return [ s.get_fu_out( tile_id, port, l ) for l in range( s.num_lanes ) ]
+
+  def get_data_mem_batch( s ):
+    return [ s.get_data_mem( l ) for l in range( s.num_lanes ) ]
+
+  def line_trace( s ):
+    res = "||\n".join( [ "[tile" + str( t ) + "]: " +
+                          "|".join( [ str( s.get_fu_out( t, j ) )
+                                      for j in range( s.num_fu_outports ) ] )
+                         for t in range( s.num_tiles ) ] )
+    res += "\n :: [" + "|".join( [ str( x ) for x in s.get_data_mem() ] ) + "]    \n"
+    return res
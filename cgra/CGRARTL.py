@@ -15,6 +15,9 @@ from ..tile.TileRTL              import TileRTL
 from ..lib.opt_type              import *
 from ..mem.data.DataMemRTL       import DataMemRTL
 from ..mem.data.DataMemCL        import DataMemCL
+from ..mem.ctrl.CtrlMemRTL       import CtrlMemRTL
+from ..lib.data_helper           import load_npy, dump_npy
+from ..lib.map_helper            import default_fu_list
 from ..fu.single.MemUnitRTL      import MemUnitRTL
 from ..fu.single.AdderRTL        import AdderRTL
 from ..fu.flexible.FlexibleFuRTL import FlexibleFuRTL
@@ -23,7 +26,9 @@ class CGRARTL( Component ):
 
   def construct( s, DataType, PredicateType, CtrlType, width, height,
                  ctrl_mem_size, data_mem_size, num_ctrl, FunctionUnit,
-                 FuList, preload_data = None, preload_const = None ):
+                 FuList, preload_data = None, preload_const = None,
+                 mem_tiles = None, CtrlMem = CtrlMemRTL,
+                 DataMem = DataMemRTL ):
 
     # Constant
     NORTH = 0
@@ -38,21 +43,61 @@ class CGRARTL( Component ):
     s.recv_waddr = [ RecvIfcRTL( AddrType )  for _ in range( s.num_tiles ) ]
     s.recv_wopt  = [ RecvIfcRTL( CtrlType )  for _ in range( s.num_tiles ) ]
 
+    # FuList can be either one list for all the tiles or a list per tile
+    # (None keeps the default FuList of TileRTL). The tiles in mem_tiles
+    # are connected to the ports of the data memory, by default the tiles
+    # in the left column. DataMem is DataMemRTL or another memory with the
+    # same constructor, such as BankedDataMemRTL.
+    if FuList == None:
+      FuList = default_fu_list
+    if not isinstance( FuList[0], list ):
+      FuList = [ FuList for _ in range( s.num_tiles ) ]
+    assert len( FuList ) == s.num_tiles
+    if mem_tiles == None:
+      mem_tiles = [ i * width for i in range( height ) ]
+    s.mem_tiles = mem_tiles
+
     # Components
     if preload_const == None:
       preload_const = [[DataType(0, 0)] for _ in range(width*height)]
     s.tile = [ TileRTL( DataType, PredicateType, CtrlType,
                         ctrl_mem_size, data_mem_size,
                         num_ctrl, 4, 2, s.num_mesh_ports,
-                        s.num_mesh_ports, const_list = preload_const[i] )
+                        s.num_mesh_ports, Fu = FunctionUnit,
+                        FuList = FuList[i], const_list = preload_const[i],
+                        CtrlMem = CtrlMem )
                         for i in range( s.num_tiles ) ]
-    s.data_mem = DataMemRTL( DataType, data_mem_size, height, height, preload_data )
+    s.data_mem = DataMem( DataType, data_mem_size, len( mem_tiles ),
+                          len( mem_tiles ), preload_data )
+
+    # Swap of the double-buffered control memories (CtrlMemShadowRTL).
+    if hasattr( s.tile[0], 'recv_swap' ):
+      s.recv_swap = [ RecvIfcRTL( b1 ) for _ in range( s.num_tiles ) ]
+      for i in range( s.num_tiles ):
+        s.recv_swap[i] //= s.tile[i].recv_swap
+
+    # A load of MemUnitLsqRTL holds its control word until its word is
+    # back; all the tiles wait for it, so the schedule is kept.
+    s.stall = Wire( b1 )
+
+    @s.update
+    def update_stall():
+      s.stall = b1( 0 )
+      for i in range( s.num_tiles ):
+        s.stall = s.stall | s.tile[i].array_hold
 
     # Connections
     for i in range( s.num_tiles):
+      s.tile[i].stall //= s.stall
       s.recv_waddr[i] //= s.tile[i].recv_waddr
       s.recv_wopt[i]  //= s.tile[i].recv_wopt
 
+      # The constants are rewritten between two ticks with load_consts().
+      s.tile[i].recv_const_waddr.en  //= 0
+      s.tile[i].recv_const_waddr.msg //= 0
+      s.tile[i].recv_const.en        //= 0
+      s.tile[i].recv_const.msg       //= DataType( 0, 0 )
+
       if i // width > 0:
         s.tile[i].send_data[SOUTH] //= s.tile[i-width].recv_data[NORTH]
 
@@ -85,11 +130,12 @@ class CGRARTL( Component ):
         s.tile[i].recv_data[EAST].en   //= 0
         s.tile[i].recv_data[EAST].msg  //= DataType( 0, 0 )
 
-      if i % width == 0:
-        s.tile[i].to_mem_raddr   //= s.data_mem.recv_raddr[i//width]
-        s.tile[i].from_mem_rdata //= s.data_mem.send_rdata[i//width]
-        s.tile[i].to_mem_waddr   //= s.data_mem.recv_waddr[i//width]
-        s.tile[i].to_mem_wdata   //= s.data_mem.recv_wdata[i//width]
+      if i in mem_tiles:
+        port = mem_tiles.index( i )
+        s.tile[i].to_mem_raddr   //= s.data_mem.recv_raddr[port]
+        s.tile[i].from_mem_rdata //= s.data_mem.send_rdata[port]
+        s.tile[i].to_mem_waddr   //= s.data_mem.recv_waddr[port]
+        s.tile[i].to_mem_wdata   //= s.data_mem.recv_wdata[port]
       else:
         s.tile[i].to_mem_raddr.rdy //= 0
         s.tile[i].from_mem_rdata.en //= 0
@@ -97,6 +143,36 @@ class CGRARTL( Component ):
         s.tile[i].to_mem_waddr.rdy //= 0
         s.tile[i].to_mem_wdata.rdy //= 0
 
+  # Reload between two ticks, without elaborating again: a data memory
+  # image from address base and the constants and control words of each
+  # tile (None keeps those of a tile). The control pointers and the
+  # const cursors restart from the first entry.
+  def load_data( s, data, base = 0 ):
+    s.data_mem.load_data( data, base )
+
+  def load_consts( s, preload_const ):
+    for tile, consts in zip( s.tile, preload_const ):
+      if consts != None:
+        tile.load_consts( consts )
+
+  def load_ctrl( s, preload_ctrl ):
+    for tile, opt_list in zip( s.tile, preload_ctrl ):
+      if opt_list != None:
+        tile.load_ctrl( opt_list )
+
+  # Bulk data memory images, see data_helper.py.
+  def load_array( s, payload, predicate = None, base = 0 ):
+    s.data_mem.load_array( payload, predicate, base )
+
+  def dump_array( s, base = 0, size = None ):
+    return s.data_mem.dump_array( base, size )
+
+  def load_npy( s, payload_file, predicate_file = None, base = 0 ):
+    load_npy( s.data_mem, payload_file, predicate_file, base )
+
+  def dump_npy( s, payload_file, predicate_file, base = 0, size = None ):
+    dump_npy( s.data_mem, payload_file, predicate_file, base, size )
+
   # Line trace
   def line_trace( s ):
     # str = "||".join([ x.element.line_trace() for x in s.tile ])
@@ -106,3 +182,7 @@ class CGRARTL( Component ):
     res += "\n :: [" + s.data_mem.line_trace() + "]    \n"
     return res
 
+  # Performance counters
+  def perf_snapshot( s ):
+    return { 'tiles'    : [ x.perf_snapshot() for x in s.tile ],
+             'data_mem' : s.data_mem.perf_snapshot() }
@@ -0,0 +1,147 @@
+"""
+==========================================================================
+CGRABanked_test.py
+==========================================================================
+Test cases for CGRAs whose memory-attached tiles share a banked data
+memory.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                         import *
+from pymtl3.stdlib.test.test_srcs   import TestSrcRTL
+
+from ...lib.opt_type                import *
+from ...lib.messages                import *
+from ...fu.flexible.FlexibleFuRTL   import FlexibleFuRTL
+from ...fu.single.AdderRTL          import AdderRTL
+from ...fu.single.MemUnitRTL        import MemUnitRTL
+from ...mem.ctrl.CtrlMemRTL         import CtrlMemRTL
+from ...mem.data.DataMemCL          import DataMemCL
+from ...mem.data.DataMemRTL         import DataMemRTL
+from ...mem.data.BankedDataMemRTL   import BankedDataMemRTL
+from ...tile.TileCL                 import TileCL
+from ...tile.TileNativeCL           import TileNativeCL
+from ..CGRACL                       import CGRACL
+from ..CGRARTL                      import CGRARTL
+from .CGRAShadow_test               import mk_fir_sim, run
+from .CGRARTL_FIR_test              import run_CGRAFL
+from .CGRANumpy_test                import fir_params
+
+import pytest
+
+#-------------------------------------------------------------------------
+# Conflicting loads
+#-------------------------------------------------------------------------
+# The four tiles of a 2x2 CGRA are attached to the data memory, each one
+# loads a word of bank 0 (LD_CONST) and increments it (INC) in a loop.
+
+width         = 2
+height        = 2
+num_tiles     = width * height
+data_mem_size = 16
+DataType      = mk_data( 16, 1 )
+PredicateType = mk_predicate( 1, 1 )
+CtrlType      = mk_ctrl( 4, 6, 8 )
+RouteType     = mk_bits( clog2( 6 + 1 ) )
+FuInType      = mk_bits( clog2( 4 + 1 ) )
+AddrType      = mk_bits( 1 )
+FuList        = [ AdderRTL, MemUnitRTL ]
+
+def mk_kernel():
+  # The loaded word goes to the first FU inport, which INC takes.
+  ld  = CtrlType( OPT_LD_CONST, b1( 0 ), [ FuInType( 0 ) ] * 4,
+                  [ RouteType( 0 ) ] * 4 + [ RouteType( 5 ) ] +
+                  [ RouteType( 0 ) ] * 3 )
+  inc = CtrlType( OPT_INC, b1( 0 ), [ FuInType( 1 ) ] + [ FuInType( 0 ) ] * 3,
+                  [ RouteType( 0 ) ] * 8 )
+  preload_data  = [ DataType( i, 1 ) for i in range( data_mem_size ) ]
+  preload_const = [ [ DataType( 4 * i, 1 ) ] for i in range( num_tiles ) ]
+  return [ ld, inc ], preload_data, preload_const
+
+class TestHarness( Component ):
+
+  def construct( s, DataMem ):
+    opts, preload_data, preload_const = mk_kernel()
+    s.src_opt   = [ TestSrcRTL( CtrlType, opts ) for _ in range( num_tiles ) ]
+    s.src_waddr = [ TestSrcRTL( AddrType, [ AddrType( 0 ), AddrType( 1 ) ] )
+                    for _ in range( num_tiles ) ]
+    s.dut = CGRARTL( DataType, PredicateType, CtrlType, width, height, 2,
+                     data_mem_size, 100, FlexibleFuRTL, FuList, preload_data,
+                     preload_const, mem_tiles = list( range( num_tiles ) ),
+                     DataMem = DataMem )
+    for i in range( num_tiles ):
+      s.src_opt[i].send   //= s.dut.recv_wopt[i]
+      s.src_waddr[i].send //= s.dut.recv_waddr[i]
+
+def mk_cgra( Tile, DataMem ):
+  opts, preload_data, preload_const = mk_kernel()
+  if Tile == None:
+    th = TestHarness( DataMem )
+  else:
+    th = CGRACL( FlexibleFuRTL, FuList, DataType, PredicateType, CtrlType,
+                 width, height, 2, data_mem_size, 100,
+                 [ opts ] * num_tiles, preload_data, preload_const,
+                 mem_tiles = list( range( num_tiles ) ), Tile = Tile,
+                 DataMem = DataMem )
+  th.elaborate()
+  th.apply( SimulationPass() )
+  th.sim_reset()
+  return th
+
+def fu_out( tile ):
+  # The word sent by the FU of the tile in this cycle, None if none.
+  if hasattr( tile, 'element' ):
+    out = tile.element.send_out[0]
+    return int( out.msg.payload ) if out.en else None
+  return int( tile.fu_out[0].payload ) if tile.fu_out_en[0] else None
+
+def run_kernel( Tile, DataMem, ncycles = 24 ):
+  th    = mk_cgra( Tile, DataMem )
+  cgra  = th.dut if Tile == None else th
+  trace = []
+  for _ in range( ncycles ):
+    th.tick()
+    trace.append( [ fu_out( x ) for x in cgra.tile ] )
+  return trace
+
+def words_of( trace, i ):
+  return [ x[i] for x in trace if x[i] != None ]
+
+def loop_of( i, n ):
+  # The first n words sent by tile i: its word loaded and incremented.
+  return ( [ 4 * i, 4 * i + 1 ] * n )[ : n ]
+
+@pytest.mark.parametrize( "Tile", [ None, TileCL, TileNativeCL ] )
+def test_conflicting_loads( Tile ):
+  DataMem = DataMemRTL if Tile == None else DataMemCL
+  ref     = run_kernel( Tile, DataMem )
+  trace   = run_kernel( Tile, BankedDataMemRTL )
+  for i in range( num_tiles ):
+    # Without the conflicts, each tile loads or increments every cycle.
+    words = words_of( ref, i )
+    assert len( words ) >= len( ref ) - 1
+    assert words == loop_of( i, len( words ) )
+    # The tiles take bank 0 in turn: a load held back keeps the tile on
+    # it, no word is lost and each load is followed by its increment.
+    words = words_of( trace, i )
+    assert len( words ) >= len( trace ) // 2 - 2
+    assert words == loop_of( i, len( words ) )
+  if Tile == TileNativeCL:
+    assert trace == run_kernel( TileCL, BankedDataMemRTL )
+
+#-------------------------------------------------------------------------
+# FIR
+#-------------------------------------------------------------------------
+
+def test_fir_banked():
+  # The loads of the FIR (in the left column) are in different cycles,
+  # so the banked memory gives the same outputs as DataMemRTL.
+  p = fir_params()
+  ref = run( mk_fir_sim( p, p['src_opt'], p['ctrl_waddr'], CtrlMemRTL ), 40 )
+  out = run( mk_fir_sim( p, p['src_opt'], p['ctrl_waddr'], CtrlMemRTL,
+                         DataMem = BankedDataMemRTL ), 40 )
+  assert out == ref
+  assert out[17] == run_CGRAFL()[0]
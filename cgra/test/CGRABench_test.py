@@ -0,0 +1,87 @@
+"""
+==========================================================================
+CGRABench_test.py
+==========================================================================
+Benchmarks of the simulation models of the 4x4 FIR CGRA: CGRARTL,
+CGRACL made of TileCL or TileNativeCL, and CGRANumpy with one lane or a
+batch of lanes. Each model runs the same control stream for the same
+number of cycles from the same data memory image and has to end with
+the same data memory; the simulated cycles per second (per dataset for
+a batch) are printed with the speedup over CGRARTL. Run with -s to see
+the table.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ...tile.TileCL               import TileCL
+from ...tile.TileNativeCL         import TileNativeCL
+from ...lib.sim_cache             import sim_cache
+from .CGRANumpy_test              import fir_params, mk_fir_engine
+from .CGRANumpy_test              import get_fir_sim, rtl_data_mem
+from .CGRAReload_test             import mk_cgra
+
+import time
+
+ncycles    = 100
+num_lanes  = 32
+
+def mk_image( p ):
+  DataType = p['DataType']
+  return [ DataType( i % 7, 1 ) for i in range( p['data_mem_size'] ) ]
+
+def timed( tick, ncycles ):
+  start = time.perf_counter()
+  for _ in range( ncycles ):
+    tick()
+  return time.perf_counter() - start
+
+def bench_rtl( p, data ):
+  th = get_fir_sim( p, data )
+  elapsed = timed( th.tick, ncycles )
+  mem = [ int( x.payload ) for x in rtl_data_mem( th.dut ) ]
+  sim_cache.release( th )
+  return elapsed, mem
+
+def bench_cl( p, data, Tile ):
+  cgra = mk_cgra( p, Tile, data, p['preload_const'] )
+  elapsed = timed( cgra.tick, ncycles )
+  return elapsed, cgra.dump_array()[0].tolist()
+
+def bench_numpy( p, data, lanes ):
+  engine = mk_fir_engine( p, None )
+  engine.load_batch( [ data ] * lanes )
+  engine.sim_reset()
+  elapsed = timed( engine.tick, ncycles )
+  mems = [ [ int( x.payload ) for x in mem ]
+           for mem in engine.get_data_mem_batch() ]
+  assert all( mem == mems[0] for mem in mems )
+  return elapsed / lanes, mems[0]
+
+def test_fir_bench():
+  p    = fir_params()
+  data = mk_image( p )
+
+  rtl, ref = bench_rtl( p, data )
+  results = [ ( 'CGRARTL', rtl ) ]
+  for name, ( elapsed, mem ) in [
+      ( 'CGRACL/TileCL',       bench_cl( p, data, TileCL ) ),
+      ( 'CGRACL/TileNativeCL', bench_cl( p, data, TileNativeCL ) ),
+      ( 'CGRANumpy',           bench_numpy( p, data, 1 ) ),
+      ( f'CGRANumpy x{num_lanes}', bench_numpy( p, data, num_lanes ) ) ]:
+    assert mem == ref, f"{name} ends with another data memory!"
+    results.append( ( name, elapsed ) )
+
+  print()
+  print( f"4x4 FIR, {ncycles} cycles (per dataset for a batch):" )
+  for name, elapsed in results:
+    print( f"  {name:24s} {ncycles / elapsed:10.0f} cycles/s "
+           f"{rtl / elapsed:8.1f}x" )
+
+  speed = dict( results )
+  assert speed['CGRACL/TileNativeCL'] < speed['CGRACL/TileCL']
+  assert speed['CGRANumpy'] < speed['CGRARTL']
+  assert speed[f'CGRANumpy x{num_lanes}'] < speed['CGRANumpy']
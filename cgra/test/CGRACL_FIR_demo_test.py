@@ -15,6 +15,7 @@ from pymtl3.stdlib.test.test_srcs import TestSrcRTL
 
 from ...lib.opt_type              import *
 from ...lib.messages              import *
+from ...lib.trace_helper          import *
 from ...lib.ctrl_helper           import *
 
 from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
@@ -51,6 +52,13 @@ class TestHarness( Component ):
                  preload_data, preload_const )
     s.DataType = DataType
 
+    # The control words are preloaded, not written through the ports.
+    for i in range( s.num_tiles ):
+      s.dut.recv_waddr[i].en  //= 0
+      s.dut.recv_waddr[i].msg //= 0
+      s.dut.recv_wopt[i].en   //= 0
+      s.dut.recv_wopt[i].msg  //= CtrlType( 0 )
+
   def line_trace( s ):
     return s.dut.line_trace()
 
@@ -65,14 +73,21 @@ def run_sim( test_harness, max_cycles=18 ):
   test_harness.apply( SimulationPass() )
   test_harness.sim_reset()
 
-  # Run simulation
+  # Run simulation, the eager line trace is only printed at TRACE_LINE
+  # (see CGRA_TRACE).
+  tracer  = Tracer( test_harness.dut )
   ncycles = 0
   print()
-  print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+  if tracer.level >= TRACE_LINE:
+    print( "{}:{}".format( ncycles, test_harness.line_trace() ))
   while ncycles < max_cycles:
     test_harness.tick()
+    tracer.sample()
     ncycles += 1
-    print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+    if tracer.level >= TRACE_LINE:
+      print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+  if tracer.level > TRACE_OFF:
+    print( format_events( tracer.events() ) )
 
   target_value = test_harness.output_target_value()
 
@@ -11,7 +11,7 @@ Author : Cheng Tan
 
 from pymtl3                       import *
 from ...lib.messages              import *
-from ..CGRAFL                     import CGRAFL
+from ..CGRAFL                     import CGRAFL, CGRAFastFL
 from ...lib.dfg_helper            import *
 
 import os
@@ -36,3 +36,20 @@ def test_fl():
   CGRAFL( fu_dfg, DataType, CtrlType, const_data )#, data_spm )
   print()
 
+
+def test_fast_fl():
+  target_json = "dfg_fir.json"
+  script_dir  = os.path.dirname(__file__)
+  file_path   = os.path.join( script_dir, target_json )
+  DataType = mk_data( 16, 1 )
+  CtrlType = mk_ctrl()
+  const_data = [ DataType( i, 1 ) for i in range( 6 ) ]
+
+  for data_spm in [ [ 3 for _ in range( 100 ) ],
+                    [ ( i * 7 ) % 11 for i in range( 100 ) ],
+                    [ 1000 + i for i in range( 100 ) ] ]:
+    reference = CGRAFL( DFG( file_path, const_data, data_spm ), DataType,
+                        CtrlType, const_data )
+    result    = CGRAFastFL( DFG( file_path, const_data, data_spm ), DataType,
+                            CtrlType, const_data )
+    assert result == reference
@@ -0,0 +1,82 @@
+"""
+==========================================================================
+CGRALsq_test.py
+==========================================================================
+Test cases for CGRAs whose memory units (MemUnitLsqRTL) are attached to
+a data memory with a latency of several cycles (PipelinedDataMemCL and
+HierDataMemCL).
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                           import *
+
+from ...fu.single.MemUnitRTL          import MemUnitRTL
+from ...fu.single.MemUnitLsqRTL       import mk_mem_unit_lsq
+from ...mem.ctrl.CtrlMemRTL           import CtrlMemRTL
+from ...mem.data.PipelinedDataMemCL   import mk_pipelined_data_mem
+from ...mem.data.HierDataMemCL        import mk_hier_data_mem
+from .CGRAShadow_test                 import mk_fir_sim
+from .CGRARTL_FIR_test                import run_CGRAFL
+from .CGRANumpy_test                  import fir_params
+
+import pytest
+
+def run_words( th, ncycles ):
+  # The words sent out by the tile of the FIR output, without the cycles
+  # in which the array waits for the memory.
+  out   = th.dut.tile[9].element.send_out[0]
+  words = []
+  for _ in range( ncycles ):
+    th.tick()
+    if out.en:
+      words.append( int( out.msg.payload ) )
+  return words
+
+def lsq_fir_params( depth ):
+  p = fir_params()
+  p['FuList'] = [ mk_mem_unit_lsq( depth ) if x is MemUnitRTL else x
+                  for x in p['FuList'] ]
+  return p
+
+@pytest.mark.parametrize( "depth, latency", [ ( 1, 1 ), ( 4, 3 ) ] )
+def test_fir_mem_latency( depth, latency ):
+  p   = fir_params()
+  ref = run_words( mk_fir_sim( p, p['src_opt'], p['ctrl_waddr'],
+                               CtrlMemRTL ), 40 )
+  p   = lsq_fir_params( depth )
+  th  = mk_fir_sim( p, p['src_opt'], p['ctrl_waddr'], CtrlMemRTL,
+                    DataMem = mk_pipelined_data_mem( latency ) )
+  # Each load sends out its own word, the array waits for it: the FIR
+  # gives the words of the single-cycle memory, only later.
+  out = run_words( th, 40 * ( latency + 2 ) // 2 )
+  assert out[ : len( ref ) ] == ref
+  assert out[8] == run_CGRAFL()[0]
+
+def test_fir_hier_mem():
+  p   = fir_params()
+  ref = run_words( mk_fir_sim( p, p['src_opt'], p['ctrl_waddr'],
+                               CtrlMemRTL ), 40 )
+  # The FIR loads words of the scratchpad (below 8) and of the backing
+  # memory, whose two lines stay in the cache once filled.
+  p   = lsq_fir_params( 4 )
+  th  = mk_fir_sim( p, p['src_opt'], p['ctrl_waddr'], CtrlMemRTL,
+                    DataMem = mk_hier_data_mem( spm_size = 8, mem_latency = 4,
+                                                cache_lines = 2,
+                                                line_words = 4 ) )
+  mem = th.dut.data_mem
+  mem.reset_stats()
+  out = run_words( th, 120 )
+  assert out[ : len( ref ) ] == ref
+  assert out[8] == run_CGRAFL()[0]
+
+  stats = mem.get_stats()
+  assert stats['reads'] == stats['spm_accesses'] + stats['cache_hits'] + \
+                           stats['cache_misses']
+  assert stats['spm_accesses'] > 0
+  assert stats['cache_misses'] == 2
+  assert stats['mem_reads'] == 8
+  assert stats['hit_rate'] > 0.8
+  assert stats['mem_bandwidth'] == stats['mem_reads'] / stats['cycles']
@@ -0,0 +1,103 @@
+"""
+==========================================================================
+CGRAMulticast_test.py
+==========================================================================
+Test cases for loading the configuration of a CGRA through the multicast
+configuration network.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+from pymtl3.stdlib.test.test_srcs import TestSrcRTL
+
+from ...lib.messages              import *
+from ...lib.ctrl_helper           import *
+from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
+from ...noc.ConfigNetworkRTL      import ConfigNetworkRTL
+from ..CGRARTL                    import CGRARTL
+from .CGRANumpy_test              import fir_params
+from .CGRARTL_FIR_test            import run_CGRAFL
+
+import pytest
+
+#-------------------------------------------------------------------------
+# Test harness
+#-------------------------------------------------------------------------
+
+class TestHarness( Component ):
+
+  def construct( s, DUT, FunctionUnit, FuList, DataType, PredicateType,
+                 CtrlType, width, height, ctrl_mem_size, data_mem_size,
+                 src_opt, ctrl_waddr, preload_data, preload_const,
+                 num_ports ):
+
+    s.num_tiles  = width * height
+    AddrType     = mk_bits( clog2( ctrl_mem_size ) )
+    waddrs, opts, masks = mk_multicast_ctrl( src_opt, ctrl_waddr,
+                                             num_ports = num_ports )
+    s.num_rounds = len( masks[0] )
+    s.DataType   = DataType
+
+    s.src_opt    = [ TestSrcRTL( CtrlType, x ) for x in opts ]
+    s.ctrl_waddr = [ TestSrcRTL( AddrType, x ) for x in waddrs ]
+    s.ctrl_mask  = [ TestSrcRTL( mk_bits( s.num_tiles ), x ) for x in masks ]
+    s.config     = ConfigNetworkRTL( CtrlType, AddrType, s.num_tiles,
+                                     num_ports )
+
+    s.dut        = DUT( DataType, PredicateType, CtrlType, width, height,
+                        ctrl_mem_size, data_mem_size, 100, FunctionUnit, FuList,
+                        preload_data, preload_const )
+
+    for p in range( num_ports ):
+      connect( s.src_opt[p].send,    s.config.recv_wopt[p]  )
+      connect( s.ctrl_waddr[p].send, s.config.recv_waddr[p] )
+      connect( s.ctrl_mask[p].send,  s.config.recv_mask[p]  )
+    for i in range( s.num_tiles ):
+      connect( s.config.send_wopt[i],  s.dut.recv_wopt[i]  )
+      connect( s.config.send_waddr[i], s.dut.recv_waddr[i] )
+
+  def done( s ):
+    return all( x.done() for x in s.src_opt + s.ctrl_waddr + s.ctrl_mask )
+
+  def line_trace( s ):
+    return s.config.line_trace() + s.dut.line_trace()
+
+  def output_target_value( s ):
+    return s.dut.tile[9].element.send_out[0].msg.payload
+
+@pytest.mark.parametrize( "num_ports", [ 1, 4, 8 ] )
+def test_fir_multicast( num_ports ):
+  p = fir_params()
+  DataType = p['DataType']
+  th = TestHarness( CGRARTL, FlexibleFuRTL, p['FuList'], DataType,
+                    p['PredicateType'], p['CtrlType'], p['width'],
+                    p['height'], p['ctrl_mem_size'], p['data_mem_size'],
+                    p['src_opt'], p['ctrl_waddr'],
+                    [ DataType( 5, 1 ) ] * p['data_mem_size'],
+                    p['preload_const'], num_ports = num_ports )
+  th.elaborate()
+  th.apply( SimulationPass() )
+  th.sim_reset()
+
+  # The shared words are sent once, so the configuration is loaded in
+  # fewer cycles than through as many ports each writing one tile (25
+  # instead of 64 with one port, 4 instead of 8 with eight). The sources
+  # start a cycle after reset.
+  assert th.num_rounds * num_ports < th.num_tiles * p['ctrl_mem_size']
+  for _ in range( th.num_rounds + 1 ):
+    th.tick()
+  assert th.done()
+  for i in range( th.num_tiles ):
+    assert list( th.dut.tile[i].ctrl_mem.reg_file.regs ) == \
+           list( p['src_opt'][i] )
+
+  # The tiles all start together, once the network writes the words 0
+  # in the last cycle of the loading. CGRARTL_FIR_test samples the
+  # result 16 cycles after its per-tile ports write the words 0, in the
+  # first cycle.
+  for _ in range( 16 ):
+    th.tick()
+  assert th.output_target_value() == run_CGRAFL()[0]
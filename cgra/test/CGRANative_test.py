@@ -0,0 +1,58 @@
+"""
+==========================================================================
+CGRANative_test.py
+==========================================================================
+Test cases for a CGRACL made of TileNativeCL, which is run in lockstep
+with the same CGRACL made of TileCL.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                import *
+
+from ...tile.TileCL        import TileCL
+from ...tile.TileNativeCL  import TileNativeCL
+from .CGRAReload_test      import mk_cgra
+from .CGRANumpy_test       import fir_params
+
+import time
+
+def get_outputs( cgra ):
+  # The messages sent to the neighbours and the memory requests of all
+  # the tiles in the current cycle.
+  outs = []
+  for tile in cgra.tile:
+    outs.append( [ ( int( x.msg.payload ), int( x.msg.predicate ) )
+                   if x.en else None for x in tile.send_data ] )
+    outs.append( [ ( int( x.en ), int( x.msg ) )
+                   for x in [ tile.to_mem_raddr, tile.to_mem_waddr ] ] )
+  return outs
+
+def test_fir_lockstep():
+  # 25 iterations of the FIR loop, far more than ctrl_mem_size words.
+  p        = fir_params()
+  DataType = p['DataType']
+  ncycles  = 25 * p['ctrl_mem_size']
+  data     = [ DataType( i % 7, 1 ) for i in range( p['data_mem_size'] ) ]
+  cgras    = [ mk_cgra( p, Tile, data, p['preload_const'] )
+               for Tile in [ TileCL, TileNativeCL ] ]
+
+  elapsed = [ 0.0, 0.0 ]
+  for i in range( ncycles ):
+    assert get_outputs( cgras[0] ) == get_outputs( cgras[1] ), \
+           f"The tiles diverge at cycle {i}!"
+    for j in range( 2 ):
+      start = time.perf_counter()
+      cgras[j].tick()
+      elapsed[j] += time.perf_counter() - start
+
+  assert cgras[0].dump_array()[0].tolist() == \
+         cgras[1].dump_array()[0].tolist()
+
+  print()
+  print( f"{ncycles} cycles, TileCL: {elapsed[0]:.3f}s, "
+         f"TileNativeCL: {elapsed[1]:.3f}s, "
+         f"speedup: {elapsed[0] / elapsed[1]:.1f}x" )
+  assert elapsed[1] < elapsed[0]
@@ -0,0 +1,249 @@
+"""
+==========================================================================
+CGRANumpy_test.py
+==========================================================================
+Test cases for the NumPy CGRA engine, checked cycle by cycle against
+CGRARTL.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ...lib.opt_type              import *
+from ...lib.messages              import *
+from ...lib.ctrl_helper           import *
+from ...lib.map_helper            import default_fu_list
+from ...lib.sim_cache             import sim_cache
+
+from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
+from ...fu.single.AdderRTL        import AdderRTL
+from ...fu.single.MulRTL          import MulRTL
+from ...fu.single.CompRTL         import CompRTL
+from ...fu.single.BranchRTL       import BranchRTL
+from ...fu.single.PhiRTL          import PhiRTL
+from ...fu.single.MemUnitRTL      import MemUnitRTL
+from ..CGRARTL                    import CGRARTL
+from ..CGRANumpy                  import CGRANumpy
+from .CGRARTL_FIR_test            import TestHarness as FirTestHarness
+from .CGRARTL_FIR_test            import run_CGRAFL
+from .CGRARTL_test                import TestHarness
+
+import os
+
+#-------------------------------------------------------------------------
+# Helpers
+#-------------------------------------------------------------------------
+
+# The messages sent by the FUs and the data memory are compared as full
+# messages (payload, predicate and bypass), so the engine has to be
+# bit-identical to CGRARTL in every cycle. The message of an output
+# whose en is low is not compared, it is left over from whichever update
+# block wrote it last.
+
+def rtl_data_mem( dut ):
+  data_mem = dut.data_mem
+  res = []
+  for i in range( len( data_mem.reg_file.regs ) ):
+    if hasattr( data_mem, 'preloadData' ) and not data_mem.initWrites[i]:
+      res.append( data_mem.preloadData[i] )
+    else:
+      res.append( data_mem.reg_file.regs[i] )
+  return res
+
+def run_lockstep( th, engine, ncycles ):
+  th.elaborate()
+  th.apply( SimulationPass() )
+  th.sim_reset()
+  check_lockstep( th, engine, ncycles )
+
+def check_lockstep( th, engine, ncycles ):
+  # th has been reset already.
+  engine.sim_reset()
+
+  for i in range( ncycles ):
+    th.tick()
+    engine.tick()
+    for t in range( engine.num_tiles ):
+      for j in range( engine.num_fu_outports ):
+        rtl_out = th.dut.tile[t].element.send_out[j]
+        assert int( rtl_out.en ) == int( engine.el_out_en[0][t][j] )
+        if rtl_out.en:
+          assert rtl_out.msg == engine.get_fu_out( t, j ), \
+                 f"The output {j} of tile {t} diverges at cycle {i}!"
+    assert rtl_data_mem( th.dut ) == engine.get_data_mem(), \
+           f"The data memory diverges at cycle {i}!"
+
+#-------------------------------------------------------------------------
+# Test cases
+#-------------------------------------------------------------------------
+
+def test_homo_2x2():
+  num_xbar_inports  = 6
+  num_xbar_outports = 8
+  ctrl_mem_size     = 6
+  width             = 2
+  height            = 2
+  RouteType         = mk_bits( clog2( num_xbar_inports + 1 ) )
+  AddrType          = mk_bits( clog2( ctrl_mem_size ) )
+  num_tiles         = width * height
+  data_mem_size     = 8
+  num_fu_in         = 4
+  DataType          = mk_data( 16, 1 )
+  PredicateType     = mk_predicate( 1, 1 )
+  CtrlType          = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+  FuInType          = mk_bits( clog2( num_fu_in + 1 ) )
+  pickRegister      = [ FuInType( x+1 ) for x in range( num_fu_in ) ]
+  routes            = [ RouteType( x ) for x in [ 4, 3, 2, 1, 5, 5, 5, 5 ] ]
+  opts              = [ OPT_INC, OPT_INC, OPT_ADD, OPT_STR, OPT_ADD, OPT_ADD ]
+  src_opt           = [ [ CtrlType( opt, b1( 0 ), pickRegister, routes )
+                          for opt in opts ] for _ in range( num_tiles ) ]
+  ctrl_waddr        = [ [ AddrType( i ) for i in range( ctrl_mem_size ) ]
+                        for _ in range( num_tiles ) ]
+
+  th = TestHarness( CGRARTL, FlexibleFuRTL, None, DataType, PredicateType,
+                    CtrlType, width, height, ctrl_mem_size, data_mem_size,
+                    src_opt, ctrl_waddr )
+  engine = CGRANumpy( DataType, PredicateType, CtrlType, width, height,
+                      ctrl_mem_size, data_mem_size, len( src_opt[0] ),
+                      FlexibleFuRTL, default_fu_list )
+  engine.set_ctrl_stream( src_opt, ctrl_waddr )
+
+  run_lockstep( th, engine, 20 )
+
+  # The stores of the left column tiles reach the data memory.
+  assert engine.get_data_mem()[0].payload == 8
+
+def fir_params():
+  target_json       = "config_fir.json"
+  script_dir        = os.path.dirname(__file__)
+  file_path         = os.path.join( script_dir, target_json )
+
+  II                = 4
+  num_xbar_inports  = 6
+  num_xbar_outports = 8
+  width             = 4
+  height            = 4
+  num_tiles         = width * height
+  RouteType         = mk_bits( clog2( num_xbar_inports + 1 ) )
+  ctrl_mem_size     = II
+  AddrType          = mk_bits( clog2( ctrl_mem_size ) )
+  data_mem_size     = 100
+  num_fu_in         = 4
+  targetFuList      = [ AdderRTL, PhiRTL, MemUnitRTL, CompRTL, MulRTL, BranchRTL ]
+  DataType          = mk_data( 16, 1 )
+  PredicateType     = mk_predicate( 1, 1 )
+  CtrlType          = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+
+  cgra_ctrl         = CGRACtrl( file_path, CtrlType, RouteType, width, height,
+                                num_fu_in, num_xbar_inports, num_xbar_outports,
+                                II )
+  src_opt           = cgra_ctrl.get_ctrl()
+  ctrl_waddr        = [ [ AddrType( i ) for i in range( II ) ]
+                        for _ in range( num_tiles ) ]
+
+  preload_const     = [ [ DataType( 0, 1 ) ] for _ in range( num_tiles ) ]
+  preload_const[5][0] = DataType( 10, 1 )
+  preload_const[6].append( DataType( 1, 1 ) )
+  preload_const[10].append( DataType( 3, 1 ) )
+
+  return dict( DataType=DataType, PredicateType=PredicateType,
+               CtrlType=CtrlType, width=width, height=height,
+               ctrl_mem_size=ctrl_mem_size, data_mem_size=data_mem_size,
+               FuList=targetFuList, src_opt=src_opt, ctrl_waddr=ctrl_waddr,
+               preload_const=preload_const )
+
+def mk_fir_engine( p, preload_data ):
+  engine = CGRANumpy( p['DataType'], p['PredicateType'], p['CtrlType'],
+                      p['width'], p['height'], p['ctrl_mem_size'],
+                      p['data_mem_size'], 100, FlexibleFuRTL, p['FuList'],
+                      preload_data, p['preload_const'] )
+  engine.set_ctrl_stream( p['src_opt'], p['ctrl_waddr'] )
+  return engine
+
+def get_fir_sim( p, preload_data ):
+  # The FIR harness around CGRARTL, elaborated and reset. It comes from
+  # the cache of elaborated simulators that is shared by the tests of the
+  # process, and is given back with sim_cache.release().
+  params = { "top.dut.tile["+str(i)+"].construct" : { 'FuList' : p['FuList'] }
+             for i in range( p['width'] * p['height'] ) }
+  return sim_cache.get_sim( FirTestHarness, CGRARTL, FlexibleFuRTL,
+                            p['FuList'], p['DataType'], p['PredicateType'],
+                            p['CtrlType'], p['width'], p['height'],
+                            p['ctrl_mem_size'], p['data_mem_size'],
+                            p['src_opt'], p['ctrl_waddr'], preload_data,
+                            p['preload_const'], params = params )
+
+def test_CGRA_4x4_fir():
+  p = fir_params()
+  DataType = p['DataType']
+  preload_data = [ DataType( 5, 1 ) ] * p['data_mem_size']
+
+  th     = get_fir_sim( p, preload_data )
+  engine = mk_fir_engine( p, preload_data )
+
+  check_lockstep( th, engine, 18 )
+
+  target = engine.get_fu_out( 9 ).payload
+  assert target == th.output_target_value()
+  assert target == run_CGRAFL()[0]
+  sim_cache.release( th )
+
+def test_CGRA_4x4_fir_batch():
+  p = fir_params()
+  DataType = p['DataType']
+  D = p['data_mem_size']
+  batch = [ [ DataType( 5, 1 ) ] * D,
+            [ DataType( ( a * 7 ) % 13, 1 ) for a in range( D ) ],
+            [ DataType( 3, 1 ) ] * 10 + [ DataType( a, 1 ) for a in range( D - 10 ) ] ]
+
+  engine = mk_fir_engine( p, None )
+  engine.load_batch( batch )
+  engine.sim_reset()
+  for _ in range( 18 ):
+    engine.tick()
+  live_out = engine.get_live_out( 9 )
+  data_mem = engine.get_data_mem_batch()
+  assert len( live_out ) == len( batch )
+  assert live_out[0].payload == run_CGRAFL()[0]
+
+  # Every lane matches the same image simulated on its own.
+  for l, preload_data in enumerate( batch ):
+    single = mk_fir_engine( p, preload_data )
+    single.sim_reset()
+    for _ in range( 18 ):
+      single.tick()
+    assert live_out[l] == single.get_fu_out( 9 )
+    assert data_mem[l] == single.get_data_mem()
+
+def test_CGRA_4x4_fir_load_data():
+  p = fir_params()
+  DataType = p['DataType']
+  D = p['data_mem_size']
+  image = [ DataType( ( a * 7 ) % 13, 1 ) for a in range( D ) ]
+
+  ref = mk_fir_engine( p, image )
+  ref.sim_reset()
+  for _ in range( 18 ):
+    ref.tick()
+
+  # The image written in two parts before sim_reset().
+  engine = mk_fir_engine( p, None )
+  engine.load_data( image[ :40 ] )
+  engine.load_data( image[ 40: ], 40 )
+  engine.sim_reset()
+  for _ in range( 18 ):
+    engine.tick()
+  assert engine.get_fu_out( 9 ) == ref.get_fu_out( 9 )
+  assert engine.get_data_mem() == ref.get_data_mem()
+
+  # The same image written over another one between two ticks.
+  engine = mk_fir_engine( p, [ DataType( 5, 1 ) ] * D )
+  engine.sim_reset()
+  engine.load_data( image )
+  for _ in range( 18 ):
+    engine.tick()
+  assert engine.get_fu_out( 9 ) == ref.get_fu_out( 9 )
+  assert engine.get_data_mem() == ref.get_data_mem()
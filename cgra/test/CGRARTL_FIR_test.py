@@ -15,9 +15,11 @@ from pymtl3.stdlib.test.test_srcs import TestSrcRTL
 
 from ...lib.opt_type              import *
 from ...lib.messages              import *
+from ...lib.trace_helper          import *
 from ...lib.ctrl_helper           import *
 
 from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
+from ...fu.flexible.FlexibleFuCL  import FlexibleFuCL
 from ...fu.single.AdderRTL        import AdderRTL
 from ...fu.single.MulRTL          import MulRTL
 from ...fu.single.LogicRTL        import LogicRTL
@@ -26,12 +28,15 @@ from ...fu.single.BranchRTL       import BranchRTL
 from ...fu.single.PhiRTL          import PhiRTL
 from ...fu.single.ShifterRTL      import ShifterRTL
 from ...fu.single.MemUnitRTL      import MemUnitRTL
+from ...mem.ctrl.CtrlMemRTL       import CtrlMemRTL
+from ...mem.data.DataMemRTL       import DataMemRTL
 from ..CGRARTL                    import CGRARTL
 
 from ..CGRAFL                     import CGRAFL
 from ...lib.dfg_helper            import *
 
 import os
+import pytest
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -41,7 +46,9 @@ class TestHarness( Component ):
 
   def construct( s, DUT, FunctionUnit, FuList, DataType, PredicateType,
                  CtrlType, width, height, ctrl_mem_size, data_mem_size,
-                 src_opt, ctrl_waddr, preload_data, preload_const ):
+                 src_opt, ctrl_waddr, preload_data, preload_const,
+                 CtrlMem = CtrlMemRTL, num_swaps = 0, swap_delay = 0,
+                 swap_interval = 0, DataMem = DataMemRTL ):
 
     s.num_tiles  = width * height
     AddrType     = mk_bits( clog2( ctrl_mem_size ) )
@@ -53,13 +60,25 @@ class TestHarness( Component ):
 
     s.dut        = DUT( DataType, PredicateType, CtrlType, width, height,
                         ctrl_mem_size, data_mem_size, 100, FunctionUnit, FuList,
-                        preload_data, preload_const )
+                        preload_data, preload_const, CtrlMem = CtrlMem,
+                        DataMem = DataMem )
     s.DataType   = DataType
 
     for i in range( s.num_tiles ):
       connect( s.src_opt[i].send,     s.dut.recv_wopt[i]  )
       connect( s.ctrl_waddr[i].send,  s.dut.recv_waddr[i] )
 
+    # The double-buffered control memories (CtrlMemShadowRTL) are written
+    # in their shadow context and switch to it on each of the num_swaps
+    # swaps, the first one swap_delay cycles after reset and the others
+    # swap_interval cycles apart.
+    if hasattr( s.dut, 'recv_swap' ):
+      s.src_swap = [ TestSrcRTL( b1, [ b1( 1 ) ] * num_swaps, swap_delay,
+                                 swap_interval )
+                     for i in range( s.num_tiles ) ]
+      for i in range( s.num_tiles ):
+        connect( s.src_swap[i].send, s.dut.recv_swap[i] )
+
   def line_trace( s ):
     return s.dut.line_trace()
 
@@ -74,14 +93,21 @@ def run_sim( test_harness, max_cycles=18 ):
   test_harness.apply( SimulationPass() )
   test_harness.sim_reset()
 
-  # Run simulation
+  # Run simulation, the eager line trace is only printed at TRACE_LINE
+  # (see CGRA_TRACE).
+  tracer  = Tracer( test_harness.dut )
   ncycles = 0
   print()
-  print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+  if tracer.level >= TRACE_LINE:
+    print( "{}:{}".format( ncycles, test_harness.line_trace() ))
   while ncycles < max_cycles:
     test_harness.tick()
+    tracer.sample()
     ncycles += 1
-    print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+    if tracer.level >= TRACE_LINE:
+      print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+  if tracer.level > TRACE_OFF:
+    print( format_events( tracer.events() ) )
 
   target_value = test_harness.output_target_value()
 
@@ -116,7 +142,8 @@ def run_CGRAFL():
   # FL golden reference
   return CGRAFL( fu_dfg, DataType, CtrlType, const_data )#, data_spm )
 
-def test_CGRA_4x4_fir():
+@pytest.mark.parametrize( "FunctionUnit", [ FlexibleFuRTL, FlexibleFuCL ] )
+def test_CGRA_4x4_fir( FunctionUnit ):
   target_json = "config_fir.json"
   script_dir  = os.path.dirname(__file__)
   file_path   = os.path.join( script_dir, target_json )
@@ -137,7 +164,6 @@ def test_CGRA_4x4_fir():
   data_mem_size     = 100
   num_fu_in         = 4
   DUT               = CGRARTL
-  FunctionUnit      = FlexibleFuRTL
   targetFuList      = [ AdderRTL, PhiRTL, MemUnitRTL, CompRTL, MulRTL, BranchRTL ]
   DataType          = mk_data( 16, 1 )
   PredicateType     = mk_predicate( 1, 1 )
@@ -15,6 +15,8 @@ from pymtl3.stdlib.test.test_srcs import TestSrcRTL
 
 from ...lib.opt_type              import *
 from ...lib.messages              import *
+from ...lib.trace_helper          import *
+from ...lib.perf_helper           import *
 
 from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
 from ...fu.single.AdderRTL        import AdderRTL
@@ -64,14 +66,21 @@ def run_sim( test_harness, max_cycles=100 ):
   test_harness.apply( SimulationPass() )
   test_harness.sim_reset()
 
-  # Run simulation
+  # Run simulation, the eager line trace is only printed at TRACE_LINE
+  # (see CGRA_TRACE).
+  tracer  = Tracer( test_harness.dut )
   ncycles = 0
   print()
-  print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+  if tracer.level >= TRACE_LINE:
+    print( "{}:{}".format( ncycles, test_harness.line_trace() ))
   while not test_harness.done() and ncycles < max_cycles:
     test_harness.tick()
+    tracer.sample()
     ncycles += 1
-    print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+    if tracer.level >= TRACE_LINE:
+      print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+  if tracer.level > TRACE_OFF:
+    print( format_events( tracer.events() ) )
 
   # Check timeout
   assert ncycles < max_cycles
@@ -176,3 +185,85 @@ def test_hetero_2x2():
   #th.set_param("top.dut.tile[1].construct", FuList=[MemUnitRTL,ShifterRTL])
   run_sim( th )
 
+def test_hetero_fu_list_2x2():
+  num_xbar_inports  = 6
+  num_xbar_outports = 8
+  ctrl_mem_size     = 6
+  width             = 2
+  height            = 2
+  RouteType         = mk_bits( clog2( num_xbar_inports + 1 ) )
+  AddrType          = mk_bits( clog2( ctrl_mem_size ) )
+  num_tiles         = width * height
+  data_mem_size     = 8
+  num_fu_in         = 4
+  DUT               = CGRARTL
+  FunctionUnit      = FlexibleFuRTL
+  # Only the left column accesses the data memory, and only tile 3
+  # shifts.
+  FuList            = [ [ MemUnitRTL, AdderRTL ], [ AdderRTL ],
+                        [ MemUnitRTL, AdderRTL ], [ AdderRTL, ShifterRTL ] ]
+  DataType          = mk_data( 16, 1 )
+  PredicateType     = mk_predicate( 1, 1 )
+  CtrlType          = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+  FuInType          = mk_bits( clog2( num_fu_in + 1 ) )
+  pickRegister      = [ FuInType( x+1 ) for x in range( num_fu_in ) ]
+  routes            = [ RouteType( x ) for x in [ 4, 3, 2, 1, 5, 5, 5, 5 ] ]
+  opts              = [ [ OPT_INC, OPT_ADD, OPT_STR, OPT_ADD ],
+                        [ OPT_INC, OPT_ADD, OPT_ADD, OPT_ADD ],
+                        [ OPT_INC, OPT_ADD, OPT_STR, OPT_ADD ],
+                        [ OPT_INC, OPT_ADD, OPT_LLS, OPT_ADD ] ]
+  src_opt           = [ [ CtrlType( opt, b1( 0 ), pickRegister, routes )
+                          for opt in opts[i] ] for i in range( num_tiles ) ]
+  ctrl_waddr        = [ [ AddrType( i ) for i in range( len( opts[0] ) ) ]
+                        for _ in range( num_tiles ) ]
+  th = TestHarness( DUT, FunctionUnit, FuList, DataType, PredicateType,
+                    CtrlType, width, height, ctrl_mem_size, data_mem_size,
+                    src_opt, ctrl_waddr )
+  run_sim( th )
+  assert [ len( tile.element.fu ) for tile in th.dut.tile ] == [ 2, 1, 2, 2 ]
+
+def test_perf_counters():
+  num_xbar_inports  = 6
+  num_xbar_outports = 8
+  ctrl_mem_size     = 6
+  width             = 2
+  height            = 2
+  RouteType         = mk_bits( clog2( num_xbar_inports + 1 ) )
+  AddrType          = mk_bits( clog2( ctrl_mem_size ) )
+  num_tiles         = width * height
+  data_mem_size     = 8
+  num_fu_in         = 4
+  DataType          = mk_data( 16, 1 )
+  PredicateType     = mk_predicate( 1, 1 )
+  CtrlType          = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+  FuInType          = mk_bits( clog2( num_fu_in + 1 ) )
+  pickRegister      = [ FuInType( x+1 ) for x in range( num_fu_in ) ]
+  routes            = [ RouteType( x ) for x in [ 4, 3, 2, 1, 5, 5, 5, 5 ] ]
+  opts              = [ OPT_INC, OPT_INC, OPT_ADD, OPT_STR, OPT_ADD, OPT_ADD ]
+  src_opt           = [ [ CtrlType( opt, b1( 0 ), pickRegister, routes )
+                          for opt in opts ] for _ in range( num_tiles ) ]
+  ctrl_waddr        = [ [ AddrType( i ) for i in range( ctrl_mem_size ) ]
+                        for _ in range( num_tiles ) ]
+  th = TestHarness( CGRARTL, FlexibleFuRTL, None, DataType, PredicateType,
+                    CtrlType, width, height, ctrl_mem_size, data_mem_size,
+                    src_opt, ctrl_waddr )
+  th.elaborate()
+  th.apply( SimulationPass() )
+  th.sim_reset()
+
+  counters = PerfCounters()
+  for _ in range( 20 ):
+    th.tick()
+    counters.sample( th.dut )
+  report = counters.report()
+  print( format_report( report ) )
+
+  assert report['ncycles'] == 20
+  assert len( report['tiles'] ) == num_tiles
+  assert len( report['data_mem']['reads'] ) == height
+  for tile in report['tiles']:
+    assert tile['busy_cycles'] + tile['idle_cycles'] == 20
+    assert set( tile['busy'].keys() ) <= set( [ 'OPT_INC', 'OPT_ADD',
+                                                'OPT_STR' ] )
+    assert len( tile['xbar_out_cycles'] ) == num_xbar_outports
+    assert max( tile['channel_max'] ) <= 2
@@ -0,0 +1,75 @@
+"""
+==========================================================================
+CGRAReload_test.py
+==========================================================================
+Test cases for reloading the data memory, constants and control words
+of an elaborated CGRA.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ...lib.checkpoint            import *
+from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
+from ...tile.TileCL               import TileCL
+from ...tile.TileNativeCL         import TileNativeCL
+from ..CGRACL                     import CGRACL
+from .CGRANumpy_test              import fir_params
+
+import numpy as np
+
+def mk_cgra( p, Tile, preload_data, preload_const ):
+  cgra = CGRACL( FlexibleFuRTL, p['FuList'], p['DataType'],
+                 p['PredicateType'], p['CtrlType'], p['width'], p['height'],
+                 p['ctrl_mem_size'], p['data_mem_size'], 100, p['src_opt'],
+                 preload_data, preload_const, Tile = Tile )
+  cgra.elaborate()
+  cgra.apply( SimulationPass() )
+  cgra.sim_reset()
+  return cgra
+
+def run( cgra, ncycles ):
+  trace = []
+  for _ in range( ncycles ):
+    cgra.tick()
+    trace.append( get_state( cgra ) )
+  return trace
+
+def test_reload_fir_cl():
+  p = fir_params()
+  DataType = p['DataType']
+  data_a   = [ DataType( 5, 1 ) ] * p['data_mem_size']
+  data_b   = [ DataType( i, 1 ) for i in range( p['data_mem_size'] ) ]
+  consts_b = [ list( x ) for x in p['preload_const'] ]
+  consts_b[5][0] = DataType( 20, 1 )
+
+  for Tile in [ TileCL, TileNativeCL ]:
+    ref   = mk_cgra( p, Tile, data_b, consts_b )
+    trace = run( ref, 30 )
+
+    cgra  = mk_cgra( p, Tile, data_a, p['preload_const'] )
+    ckpt  = save_checkpoint( cgra )
+    assert run( cgra, 30 ) != trace
+    # Back to the reset state, then the new kernel inputs.
+    restore_checkpoint( ckpt )
+    cgra.load_data( data_b )
+    cgra.load_consts( consts_b )
+    cgra.load_ctrl( p['src_opt'] )
+    assert run( cgra, 30 ) == trace
+
+def test_array_fir_cl():
+  p = fir_params()
+  DataType = p['DataType']
+  payload  = np.arange( p['data_mem_size'] ) % 7
+  ref      = mk_cgra( p, TileNativeCL,
+                      [ DataType( int( x ), 1 ) for x in payload ],
+                      p['preload_const'] )
+  trace    = run( ref, 30 )
+
+  cgra = mk_cgra( p, TileNativeCL, [], p['preload_const'] )
+  cgra.load_array( payload )
+  assert run( cgra, 30 ) == trace
+  assert cgra.dump_array()[0].tolist() == ref.dump_array()[0].tolist()
@@ -0,0 +1,87 @@
+"""
+==========================================================================
+CGRAShadow_test.py
+==========================================================================
+Test cases for overlapping the reconfiguration of a CGRA with the run of
+a kernel, with double-buffered control memories.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ...lib.opt_type              import *
+from ...lib.sim_cache             import sim_cache
+from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
+from ...mem.ctrl.CtrlMemRTL       import CtrlMemRTL
+from ...mem.ctrl.CtrlMemShadowRTL import CtrlMemShadowRTL
+from ..CGRARTL                    import CGRARTL
+from .CGRANumpy_test              import fir_params, get_fir_sim
+from .CGRARTL_FIR_test            import TestHarness, run_CGRAFL
+
+def mk_fir_sim( p, src_opt, ctrl_waddr, CtrlMem, **kwargs ):
+  DataType = p['DataType']
+  th = TestHarness( CGRARTL, FlexibleFuRTL, p['FuList'], DataType,
+                    p['PredicateType'], p['CtrlType'], p['width'],
+                    p['height'], p['ctrl_mem_size'], p['data_mem_size'],
+                    src_opt, ctrl_waddr,
+                    [ DataType( 5, 1 ) ] * p['data_mem_size'],
+                    p['preload_const'], CtrlMem = CtrlMem, **kwargs )
+  for i in range( p['width'] * p['height'] ):
+    th.set_param( "top.dut.tile["+str(i)+"].construct", FuList=p['FuList'] )
+  th.elaborate()
+  th.apply( SimulationPass() )
+  th.sim_reset()
+  return th
+
+def run( th, ncycles ):
+  # The output of the FIR in each cycle.
+  trace = []
+  for _ in range( ncycles ):
+    th.tick()
+    trace.append( int( th.output_target_value() ) )
+  return trace
+
+def test_fir_overlapped_reconfiguration():
+  p  = fir_params()
+  II = p['ctrl_mem_size']
+  DataType = p['DataType']
+
+  # Kernel b sums the loaded words instead of multiplying them.
+  kernel_a = p['src_opt']
+  kernel_b = [ [ opt.clone() for opt in opts ] for opts in kernel_a ]
+  for opts in kernel_b:
+    for opt in opts:
+      if opt.ctrl == OPT_MUL:
+        opt.ctrl = OPT_ADD
+
+  # Each kernel from reset, with the control memories of CGRARTL.
+  th = get_fir_sim( p, [ DataType( 5, 1 ) ] * p['data_mem_size'] )
+  ref_a = run( th, 80 )
+  sim_cache.release( th )
+  ref_b = run( mk_fir_sim( p, kernel_b, p['ctrl_waddr'], CtrlMemRTL ), 80 )
+  assert ref_a[17] == run_CGRAFL()[0]
+  assert ref_b[17] == 3 * ( 5 + 5 )
+
+  # Kernel a is written in the shadow contexts and swapped in with its
+  # last word. Kernel b is written right after it, while kernel a runs,
+  # and swapped in at the end of the iteration in which the second swap
+  # is requested, after two loops of kernel a.
+  th = mk_fir_sim( p, [ a + b for a, b in zip( kernel_a, kernel_b ) ],
+                   [ x + x for x in p['ctrl_waddr'] ], CtrlMemShadowRTL,
+                   num_swaps = 2, swap_delay = II + 1, swap_interval = 28 )
+  out = run( th, 80 )
+
+  # Kernel a starts once its last word is written, II - 1 cycles after
+  # the first word starts a control memory of CGRARTL.
+  start = II - 1
+  assert out[ start : start + 32 ] == ref_a[ : 32 ]
+  assert out[ start + 17 ] == run_CGRAFL()[0]
+
+  # Kernel b follows in the next cycle. Its first loop drains the values
+  # left by kernel a, the next ones give the results of kernel b as if
+  # from reset.
+  assert out[ 64 : 80 ] == ref_b[ 64 - start : 80 - start ]
+  assert 3 * ( 5 + 5 ) in out[ 64 : 80 ]
@@ -22,7 +22,7 @@ from ...fu.single.ShifterRTL        import ShifterRTL
 from ...fu.single.MemUnitRTL        import MemUnitRTL
 from ..CGRARTL                      import CGRARTL
 
-from pymtl3.passes.backends.verilog import TranslationImportPass
+from ...lib.verilator_cache         import CachedTranslationImportPass
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -66,7 +66,7 @@ def run_sim( test_harness, max_cycles=100 ):
 
   test_harness.dut.verilog_translate_import = True
   test_harness.dut.config_verilog_import = VerilatorImportConfigs(vl_Wno_list             =         ['UNSIGNED',            'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT', 'ALWCOMBORDER'])
-  test_harness = TranslationImportPass()(test_harness)
+  test_harness = CachedTranslationImportPass()(test_harness)
 
   test_harness.apply( SimulationPass() )
   test_harness.sim_reset()
@@ -38,6 +38,9 @@ class Fu( Component ):
     s.to_mem_waddr   = SendIfcRTL( AddrType )
     s.to_mem_wdata   = SendIfcRTL( DataType )
 
+    # Only a memory unit holds its control word, see MemUnitRTL.
+    s.opt_hold       = OutPort( b1 )
+
     @s.update
     def update_signal():
       for j in range( num_outports ):
@@ -52,6 +55,7 @@ class Fu( Component ):
       s.to_mem_waddr.msg   = AddrType( 0 )
       s.to_mem_raddr.msg   = AddrType( 0 )
       s.to_mem_raddr.en    = b1( 0 )
+      s.opt_hold           = b1( 0 )
       s.from_mem_rdata.rdy = b1( 0 )
 
   def line_trace( s ):
@@ -39,6 +39,9 @@ class ThreeCombo( Component ):
     s.to_mem_waddr   = SendIfcRTL( AddrType )
     s.to_mem_wdata   = SendIfcRTL( DataType )
 
+    # Only a memory unit holds its control word, see MemUnitRTL.
+    s.opt_hold       = OutPort( b1 )
+
     # Components
     s.Fu0 = Fu0( DataType, PredicateType, CtrlType, 2, 1, data_mem_size )
     s.Fu1 = Fu1( DataType, PredicateType, CtrlType, 2, 1, data_mem_size )
@@ -106,6 +109,7 @@ class ThreeCombo( Component ):
       s.to_mem_waddr.msg   = AddrType( 0 )
       s.to_mem_raddr.msg   = AddrType( 0 )
       s.to_mem_raddr.en    = b1( 0 )
+      s.opt_hold           = b1( 0 )
       s.from_mem_rdata.rdy = b1( 0 )
 
   def line_trace( s ):
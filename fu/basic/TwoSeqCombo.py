@@ -38,6 +38,9 @@ class TwoSeqCombo( Component ):
     s.to_mem_waddr   = SendIfcRTL( AddrType )
     s.to_mem_wdata   = SendIfcRTL( DataType )
 
+    # Only a memory unit holds its control word, see MemUnitRTL.
+    s.opt_hold       = OutPort( b1 )
+
     # Components
     s.Fu0 = Fu0( DataType, PredicateType, CtrlType, 4, 2, data_mem_size )
     s.Fu1 = Fu1( DataType, PredicateType, CtrlType, 4, 2, data_mem_size )
@@ -95,6 +98,7 @@ class TwoSeqCombo( Component ):
       s.to_mem_waddr.msg   = AddrType( 0 )
       s.to_mem_raddr.msg   = AddrType( 0 )
       s.to_mem_raddr.en    = b1( 0 )
+      s.opt_hold           = b1( 0 )
       s.from_mem_rdata.rdy = b1( 0 )
 
   def line_trace( s ):
@@ -0,0 +1,670 @@
+"""
+==========================================================================
+FlexibleFuCL.py
+==========================================================================
+A flexible functional unit with the same interface as FlexibleFuRTL for
+fast simulation. Instead of instantiating every FU in FuList and fanning
+the inputs out to all of them, a dispatch table built at construction
+time maps each opcode to the FU that implements it, and only that FU is
+evaluated in the single update block of the model.
+
+The observable behavior follows FlexibleFuRTL, including the rdy of the
+operands raised by the FUs that do not implement the current opcode and
+the rdy of recv_opt/recv_const/recv_predicate that stay high once set.
+That state is read as the previous cycle left it and committed in
+update_ff, so the update block can be evaluated any number of times.
+Output messages are built fresh instead of being shared by reference, so
+e.g. a load does not update the predicate of the data memory entry, and
+a division by zero gives zero. The combined FUs of fu/double and
+fu/triple are evaluated stage by stage with the same functions, except
+PrlMulAdderRTL that neither FlexibleFuRTL nor FlexibleFuCL can hold.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                               import *
+from pymtl3.stdlib.ifcs                   import SendIfcRTL, RecvIfcRTL
+from ...lib.opt_type                      import *
+from ...fu.single.AdderRTL                import AdderRTL
+from ...fu.single.BranchRTL               import BranchRTL
+from ...fu.single.CompRTL                 import CompRTL
+from ...fu.single.LogicRTL                import LogicRTL
+from ...fu.single.MemUnitRTL              import MemUnitRTL
+from ...fu.single.MulRTL                  import MulRTL
+from ...fu.single.PhiRTL                  import PhiRTL
+from ...fu.single.RetRTL                  import RetRTL
+from ...fu.single.SelRTL                  import SelRTL
+from ...fu.single.ShifterRTL              import ShifterRTL
+from ...fu.basic.TwoPrlCombo              import TwoPrlCombo
+from ...fu.double.SeqMulAdderRTL          import SeqMulAdderRTL
+from ...fu.double.SeqMulShifterRTL        import SeqMulShifterRTL
+from ...fu.triple.ThreeMulAdderShifterRTL import ThreeMulAdderShifterRTL
+
+#-------------------------------------------------------------------------
+# Per-cycle state of the FU
+#-------------------------------------------------------------------------
+
+class FuIO:
+
+  def __init__( s, DataType, num_inports, num_outports ):
+    s.DataType  = DataType
+    s.ins       = [ DataType() for _ in range( num_inports ) ]
+    s.in_en     = [ 0 ] * num_inports
+    s.counts    = [ 0 ] * num_inports
+    s.in_rdy    = [ 0 ] * num_inports
+    s.out       = [ DataType() for _ in range( num_outports ) ]
+    s.out_en    = [ 0 ] * num_outports
+    s.out_rdy   = [ 0 ] * num_outports
+    s.opt       = None
+    s.opt_en    = 0
+    s.const     = None
+    s.const_en  = 0
+    s.const_rdy = 0
+    s.pred      = None
+    s.pred_rdy  = 0
+    s.first     = 0
+    s.opt_hold  = 0
+    # State kept across cycles, read as left by the previous cycle and
+    # committed by commit() at the clock edge. The rdy of recv_opt,
+    # recv_const and recv_predicate stay high once set, the MemUnit keeps
+    # the en of its outports, and the rdy of its recv_opt is cleared by a
+    # load held back by the data memory (opt_hold).
+    s.last_opt_rdy     = 0
+    s.last_const_rdy   = 0
+    s.last_pred_rdy    = 0
+    s.last_mem_opt_rdy = 0
+    s.last_mem_out_en  = [ 0 ] * num_outports
+    # The same state as computed in the current cycle.
+    s.next_opt_rdy     = 0
+    s.next_const_rdy   = 0
+    s.next_pred_rdy    = 0
+    s.next_mem_opt_rdy = 0
+    s.next_mem_out_en  = [ 0 ] * num_outports
+    # Data memory requests of the MemUnit.
+    s.rdata     = None
+    s.rdata_rdy = 0
+    s.raddr_rdy = 0
+    s.waddr_rdy = 0
+    s.wdata_rdy = 0
+    s.raddr     = None
+    s.waddr     = None
+    s.wdata     = None
+    # The combined opcode each TwoSeqCombo was last given, which sets
+    # the opcodes of its FUs until the next one.
+    s.combo_opt = {}
+    # Operands of the FU evaluated as a stage of a combined FU.
+    s.stage     = None
+
+  def commit( s ):
+    s.last_opt_rdy     = s.next_opt_rdy
+    s.last_const_rdy   = s.next_const_rdy
+    s.last_pred_rdy    = s.next_pred_rdy
+    s.last_mem_opt_rdy = s.next_mem_opt_rdy
+    s.last_mem_out_en  = list( s.next_mem_out_en )
+
+  def pick( s, num ):
+    # Selects the first num operands given by fu_in and raises their rdy,
+    # as all the FUs do before decoding the opcode.
+    picked = [ 0, 0, 0 ]
+    if s.opt_en:
+      for x in range( num ):
+        if s.opt.fu_in[x] != 0:
+          picked[x] = int( s.opt.fu_in[x] ) - 1
+          s.in_rdy[ picked[x] ] = 1
+      if s.opt.predicate:
+        s.pred_rdy = 1
+    return picked
+
+  def not_ready( s, *picked ):
+    return s.opt_en and any( [ s.counts[i] == 0 for i in picked ] )
+
+  def mk_out( s, payload, predicate ):
+    return s.DataType( payload, predicate )
+
+  def apply_predicate( s, j = 0 ):
+    if s.opt.predicate:
+      s.out[j] = s.mk_out( s.out[j].payload,
+                           s.out[j].predicate & s.pred.predicate )
+
+#-------------------------------------------------------------------------
+# Functional units
+#-------------------------------------------------------------------------
+# Each function evaluates one FU for the opcode in io.opt, which is one of
+# the opcodes the FU implements.
+
+def adder( io ):
+  in0, in1, _ = io.pick( 2 )
+  a, b = io.ins[in0], io.ins[in1]
+  ctrl = io.opt.ctrl
+  if ctrl == OPT_ADD:
+    io.out[0] = io.mk_out( a.payload + b.payload, a.predicate & b.predicate )
+    if io.not_ready( in0, in1 ):
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+      io.out[0] = io.mk_out( io.out[0].payload, 0 )
+  elif ctrl == OPT_ADD_CONST:
+    io.out[0] = io.mk_out( a.payload + io.const.payload, a.predicate )
+  elif ctrl == OPT_INC:
+    io.out[0] = io.mk_out( a.payload + 1, a.predicate )
+  elif ctrl == OPT_SUB:
+    io.out[0] = io.mk_out( a.payload - b.payload, a.predicate )
+    if io.not_ready( in0, in1 ):
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+      io.out[0] = io.mk_out( io.out[0].payload, 0 )
+  elif ctrl == OPT_PAS:
+    io.out[0] = io.mk_out( a.payload, a.predicate )
+  io.apply_predicate()
+
+def mul( io ):
+  in0, in1, _ = io.pick( 2 )
+  a, b = io.ins[in0], io.ins[in1]
+  ctrl = io.opt.ctrl
+  if ctrl == OPT_MUL:
+    io.out[0] = io.mk_out( a.payload * b.payload, a.predicate & b.predicate )
+    if io.not_ready( in0, in1 ):
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+      io.out[0] = io.mk_out( io.out[0].payload, 0 )
+  elif ctrl == OPT_MUL_CONST:
+    io.out[0] = io.mk_out( a.payload * io.const.payload, a.predicate )
+  elif ctrl == OPT_DIV:
+    payload = a.payload // b.payload if b.payload != 0 else 0
+    io.out[0] = io.mk_out( payload, a.predicate & b.predicate )
+    if io.not_ready( in0, in1 ):
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+      io.out[0] = io.mk_out( io.out[0].payload, 0 )
+  io.apply_predicate()
+
+def logic( io ):
+  in0, in1, _ = io.pick( 2 )
+  a, b = io.ins[in0], io.ins[in1]
+  ctrl = io.opt.ctrl
+  if ctrl == OPT_OR:
+    payload = a.payload | b.payload
+  elif ctrl == OPT_AND:
+    payload = a.payload & b.payload
+  elif ctrl == OPT_NOT:
+    payload = ~ a.payload
+  else:
+    payload = a.payload ^ b.payload
+  io.out[0] = io.mk_out( payload, a.predicate & b.predicate )
+  if ctrl != OPT_NOT and io.not_ready( in0, in1 ):
+    io.in_rdy[in0] = io.in_rdy[in1] = 0
+    io.out[0] = io.mk_out( payload, 0 )
+  io.apply_predicate()
+
+def shifter( io ):
+  in0, in1, _ = io.pick( 2 )
+  a, b = io.ins[in0], io.ins[in1]
+  if io.opt.ctrl == OPT_LLS:
+    payload = a.payload << b.payload
+  else:
+    payload = a.payload >> b.payload
+  io.out[0] = io.mk_out( payload, a.predicate & b.predicate )
+  if io.not_ready( in0, in1 ):
+    io.in_rdy[in0] = io.in_rdy[in1] = 0
+    io.out[0] = io.mk_out( payload, 0 )
+  io.apply_predicate()
+
+def phi( io ):
+  in0, in1, _ = io.pick( 2 )
+  a, b = io.ins[in0], io.ins[in1]
+  if io.opt.ctrl == OPT_PHI:
+    if a.predicate:
+      io.out[0] = io.mk_out( a.payload, 1 )
+    elif b.predicate:
+      io.out[0] = io.mk_out( b.payload, 1 )
+    else: # No predecessor is active.
+      io.out[0] = io.mk_out( a.payload, 0 )
+    if io.not_ready( in0, in1 ):
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+      io.pred_rdy = 0
+      io.out[0] = io.mk_out( io.out[0].payload, 0 )
+    if io.opt.predicate and io.pred.payload == 0:
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+      io.pred_rdy = 0
+  else:
+    payload = a.payload if a.predicate else io.const.payload
+    io.out[0] = io.mk_out( payload, 1 )
+    # Predication signal not arrive yet.
+    if io.opt.predicate and io.pred.payload == 0:
+      io.in_rdy[in0] = 0
+  io.apply_predicate()
+  # The PHI_CONST operation executed the first time does not need the
+  # predication signal.
+  if io.opt.predicate and io.opt.ctrl == OPT_PHI_CONST and \
+     io.pred.payload == 0:
+    io.out[0] = io.mk_out( io.out[0].payload, 1 )
+
+def comp( io ):
+  in0, in1, _ = io.pick( 2 )
+  a, b = io.ins[in0], io.ins[in1]
+  ctrl = io.opt.ctrl
+  predicate = a.predicate & b.predicate
+  if ctrl == OPT_EQ:
+    io.out[0] = io.mk_out( int( a.payload == b.payload ), predicate )
+    if io.not_ready( in0, in1 ):
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+      io.out[0] = io.mk_out( io.out[0].payload, 0 )
+  elif ctrl == OPT_EQ_CONST:
+    io.out[0] = io.mk_out( int( a.payload == io.const.payload ), 1 )
+  else:
+    io.out[0] = io.mk_out( int( a.payload < b.payload ), predicate )
+    if io.not_ready( in0, in1 ):
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+  io.apply_predicate()
+
+def branch( io ):
+  in0, _, _ = io.pick( 1 )
+  if io.opt.ctrl == OPT_BRH:
+    taken = io.ins[in0].payload == 0
+  else:
+    taken = io.first
+  # Branch is only used to set predication rather than delivering value.
+  io.out[0] = io.DataType( 0, int( taken ), 0 )
+  io.out[1] = io.DataType( 0, int( not taken ), 0 )
+  if io.opt.ctrl != OPT_BRH_START:
+    io.apply_predicate( 0 )
+    io.apply_predicate( 1 )
+
+def ret( io ):
+  in0, _, _ = io.pick( 1 )
+  io.out[0] = io.DataType( io.ins[in0].payload,
+                           int( io.ins[in0].predicate != 0 ), 0 )
+  io.apply_predicate()
+
+def sel( io ):
+  in0, in1, in2 = io.pick( 3 )
+  picked = io.ins[in1] if io.ins[in0].payload == 1 else io.ins[in2]
+  io.out[0] = io.DataType( picked.payload, picked.predicate, picked.bypass )
+  if io.not_ready( in0, in1, in2 ):
+    io.in_rdy[in0] = io.in_rdy[in1] = io.in_rdy[in2] = 0
+    io.out[0] = io.mk_out( picked.payload, 0 )
+  io.apply_predicate()
+
+def mem_unit( io ):
+  in0, in1, _ = io.pick( 2 )
+  for j in range( len( io.out_en ) ):
+    io.out_en[j] = int( ( any( io.in_en ) or io.last_mem_out_en[j] ) and
+                        io.opt_en )
+  rdata = io.rdata
+  ctrl  = io.opt.ctrl
+  if ctrl == OPT_LD:
+    io.in_rdy[in0] = io.raddr_rdy
+    io.in_rdy[in1] = io.rdata_rdy
+    io.raddr       = ( io.ins[in0].payload, io.in_en[in0] )
+    io.rdata_rdy   = io.out_rdy[0]
+    io.out[0]      = io.DataType( rdata.payload, io.ins[in0].predicate,
+                                  rdata.bypass )
+    io.out_en[0]   = io.opt_en
+    # A load whose address is held back by the data memory waits with
+    # its control word.
+    held = int( io.opt.fu_in[0] ) - 1
+    if held >= 0 and io.counts[held] != 0 and not io.raddr_rdy:
+      io.in_rdy[held] = 0
+      io.opt_hold     = 1
+      io.out_en[0]    = 0
+  elif ctrl == OPT_LD_CONST:
+    for i in range( len( io.in_rdy ) ):
+      io.in_rdy[i] = 0
+    io.const_rdy = io.const_rdy or io.raddr_rdy
+    io.raddr     = ( io.const.payload, io.const_en )
+    io.rdata_rdy = io.out_rdy[0]
+    # Const's predicate will always be true.
+    io.out[0]    = io.DataType( rdata.payload, 1, rdata.bypass )
+    io.out_en[0] = io.opt_en
+    if not io.raddr_rdy:
+      io.opt_hold  = 1
+      io.out_en[0] = 0
+  else:
+    io.in_rdy[in0] = io.waddr_rdy
+    io.in_rdy[in1] = io.wdata_rdy
+    io.waddr       = ( io.ins[0].payload, io.in_en[in0] )
+    io.wdata       = ( io.ins[in1], io.in_en[in1] )
+    io.out_en[0]   = 0
+    io.out[0]      = io.DataType( rdata.payload,
+                                  io.ins[in0].predicate & io.ins[in1].predicate,
+                                  rdata.bypass )
+    if io.not_ready( in0, in1 ):
+      io.in_rdy[in0] = io.in_rdy[in1] = 0
+      io.out[0] = io.mk_out( rdata.payload, 0 )
+    # So does a store whose address and word are not both taken.
+    fu_in = [ int( x ) - 1 for x in io.opt.fu_in[:2] ]
+    if min( fu_in ) >= 0 and io.counts[ fu_in[0] ] != 0 and \
+       io.counts[ fu_in[1] ] != 0 and not ( io.waddr_rdy and io.wdata_rdy ):
+      io.in_rdy[ fu_in[0] ] = io.in_rdy[ fu_in[1] ] = 0
+      io.opt_hold = 1
+  io.apply_predicate()
+  io.next_mem_out_en = list( io.out_en )
+
+#-------------------------------------------------------------------------
+# Combined functional units
+#-------------------------------------------------------------------------
+# The FUs of a combined FU are evaluated one after the other by the
+# functions above, on the operands wired to them and with fu_in fixed to
+# [1, 2]. They share the predicate of the control word.
+
+class StageOpt:
+
+  def __init__( s ):
+    s.ctrl      = OPT_START
+    s.predicate = 0
+    s.fu_in     = [ 1, 2 ]
+
+def stage( io, func, ctrl, a, b, count_a, count_b, const ):
+  if io.stage == None:
+    io.stage     = FuIO( io.DataType, 2, 1 )
+    io.stage.opt = StageOpt()
+  sub = io.stage
+  sub.ins[0], sub.ins[1]       = a, b
+  sub.counts[0], sub.counts[1] = count_a, count_b
+  sub.opt.ctrl      = ctrl
+  sub.opt.predicate = io.opt.predicate
+  sub.opt_en        = io.opt_en
+  sub.const         = const
+  sub.pred          = io.pred
+  sub.out[0]        = io.DataType()
+  func( sub )
+  return sub.out[0]
+
+class SeqCombo:
+  # TwoSeqCombo: the first FU takes in0, in1 and the const, the second
+  # takes its result and in2. Its outport is enabled by in0 whatever the
+  # opcode, with the result of the last combined opcode it was given, so
+  # it overrides the FUs before it in FuList.
+
+  def __init__( s, fu0, fu1, ops ):
+    s.fu0 = fu0
+    s.fu1 = fu1
+    s.ops = ops
+
+  def __call__( s, io ):
+    io.combo_opt[ s ] = int( io.opt.ctrl )
+    s.evaluate( io )
+
+  def evaluate( s, io ):
+    ctrl = io.combo_opt.get( s )
+    if ctrl == None:
+      io.out[0] = io.DataType()
+    else:
+      ctrl0, ctrl1 = s.ops[ ctrl ]
+      mid = stage( io, s.fu0, ctrl0, io.ins[0], io.ins[1],
+                   io.counts[0], io.counts[1], io.const )
+      # The const of the second FU is not connected.
+      io.out[0] = stage( io, s.fu1, ctrl1, mid, io.ins[2],
+                         io.counts[0], io.counts[2], io.DataType() )
+    io.out_en[0] = int( io.in_en[0] and io.opt_en )
+    for j in range( 1, len( io.out ) ):
+      io.out_en[j] = 0
+
+  def override( s, io ):
+    # Evaluated after the FU of another opcode.
+    if io.in_en[0] and io.opt_en:
+      out_en = list( io.out_en )
+      s.evaluate( io )
+      for j in range( 1, len( io.out ) ):
+        io.out_en[j] = out_en[j]
+
+class ThreeCombo:
+  # ThreeCombo: the first two FUs take in0, in1 and in2, in3, the third
+  # takes their results. Both outports carry the result, enabled when all
+  # the operands are. No const is connected.
+
+  def __init__( s, fu0, fu1, fu2, ops ):
+    s.fu0 = fu0
+    s.fu1 = fu1
+    s.fu2 = fu2
+    s.ops = ops
+
+  def __call__( s, io ):
+    ctrl0, ctrl1, ctrl2 = s.ops[ int( io.opt.ctrl ) ]
+    zero = io.DataType()
+    out0 = stage( io, s.fu0, ctrl0, io.ins[0], io.ins[1],
+                  io.counts[0], io.counts[1], zero )
+    out1 = stage( io, s.fu1, ctrl1, io.ins[2], io.ins[3],
+                  io.counts[2], io.counts[3], zero )
+    out  = stage( io, s.fu2, ctrl2, out0, out1,
+                  io.counts[0], io.counts[2], zero )
+    en   = int( all( io.in_en[:4] ) and io.opt_en )
+    for j in range( len( io.out ) ):
+      io.out[j]    = out
+      io.out_en[j] = en
+
+seq_mul_adder = SeqCombo( mul, adder, {
+  int( OPT_MUL_ADD )       : ( OPT_MUL,       OPT_ADD ),
+  int( OPT_MUL_CONST_ADD ) : ( OPT_MUL_CONST, OPT_ADD ),
+  int( OPT_MUL_CONST )     : ( OPT_MUL_CONST, OPT_PAS ),
+  int( OPT_MUL_SUB )       : ( OPT_MUL,       OPT_SUB ),
+} )
+
+seq_mul_shifter = SeqCombo( mul, shifter, {
+  int( OPT_MUL_LLS ) : ( OPT_MUL, OPT_LLS ),
+  int( OPT_MUL_LRS ) : ( OPT_MUL, OPT_LRS ),
+} )
+
+three_mul_adder_shifter = ThreeCombo( mul, adder, shifter, {
+  int( OPT_MUL_ADD_LLS ) : ( OPT_MUL, OPT_ADD, OPT_LLS ),
+  int( OPT_MUL_SUB_LLS ) : ( OPT_MUL, OPT_SUB, OPT_LLS ),
+  int( OPT_MUL_SUB_LRS ) : ( OPT_MUL, OPT_SUB, OPT_LRS ),
+} )
+
+#-------------------------------------------------------------------------
+# Dispatch
+#-------------------------------------------------------------------------
+
+# The opcodes of each FU, the function evaluating them and the number of
+# operands each FU picks before decoding the opcode.
+fu_table = {
+  AdderRTL   : ( [ OPT_ADD, OPT_ADD_CONST, OPT_INC, OPT_SUB, OPT_PAS ],
+                 adder, 2 ),
+  MulRTL     : ( [ OPT_MUL, OPT_MUL_CONST, OPT_DIV ], mul, 2 ),
+  LogicRTL   : ( [ OPT_OR, OPT_AND, OPT_NOT, OPT_XOR ], logic, 2 ),
+  ShifterRTL : ( [ OPT_LLS, OPT_LRS ], shifter, 2 ),
+  PhiRTL     : ( [ OPT_PHI, OPT_PHI_CONST ], phi, 2 ),
+  CompRTL    : ( [ OPT_EQ, OPT_EQ_CONST, OPT_LE ], comp, 2 ),
+  BranchRTL  : ( [ OPT_BRH, OPT_BRH_START ], branch, 1 ),
+  RetRTL     : ( [ OPT_RET ], ret, 1 ),
+  SelRTL     : ( [ OPT_SEL ], sel, 3 ),
+  MemUnitRTL : ( [ OPT_LD, OPT_LD_CONST, OPT_STR ], mem_unit, 2 ),
+  SeqMulAdderRTL   : ( [ OPT_MUL_ADD, OPT_MUL_CONST_ADD, OPT_MUL_CONST,
+                         OPT_MUL_SUB ], seq_mul_adder, 0 ),
+  SeqMulShifterRTL : ( [ OPT_MUL_LLS, OPT_MUL_LRS ], seq_mul_shifter, 0 ),
+  ThreeMulAdderShifterRTL : ( [ OPT_MUL_ADD_LLS, OPT_MUL_SUB_LLS,
+                                OPT_MUL_SUB_LRS ], three_mul_adder_shifter, 0 ),
+}
+
+# The number of operands whose rdy the combined FUs raise with the rdy of
+# their first outport, whatever the opcode.
+combo_ready = {
+  SeqMulAdderRTL          : 3,
+  SeqMulShifterRTL        : 3,
+  ThreeMulAdderShifterRTL : 4,
+}
+
+def fu_kinds( FuList ):
+  # Whether FuList has single FUs, which raise the rdy of recv_opt and
+  # recv_const with any outport, and combined FUs, which raise the rdy of
+  # recv_opt with the first outport only.
+  return ( any( [ Fu not in combo_ready for Fu in FuList ] ),
+           any( [ Fu in combo_ready for Fu in FuList ] ) )
+
+def out_rdy_of( kinds, out_rdy ):
+  # The rdy the FUs raise on recv_opt and recv_const.
+  single, combo = kinds
+  rdy = int( single and any( out_rdy ) )
+  return rdy | int( combo and out_rdy[0] ), rdy
+
+def mk_dispatch( FuList ):
+  # Maps each opcode to ( function, number of operands picked by the
+  # other FUs, number of operands raised by the combined FUs, the
+  # TwoSeqCombos after the FU in FuList ). The entry None is for the
+  # opcodes no FU implements.
+  for Fu in FuList:
+    if issubclass( Fu, TwoPrlCombo ):
+      raise Exception( f"{Fu.__name__} has neither recv_const nor memory "
+                       f"ports, FlexibleFuCL and FlexibleFuRTL can not "
+                       f"hold it!" )
+    if Fu not in fu_table:
+      raise Exception( f"{Fu.__name__} is not supported by FlexibleFuCL, "
+                       f"use FlexibleFuRTL instead!" )
+  num_ready = max( [ combo_ready.get( x, 0 ) for x in FuList ] + [ 0 ] )
+  seqs = [ ( i, fu_table[ x ][1] ) for i, x in enumerate( FuList )
+           if isinstance( fu_table[ x ][1], SeqCombo ) ]
+  dispatch = {}
+  for k, Fu in enumerate( FuList ):
+    opts, func, _ = fu_table[ Fu ]
+    others = [ fu_table[ x ][2] for i, x in enumerate( FuList ) if i != k ]
+    after  = [ seq for i, seq in seqs if i > k ]
+    for opt in opts:
+      dispatch.setdefault( int( opt ), ( func, max( others + [ 0 ] ),
+                                         num_ready, after ) )
+  dispatch[ None ] = ( None, max( [ fu_table[ x ][2] for x in FuList ] + [ 0 ] ),
+                       num_ready, [ seq for _, seq in seqs ] )
+  return dispatch
+
+def execute( io, dispatch ):
+  # Evaluates the FU of the current opcode on io, whose inputs are set and
+  # whose rdy are cleared.
+  func, num_picked, num_ready, seqs = \
+    dispatch.get( int( io.opt.ctrl ), dispatch[ None ] )
+  if func != None:
+    for j in range( len( io.out ) ):
+      io.out_en[j] = io.opt_en
+      io.out[j]    = io.DataType()
+    func( io )
+  if func != mem_unit:
+    io.next_mem_out_en = [ 0 ] * len( io.out )
+  for seq in seqs:
+    seq.override( io )
+  # The other FUs still pick their operands.
+  if num_picked > 0:
+    io.pick( num_picked )
+  if num_ready > 0:
+    for i in range( num_ready ):
+      io.in_rdy[i] = io.in_rdy[i] | io.out_rdy[0]
+    if io.opt_en and io.opt.predicate:
+      io.pred_rdy = 1
+
+#-------------------------------------------------------------------------
+# FlexibleFuCL
+#-------------------------------------------------------------------------
+
+class FlexibleFuCL( Component ):
+
+  def construct( s, DataType, PredicateType, CtrlType,
+                 num_inports, num_outports, data_mem_size, FuList ):
+
+    # Constant
+    s.fu_list_size = len( FuList )
+    num_entries    = 2
+    CountType      = mk_bits( clog2( num_entries + 1 ) )
+    AddrType       = mk_bits( clog2( data_mem_size ) )
+    assert FuList.count( MemUnitRTL ) <= 1
+    s.mem_index    = FuList.index( MemUnitRTL ) if MemUnitRTL in FuList \
+                     else None
+    s.has_branch   = BranchRTL in FuList
+    s.fu_kinds     = fu_kinds( FuList )
+    s.dispatch     = mk_dispatch( FuList )
+    s.io           = FuIO( DataType, num_inports, num_outports )
+
+    # Interface
+    s.recv_in        = [ RecvIfcRTL( DataType ) for _ in range( num_inports  ) ]
+    s.recv_in_count  = [ InPort( CountType ) for _ in range( num_inports  ) ]
+    s.recv_predicate = RecvIfcRTL( PredicateType )
+    s.recv_const     = RecvIfcRTL( DataType )
+    s.recv_opt       = RecvIfcRTL( CtrlType )
+    s.send_out       = [ SendIfcRTL( DataType ) for _ in range( num_outports ) ]
+
+    s.to_mem_raddr   = [ SendIfcRTL( AddrType ) for _ in range( s.fu_list_size ) ]
+    s.from_mem_rdata = [ RecvIfcRTL( DataType ) for _ in range( s.fu_list_size ) ]
+    s.to_mem_waddr   = [ SendIfcRTL( AddrType ) for _ in range( s.fu_list_size ) ]
+    s.to_mem_wdata   = [ SendIfcRTL( DataType ) for _ in range( s.fu_list_size ) ]
+    s.opt_hold       = OutPort( b1 )
+
+    # The first BRH_START is taken.
+    s.first = Wire( b1 )
+
+    @s.update
+    def comb_logic():
+      io = s.io
+      for i in range( num_inports ):
+        io.ins[i]    = s.recv_in[i].msg
+        io.in_en[i]  = int( s.recv_in[i].en )
+        io.counts[i] = int( s.recv_in_count[i] )
+        io.in_rdy[i] = 0
+      for j in range( num_outports ):
+        io.out_rdy[j] = int( s.send_out[j].rdy )
+        io.out_en[j]  = 0
+      io.opt       = s.recv_opt.msg
+      io.opt_en    = int( s.recv_opt.en )
+      io.const     = s.recv_const.msg
+      io.const_en  = int( s.recv_const.en )
+      io.const_rdy = 0
+      io.pred      = s.recv_predicate.msg
+      io.pred_rdy  = 0
+      io.first     = int( s.first )
+      io.raddr     = None
+      io.waddr     = None
+      io.wdata     = None
+      io.opt_hold  = 0
+      for k in range( s.fu_list_size ):
+        if k == s.mem_index:
+          io.rdata     = s.from_mem_rdata[k].msg
+          io.rdata_rdy = int( s.from_mem_rdata[k].rdy )
+          io.raddr_rdy = int( s.to_mem_raddr[k].rdy )
+          io.waddr_rdy = int( s.to_mem_waddr[k].rdy )
+          io.wdata_rdy = int( s.to_mem_wdata[k].rdy )
+
+      execute( io, s.dispatch )
+
+      for i in range( num_inports ):
+        s.recv_in[i].rdy = b1( io.in_rdy[i] )
+      for j in range( num_outports ):
+        s.send_out[j].en = b1( io.out_en[j] )
+        if io.out_en[j]:
+          s.send_out[j].msg = io.out[j]
+      opt_out_rdy, out_rdy = out_rdy_of( s.fu_kinds, io.out_rdy )
+      io.next_pred_rdy = io.last_pred_rdy | io.pred_rdy
+      io.next_opt_rdy  = io.last_opt_rdy | opt_out_rdy
+      if s.mem_index != None:
+        io.next_mem_opt_rdy = 0 if io.opt_hold else \
+                              int( io.last_mem_opt_rdy or any( io.out_rdy ) )
+        io.next_opt_rdy = io.next_opt_rdy & io.next_mem_opt_rdy
+      io.next_const_rdy = io.last_const_rdy | out_rdy | io.const_rdy
+      s.recv_predicate.rdy = b1( io.next_pred_rdy )
+      s.recv_opt.rdy       = b1( io.next_opt_rdy )
+      s.recv_const.rdy     = b1( io.next_const_rdy )
+      s.opt_hold           = b1( io.opt_hold )
+
+      for k in range( s.fu_list_size ):
+        if k == s.mem_index:
+          s.to_mem_waddr[k].en = b1( 0 )
+          s.to_mem_wdata[k].en = b1( 0 )
+          if io.raddr != None:
+            s.to_mem_raddr[k].msg   = AddrType( io.raddr[0] )
+            s.to_mem_raddr[k].en    = b1( io.raddr[1] )
+            s.from_mem_rdata[k].rdy = b1( io.rdata_rdy )
+          if io.waddr != None:
+            s.to_mem_waddr[k].msg = AddrType( io.waddr[0] )
+            s.to_mem_waddr[k].en  = b1( io.waddr[1] )
+            s.to_mem_wdata[k].msg = io.wdata[0]
+            s.to_mem_wdata[k].en  = b1( io.wdata[1] )
+
+    @s.update_ff
+    def update_state():
+      s.io.commit()
+
+    @s.update_ff
+    def br_start_once():
+      if s.reset:
+        s.first <<= b1( 1 )
+      if s.recv_opt.msg.ctrl == OPT_BRH_START:
+        s.first <<= b1( 0 )
+
+  def line_trace( s ):
+    opt_str = " #"
+    if s.recv_opt.en:
+      opt_str = OPT_SYMBOL_DICT[s.recv_opt.msg.ctrl]
+    out_str = ",".join([str(x.msg) for x in s.send_out])
+    recv_str = ",".join([str(x.msg) for x in s.recv_in])
+    return f'[recv: {recv_str}] {opt_str}(P{s.recv_opt.msg.predicate}) (const: {s.recv_const.msg}, en: {s.recv_const.en}) ] = [out: {out_str}]'
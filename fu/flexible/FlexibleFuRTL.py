@@ -38,6 +38,7 @@ class FlexibleFuRTL( Component ):
     s.from_mem_rdata = [ RecvIfcRTL( DataType ) for _ in range( s.fu_list_size ) ]
     s.to_mem_waddr   = [ SendIfcRTL( AddrType ) for _ in range( s.fu_list_size ) ]
     s.to_mem_wdata   = [ SendIfcRTL( DataType ) for _ in range( s.fu_list_size ) ]
+    s.opt_hold       = OutPort( b1 )
 
     # Components
     s.fu = [ FuList[i]( DataType, PredicateType, CtrlType, num_inports, num_outports,
@@ -86,6 +87,14 @@ class FlexibleFuRTL( Component ):
           s.fu[i].send_out[j].rdy = s.send_out[j].rdy
 
 
+      # A unit holding its control word (a memory unit whose request is
+      # not taken) holds it for the others.
+      s.opt_hold = b1( 0 )
+      for i in range( s.fu_list_size ):
+        s.opt_hold = s.opt_hold | s.fu[i].opt_hold
+      if s.opt_hold:
+        s.recv_opt.rdy = b1( 0 )
+
       for j in range( num_inports ):
         s.recv_in[j].rdy = b1( 0 )
 
@@ -0,0 +1,219 @@
+"""
+==========================================================================
+FlexibleFuCL_test.py
+==========================================================================
+Test cases for the opcode-dispatched flexible functional unit, which
+runs the same cases as FlexibleFuRTL.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+from pymtl3.stdlib.test           import TestSinkCL
+from pymtl3.stdlib.test.test_srcs import TestSrcRTL
+
+from ..FlexibleFuCL               import FlexibleFuCL, mk_dispatch, adder, \
+                                         seq_mul_adder
+from ..FlexibleFuRTL              import FlexibleFuRTL
+from ....lib.opt_type             import *
+from ....lib.messages             import *
+
+from ...single.AdderRTL           import AdderRTL
+from ...single.MulRTL             import MulRTL
+from ...single.ShifterRTL         import ShifterRTL
+from ...single.LogicRTL           import LogicRTL
+from ...single.PhiRTL             import PhiRTL
+from ...single.MemUnitRTL         import MemUnitRTL
+from ...single.CompRTL            import CompRTL
+from ...single.BranchRTL          import BranchRTL
+from ...single.SelRTL             import SelRTL
+from ...double.SeqMulAdderRTL     import SeqMulAdderRTL
+from ...double.PrlMulAdderRTL     import PrlMulAdderRTL
+from ...triple.ThreeMulAdderShifterRTL import ThreeMulAdderShifterRTL
+
+from .FlexibleFuRTL_test          import TestHarness, run_sim
+
+import pytest
+
+def test_dispatch():
+  dispatch = mk_dispatch( [ AdderRTL, MulRTL, BranchRTL ] )
+  assert dispatch[ int( OPT_ADD ) ] == ( adder, 2, 0, [] )
+  # Only the adder and the multiplier pick operands besides the branch.
+  assert dispatch[ int( OPT_BRH ) ][1] == 2
+  assert int( OPT_LD ) not in dispatch
+  assert dispatch[ None ] == ( None, 2, 0, [] )
+  assert mk_dispatch( [ SelRTL ] )[ None ] == ( None, 3, 0, [] )
+  # The combined FU raises three operands and overrides the adder
+  # before it, not the one after it.
+  dispatch = mk_dispatch( [ AdderRTL, SeqMulAdderRTL, MulRTL ] )
+  assert dispatch[ int( OPT_ADD ) ] == ( adder, 2, 3, [ seq_mul_adder ] )
+  assert dispatch[ int( OPT_MUL_ADD ) ] == ( seq_mul_adder, 2, 3, [] )
+  assert dispatch[ int( OPT_MUL ) ][3] == []
+  with pytest.raises( Exception, match = "PrlMulAdderRTL has neither" ):
+    mk_dispatch( [ PrlMulAdderRTL ] )
+
+def test_flexible_alu():
+  FU            = FlexibleFuCL
+  FuList        = [AdderRTL]
+  DataType      = mk_data( 16, 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  CtrlType      = mk_ctrl()
+  data_mem_size = 8
+  num_inports   = 2
+  num_outports  = 2
+  FuInType      = mk_bits( clog2( num_inports + 1 ) )
+  pickRegister  = [ FuInType( x+1 ) for x in range( num_inports ) ]
+  src_in0       = [ DataType(1, 1), DataType(2, 1), DataType(9, 1) ]
+  src_in1       = [ DataType(2, 1), DataType(3, 1), DataType(1, 1) ]
+  src_predicate = [ PredicateType(1, 0), PredicateType(1, 0), PredicateType(1, 0) ]
+  sink_out      = [ DataType(3, 0), DataType(5, 1), DataType(8, 0) ]
+  src_opt       = [ CtrlType( OPT_ADD, b1( 1 ), pickRegister ),
+                    CtrlType( OPT_ADD, b1( 0 ), pickRegister ),
+                    CtrlType( OPT_SUB, b1( 1 ), pickRegister ) ]
+  th = TestHarness( FU, FuList, DataType, PredicateType, CtrlType,
+                    data_mem_size, num_inports, num_outports,
+                    src_in0, src_in1, src_predicate, src_opt,
+                    sink_out, sink_out )
+  run_sim( th )
+
+def test_flexible_mul():
+  FU            = FlexibleFuCL
+  FuList        = [AdderRTL, MulRTL]
+  DataType      = mk_data( 16, 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  CtrlType      = mk_ctrl()
+  data_mem_size = 8
+  num_inports   = 2
+  num_outports  = 2
+  FuInType      = mk_bits( clog2( num_inports + 1 ) )
+  pickRegister  = [ FuInType( x+1 ) for x in range( num_inports ) ]
+  src_in0       = [ DataType(1, 1), DataType(2, 1), DataType(9, 1) ]
+  src_in1       = [ DataType(2, 1), DataType(3, 1), DataType(2, 1) ]
+  src_predicate = [ PredicateType(1, 0), PredicateType(1, 1), PredicateType(1, 1) ]
+  sink_out      = [ DataType(2, 0), DataType(6, 1), DataType(18, 1) ]
+  src_opt       = [ CtrlType( OPT_MUL, b1( 1 ), pickRegister ),
+                    CtrlType( OPT_MUL, b1( 1 ), pickRegister ),
+                    CtrlType( OPT_MUL, b1( 1 ), pickRegister ) ]
+  th = TestHarness( FU, FuList, DataType, PredicateType, CtrlType,
+                    data_mem_size, num_inports, num_outports,
+                    src_in0, src_in1, src_predicate, src_opt,
+                    sink_out, sink_out )
+  run_sim( th )
+
+def test_flexible_universal():
+  FU            = FlexibleFuCL
+  FuList        = [AdderRTL, MulRTL, LogicRTL, ShifterRTL, PhiRTL, CompRTL, BranchRTL, MemUnitRTL]
+  DataType      = mk_data( 16, 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  CtrlType      = mk_ctrl()
+  data_mem_size = 8
+  num_inports   = 2
+  num_outports  = 2
+  FuInType      = mk_bits( clog2( num_inports + 1 ) )
+  pickRegister  = [ FuInType( x+1 ) for x in range( num_inports ) ]
+  src_in0       = [ DataType(2, 1), DataType(1, 1), DataType(3, 0) ]
+  src_in1       = [ DataType(2, 1), DataType(0, 1), DataType(2, 1) ]
+  src_predicate = [ PredicateType(1, 0), PredicateType(1, 1), PredicateType(1, 0) ]
+  sink_out0     = [ DataType(1, 0), DataType(0, 0), DataType(2, 1) ]
+  sink_out1     = [ DataType(0, 0), DataType(0, 1), DataType(0, 0) ]
+  src_opt       = [ CtrlType( OPT_EQ , b1( 1 ), pickRegister ),
+                    CtrlType( OPT_BRH, b1( 1 ), pickRegister ),
+                    CtrlType( OPT_PHI, b1( 0 ), pickRegister ) ]
+  th = TestHarness( FU, FuList, DataType, PredicateType, CtrlType,
+                    data_mem_size, num_inports, num_outports,
+                    src_in0, src_in1, src_predicate, src_opt,
+                    sink_out0, sink_out1 )
+  run_sim( th )
+
+#-------------------------------------------------------------------------
+# Combined FUs
+#-------------------------------------------------------------------------
+
+class ComboHarness( Component ):
+
+  def construct( s, FunctionUnit, FuList, DataType, PredicateType,
+                 CtrlType, src_msgs, src_const, src_predicate, ctrl_msgs ):
+
+    num_inports  = len( src_msgs )
+    s.src_in        = [ TestSrcRTL( DataType, x ) for x in src_msgs ]
+    s.src_predicate = TestSrcRTL( PredicateType, src_predicate )
+    s.src_const     = TestSrcRTL( DataType,      src_const     )
+    s.src_opt       = TestSrcRTL( CtrlType,      ctrl_msgs     )
+
+    s.dut = FunctionUnit( DataType, PredicateType, CtrlType,
+                          num_inports, 2, 8, FuList )
+
+    for i in range( num_inports ):
+      s.dut.recv_in_count[i] //= 1
+      s.src_in[i].send       //= s.dut.recv_in[i]
+    s.src_const.send     //= s.dut.recv_const
+    s.src_predicate.send //= s.dut.recv_predicate
+    s.src_opt.send       //= s.dut.recv_opt
+    for j in range( 2 ):
+      s.dut.send_out[j].rdy //= 1
+
+    AddrType = mk_bits( clog2( 8 ) )
+    s.to_mem_raddr   = [ TestSinkCL( AddrType, [] ) for _ in FuList ]
+    s.from_mem_rdata = [ TestSrcRTL( DataType, [] ) for _ in FuList ]
+    s.to_mem_waddr   = [ TestSinkCL( AddrType, [] ) for _ in FuList ]
+    s.to_mem_wdata   = [ TestSinkCL( DataType, [] ) for _ in FuList ]
+
+    for i in range( len( FuList ) ):
+      s.to_mem_raddr[i].recv   //= s.dut.to_mem_raddr[i]
+      s.from_mem_rdata[i].send //= s.dut.from_mem_rdata[i]
+      s.to_mem_waddr[i].recv   //= s.dut.to_mem_waddr[i]
+      s.to_mem_wdata[i].recv   //= s.dut.to_mem_wdata[i]
+
+  def outputs( s ):
+    dut = s.dut
+    return ( [ ( int( x.en ), str( x.msg ) if x.en else None )
+               for x in dut.send_out ],
+             [ int( x.rdy ) for x in dut.recv_in ],
+             int( dut.recv_opt.rdy ), int( dut.recv_const.rdy ),
+             int( dut.recv_predicate.rdy ) )
+
+def test_flexible_combo():
+  # The combined FUs give the same outputs and rdy as in FlexibleFuRTL,
+  # including SeqMulAdderRTL overriding the ADD of the adder before it
+  # with its last combined opcode.
+  FuList        = [ AdderRTL, SeqMulAdderRTL, ThreeMulAdderShifterRTL ]
+  DataType      = mk_data( 16, 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  CtrlType      = mk_ctrl( 4 )
+  FuInType      = mk_bits( clog2( 4 + 1 ) )
+  pickRegister  = [ FuInType( x+1 ) for x in range( 4 ) ]
+  src_msgs      = [ [ DataType(1, 1), DataType(2, 1), DataType(4, 1),
+                      DataType(5, 1), DataType(1, 1) ],
+                    [ DataType(2, 1), DataType(3, 1), DataType(3, 1),
+                      DataType(2, 1), DataType(2, 1) ],
+                    [ DataType(1, 1), DataType(3, 1), DataType(3, 1),
+                      DataType(1, 1), DataType(7, 1) ],
+                    [ DataType(1, 1), DataType(2, 1), DataType(1, 1),
+                      DataType(1, 1), DataType(1, 1) ] ]
+  src_const     = [ DataType(3, 1) for _ in range( 5 ) ]
+  src_predicate = [ PredicateType(1, 0), PredicateType(1, 1) ] * 3
+  src_opt       = [ CtrlType( OPT_MUL_ADD,       b1( 0 ), pickRegister ),
+                    CtrlType( OPT_MUL_CONST_ADD, b1( 1 ), pickRegister ),
+                    CtrlType( OPT_ADD,           b1( 0 ), pickRegister ),
+                    CtrlType( OPT_MUL_SUB_LLS,   b1( 0 ), pickRegister ),
+                    CtrlType( OPT_MUL_SUB,       b1( 0 ), pickRegister ) ]
+  ths = [ ComboHarness( FU, FuList, DataType, PredicateType, CtrlType,
+                        src_msgs, src_const, src_predicate, src_opt )
+          for FU in [ FlexibleFuRTL, FlexibleFuCL ] ]
+  for th in ths:
+    th.elaborate()
+    th.apply( SimulationPass() )
+    th.sim_reset()
+  results = []
+  for _ in range( 8 ):
+    assert ths[0].outputs() == ths[1].outputs()
+    results.append( ths[1].outputs()[0][0] )
+    for th in ths:
+      th.tick()
+  assert results[1:6] == [ ( 1, str( DataType(3, 1) ) ),
+                           ( 1, str( DataType(9, 0) ) ),
+                           ( 1, str( DataType(15, 1) ) ),
+                           ( 1, str( DataType(10, 1) ) ),
+                           ( 1, str( DataType(0xfffb, 1) ) ) ]
@@ -27,7 +27,7 @@ from ...single.MemUnitRTL           import MemUnitRTL
 from ...single.CompRTL              import CompRTL
 from ...single.BranchRTL            import BranchRTL
 
-from pymtl3.passes.backends.verilog import TranslationImportPass
+from ....lib.verilator_cache        import CachedTranslationImportPass
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -84,7 +84,7 @@ def run_sim( test_harness, max_cycles=100 ):
   test_harness.elaborate()
   test_harness.dut.verilog_translate_import = True
   test_harness.dut.config_verilog_import = VerilatorImportConfigs(vl_Wno_list = ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT', 'ALWCOMBORDER'])
-  test_harness = TranslationImportPass()(test_harness)
+  test_harness = CachedTranslationImportPass()(test_harness)
   test_harness.apply( SimulationPass() )
   test_harness.sim_reset()
 
@@ -0,0 +1,316 @@
+"""
+==========================================================================
+MemUnitLsqRTL.py
+==========================================================================
+Scratchpad memory access unit with a load/store queue, for memories
+with a multi-cycle read latency (e.g., PipelinedDataMemCL). It has the
+ports of MemUnitRTL and can replace it in FuList.
+
+MemUnitRTL returns the word of a load in the cycle of its request. Here
+a load issues its request and holds its control word (opt_hold) until
+its own word is back, which it then sends out itself, so each load
+delivers the word of its own iteration. In CGRARTL the whole array
+waits for it (TileRTL.array_hold), so the mapping does not change with
+the latency of the memory. With a single-cycle
+memory, or a word forwarded from the store queue, the load completes
+in the cycle of its request, as with MemUnitRTL.
+
+A store the memory does not take at once waits in the store queue (up
+to lsq_depth entries) and the stores are written in order. A load
+whose address matches a queued store takes the word of the youngest
+such store instead of reading the memory, so it always sees the stores
+before it. A store waits while the queue is full, so the array only
+waits on the stores when more than lsq_depth of them are pending.
+
+The queues are registers, so the unit can be translated as the other
+FUs.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3              import *
+from pymtl3.stdlib.ifcs  import SendIfcRTL, RecvIfcRTL
+from ...lib.opt_type     import *
+from .MemUnitRTL         import MemUnitRTL
+
+class MemUnitLsqRTL( MemUnitRTL ):
+
+  def construct( s, DataType, PredicateType, CtrlType,
+                 num_inports, num_outports, data_mem_size, lsq_depth = 4 ):
+
+    # Constant
+    AddrType      = mk_bits( clog2( data_mem_size ) )
+    num_entries   = 2
+    CountType     = mk_bits( clog2( num_entries + 1 ) )
+    FuInType      = mk_bits( clog2( num_inports + 1 ) )
+    LsqCountType  = mk_bits( clog2( lsq_depth + 1 ) )
+    PayloadType   = DataType.__bitstruct_fields__['payload']
+    BypassType    = DataType.__bitstruct_fields__['bypass']
+    s.lsq_depth   = lsq_depth
+
+    # Interface
+    s.recv_in        = [ RecvIfcRTL( DataType ) for _ in range( num_inports ) ]
+    s.recv_in_count  = [ InPort( CountType ) for _ in range( num_inports ) ]
+    s.recv_predicate = RecvIfcRTL( PredicateType )
+    s.recv_const     = RecvIfcRTL( DataType )
+    s.recv_opt       = RecvIfcRTL( CtrlType )
+    s.send_out       = [ SendIfcRTL( DataType ) for _ in range( num_outports ) ]
+
+    # Interface to the data sram, need to interface them with
+    # the data memory module in top level
+    s.to_mem_raddr   = SendIfcRTL( AddrType )
+    s.from_mem_rdata = RecvIfcRTL( DataType )
+    s.to_mem_waddr   = SendIfcRTL( AddrType )
+    s.to_mem_wdata   = SendIfcRTL( DataType )
+    s.opt_hold       = OutPort( b1 )
+
+    # Component
+
+    # The load in flight, if any: its word (with the predicate of the
+    # load) and whether the word is back. Store queue, the oldest store
+    # first: its address and word.
+    s.ld_pending    = Wire( b1 )
+    s.ld_word       = Wire( DataType )
+    s.ld_back       = Wire( b1 )
+    s.st_queue_addr = [ Wire( AddrType ) for _ in range( lsq_depth ) ]
+    s.st_queue_word = [ Wire( DataType ) for _ in range( lsq_depth ) ]
+    s.st_count      = Wire( LsqCountType )
+
+    # The load and the store queue at the end of the cycle, before the
+    # load or the oldest store leaves: the word back from the memory is
+    # in the load and the current load or store is appended.
+    s.ld_next_word  = Wire( DataType )
+    s.ld_next_back  = Wire( b1 )
+    s.st_next_addr  = [ Wire( AddrType ) for _ in range( lsq_depth + 1 ) ]
+    s.st_next_word  = [ Wire( DataType ) for _ in range( lsq_depth + 1 ) ]
+
+    # The entry taken by the current load or store, and the load sent
+    # out or the store leaving the queue.
+    s.ld_push  = Wire( b1 )
+    s.ld_sent  = Wire( b1 )
+    s.ld_fwd   = Wire( b1 )
+    s.ld_msg   = Wire( DataType )
+    s.st_push  = Wire( b1 )
+    s.st_pop   = Wire( b1 )
+    s.st_addr  = Wire( AddrType )
+    s.st_msg   = Wire( DataType )
+
+    @s.update
+    def comb_logic():
+
+      # For pick input register
+      in0 = FuInType( 0 )
+      in1 = FuInType( 0 )
+      for i in range( num_inports ):
+        s.recv_in[i].rdy = b1( 0 )
+
+      s.recv_predicate.rdy = b1( 0 )
+      s.opt_hold           = b1( 0 )
+
+      if s.recv_opt.en:
+        if s.recv_opt.msg.fu_in[0] != FuInType( 0 ):
+          in0 = s.recv_opt.msg.fu_in[0] - FuInType( 1 )
+          s.recv_in[in0].rdy = b1( 1 )
+        if s.recv_opt.msg.fu_in[1] != FuInType( 0 ):
+          in1 = s.recv_opt.msg.fu_in[1] - FuInType( 1 )
+          s.recv_in[in1].rdy = b1( 1 )
+        if s.recv_opt.msg.predicate == b1( 1 ):
+          s.recv_predicate.rdy = b1( 1 )
+
+      for j in range( num_outports ):
+        s.recv_const.rdy = s.send_out[j].rdy or s.recv_const.rdy
+
+      for j in range( num_outports ):
+        s.recv_opt.rdy = s.send_out[j].rdy or s.recv_opt.rdy
+
+      for j in range( num_outports ):
+        for i in range( num_inports ):
+          s.send_out[j].en = s.recv_in[i].en or s.send_out[j].en
+        s.send_out[j].en = s.send_out[j].en and s.recv_opt.en
+
+      s.ld_push = b1( 0 )
+      s.ld_sent = b1( 0 )
+      s.ld_fwd  = b1( 0 )
+      s.st_push = b1( 0 )
+      s.to_mem_raddr.en    = b1( 0 )
+      s.from_mem_rdata.rdy = b1( 1 )
+
+      # The word back from the memory is the one of the load in flight.
+      s.ld_next_word = DataType( s.ld_word.payload, s.ld_word.predicate,
+                                 s.ld_word.bypass )
+      s.ld_next_back = s.ld_back
+      if s.ld_pending & s.from_mem_rdata.en:
+        s.ld_next_word.payload = s.from_mem_rdata.msg.payload
+        s.ld_next_word.bypass  = s.from_mem_rdata.msg.bypass
+        s.ld_next_back         = b1( 1 )
+
+      for i in range( lsq_depth ):
+        s.st_next_addr[i] = s.st_queue_addr[i]
+        s.st_next_word[i] = s.st_queue_word[i]
+      s.st_next_addr[lsq_depth] = AddrType( 0 )
+      s.st_next_word[lsq_depth] = DataType( PayloadType( 0 ), b1( 0 ),
+                                           BypassType( 0 ) )
+
+      # The oldest queued store is written first.
+      if s.st_count != LsqCountType( 0 ):
+        s.to_mem_waddr.msg = s.st_queue_addr[0]
+        s.to_mem_wdata.msg = s.st_queue_word[0]
+        s.to_mem_waddr.en  = b1( 1 )
+        s.to_mem_wdata.en  = b1( 1 )
+      else:
+        s.to_mem_waddr.en  = b1( 0 )
+        s.to_mem_wdata.en  = b1( 0 )
+
+      if s.recv_opt.msg.ctrl == OPT_LD or s.recv_opt.msg.ctrl == OPT_LD_CONST:
+        # The operands are picked before the control word is accepted,
+        # since a load holds the word while its own word is in flight.
+        if s.recv_opt.msg.fu_in[0] != FuInType( 0 ):
+          in0 = s.recv_opt.msg.fu_in[0] - FuInType( 1 )
+        if s.recv_opt.msg.fu_in[1] != FuInType( 0 ):
+          in1 = s.recv_opt.msg.fu_in[1] - FuInType( 1 )
+        if s.recv_opt.msg.ctrl == OPT_LD:
+          addr  = AddrType( s.recv_in[in0].msg.payload )
+          pred  = s.recv_in[in0].msg.predicate
+          issue = b1( 0 )
+          if s.recv_in_count[in0] != CountType( 0 ):
+            issue = b1( 1 )
+        else:
+          addr  = AddrType( s.recv_const.msg.payload )
+          # Const's predicate will always be true.
+          pred  = b1( 1 )
+          issue = b1( 1 )
+        # The word of the youngest queued store to the address, if any.
+        s.ld_msg = DataType( PayloadType( 0 ), pred, BypassType( 0 ) )
+        for i in range( lsq_depth ):
+          if ( LsqCountType( i ) < s.st_count ) & \
+             ( s.st_queue_addr[i] == addr ):
+            s.ld_fwd = b1( 1 )
+            s.ld_msg = DataType( s.st_queue_word[i].payload, pred,
+                                 s.st_queue_word[i].bypass )
+        # No new request while a load is in flight.
+        ready = ~s.ld_pending & ( s.ld_fwd | s.to_mem_raddr.rdy )
+        if s.recv_opt.msg.ctrl == OPT_LD:
+          s.recv_in[in0].rdy = ready
+          s.recv_in[in1].rdy = ready
+          s.ld_push          = s.recv_in[in0].en
+        else:
+          for i in range( num_inports):
+            s.recv_in[i].rdy = b1( 0 )
+          # The constant is always there; a stalled tile does not take
+          # it (see TileRTL), the request does not wait for that.
+          s.recv_const.rdy   = ready
+          s.ld_push          = ready
+        s.to_mem_raddr.msg = addr
+        s.to_mem_raddr.en  = s.ld_push & ~s.ld_fwd
+
+        # The new load takes the word read in this cycle (single-cycle
+        # memory).
+        if s.ld_push:
+          s.ld_next_word = DataType( s.ld_msg.payload, s.ld_msg.predicate,
+                                     s.ld_msg.bypass )
+          s.ld_next_back = s.ld_fwd
+          if s.from_mem_rdata.en:
+            s.ld_next_word.payload = s.from_mem_rdata.msg.payload
+            s.ld_next_word.bypass  = s.from_mem_rdata.msg.bypass
+            s.ld_next_back         = b1( 1 )
+
+        # The load sends out its own word once it is back, and holds its
+        # control word until then. It is copied, the predicate written
+        # below must not change the load in flight.
+        s.send_out[0].msg = DataType( s.ld_next_word.payload,
+                                      s.ld_next_word.predicate,
+                                      s.ld_next_word.bypass )
+        done = ( s.ld_pending | s.ld_push ) & s.ld_next_back
+        if ( issue & ~ready & ~s.ld_pending ) | \
+           ( ( s.ld_pending | s.ld_push ) & ~s.ld_next_back ):
+          s.recv_opt.rdy = b1( 0 )
+          s.opt_hold     = b1( 1 )
+        s.send_out[0].en  = s.recv_opt.en & done
+        s.ld_sent         = s.send_out[0].en
+
+      elif s.recv_opt.msg.ctrl == OPT_STR:
+        room = b1( 0 )
+        if s.st_count != LsqCountType( lsq_depth ):
+          room = b1( 1 )
+        s.recv_in[in0].rdy = room
+        s.recv_in[in1].rdy = room
+        s.st_addr = AddrType( s.recv_in[in0].msg.payload )
+        s.st_msg  = s.recv_in[in1].msg
+        if s.recv_opt.en and ( s.recv_in_count[in0] == CountType( 0 ) or\
+                               s.recv_in_count[in1] == CountType( 0 ) ):
+          s.recv_in[in0].rdy = b1( 0 )
+          s.recv_in[in1].rdy = b1( 0 )
+        valid = s.recv_in[in0].en & s.recv_in[in1].en
+        if ~room & ( s.recv_in_count[in0] != CountType( 0 ) ) & \
+                   ( s.recv_in_count[in1] != CountType( 0 ) ):
+          s.recv_opt.rdy = b1( 0 )
+          s.opt_hold     = b1( 1 )
+        # Straight to the memory if no store is queued before.
+        if s.st_count == LsqCountType( 0 ):
+          s.to_mem_waddr.msg = s.st_addr
+          s.to_mem_wdata.msg = s.st_msg
+          s.to_mem_waddr.en  = valid
+          s.to_mem_wdata.en  = valid
+          s.st_push = valid & ~( s.to_mem_waddr.rdy & s.to_mem_wdata.rdy )
+        else:
+          s.st_push = valid
+        if s.st_push:
+          s.st_next_addr[ s.st_count ] = s.st_addr
+          s.st_next_word[ s.st_count ] = s.st_msg
+        s.send_out[0].en   = b1( 0 )
+
+      else:
+        for j in range( num_outports ):
+          s.send_out[j].en = b1( 0 )
+
+      s.st_pop = ( s.st_count != LsqCountType( 0 ) ) & \
+                 s.to_mem_waddr.rdy & s.to_mem_wdata.rdy
+
+      if s.recv_opt.msg.predicate == b1( 1 ):
+        s.send_out[0].msg.predicate = s.send_out[0].msg.predicate and\
+                                      s.recv_predicate.msg.predicate
+
+    # The oldest store leaves by shifting the queue.
+    @s.update_ff
+    def update_queue():
+      s.ld_word <<= s.ld_next_word
+      s.ld_back <<= s.ld_next_back
+      if s.reset:
+        s.ld_pending <<= b1( 0 )
+        s.st_count   <<= LsqCountType( 0 )
+      else:
+        if s.ld_sent:
+          s.ld_pending <<= b1( 0 )
+        elif s.ld_push:
+          s.ld_pending <<= b1( 1 )
+        for i in range( lsq_depth ):
+          if s.st_pop:
+            s.st_queue_addr[i] <<= s.st_next_addr[i+1]
+            s.st_queue_word[i] <<= s.st_next_word[i+1]
+          else:
+            s.st_queue_addr[i] <<= s.st_next_addr[i]
+            s.st_queue_word[i] <<= s.st_next_word[i]
+        if s.st_push & ~s.st_pop:
+          s.st_count <<= s.st_count + LsqCountType( 1 )
+        elif ~s.st_push & s.st_pop:
+          s.st_count <<= s.st_count - LsqCountType( 1 )
+
+  def line_trace( s ):
+    opt_str = " #"
+    if s.recv_opt.en:
+      opt_str = OPT_SYMBOL_DICT[s.recv_opt.msg.ctrl]
+    out_str = ",".join([str(x.msg) for x in s.send_out])
+    recv_str = ",".join([str(x.msg) for x in s.recv_in])
+    return f'[recv: {recv_str}] {opt_str}(P{s.recv_opt.msg.predicate}) (const: {s.recv_const.msg}) ] = [out: {out_str}] (lsq: {s.ld_pending}/{s.st_count}, send[0].en: {s.send_out[0].en}) '
+
+def mk_mem_unit_lsq( lsq_depth ):
+  # A MemUnitLsqRTL of the given depth with the constructor of the other
+  # FUs, for FuList.
+  class MemUnitLsq( MemUnitLsqRTL ):
+    def construct( s, DataType, PredicateType, CtrlType,
+                   num_inports, num_outports, data_mem_size ):
+      super().construct( DataType, PredicateType, CtrlType, num_inports,
+                         num_outports, data_mem_size, lsq_depth )
+  return MemUnitLsq
@@ -40,6 +40,10 @@ class MemUnitRTL( Component ):
     s.to_mem_waddr   = SendIfcRTL( AddrType )
     s.to_mem_wdata   = SendIfcRTL( DataType )
 
+    # The control word is held, with the tile, by a request the data
+    # memory does not take (e.g., a bank conflict in BankedDataMemRTL).
+    s.opt_hold       = OutPort( b1 )
+
     @s.update
     def comb_logic():
 
@@ -50,6 +54,7 @@ class MemUnitRTL( Component ):
         s.recv_in[i].rdy = b1( 0 )
 
       s.recv_predicate.rdy = b1( 0 )
+      s.opt_hold           = b1( 0 )
 
       if s.recv_opt.en:
         if s.recv_opt.msg.fu_in[0] != FuInType( 0 ):
@@ -72,7 +77,11 @@ class MemUnitRTL( Component ):
           s.send_out[j].en = s.recv_in[i].en or s.send_out[j].en
         s.send_out[j].en = s.send_out[j].en and s.recv_opt.en
 
-      s.send_out[0].msg = s.from_mem_rdata.msg
+      # The word is copied into a new message, the predicate written
+      # below must not change the word held by the data memory.
+      s.send_out[0].msg = DataType( s.from_mem_rdata.msg.payload,
+                                    s.from_mem_rdata.msg.predicate,
+                                    s.from_mem_rdata.msg.bypass )
       s.to_mem_waddr.en = b1( 0 )
       s.to_mem_wdata.en = b1( 0 )
       if s.recv_opt.msg.ctrl == OPT_LD:
@@ -81,9 +90,20 @@ class MemUnitRTL( Component ):
         s.to_mem_raddr.msg   = AddrType( s.recv_in[in0].msg.payload )
         s.to_mem_raddr.en    = s.recv_in[in0].en
         s.from_mem_rdata.rdy = s.send_out[0].rdy
-        s.send_out[0].msg    = s.from_mem_rdata.msg
+        s.send_out[0].msg    = DataType( s.from_mem_rdata.msg.payload,
+                                         s.from_mem_rdata.msg.predicate,
+                                         s.from_mem_rdata.msg.bypass )
         s.send_out[0].en     = s.recv_opt.en
         s.send_out[0].msg.predicate = s.recv_in[in0].msg.predicate
+        # A load whose address is held back by the data memory (e.g., a
+        # bank conflict in BankedDataMemRTL) waits with its control word.
+        if s.recv_opt.msg.fu_in[0] != FuInType( 0 ):
+          in0 = s.recv_opt.msg.fu_in[0] - FuInType( 1 )
+          if ( s.recv_in_count[in0] != CountType( 0 ) ) & ~s.to_mem_raddr.rdy:
+            s.recv_in[in0].rdy = b1( 0 )
+            s.recv_opt.rdy     = b1( 0 )
+            s.send_out[0].en   = b1( 0 )
+            s.opt_hold         = b1( 1 )
 
       elif s.recv_opt.msg.ctrl == OPT_LD_CONST:
         for i in range( num_inports):
@@ -92,10 +112,16 @@ class MemUnitRTL( Component ):
         s.to_mem_raddr.msg   = AddrType( s.recv_const.msg.payload )
         s.to_mem_raddr.en    = s.recv_const.en
         s.from_mem_rdata.rdy = s.send_out[0].rdy
-        s.send_out[0].msg    = s.from_mem_rdata.msg
+        s.send_out[0].msg    = DataType( s.from_mem_rdata.msg.payload,
+                                         s.from_mem_rdata.msg.predicate,
+                                         s.from_mem_rdata.msg.bypass )
         s.send_out[0].en     = s.recv_opt.en
         # Const's predicate will always be true.
         s.send_out[0].msg.predicate = b1( 1 )
+        if ~s.to_mem_raddr.rdy:
+          s.recv_opt.rdy   = b1( 0 )
+          s.send_out[0].en = b1( 0 )
+          s.opt_hold       = b1( 1 )
 
       elif s.recv_opt.msg.ctrl == OPT_STR:
         s.send_out[0].en   = s.from_mem_rdata.en and s.recv_in[in0].en and s.recv_in[in1].en
@@ -106,7 +132,9 @@ class MemUnitRTL( Component ):
         s.to_mem_wdata.msg = s.recv_in[in1].msg
         s.to_mem_wdata.en  = s.recv_in[in1].en
         s.send_out[0].en   = b1( 0 )
-        s.send_out[0].msg  = s.from_mem_rdata.msg
+        s.send_out[0].msg  = DataType( s.from_mem_rdata.msg.payload,
+                                       s.from_mem_rdata.msg.predicate,
+                                       s.from_mem_rdata.msg.bypass )
         s.send_out[0].msg.predicate = s.recv_in[in0].msg.predicate and\
                                       s.recv_in[in1].msg.predicate
         if s.recv_opt.en and ( s.recv_in_count[in0] == CountType( 0 ) or\
@@ -114,6 +142,18 @@ class MemUnitRTL( Component ):
           s.recv_in[in0].rdy = b1( 0 )
           s.recv_in[in1].rdy = b1( 0 )
           s.send_out[0].msg.predicate = b1( 0 )
+        # So does a store whose address and word are not both taken.
+        if ( s.recv_opt.msg.fu_in[0] != FuInType( 0 ) ) & \
+           ( s.recv_opt.msg.fu_in[1] != FuInType( 0 ) ):
+          in0 = s.recv_opt.msg.fu_in[0] - FuInType( 1 )
+          in1 = s.recv_opt.msg.fu_in[1] - FuInType( 1 )
+          if ( s.recv_in_count[in0] != CountType( 0 ) ) & \
+             ( s.recv_in_count[in1] != CountType( 0 ) ) & \
+             ~( s.to_mem_waddr.rdy & s.to_mem_wdata.rdy ):
+            s.recv_in[in0].rdy = b1( 0 )
+            s.recv_in[in1].rdy = b1( 0 )
+            s.recv_opt.rdy     = b1( 0 )
+            s.opt_hold         = b1( 1 )
 
       else:
         for j in range( num_outports ):
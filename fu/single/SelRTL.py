@@ -40,6 +40,9 @@ class SelRTL( Component ):
     s.to_mem_waddr   = SendIfcRTL( AddrType )
     s.to_mem_wdata   = SendIfcRTL( DataType )
 
+    # Only a memory unit holds its control word, see MemUnitRTL.
+    s.opt_hold       = OutPort( b1 )
+
     @s.update
     def update_mem():
       s.to_mem_waddr.en    = b1( 0 )
@@ -48,6 +51,7 @@ class SelRTL( Component ):
       s.to_mem_waddr.msg   = AddrType( 0 )
       s.to_mem_raddr.msg   = AddrType( 0 )
       s.to_mem_raddr.en    = b1( 0 )
+      s.opt_hold           = b1( 0 )
       s.from_mem_rdata.rdy = b1( 0 )
 
     @s.update
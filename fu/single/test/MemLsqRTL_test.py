@@ -0,0 +1,58 @@
+"""
+==========================================================================
+MemLsqRTL_test.py
+==========================================================================
+Test cases for the memory unit with a load/store queue.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                          import *
+
+from ..MemUnitLsqRTL                 import MemUnitLsqRTL, mk_mem_unit_lsq
+from ....mem.data.DataMemCL          import DataMemCL
+from ....mem.data.PipelinedDataMemCL import mk_pipelined_data_mem
+from ....lib.opt_type                import *
+from ....lib.messages                import *
+from .MemRTL_test                    import TestHarness, run_sim
+
+def run_lsq( FU, DataUnit ):
+  DataType      = mk_data( 16, 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  ConfigType    = mk_ctrl()
+  data_mem_size = 8
+  num_inports   = 2
+  num_outports  = 1
+  FuInType      = mk_bits( clog2( num_inports + 1 ) )
+  pickRegister  = [ FuInType( x+1 ) for x in range( num_inports ) ]
+  # Address and data of each store, address (and an unused operand) of
+  # each load.
+  src_in0       = [ DataType(1, 1), DataType(1, 1), DataType(2, 1),
+                    DataType(2, 1), DataType(3, 1), DataType(1, 1) ]
+  src_in1       = [ DataType(9, 1), DataType(0, 1), DataType(7, 1),
+                    DataType(0, 1), DataType(0, 1), DataType(0, 1) ]
+  src_predicate = [ PredicateType(1, 0) ]
+  # Each load sends out its own word, whatever the latency of the
+  # memory: it waits with its control word until the word is back.
+  sink_out      = [ DataType(9, 1), DataType(7, 1), DataType(0, 1),
+                    DataType(9, 1) ]
+  src_opt       = [ ConfigType( OPT_STR, b1( 0 ), pickRegister ),
+                    ConfigType( OPT_LD,  b1( 0 ), pickRegister ),
+                    ConfigType( OPT_STR, b1( 0 ), pickRegister ),
+                    ConfigType( OPT_LD,  b1( 0 ), pickRegister ),
+                    ConfigType( OPT_LD,  b1( 0 ), pickRegister ),
+                    ConfigType( OPT_LD,  b1( 0 ), pickRegister ) ]
+  th = TestHarness( FU, DataUnit, DataType, PredicateType, ConfigType,
+                    num_inports, num_outports, data_mem_size,
+                    src_in0, src_in1, src_predicate, src_opt, sink_out )
+  run_sim( th )
+
+def test_single_cycle():
+  run_lsq( MemUnitLsqRTL, DataMemCL )
+
+def test_multi_cycle():
+  for latency in [ 1, 3 ]:
+    for depth in [ 1, 4 ]:
+      run_lsq( mk_mem_unit_lsq( depth ), mk_pipelined_data_mem( latency ) )
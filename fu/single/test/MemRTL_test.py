@@ -16,6 +16,7 @@ from pymtl3.stdlib.test.test_srcs import TestSrcRTL
 from ..MemUnitRTL                 import MemUnitRTL
 from ....mem.data.DataMemRTL      import DataMemRTL
 from ....mem.data.DataMemCL       import DataMemCL
+from ....mem.data.BankedDataMemRTL import BankedDataMemRTL
 from ....lib.opt_type             import *
 from ....lib.messages             import *
 
@@ -61,6 +62,96 @@ class TestHarness( Component ):
   def line_trace( s ):
     return s.dut.line_trace() + s.data_mem.line_trace()
 
+class ConflictTestHarness( Component ):
+
+  def construct( s, DataType, PredicateType, ConfigType, data_mem_size,
+                 src0_msgs, ctrl_msgs, sink_msgs ):
+
+    s.src_in0  = TestSrcRTL( DataType,   src0_msgs )
+    s.src_opt  = TestSrcRTL( ConfigType, ctrl_msgs )
+    s.sink_out = TestSinkCL( DataType,   sink_msgs )
+
+    s.dut = MemUnitRTL( DataType, PredicateType, ConfigType, 2, 1,
+                        data_mem_size )
+    s.data_mem = BankedDataMemRTL( DataType, data_mem_size, 2, 1,
+                                   [ DataType( i, 1 ) for i in
+                                     range( data_mem_size ) ], 2 )
+
+    # Read port 1 keeps reading word 0, so the loads of the even words
+    # through port 0 conflict with it every other cycle.
+    s.data_mem.recv_raddr[1].en  //= 1
+    s.data_mem.recv_raddr[1].msg //= 0
+    s.data_mem.send_rdata[1].rdy //= 1
+
+    for i in range( 2 ):
+      s.dut.recv_in_count[i] //= 1
+    s.dut.recv_in[1].en        //= 0
+    s.dut.recv_in[1].msg       //= DataType( 0, 0 )
+    s.dut.recv_predicate.en    //= 0
+    s.dut.recv_predicate.msg   //= PredicateType( 0, 0 )
+    s.dut.recv_const.en        //= 0
+    s.dut.recv_const.msg       //= DataType( 0, 0 )
+
+    connect( s.dut.to_mem_raddr,   s.data_mem.recv_raddr[0] )
+    connect( s.dut.from_mem_rdata, s.data_mem.send_rdata[0] )
+    connect( s.dut.to_mem_waddr,   s.data_mem.recv_waddr[0] )
+    connect( s.dut.to_mem_wdata,   s.data_mem.recv_wdata[0] )
+
+    connect( s.src_in0.send,       s.dut.recv_in[0]     )
+    connect( s.src_opt.send,       s.dut.recv_opt       )
+    connect( s.dut.send_out[0],    s.sink_out.recv      )
+
+  def done( s ):
+    return s.src_in0.done() and s.src_opt.done() and s.sink_out.done()
+
+  def line_trace( s ):
+    return s.dut.line_trace() + s.data_mem.line_trace()
+
+class StoreConflictTestHarness( Component ):
+
+  def construct( s, DataType, PredicateType, ConfigType, data_mem_size,
+                 src0_msgs, src1_msgs, ctrl_msgs ):
+
+    s.src_in0 = TestSrcRTL( DataType,   src0_msgs )
+    s.src_in1 = TestSrcRTL( DataType,   src1_msgs )
+    s.src_opt = TestSrcRTL( ConfigType, ctrl_msgs )
+
+    s.dut = MemUnitRTL( DataType, PredicateType, ConfigType, 2, 1,
+                        data_mem_size )
+    s.data_mem = BankedDataMemRTL( DataType, data_mem_size, 1, 2,
+                                   [ DataType( i, 1 ) for i in
+                                     range( data_mem_size ) ], 2 )
+
+    # Write port 1 keeps writing word 0, so the stores to the even words
+    # through port 0 conflict with it every other cycle.
+    s.data_mem.recv_waddr[1].en  //= 1
+    s.data_mem.recv_waddr[1].msg //= 0
+    s.data_mem.recv_wdata[1].en  //= 1
+    s.data_mem.recv_wdata[1].msg //= DataType( 0, 1 )
+
+    for i in range( 2 ):
+      s.dut.recv_in_count[i] //= 1
+    s.dut.recv_predicate.en    //= 0
+    s.dut.recv_predicate.msg   //= PredicateType( 0, 0 )
+    s.dut.recv_const.en        //= 0
+    s.dut.recv_const.msg       //= DataType( 0, 0 )
+    s.dut.send_out[0].rdy      //= 1
+
+    connect( s.dut.to_mem_raddr,   s.data_mem.recv_raddr[0] )
+    connect( s.dut.from_mem_rdata, s.data_mem.send_rdata[0] )
+    connect( s.dut.to_mem_waddr,   s.data_mem.recv_waddr[0] )
+    connect( s.dut.to_mem_wdata,   s.data_mem.recv_wdata[0] )
+
+    connect( s.src_in0.send,       s.dut.recv_in[0]     )
+    connect( s.src_in1.send,       s.dut.recv_in[1]     )
+    connect( s.src_opt.send,       s.dut.recv_opt       )
+
+  def done( s ):
+    return s.src_in0.done() and s.src_in1.done() and s.src_opt.done()
+
+  def line_trace( s ):
+    return s.dut.line_trace() + s.data_mem.line_trace()
+
 def run_sim( test_harness, max_cycles=100 ):
   test_harness.elaborate()
   test_harness.apply( SimulationPass() )
@@ -132,3 +223,43 @@ def test_PseudoMem():
                     src_predicate, src_opt, sink_out )
   run_sim( th )
 
+
+def test_bank_conflict():
+  # A load held back by a bank conflict waits with its control word, and
+  # each word is delivered once.
+  DataType      = mk_data( 16, 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  ConfigType    = mk_ctrl()
+  data_mem_size = 8
+  FuInType      = mk_bits( clog2( 2 + 1 ) )
+  pickRegister  = [ FuInType( x+1 ) for x in range( 2 ) ]
+  src_in0       = [ DataType( 2, 1 ), DataType( 3, 1 ), DataType( 4, 1 ),
+                    DataType( 6, 1 ) ]
+  sink_out      = [ DataType( 2, 1 ), DataType( 3, 1 ), DataType( 4, 1 ),
+                    DataType( 6, 1 ) ]
+  src_opt       = [ ConfigType( OPT_LD, b1( 0 ), pickRegister )
+                    for _ in range( 4 ) ]
+  th = ConflictTestHarness( DataType, PredicateType, ConfigType,
+                            data_mem_size, src_in0, src_opt, sink_out )
+  run_sim( th )
+
+def test_store_bank_conflict():
+  # A store held back by a bank conflict waits with its control word, and
+  # each word is written.
+  DataType      = mk_data( 16, 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  ConfigType    = mk_ctrl()
+  data_mem_size = 8
+  FuInType      = mk_bits( clog2( 2 + 1 ) )
+  pickRegister  = [ FuInType( x+1 ) for x in range( 2 ) ]
+  src_in0       = [ DataType( 2, 1 ), DataType( 3, 1 ), DataType( 4, 1 ),
+                    DataType( 6, 1 ) ]
+  src_in1       = [ DataType( 12, 1 ), DataType( 13, 1 ), DataType( 14, 1 ),
+                    DataType( 16, 1 ) ]
+  src_opt       = [ ConfigType( OPT_STR, b1( 0 ), pickRegister )
+                    for _ in range( 4 ) ]
+  th = StoreConflictTestHarness( DataType, PredicateType, ConfigType,
+                                 data_mem_size, src_in0, src_in1, src_opt )
+  run_sim( th )
+  for addr in [ 2, 3, 4, 6 ]:
+    assert th.data_mem.get_word( addr ) == DataType( addr + 10, 1 )
@@ -17,7 +17,8 @@ from ..CompRTL                      import CompRTL
 from ....lib.opt_type               import *
 from ....lib.messages               import *
 
-from pymtl3.passes.backends.verilog import TranslationPass, VerilatorImportPass, TranslationImportPass
+from pymtl3.passes.backends.verilog import TranslationPass, VerilatorImportPass
+from ....lib.verilator_cache        import CachedTranslationImportPass
 from pymtl3.passes.PassGroups       import *
 
 #-------------------------------------------------------------------------
@@ -60,7 +61,7 @@ def run_sim( test_harness, max_cycles=10 ):
 #  test_harness.apply( TranslationPass() )
 #  test_harness = VerilatorImportPass()( test_harness )
   test_harness.dut.config_verilog_import = VerilatorImportConfigs(vl_Wno_list = ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT', 'ALWCOMBORDER'])
-  test_harness = TranslationImportPass()(test_harness)
+  test_harness = CachedTranslationImportPass()(test_harness)
   test_harness.apply( SimulationPass() )
   test_harness.sim_reset()
 
@@ -0,0 +1,43 @@
+"""
+==========================================================================
+bits_helper.py
+==========================================================================
+Helpers to set the signal values of an elaborated model between two
+ticks (e.g., to reload the memories or restore a snapshot). The values
+are copied instead of modified in place, since the simulator lets the
+connected signals share one value object.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3.datatypes import is_bitstruct_inst
+
+def clone_bits( x ):
+  # A copy of a Bits value of the same class (copy.deepcopy turns a
+  # Bits1 into a plain Bits that can not be used with <<=), with the
+  # attributes the simulator adds, e.g., _next for <<=.
+  y = object.__new__( type( x ) )
+  y.nbits = x.nbits
+  y.value = x.value
+  if hasattr( x, '__dict__' ):
+    y.__dict__.update( x.__dict__ )
+  return y
+
+def replace_bits( old, value ):
+  # A copy of the signal value old holding value, to set a register or
+  # wire of an elaborated model between two ticks without touching the
+  # signals that share the old value. The value of the next cycle is
+  # set as well, so that a register the model does not write in the
+  # next tick keeps value.
+  if is_bitstruct_inst( old ):
+    new = value.clone()
+    if hasattr( old, '_next' ):
+      new._next = value.clone()
+    return new
+  new = clone_bits( old )
+  new.value = int( value ) & ( ( 1 << new.nbits ) - 1 )
+  if hasattr( new, '_next' ):
+    new._next = new.value
+  return new
@@ -0,0 +1,153 @@
+"""
+==========================================================================
+bitstream.py
+==========================================================================
+Packed binary format for the control signals of a CGRA. Every control
+word keeps the bit layout of mk_ctrl (ctrl in the most significant bits,
+followed by predicate, fu_in, outport and predicate_in), padded to whole
+bytes and stored little-endian, II words per tile with the tiles in the
+same order as CGRACtrl (row by row from y = 0).
+
+The header is
+
+  magic ( b'CGBS' ), version, width, height, II, num_fu_in,
+  num_inports, num_outports, bytes per word
+
+and the words follow it. A bitstream is encoded once from the JSON read
+by CGRACtrl and then loaded through mmap without parsing anything.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3       import *
+from .messages    import *
+from .ctrl_helper import *
+
+import mmap
+import struct
+
+magic        = b'CGBS'
+version      = 1
+header_fmt   = '<4sHHHHBBBB'
+header_size  = struct.calcsize( header_fmt )
+
+ctrl_nbits = 6
+
+def mk_layout( num_fu_in, num_inports, num_outports ):
+  # ( field name, number of entries, bits per entry ) from the most
+  # significant field down, as in mk_ctrl. The first entry of a list
+  # field takes its least significant bits.
+  return [ ( 'ctrl',         None,         ctrl_nbits ),
+           ( 'predicate',    None,         1 ),
+           ( 'fu_in',        num_fu_in,    clog2( num_fu_in + 1 ) ),
+           ( 'outport',      num_outports, clog2( num_inports + 1 ) ),
+           ( 'predicate_in', num_inports,  1 ) ]
+
+def get_word_nbits( layout ):
+  return sum( [ nbits * ( 1 if num == None else num )
+                for _, num, nbits in layout ] )
+
+def pack_ctrl( ctrl, layout ):
+  word = 0
+  for name, num, nbits in layout:
+    field = getattr( ctrl, name )
+    if num == None:
+      word = ( word << nbits ) | int( field )
+      continue
+    # CGRACtrl leaves predicate_in empty when the JSON does not set it.
+    for i in reversed( range( num ) ):
+      word = ( word << nbits ) | ( int( field[i] ) if i < len( field ) else 0 )
+  return word
+
+def unpack_ctrl( word, CtrlType, layout ):
+  values = []
+  shift  = get_word_nbits( layout )
+  for name, num, nbits in layout:
+    FieldType = mk_bits( nbits )
+    mask      = ( 1 << nbits ) - 1
+    if num == None:
+      shift -= nbits
+      values.append( FieldType( ( word >> shift ) & mask ) )
+      continue
+    entries = []
+    for i in range( num ):
+      shift -= nbits
+      entries.insert( 0, FieldType( ( word >> shift ) & mask ) )
+    values.append( entries )
+  return CtrlType( *values )
+
+#-------------------------------------------------------------------------
+# Encoder
+#-------------------------------------------------------------------------
+
+def encode_json( json_file_name, bitstream_file_name, width, height,
+                 num_fu_in, num_inports, num_outports, II ):
+  # The JSON goes through CGRACtrl, so that the bitstream holds exactly
+  # the control signals CGRACtrl would load.
+  CtrlType  = mk_ctrl( num_fu_in, num_inports, num_outports )
+  RouteType = mk_bits( clog2( num_inports + 1 ) )
+  cgra_ctrl = CGRACtrl( json_file_name, CtrlType, RouteType, width, height,
+                        num_fu_in, num_inports, num_outports, II )
+  write_bitstream( bitstream_file_name, cgra_ctrl.get_ctrl(), width, height,
+                   num_fu_in, num_inports, num_outports )
+
+def write_bitstream( bitstream_file_name, src_opt, width, height, num_fu_in,
+                     num_inports, num_outports ):
+  # src_opt has one list of CtrlType per tile, as returned by
+  # CGRACtrl.get_ctrl().
+  layout     = mk_layout( num_fu_in, num_inports, num_outports )
+  word_bytes = ( get_word_nbits( layout ) + 7 ) // 8
+  II         = len( src_opt[0] )
+  with open( bitstream_file_name, 'wb' ) as f:
+    f.write( struct.pack( header_fmt, magic, version, width, height, II,
+                          num_fu_in, num_inports, num_outports, word_bytes ) )
+    for ctrls in src_opt:
+      assert len( ctrls ) == II
+      for ctrl in ctrls:
+        f.write( pack_ctrl( ctrl, layout ).to_bytes( word_bytes, 'little' ) )
+
+#-------------------------------------------------------------------------
+# Loader
+#-------------------------------------------------------------------------
+
+class Bitstream:
+
+  def __init__( s, bitstream_file_name ):
+    with open( bitstream_file_name, 'rb' ) as f:
+      s.buf = mmap.mmap( f.fileno(), 0, access = mmap.ACCESS_READ )
+    ( tag, ver, s.width, s.height, s.II, s.num_fu_in, s.num_inports,
+      s.num_outports, s.word_bytes ) = struct.unpack_from( header_fmt, s.buf )
+    if tag != magic or ver != version:
+      raise Exception( f"{bitstream_file_name} is not a CGRA bitstream!" )
+    s.num_tiles = s.width * s.height
+    s.layout    = mk_layout( s.num_fu_in, s.num_inports, s.num_outports )
+    s.CtrlType  = mk_ctrl( s.num_fu_in, s.num_inports, s.num_outports )
+    if len( s.buf ) != header_size + s.num_tiles * s.II * s.word_bytes:
+      raise Exception( f"{bitstream_file_name} is truncated!" )
+
+  def close( s ):
+    s.buf.close()
+
+  def get_words( s, tile_id ):
+    # The raw control words of a tile.
+    base = header_size + tile_id * s.II * s.word_bytes
+    return [ int.from_bytes( s.buf[ base + i * s.word_bytes :
+                                    base + ( i + 1 ) * s.word_bytes ],
+                             'little' )
+             for i in range( s.II ) ]
+
+  def get_ctrl( s ):
+    # Same as CGRACtrl.get_ctrl(), ready for recv_wopt.
+    return [ [ unpack_ctrl( word, s.CtrlType, s.layout )
+               for word in s.get_words( tile_id ) ]
+             for tile_id in range( s.num_tiles ) ]
+
+  def get_waddr( s, ctrl_mem_size = None ):
+    # The write addresses for recv_waddr, the II words go to the first
+    # entries of the control memory.
+    AddrType = mk_bits( clog2( s.II if ctrl_mem_size == None
+                               else ctrl_mem_size ) )
+    return [ [ AddrType( i ) for i in range( s.II ) ]
+             for _ in range( s.num_tiles ) ]
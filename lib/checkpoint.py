@@ -0,0 +1,108 @@
+"""
+==========================================================================
+checkpoint.py
+==========================================================================
+Checkpoints of a simulated CGRA. A checkpoint is a copy of the whole
+state of an elaborated model taken between two ticks: the registers and
+wires of every component (including the rdy signals that the RTL keeps
+high once set) and the Python state of the CL models. It works for
+CGRARTL and CGRACL, with TileCL or TileNativeCL, or any harness around
+them. Restoring a checkpoint puts the same simulator back to that
+point, so the setup (reset, loading the configuration through recv_wopt,
+running the prologue) is simulated once and every experiment starts
+from the checkpoint:
+
+  th.sim_reset()
+  ...                             # warm-up
+  ckpt = save_checkpoint( th )
+  for experiment in experiments:
+    restore_checkpoint( ckpt )
+    ...
+
+The PyMTL simulator can not be written to disk (see sim_cache.py), so a
+checkpoint lives in the process. get_state() gives a plain view of the
+architectural state (control memory pointers, channel and predicate
+register contents, const cursors, branch flags and data memory) to
+compare or store checkpoints.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from .sim_cache import snapshot, restore
+
+class Checkpoint:
+
+  def __init__( s, top ):
+    s.top  = top
+    s.snap = snapshot( top )
+
+def save_checkpoint( top ):
+  return Checkpoint( top )
+
+def restore_checkpoint( ckpt ):
+  # The snapshot is copied again, so a checkpoint can be restored any
+  # number of times.
+  restore( ckpt.snap )
+  return ckpt.top
+
+#-------------------------------------------------------------------------
+# Architectural state
+#-------------------------------------------------------------------------
+
+def get_msg( msg ):
+  return tuple( int( getattr( msg, name ) )
+                for name in type( msg ).__bitstruct_fields__ )
+
+def get_queue( queue ):
+  # The messages in a NativeQueue or a NormalQueueRTL, oldest first.
+  if hasattr( queue, 'entries' ):
+    entries, head, count = queue.entries, queue.head, queue.count
+  else:
+    entries = queue.dpath.queue.regs
+    head    = int( queue.ctrl.head )
+    count   = int( queue.ctrl.count )
+  return [ get_msg( entries[ ( head + i ) % len( entries ) ] )
+           for i in range( count ) ]
+
+def get_tile_state( tile ):
+  if hasattr( tile, 'ctrl_cur' ): # TileNativeCL
+    return { 'ctrl_cur'   : tile.ctrl_cur,
+             'ctrl_times' : tile.ctrl_times,
+             'channel'    : [ get_queue( x ) for x in tile.channel ],
+             'predicate'  : get_queue( tile.reg_predicate ),
+             'const_cur'  : tile.const_cur,
+             'first'      : [ tile.first ] }
+
+  ctrl_mem = tile.ctrl_mem
+  if hasattr( ctrl_mem, 'raddr' ): # CtrlMemShadowRTL
+    ctrl_cur = int( ctrl_mem.raddr )
+  elif hasattr( ctrl_mem, 'reg_file' ): # CtrlMemRTL
+    ctrl_cur = int( ctrl_mem.reg_file.raddr[0] )
+  else:
+    ctrl_cur = int( ctrl_mem.cur )
+  element = tile.element
+  if hasattr( element, 'fu' ): # FlexibleFuRTL
+    first = [ int( x.first ) for x in element.fu if hasattr( x, 'first' ) ]
+  else:
+    first = [ int( element.first ) ]
+  return { 'ctrl_cur'   : ctrl_cur,
+           'ctrl_times' : int( ctrl_mem.times ),
+           'channel'    : [ get_queue( x.queues[-1] ) for x in tile.channel ],
+           'predicate'  : get_queue( tile.reg_predicate.queues[-1] ),
+           'const_cur'  : int( tile.const_queue.cur ),
+           'first'      : first }
+
+def get_state( cgra ):
+  data_mem = cgra.data_mem
+  if hasattr( data_mem, 'arrays' ): # NumpyDataMemCL
+    data = list( zip( *[ x.tolist() for x in data_mem.arrays ] ) )
+  elif hasattr( data_mem, 'sram' ): # DataMemCL
+    data = [ get_msg( x ) for x in data_mem.sram ]
+  else: # DataMemRTL, BankedDataMemRTL
+    # get_word() gives the words still served from preloadData as well.
+    data = [ get_msg( data_mem.get_word( i ) )
+             for i in range( data_mem.data_mem_size ) ]
+  return { 'tiles'    : [ get_tile_state( x ) for x in cgra.tile ],
+           'data_mem' : data }
@@ -68,7 +68,7 @@ class CGRACtrl:
     with open( json_file_name ) as json_file:
       ctrls = json.load( json_file )
       for ctrl in ctrls:
-        tile  = get_tile( ctrl['x'], ctrl['y'], s.tiles )
+        tile  = s.tiles[ ctrl['y'] * width + ctrl['x'] ]
         reg = None
         reg = [ FuInType( 0 ) for x in range( num_fu_in ) ]
         if ctrl['opt'] != "OPT_NAH":
@@ -115,3 +115,85 @@ class CGRACtrl:
 def wrap_ctrl_signals(CtrlType, raw_ctrls):
   pass
 
+#-------------------------------------------------------------------------
+# Multicast configuration
+#-------------------------------------------------------------------------
+
+def get_ctrl_key( ctrl ):
+  # The fields of a control word as a tuple, to compare words.
+  key = []
+  for name in type( ctrl ).__bitstruct_fields__:
+    value = getattr( ctrl, name )
+    if isinstance( value, list ):
+      key.append( tuple( int( x ) for x in value ) )
+    else:
+      key.append( int( value ) )
+  return tuple( key )
+
+def mk_multicast_ctrl( src_opt, ctrl_waddr, num_tiles = None,
+                       num_ports = 1 ):
+  # Turns the programs of the tiles (src_opt[i] written at ctrl_waddr[i])
+  # into the messages of a ConfigNetworkRTL with num_ports ports: the
+  # same word written at the same address of several tiles becomes a
+  # single message whose mask holds these tiles. Returns the addresses,
+  # words and masks sent on each port, one message per port and cycle.
+  #
+  # The messages of a cycle write disjoint sets of tiles. The network
+  # holds the words at address 0 and writes them all in the cycle the
+  # last one arrives, which starts the tiles together, so they are sent
+  # after all the other words. Every tile needs a word 0. A port with
+  # nothing to send in a cycle sends an empty mask.
+  if num_tiles == None:
+    num_tiles = len( src_opt )
+  MaskType = mk_bits( num_tiles )
+  msgs = {} # ( address, word ) -> [ address, word, mask ]
+  for i in range( len( src_opt ) ):
+    for waddr, ctrl in zip( ctrl_waddr[i], src_opt[i] ):
+      key = ( int( waddr ), get_ctrl_key( ctrl ) )
+      if key not in msgs:
+        msgs[ key ] = [ waddr, ctrl, 0 ]
+      msgs[ key ][2] |= 1 << i
+  msgs   = list( msgs.values() )
+  starts  = [ x for x in msgs if int( x[0] ) == 0 ]
+  started = 0
+  for x in starts:
+    started |= x[2]
+  missing = [ i for i in range( num_tiles ) if not started >> i & 1 ]
+  if missing:
+    raise Exception( f"Every tile needs a word at address 0, tiles "
+                     f"{missing} have none!" )
+
+  def pack( rest ):
+    # Greedy packing, the messages writing the most tiles first.
+    rest   = sorted( rest, key = lambda x: ( -bin( x[2] ).count( '1' ),
+                                             -int( x[0] ) ) )
+    rounds = []
+    while len( rest ) > 0:
+      taken, used, left = [], 0, []
+      for x in rest:
+        if len( taken ) < num_ports and x[2] & used == 0:
+          taken.append( x )
+          used |= x[2]
+        else:
+          left.append( x )
+      rounds.append( taken )
+      rest = left
+    return rounds
+
+  rounds = pack( [ x for x in msgs if int( x[0] ) != 0 ] ) + pack( starts )
+
+  AddrType = type( msgs[0][0] )
+  CtrlType = type( msgs[0][1] )
+  waddrs   = [ [] for _ in range( num_ports ) ]
+  opts     = [ [] for _ in range( num_ports ) ]
+  masks    = [ [] for _ in range( num_ports ) ]
+  for taken in rounds:
+    for p in range( num_ports ):
+      if p < len( taken ):
+        waddr, ctrl, mask = taken[p]
+      else:
+        waddr, ctrl, mask = AddrType( 0 ), CtrlType( 0 ), 0
+      waddrs[p].append( waddr )
+      opts[p].append( ctrl )
+      masks[p].append( MaskType( mask ) )
+  return waddrs, opts, masks
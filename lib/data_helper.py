@@ -0,0 +1,74 @@
+"""
+==========================================================================
+data_helper.py
+==========================================================================
+Bulk transfers between the data memories and NumPy arrays. A memory
+image is a pair of parallel arrays, the payloads and the predicates of
+the words (the predicates default to 1, i.e., valid data). The data
+memories (and the CGRA tops) provide
+
+  load_array( payload, predicate = None, base = 0 )
+  dump_array( base = 0, size = None ) -> ( payload, predicate )
+
+and load_npy()/dump_npy() below go through .npy files. An input file
+is memory-mapped and converted a chunk at a time, so only a chunk of
+messages exists at once (NumpyDataMemCL copies the arrays without
+building any message).
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+import numpy as np
+
+chunk_size = 4096
+
+def get_field_dtype( nbits ):
+  for dtype in [ np.uint8, np.uint16, np.uint32, np.uint64 ]:
+    if nbits <= np.dtype( dtype ).itemsize * 8:
+      return dtype
+  return object
+
+def get_predicate( payload, predicate ):
+  if predicate is None:
+    return np.ones( len( payload ), dtype = np.uint8 )
+  assert len( predicate ) == len( payload )
+  return predicate
+
+def iter_msgs( DataType, payload, predicate = None ):
+  # Yields ( offset, messages ) a chunk at a time.
+  predicate = get_predicate( payload, predicate )
+  for start in range( 0, len( payload ), chunk_size ):
+    end = start + chunk_size
+    yield start, [ DataType( p, q ) for p, q in
+                   zip( payload[ start : end ].tolist(),
+                        predicate[ start : end ].tolist() ) ]
+
+def msgs_to_array( DataType, msgs ):
+  fields    = DataType.__bitstruct_fields__
+  payload   = np.fromiter( ( int( x.payload ) for x in msgs ),
+                           get_field_dtype( fields['payload'].nbits ),
+                           len( msgs ) )
+  predicate = np.fromiter( ( int( x.predicate ) for x in msgs ),
+                           get_field_dtype( fields['predicate'].nbits ),
+                           len( msgs ) )
+  return payload, predicate
+
+#-------------------------------------------------------------------------
+# Files
+#-------------------------------------------------------------------------
+
+def load_npy( data_mem, payload_file, predicate_file = None, base = 0 ):
+  # data_mem is a data memory or a CGRA.
+  payload   = np.load( payload_file, mmap_mode = 'r' )
+  predicate = None
+  if predicate_file != None:
+    predicate = np.load( predicate_file, mmap_mode = 'r' )
+  data_mem.load_array( payload, predicate, base )
+
+def dump_npy( data_mem, payload_file, predicate_file, base = 0,
+              size = None ):
+  payload, predicate = data_mem.dump_array( base, size )
+  np.save( payload_file, payload )
+  np.save( predicate_file, predicate )
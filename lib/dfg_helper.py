@@ -70,6 +70,9 @@ class Node:
     s.input_predicate = predicate
 
 def get_node( node_id, nodes ):
+  # nodes can also be the node_index of a DFG.
+  if isinstance( nodes, dict ):
+    return nodes.get( node_id )
   for node in nodes:
     if node.id == node_id:
       return node
@@ -79,6 +82,11 @@ class DFG:
 
   def __init__( s, json_file_name, const_list, data_spm ):
     s.nodes       = []
+    # Nodes indexed by id, and the ids of the predecessors (data and
+    # predicate inputs) and successors of each node.
+    s.node_index   = {}
+    s.predecessors = {}
+    s.successors   = {}
     s.num_const   = 0
     s.num_input   = 0
 #    s.num_output  = 0
@@ -98,10 +106,11 @@ class DFG:
                      dfg[i]['in_predicate'],
                      dfg[i]['out'] )
         s.nodes.append( node )
+        s.node_index.setdefault( node.id, node )
         max_layer = -1
         print("cur_node: ", node.id, " pre: ", (node.input_node+node.input_predicate_node))
         for input_node in (node.input_node+node.input_predicate_node):
-          pre_node = get_node( input_node, s.nodes )
+          pre_node = s.get_node( input_node )
           if( pre_node != None ):
             if pre_node.layer > max_layer:
               max_layer = pre_node.layer
@@ -115,11 +124,28 @@ class DFG:
         if 'live_out_val' in dfg[i].keys():
           node.live_out_val = 1
 
+    for node in s.nodes:
+      s.predecessors[ node.id ] = []
+      s.successors  [ node.id ] = []
+    for node in s.nodes:
+      for node_id in (node.input_node+node.input_predicate_node):
+        if node_id not in s.predecessors[ node.id ]:
+          s.predecessors[ node.id ].append( node_id )
+      for array in node.output_node:
+        for node_id in array:
+          if node_id not in s.successors[ node.id ]:
+            s.successors[ node.id ].append( node_id )
+
+    # The layer of a node only accounts for the predecessors listed
+    # before it (the others are loop-carried), so sorting by layer gives
+    # a topological order of the DFG without its back edges.
+    s.topo_order = sorted( s.nodes, key = lambda node: node.layer )
+
     s.layer_diff_list = [ 0 ] * s.num_input
     channel_index= 0
     for node in s.nodes:
       for node_id in node.input_node:
-        layer_diff = node.layer - get_node( node_id, s.nodes ).layer
+        layer_diff = node.layer - s.get_node( node_id ).layer
         if layer_diff > 0:
           s.layer_diff_list[channel_index] = layer_diff
         else:
@@ -127,5 +153,10 @@ class DFG:
         channel_index += 1
 
   def get_node( s, node_id ):
-    return get_node( node_id, s.nodes)
+    return s.node_index.get( node_id )
+
+  def get_predecessors( s, node_id ):
+    return [ s.node_index[ i ] for i in s.predecessors[ node_id ] ]
 
+  def get_successors( s, node_id ):
+    return [ s.node_index[ i ] for i in s.successors[ node_id ] ]
@@ -0,0 +1,273 @@
+"""
+==========================================================================
+dse_helper.py
+==========================================================================
+Design-space exploration over the parameters of CGRARTL. A grid of
+design points (CGRA size, FuList of the tiles, control/data memory size,
+data bitwidth and channel latency) is fanned out over a process pool.
+Every point is elaborated, loaded with the control signals of a mapped
+kernel and simulated, and a table collects the cycle count, the achieved
+II and the simulation time of each point.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+from pymtl3.dsl                   import errors
+from pymtl3.stdlib.test.test_srcs import TestSrcRTL
+
+from .messages                    import *
+from .ctrl_helper                 import *
+from ..cgra.CGRARTL               import CGRARTL
+from ..fu.flexible.FlexibleFuRTL  import FlexibleFuRTL
+from ..fu.single.AdderRTL         import AdderRTL
+from ..fu.single.BranchRTL        import BranchRTL
+from ..fu.single.CompRTL          import CompRTL
+from ..fu.single.MemUnitRTL       import MemUnitRTL
+from ..fu.single.MulRTL           import MulRTL
+from ..fu.single.PhiRTL           import PhiRTL
+
+from multiprocessing              import Pool
+
+import itertools
+import json
+import time
+
+num_fu_in         = 4
+num_xbar_inports  = 6
+num_xbar_outports = 8
+
+default_point = {
+  'width'           : 4,
+  'height'          : 4,
+  'fu_list'         : [ AdderRTL, PhiRTL, MemUnitRTL, CompRTL, MulRTL,
+                        BranchRTL ],
+  'ctrl_mem_size'   : 4,
+  'data_mem_size'   : 100,
+  'data_nbits'      : 16,
+  'channel_latency' : 1,
+}
+
+# A design point that can not run the kernel.
+class DesignPointError( Exception ):
+  pass
+
+# The errors of PyMTL elaboration, e.g., a FuList that leaves a port of
+# the CGRA unconnected.
+elab_errors = tuple( [ x for x in vars( errors ).values()
+                       if isinstance( x, type ) and issubclass( x, Exception ) ] )
+
+#-------------------------------------------------------------------------
+# Kernel
+#-------------------------------------------------------------------------
+# A mapped kernel is described by its control signals (a JSON file read
+# by CGRACtrl), its II, the preloaded data memory, the constants of each
+# tile and the tile/port that produces the live-out value. Tiles are
+# given by their ( x, y ) position so that the same mapping can be placed
+# on CGRAs of different sizes.
+
+class Kernel:
+
+  def __init__( s, config, II, preload_data, preload_const, live_out,
+                live_out_port = 0, expected = None ):
+    s.config        = config
+    s.II            = II
+    s.preload_data  = preload_data
+    s.preload_const = preload_const
+    s.live_out      = live_out
+    s.live_out_port = live_out_port
+    s.expected      = expected
+
+#-------------------------------------------------------------------------
+# Test harness
+#-------------------------------------------------------------------------
+
+class DSEHarness( Component ):
+
+  def construct( s, DataType, PredicateType, CtrlType, width, height,
+                 ctrl_mem_size, data_mem_size, fu_list, src_opt, ctrl_waddr,
+                 preload_data, preload_const ):
+
+    s.num_tiles  = width * height
+    AddrType     = mk_bits( clog2( ctrl_mem_size ) )
+
+    s.src_opt    = [ TestSrcRTL( CtrlType, src_opt[i] )
+                     for i in range( s.num_tiles ) ]
+    s.ctrl_waddr = [ TestSrcRTL( AddrType, ctrl_waddr[i] )
+                     for i in range( s.num_tiles ) ]
+
+    s.dut        = CGRARTL( DataType, PredicateType, CtrlType, width, height,
+                            ctrl_mem_size, data_mem_size, 100, FlexibleFuRTL,
+                            fu_list, preload_data, preload_const )
+
+    for i in range( s.num_tiles ):
+      connect( s.src_opt[i].send,    s.dut.recv_wopt[i]  )
+      connect( s.ctrl_waddr[i].send, s.dut.recv_waddr[i] )
+
+  def line_trace( s ):
+    return s.dut.line_trace()
+
+#-------------------------------------------------------------------------
+# Design points
+#-------------------------------------------------------------------------
+
+def mk_grid( **axes ):
+  # Cartesian product of the given axes, the parameters that are not
+  # swept keep their value in default_point.
+  names  = list( axes.keys() )
+  points = []
+  for values in itertools.product( *[ axes[ name ] for name in names ] ):
+    point = dict( default_point )
+    point.update( zip( names, values ) )
+    points.append( point )
+  return points
+
+def mk_harness( point, kernel ):
+  width     = point['width']
+  height    = point['height']
+  num_tiles = width * height
+  ctrl_mem_size = point['ctrl_mem_size']
+  data_mem_size = point['data_mem_size']
+
+  DataType      = mk_data( point['data_nbits'], 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  CtrlType      = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+  RouteType     = mk_bits( clog2( num_xbar_inports + 1 ) )
+  AddrType      = mk_bits( clog2( ctrl_mem_size ) )
+
+  # The kernel has to fit on the design point.
+  if kernel.II > ctrl_mem_size:
+    raise DesignPointError( f"II {kernel.II} does not fit in a control "
+                            f"memory of {ctrl_mem_size} words!" )
+  with open( kernel.config ) as json_file:
+    tiles = [ ( ctrl['x'], ctrl['y'] ) for ctrl in json.load( json_file ) ]
+  tiles += list( kernel.preload_const.keys() ) + [ kernel.live_out ]
+  for x, y in tiles:
+    if x >= width or y >= height:
+      raise DesignPointError( f"The kernel uses tile ( {x}, {y} ) of a "
+                              f"{width}x{height} CGRA!" )
+
+  cgra_ctrl  = CGRACtrl( kernel.config, CtrlType, RouteType, width, height,
+                         num_fu_in, num_xbar_inports, num_xbar_outports,
+                         kernel.II )
+  src_opt    = cgra_ctrl.get_ctrl()
+  ctrl_waddr = [ [ AddrType( i ) for i in range( kernel.II ) ]
+                 for _ in range( num_tiles ) ]
+
+  preload_data  = [ DataType( v, 1 ) for v in kernel.preload_data ]
+  preload_data  = preload_data[ :data_mem_size ]
+  preload_const = [ [ DataType( 0, 1 ) ] for _ in range( num_tiles ) ]
+  for ( x, y ), values in kernel.preload_const.items():
+    preload_const[ y * width + x ] = [ DataType( v, 1 ) for v in values ]
+
+  # FuList can be either one list for all the tiles or a list per tile.
+  th = DSEHarness( DataType, PredicateType, CtrlType, width, height,
+                   ctrl_mem_size, data_mem_size, point['fu_list'], src_opt,
+                   ctrl_waddr, preload_data, preload_const )
+
+  for i in range( num_tiles ):
+    for j in range( num_xbar_outports ):
+      th.set_param( "top.dut.tile["+str(i)+"].channel["+str(j)+"].construct",
+                    latency=point['channel_latency'] )
+  return th
+
+def run_point( point, kernel, max_cycles = 40 ):
+  # Simulates one design point. The cycle count is the first cycle in
+  # which the live-out port sends the expected value (or, without an
+  # expected value, the last cycle in which the live-out changes). The
+  # achieved II is the average distance between two issues of the control
+  # word that produces the live-out.
+  result = dict( point )
+  result.update( ncycles = None, ii = None, live_out = None, elab_time = 0.0,
+                 sim_time = 0.0, error = None )
+  # Only the errors caused by the design point itself are reported in
+  # the result, any other one is a bug and is raised.
+  try:
+    start = time.time()
+    th = mk_harness( point, kernel )
+    th.elaborate()
+    th.apply( SimulationPass() )
+  except ( DesignPointError, ) + elab_errors as e:
+    result['error'] = f'{type( e ).__name__}: {e}'
+    return result
+  th.sim_reset()
+  result['elab_time'] = time.time() - start
+
+  x, y   = kernel.live_out
+  tile   = th.dut.tile[ y * point['width'] + x ]
+  out    = tile.element.send_out[ kernel.live_out_port ]
+  issues = []
+  done   = None
+  start  = time.time()
+  for i in range( max_cycles ):
+    th.tick()
+    cycle = i + 1
+    if tile.ctrl_mem.send_ctrl.en:
+      issues.append( ( cycle, int( tile.ctrl_mem.reg_file.raddr[0] ) ) )
+    if out.en and done == None:
+      payload = int( out.msg.payload )
+      if kernel.expected == None:
+        if payload != result['live_out']:
+          result['ncycles'] = cycle
+      elif payload == kernel.expected:
+        done = ( cycle, int( tile.ctrl_mem.reg_file.raddr[0] ) )
+        result['ncycles'] = cycle
+      result['live_out'] = payload
+  result['sim_time'] = time.time() - start
+
+  if done == None and result['ncycles'] != None:
+    done = [ issue for issue in issues if issue[0] == result['ncycles'] ][0]
+  if done != None:
+    cycles = [ c for c, raddr in issues if raddr == done[1] ]
+    if len( cycles ) > 1:
+      result['ii'] = ( cycles[-1] - cycles[0] ) / ( len( cycles ) - 1 )
+  return result
+
+def _run_point( args ):
+  return run_point( *args )
+
+def run_dse( grid, kernel, max_cycles = 40, num_workers = None ):
+  # Returns the results in the order of the grid. The points are
+  # distributed over num_workers processes (one per core by default).
+  args = [ ( point, kernel, max_cycles ) for point in grid ]
+  if num_workers == 1:
+    return [ _run_point( arg ) for arg in args ]
+  with Pool( num_workers ) as pool:
+    return pool.map( _run_point, args, chunksize = 1 )
+
+#-------------------------------------------------------------------------
+# Result table
+#-------------------------------------------------------------------------
+
+def fu_list_str( fu_list ):
+  if isinstance( fu_list[0], list ):
+    return "hetero"
+  return "+".join( [ fu.__name__.replace( "RTL", "" ) for fu in fu_list ] )
+
+table_columns = [
+  ( 'width'           , lambda r: str( r['width'] )                    ),
+  ( 'height'          , lambda r: str( r['height'] )                   ),
+  ( 'fu_list'         , lambda r: fu_list_str( r['fu_list'] )          ),
+  ( 'ctrl_mem'        , lambda r: str( r['ctrl_mem_size'] )            ),
+  ( 'data_mem'        , lambda r: str( r['data_mem_size'] )            ),
+  ( 'nbits'           , lambda r: str( r['data_nbits'] )               ),
+  ( 'latency'         , lambda r: str( r['channel_latency'] )          ),
+  ( 'cycles'          , lambda r: str( r['ncycles'] )                  ),
+  ( 'II'              , lambda r: '-' if r['ii'] == None else
+                                  '{:.2f}'.format( r['ii'] )           ),
+  ( 'live_out'        , lambda r: str( r['live_out'] )                 ),
+  ( 'sim_time(s)'     , lambda r: '{:.2f}'.format( r['elab_time'] +
+                                                   r['sim_time'] )     ),
+  ( 'error'           , lambda r: r['error'] or ''                     ),
+]
+
+def format_table( results ):
+  rows = [ [ name for name, _ in table_columns ] ]
+  rows.extend( [ [ fn( r ) for _, fn in table_columns ] for r in results ] )
+  widths = [ max( [ len( row[i] ) for row in rows ] )
+             for i in range( len( table_columns ) ) ]
+  return "\n".join( [ " | ".join( [ cell.ljust( w )
+                                    for cell, w in zip( row, widths ) ] ).rstrip()
+                      for row in rows ] )
@@ -0,0 +1,142 @@
+"""
+==========================================================================
+fork_runner.py
+==========================================================================
+Fan-out of simulations from a warm simulator. The model is elaborated,
+reset and warmed up once in the parent; fork_run() then forks one worker
+per variant, which shares the elaborated component tree with the parent
+copy-on-write, applies its variant (data memory image, const queues or
+any setup function), runs it and sends the result back over a pipe.
+Hundreds of variants thus cost their simulation cycles only.
+
+A variant is a dict with the optional keys
+
+  data  : data memory image, a list of DataType written from address 0
+  const : { tile index : list of DataType } replacing const queues
+  setup : function called with the top component
+
+and run( top ) returns the (picklable) result of a variant. Results are
+returned in the order of the variants. Only available where os.fork()
+is (i.e., not on Windows).
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3       import *
+from .bits_helper import replace_bits
+
+import gc
+import os
+import pickle
+import select
+import signal
+import sys
+import traceback
+
+#-------------------------------------------------------------------------
+# Variants
+#-------------------------------------------------------------------------
+
+def get_cgra( top ):
+  # The CGRA in a test harness, or the CGRA itself.
+  return top.dut if hasattr( top, 'dut' ) else top
+
+def set_consts( tile, consts ):
+  # Unlike load_consts(), the cursor of the queue is kept. The constants
+  # loaded on reset are replaced as well, since the reset of the queue
+  # can still be high in the tick after sim_reset().
+  if hasattr( tile, 'consts' ): # TileNativeCL
+    tile.consts    = list( consts )
+    tile.const_cur = tile.const_cur % len( consts )
+  else:
+    const_queue = tile.const_queue
+    queue       = const_queue.const_queue
+    if len( consts ) != len( queue ):
+      raise Exception( f"The const queue of {tile} holds {len( queue )} "
+                       f"entries, {len( consts )} given!" )
+    for i, x in enumerate( consts ):
+      const_queue.const_init[i] = x
+      queue[i] = replace_bits( queue[i], x )
+
+def apply_variant( top, variant ):
+  cgra = get_cgra( top )
+  if 'data' in variant:
+    cgra.load_data( variant['data'] )
+  for i, consts in variant.get( 'const', {} ).items():
+    set_consts( cgra.tile[i], consts )
+  if 'setup' in variant:
+    variant['setup']( top )
+
+#-------------------------------------------------------------------------
+# Workers
+#-------------------------------------------------------------------------
+
+def run_worker( top, variant, run, wfd ):
+  # Runs in the forked process and never returns.
+  try:
+    apply_variant( top, variant )
+    result = ( 'ok', run( top ) )
+    data   = pickle.dumps( result )
+  except BaseException:
+    data   = pickle.dumps( ( 'error', traceback.format_exc() ) )
+  try:
+    with os.fdopen( wfd, 'wb' ) as f:
+      f.write( data )
+  finally:
+    os._exit( 0 )
+
+def kill_workers( running ):
+  for fd, ( pid, _, _ ) in running.items():
+    os.kill( pid, signal.SIGKILL )
+    os.waitpid( pid, 0 )
+    os.close( fd )
+
+def fork_run( top, variants, run, max_workers = None ):
+  if not hasattr( os, 'fork' ):
+    raise Exception( "fork_run() needs os.fork()!" )
+  if max_workers == None:
+    max_workers = os.cpu_count() or 1
+
+  # Objects that exist now are left alone by the garbage collector of the
+  # workers, which would otherwise touch (and copy) their pages.
+  gc.collect()
+  gc.freeze()
+
+  results = [ None ] * len( variants )
+  pending = list( enumerate( variants ) )[::-1]
+  running = {} # read end of the pipe -> ( pid, variant index, chunks )
+  try:
+    while pending or running:
+      while pending and len( running ) < max_workers:
+        i, variant = pending.pop()
+        rfd, wfd = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+          os.close( rfd )
+          run_worker( top, variant, run, wfd )
+        os.close( wfd )
+        running[ rfd ] = ( pid, i, [] )
+
+      ready, _, _ = select.select( list( running ), [], [] )
+      for fd in ready:
+        data = os.read( fd, 1 << 16 )
+        if data:
+          running[ fd ][2].append( data )
+          continue
+        pid, i, chunks = running.pop( fd )
+        os.close( fd )
+        os.waitpid( pid, 0 )
+        if not chunks:
+          raise Exception( f"The worker of variant {i} died!" )
+        status, value = pickle.loads( b''.join( chunks ) )
+        if status == 'error':
+          raise Exception( f"Variant {i} failed:\n{value}" )
+        results[i] = value
+  finally:
+    kill_workers( running )
+    gc.unfreeze()
+  return results
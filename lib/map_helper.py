@@ -36,6 +36,10 @@ unit_map = { "Adder"           : AdderRTL,
              "Selecter"        : SelRTL,
              "MemUnit"         : MemUnitRTL }
 
+# Default FuList of TileRTL, also used by the CGRAs, CGRANumpy and the
+# mapper when no FuList is given.
+default_fu_list = [ MemUnitRTL, AdderRTL, PhiRTL, CompRTL, MulRTL, BranchRTL ]
+
 opt_map  = { "OPT_START"       : OPT_START,
              "OPT_NAH"         : OPT_NAH,
              "OPT_ADD"         : OPT_ADD,
@@ -45,11 +49,13 @@ opt_map  = { "OPT_START"       : OPT_START,
              "OPT_LLS"         : OPT_LLS,
              "OPT_LRS"         : OPT_LRS,
              "OPT_MUL"         : OPT_MUL,
+             "OPT_MUL_CONST"   : OPT_MUL_CONST,
              "OPT_OR"          : OPT_OR,
              "OPT_XOR"         : OPT_XOR,
              "OPT_AND"         : OPT_AND,
              "OPT_NOT"         : OPT_NOT,
              "OPT_LD"          : OPT_LD,
+             "OPT_LD_CONST"    : OPT_LD_CONST,
              "OPT_STR"         : OPT_STR,
              "OPT_EQ"          : OPT_EQ,
              "OPT_EQ_CONST"    : OPT_EQ_CONST,
@@ -0,0 +1,776 @@
+"""
+==========================================================================
+mapper.py
+==========================================================================
+Modulo-scheduling mapper from a DFG (the JSON format read by DFG) to the
+control signals of a CGRA (the JSON format read by CGRACtrl). Starting
+from the minimum II (the larger of ResMII and RecMII), the nodes are
+scheduled in topological order and each one is placed on the tile and
+cycle that can be reached by all its already mapped neighbours, routing
+every edge over the crossbars and the mesh. The first II for which all
+the nodes fit is returned.
+
+The placement is greedy, so the II can be well above the MII on large
+DFGs. Both operands of a node come from the same stage (see _place()),
+so a chain of operations that pair their operands has to fit in one II.
+50 independent kernels of five operations (250 nodes, test_map_scale)
+map on an 8x8 array in about ten seconds, at an II of 19 against an MII
+of 7.
+
+The timing model follows CGRARTL:
+ - A result is on the crossbar of its tile in the cycle the operation is
+   issued. Sending it to a neighbour from there is bypassed, while every
+   further hop goes through the (one cycle) channel of the next tile.
+ - Routing a value into an input channel of the FU makes it available
+   from the next cycle on, and it has to be consumed within II cycles so
+   that every channel holds the values of one iteration at a time.
+ - Memory operations can only be placed on the tiles connected to the
+   data memory (mem_tiles, the left column by default).
+ - The const queue of a tile advances every cycle from the first one in
+   which the crossbar takes an output of the FU, so the const list of a
+   tile has one entry per cycle of the II.
+ - The predicate register of a tile is popped by every predicated
+   operation and only the FU outputs of the tile reliably push into it,
+   so a predicate is delivered to one operation, which is placed on the
+   tile of the producer. The other operations guarded by the same
+   predicate are issued unpredicated (they keep running after the loop
+   exits, as in the hand-mapped FIR).
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from .dfg_helper            import DFG
+from .map_helper            import *
+from ..fu.single.MemUnitRTL import MemUnitRTL
+
+import json
+import math
+import random
+
+NORTH = 0
+SOUTH = 1
+WEST  = 2
+EAST  = 3
+
+num_mesh_ports  = 4
+num_fu_inports  = 4
+num_fu_outports = 2
+
+# Operations with a const input are lowered to the variants that read the
+# const queue of the tile.
+const_opt_map = { "OPT_ADD" : "OPT_ADD_CONST",
+                  "OPT_MUL" : "OPT_MUL_CONST",
+                  "OPT_EQ"  : "OPT_EQ_CONST",
+                  "OPT_PHI" : "OPT_PHI_CONST",
+                  "OPT_LD"  : "OPT_LD_CONST" }
+
+opt_name_map = { int( opt ) : name for name, opt in opt_map.items() }
+
+#-------------------------------------------------------------------------
+# Edges of the DFG
+#-------------------------------------------------------------------------
+# dist is the iteration distance: an input listed after its consumer in
+# the DFG is loop-carried (the same convention as DFG.layer). operand is
+# the input channel picked by the consumer, or None for a predicate.
+
+class Edge:
+
+  def __init__( s, src, port, dst, dist, operand ):
+    s.src     = src
+    s.port    = port
+    s.dst     = dst
+    s.dist    = dist
+    s.operand = operand
+
+#-------------------------------------------------------------------------
+# Claims
+#-------------------------------------------------------------------------
+# The resources taken by a placement that is being tried, as a list of
+# ( key, owner, action ) that is committed in order, indexed by key so
+# that checking a resource does not go through the whole list.
+
+class Claims( list ):
+
+  def __init__( s ):
+    super().__init__()
+    s.owners = {}
+
+  def append( s, claim ):
+    super().append( claim )
+    s.owners[ claim[0] ] = claim[1]
+
+  def extend( s, claims ):
+    for claim in claims:
+      s.append( claim )
+
+def mk_path( hops ):
+  # A route under search is kept as a linked list of hops ( parent, [
+  # claims ] ), returned here as Claims, or None if it takes a resource
+  # twice for different owners.
+  segments = []
+  while hops != None:
+    segments.append( hops[1] )
+    hops = hops[0]
+  path = Claims()
+  for segment in reversed( segments ):
+    for key, owner, action in segment:
+      if path.owners.get( key, owner ) != owner:
+        return None
+      path.append( ( key, owner, action ) )
+  return path
+
+class Mapping:
+
+  def __init__( s, II, width, height, placement, ctrls, consts, live_out,
+                unpredicated ):
+    s.II           = II
+    s.width        = width
+    s.height       = height
+    # Node id -> ( x, y, cycle ).
+    s.placement    = placement
+    s.ctrls        = ctrls
+    # ( x, y ) -> [ const values ], as expected by the Kernel of DSE.
+    s.consts       = consts
+    s.live_out     = live_out
+    s.unpredicated = unpredicated
+
+  def get_preload_const( s, DataType ):
+    preload_const = [ [ DataType( 0, 1 ) ] for _ in range( s.width * s.height ) ]
+    for ( x, y ), values in s.consts.items():
+      preload_const[ y * s.width + x ] = [ DataType( v, 1 ) for v in values ]
+    return preload_const
+
+  def write( s, json_file_name ):
+    with open( json_file_name, 'w' ) as json_file:
+      json.dump( s.ctrls, json_file, indent = 2 )
+
+#-------------------------------------------------------------------------
+# Mapper
+#-------------------------------------------------------------------------
+
+class Mapper:
+
+  def __init__( s, json_file_name, src_const, width, height, fu_list = None,
+                mem_tiles = None ):
+    s.width     = width
+    s.height    = height
+    s.num_tiles = width * height
+    s.src_const = [ c if isinstance( c, int ) else int( c.payload )
+                    for c in src_const ]
+
+    # FuList can be either one list for all the tiles or a list per tile.
+    if fu_list == None:
+      fu_list = default_fu_list
+    if not isinstance( fu_list[0], list ):
+      fu_list = [ fu_list ] * s.num_tiles
+    s.fu_list = fu_list
+    # The tiles connected to the data memory, as in CGRACL.
+    if mem_tiles == None:
+      mem_tiles = [ i * width for i in range( height ) ]
+    s.mem_tiles = mem_tiles
+    # The kinds of FU each tile can run (memory only in mem_tiles).
+    s.tile_fus = [ set( [ fu for fu in fu_list[ tile ]
+                          if fu != MemUnitRTL or tile in mem_tiles ] )
+                   for tile in range( s.num_tiles ) ]
+    s._init_mesh()
+
+    s.dfg   = DFG( json_file_name, src_const, None )
+    s.nodes = s.dfg.nodes
+    s.pos   = { node.id : i for i, node in enumerate( s.nodes ) }
+    s._init_ops()
+    s._init_edges()
+    s._init_pressure()
+
+  def _init_mesh( s ):
+    # Distances and neighbours are looked up in the inner loop of the
+    # router, so they are computed once.
+    s.dist = [ [ s._manhattan( a, b ) for b in range( s.num_tiles ) ]
+               for a in range( s.num_tiles ) ]
+    s.nbr  = [ [ s._neighbour( tile, d ) for d in range( num_mesh_ports ) ]
+               for tile in range( s.num_tiles ) ]
+
+  def _init_ops( s ):
+    s.opt   = {}
+    s.const = {}
+    for node in s.nodes:
+      name = opt_name_map[ int( node.opt ) ]
+      if node.num_const > 1 or node.num_const + node.num_input > 2:
+        raise Exception( f"Node {node.id} ({name}) has too many inputs to map!" )
+      if node.num_const == 1:
+        if name not in const_opt_map:
+          raise Exception( f"Node {node.id} ({name}) has no const variant!" )
+        name = const_opt_map[ name ]
+        s.const[ node.id ] = s.src_const[ node.const_index[0] ]
+      s.opt[ node.id ] = name
+
+  def _init_edges( s ):
+    s.in_edges     = { node.id : [] for node in s.nodes }
+    s.out_edges    = { node.id : [] for node in s.nodes }
+    s.unpredicated = []
+    pred_taken     = set()
+    for node in s.nodes:
+      edges = [ ( src, i ) for i, src in enumerate( node.input_node ) ]
+      for src in node.input_predicate_node:
+        if src in pred_taken:
+          s.unpredicated.append( node.id )
+        else:
+          pred_taken.add( src )
+          edges.append( ( src, None ) )
+      for src, operand in edges:
+        src_node = s.dfg.get_node( src )
+        port = 0
+        for j, array in enumerate( src_node.output_node ):
+          if node.id in array:
+            port = j
+        dist = 1 if s.pos[ src ] >= s.pos[ node.id ] else 0
+        edge = Edge( src, port, node.id, dist, operand )
+        s.in_edges [ node.id ].append( edge )
+        s.out_edges[ src ].append( edge )
+
+  #-----------------------------------------------------------------------
+  # Minimum II
+  #-----------------------------------------------------------------------
+
+  def supports( s, tile, fu_type ):
+    return fu_type in s.tile_fus[ tile ]
+
+  def _init_pressure( s ):
+    # Number of nodes per tile that can execute them, for each kind of FU.
+    s.demand   = {}
+    s.pressure = {}
+    s.reach    = {}
+    for fu_type in set( [ node.fu_type for node in s.nodes ] ):
+      tiles = [ t for t in range( s.num_tiles ) if s.supports( t, fu_type ) ]
+      if len( tiles ) == 0:
+        raise Exception( f"No tile supports {fu_type.__name__}!" )
+      nodes = [ node for node in s.nodes if node.fu_type == fu_type ]
+      s.demand  [ fu_type ] = ( len( nodes ), len( tiles ) )
+      s.pressure[ fu_type ] = len( nodes ) / len( tiles )
+      s.reach   [ fu_type ] = [ min( [ s.dist[ tile ][ t ] for t in tiles ] )
+                                for tile in range( s.num_tiles ) ]
+    # Demand for the units of a tile that a node of fu_type does not use.
+    s.spare = { fu_type : [ sum( [ s.pressure[ fu ] for fu in s.pressure
+                                   if fu != fu_type and s.supports( tile, fu ) ] )
+                            for tile in range( s.num_tiles ) ]
+                for fu_type in s.pressure }
+
+  def res_mii( s ):
+    mii = max( [ math.ceil( n / t ) for n, t in s.demand.values() ] )
+    tiles = [ t for t in range( s.num_tiles )
+              if any( [ s.supports( t, fu ) for fu in s.pressure ] ) ]
+    return max( mii, math.ceil( len( s.nodes ) / len( tiles ) ) )
+
+  def _longest_paths( s, II, reverse = False ):
+    # Bellman-Ford on the longest paths from (or, reversed, to) any node,
+    # every edge takes at least one cycle and a loop-carried one gains II
+    # cycles per iteration. Returns None if II is below RecMII.
+    dist  = { node.id : 0 for node in s.nodes }
+    edges = [ ( e.dst, e.src, e.dist ) if reverse else ( e.src, e.dst, e.dist )
+              for es in s.in_edges.values() for e in es ]
+    for _ in range( len( s.nodes ) ):
+      changed = False
+      for src, dst, d in edges:
+        if dist[ src ] + 1 - d * II > dist[ dst ]:
+          dist[ dst ] = dist[ src ] + 1 - d * II
+          changed = True
+      if not changed:
+        return dist
+    return None
+
+  def rec_mii( s ):
+    II = 1
+    while s._longest_paths( II ) == None:
+      II += 1
+    return II
+
+  def recurrences( s ):
+    # Ids of the nodes on a cycle of the DFG (Tarjan's strongly connected
+    # components).
+    index = {}
+    low   = {}
+    stack = []
+    res   = set()
+    def visit( v ):
+      index[v] = low[v] = len( index )
+      stack.append( v )
+      for e in s.out_edges[v]:
+        if e.dst not in index:
+          visit( e.dst )
+          low[v] = min( low[v], low[ e.dst ] )
+        elif e.dst in stack:
+          low[v] = min( low[v], index[ e.dst ] )
+      if low[v] == index[v]:
+        scc = stack[ stack.index( v ): ]
+        del stack[ stack.index( v ): ]
+        if len( scc ) > 1 or any( [ e.dst == v for e in s.out_edges[v] ] ):
+          res.update( scc )
+    for node in s.nodes:
+      if node.id not in index:
+        visit( node.id )
+    return res
+
+  def schedule_order( s, II ):
+    # Nodes sorted by their earliest cycle (a topological order without
+    # the back edges), the ones on a recurrence and then the ones with
+    # less slack first. After a node, the consumers it makes ready are
+    # taken depth first, so that a value is routed before the mesh around
+    # its producer fills up with other values.
+    asap   = s._longest_paths( II )
+    height = s._longest_paths( II, reverse = True )
+    length = max( [ asap[ n.id ] + height[ n.id ] for n in s.nodes ] )
+    rec    = s.recurrences()
+    base   = sorted( s.nodes, key = lambda n: ( asap[ n.id ], n.id not in rec,
+                     length - height[ n.id ] - asap[ n.id ], s.pos[ n.id ] ) )
+    rank   = { n.id : i for i, n in enumerate( base ) }
+    order  = []
+    done   = set()
+    def ready( node_id ):
+      return node_id not in done and \
+             all( [ e.src in done for e in s.in_edges[ node_id ]
+                    if e.dist == 0 ] )
+    for node in base:
+      if node.id in done:
+        continue
+      stack = [ node.id ]
+      while len( stack ) > 0:
+        node_id = stack.pop()
+        if node_id in done:
+          continue
+        done.add( node_id )
+        order.append( s.dfg.get_node( node_id ) )
+        succs = [ e.dst for e in s.out_edges[ node_id ]
+                  if e.dst not in rec and ready( e.dst ) ]
+        stack.extend( sorted( set( succs ), key = lambda n: -rank[n] ) )
+    return order
+
+  def mii( s ):
+    return max( s.res_mii(), s.rec_mii() )
+
+  #-----------------------------------------------------------------------
+  # Mapping
+  #-----------------------------------------------------------------------
+
+  def map( s, max_ii = None, num_tries = 4, num_restarts = 4, effort = 500,
+           seed = 0 ):
+    # The IIs are tried upward from the minimum one, each with a few
+    # randomized orders of the candidate tiles, and the first one that
+    # maps is returned. Whether a DFG maps is not monotonic in the II
+    # (the routes and the const queues change with it), so no II is
+    # skipped. effort bounds the states searched by the router per node
+    # and schedule: a schedule that fits takes a few tens of them, while
+    # one that is stuck on a congested mesh can take thousands.
+    if max_ii == None:
+      max_ii = len( s.nodes ) * 2
+    for II in range( s.mii(), max_ii + 1 ):
+      rng = random.Random( seed )
+      for i in range( num_tries ):
+        s.budget = effort * len( s.nodes )
+        if s._schedule( II, rng if i > 0 else None, num_restarts ):
+          mapping = s._emit()
+          if mapping != None:
+            return mapping
+    raise Exception( f"Failed to map the DFG with II <= {max_ii}!" )
+
+  def _schedule( s, II, rng, num_restarts ):
+    s.II        = II
+    order       = s.schedule_order( II )
+    tile_order  = list( range( s.num_tiles ) )
+    if rng != None:
+      rng.shuffle( tile_order )
+    # When a node can not be mapped in the stage of the peers it has to
+    # pair with, those peers are moved to a later stage and the schedule
+    # starts over (a few times, a schedule that keeps pushing nodes back
+    # rarely fits and gets slower as the mesh fills up).
+    s.min_stage = {}
+    for i in range( num_restarts ):
+      s.usage   = {}
+      s.place   = {}
+      s.fu_in   = {}
+      s.xbar    = {}
+      s.pred_in = {}
+      for node in order:
+        s.pushed = {}
+        if not s._place( node, tile_order ):
+          break
+      else:
+        return True
+      changed = False
+      for peer, k in s.pushed.items():
+        if k > s.min_stage.get( peer, 0 ):
+          s.min_stage[ peer ] = k
+          changed = True
+      if not changed or s.budget < 0:
+        return False
+    return False
+
+  def _xy( s, tile ):
+    return tile % s.width, tile // s.width
+
+  def _manhattan( s, a, b ):
+    ax, ay = s._xy( a )
+    bx, by = s._xy( b )
+    return abs( ax - bx ) + abs( ay - by )
+
+  def _neighbour( s, tile, d ):
+    x, y = s._xy( tile )
+    if d == NORTH and y < s.height - 1: return tile + s.width, SOUTH
+    if d == SOUTH and y > 0:            return tile - s.width, NORTH
+    if d == WEST  and x > 0:            return tile - 1, EAST
+    if d == EAST  and x < s.width - 1:  return tile + 1, WEST
+    return None, None
+
+  def _place( s, node, tile_order ):
+    II     = s.II
+    placed_in  = [ e for e in s.in_edges[ node.id ] if e.src in s.place ]
+    placed_out = [ e for e in s.out_edges[ node.id ] if e.dst in s.place ]
+    est = 0
+    lst = None
+    for e in placed_in:
+      est = max( est, s.place[ e.src ][1] + 1 - e.dist * II )
+    for e in placed_out:
+      t = s.place[ e.dst ][1] + e.dist * II - 1
+      lst = t if lst == None else min( lst, t )
+
+    # The control words run from the first cycle, so a node issued in
+    # stage k (cycle t with t // II == k) runs k times before the first
+    # iteration and sends as many dummy values. A node with two operands
+    # waits for both of them, so its producers send the same number of
+    # dummy values and the operands stay paired, i.e., t // II - dist is
+    # the same for both of its input edges. The stage of a node can be
+    # pushed back by a later schedule (see _schedule()).
+    est   = max( est, s.min_stage.get( node.id, 0 ) * II )
+    stage = None
+    peers = []
+    for e in s.out_edges[ node.id ]:
+      if e.operand == None:
+        continue
+      for other in s.in_edges[ e.dst ]:
+        if other is e or other.operand == None or other.src not in s.place:
+          continue
+        k = s.place[ other.src ][1] // II - other.dist + e.dist
+        if stage != None and stage != k:
+          return False
+        stage = k
+        peers.append( ( other.src, other.dist - e.dist ) )
+    if stage != None:
+      # Issued in a later stage, the peers have to move as well.
+      retry = max( est // II, stage + 1 )
+      for peer, offset in peers:
+        s.pushed[ peer ] = max( s.pushed.get( peer, 0 ), retry + offset )
+      est = max( est, stage * II )
+      lst = stage * II + II - 1 if lst == None else \
+            min( lst, stage * II + II - 1 )
+
+    # A delivered predicate pins the consumer on the tile of its producer.
+    fixed = None
+    for e in placed_in + placed_out:
+      if e.operand == None:
+        fixed = s.place[ e.src if e.dst == node.id else e.dst ][0]
+
+    # Distance to the mapped neighbours (or to the closest tile that can
+    # run a consumer that is not mapped yet), and the demand for the units
+    # of the tile that the node does not use (e.g., keeps the tiles next
+    # to the data memory for the loads and stores).
+    unplaced = [ s.dfg.get_node( e.dst ).fu_type
+                 for e in s.out_edges[ node.id ] if e.dst not in s.place ]
+    def cost( tile ):
+      return sum( [ s.dist[ tile ][ s.place[ e.src ][0] ]
+                    for e in placed_in ] ) + \
+             sum( [ s.dist[ tile ][ s.place[ e.dst ][0] ]
+                    for e in placed_out ] ) + \
+             sum( [ s.reach[ fu ][ tile ] for fu in unplaced ] ) + \
+             s.spare[ node.fu_type ][ tile ]
+
+    tiles = [ t for t in tile_order if s.supports( t, node.fu_type ) and
+              ( fixed == None or t == fixed ) ]
+    tiles = sorted( tiles, key = cost )
+    last  = est + II - 1 if lst == None else min( lst, est + II - 1 )
+    for t in range( est, last + 1 ):
+      for tile in tiles:
+        claims = s._try_place( node, tile, t, placed_in, placed_out )
+        if claims != None:
+          s._commit( node, tile, t, claims )
+          return True
+    return False
+
+  #-----------------------------------------------------------------------
+  # Resources
+  #-----------------------------------------------------------------------
+  # Every resource is used once per II:
+  #  ( 'f', tile, slot )       : the FU of a tile
+  #  ( 'x', tile, out, slot )  : an outport of a crossbar
+  #  ( 'q', tile, out, slot )  : the channel behind an outport
+  #  ( 'p', tile, slot )       : the predicate register of a tile
+  # A value that is fanned out can share the crossbar and mesh resources
+  # it already uses, so those are owned by the value and the cycle.
+
+  def _slot( s, kind, tile, *rest ):
+    # Resource key, the cycle (last field) is taken modulo II.
+    return ( kind, tile ) + rest[:-1] + ( rest[-1] % s.II, )
+
+  def _free( s, key, owner, claims, path = None ):
+    # path holds the hops of a route that is still being searched.
+    if path != None and path.owners.get( key, owner ) != owner:
+      return False
+    if claims.owners.get( key, owner ) != owner:
+      return False
+    return s.usage.get( key, owner ) == owner
+
+  def _claim( s, claims, key, owner, action = None ):
+    claims.append( ( key, owner, action ) )
+
+  def _try_place( s, node, tile, t, placed_in, placed_out ):
+    claims = Claims()
+    if not s._free( s._slot( 'f', tile, t ), node.id, claims ):
+      return None
+    # A value goes one hop further per cycle (see _route()).
+    for e in placed_in:
+      src_tile, src_t = s.place[ e.src ]
+      if s.dist[ src_tile ][ tile ] > t + e.dist * s.II - src_t:
+        return None
+    for e in placed_out:
+      dst_tile, dst_t = s.place[ e.dst ]
+      if s.dist[ tile ][ dst_tile ] > dst_t + e.dist * s.II - t:
+        return None
+    s._claim( claims, s._slot( 'f', tile, t ), node.id )
+    for e in placed_in:
+      src_tile, src_t = s.place[ e.src ]
+      if not s._route( e, src_tile, src_t, tile, t + e.dist * s.II, claims ):
+        return None
+    for e in placed_out:
+      dst_tile, dst_t = s.place[ e.dst ]
+      if not s._route( e, tile, t, dst_tile, dst_t + e.dist * s.II, claims ):
+        return None
+    # The consumers that are not mapped yet need a way out of the tile,
+    # which is kept for the value so that later routes can not take it.
+    for e in s.out_edges[ node.id ]:
+      if e.dst not in s.place and e.operand != None and \
+         not s._reserve_exit( tile, t, ( node.id, e.port, t ),
+                              s.dfg.get_node( e.dst ).fu_type, claims ):
+        return None
+    return claims
+
+  def _reserve_exit( s, tile, t, value, fu_type, claims ):
+    # Claims an outport towards a neighbour for the FU output of cycle t
+    # (the closer to a tile that runs fu_type the better), or checks that
+    # an FU channel of the same tile is free.
+    inport = num_mesh_ports + value[1]
+    exits  = [ d for d in range( num_mesh_ports )
+               if s.nbr[ tile ][ d ][0] != None ]
+    exits  = sorted( exits,
+                     key = lambda d: s.reach[ fu_type ][ s.nbr[ tile ][ d ][0] ] )
+    for d in exits:
+      hop = [ ( s._slot( 'x', tile, d, t ), value + ( inport, ), None ),
+              ( s._slot( 'q', tile, d, t ), value + ( t, ), None ) ]
+      if all( [ s._free( k, o, claims ) for k, o, _ in hop ] ):
+        claims.extend( hop )
+        return True
+    if not s.supports( tile, fu_type ):
+      return False
+    for chan in range( num_fu_inports ):
+      out = num_mesh_ports + chan
+      if s._free( s._slot( 'x', tile, out, t ), value + ( inport, ), claims ) \
+         and s._free( s._slot( 'q', tile, out, t + 1 ), None, claims ):
+        return True
+    return False
+
+  def _commit( s, node, tile, t, claims ):
+    s.place[ node.id ] = ( tile, t )
+    for key, owner, action in claims:
+      s.usage[ key ] = owner
+      if action == None:
+        continue
+      if action[0] == 'x':
+        _, xtile, cycle, out, inport = action
+        s.xbar[ ( xtile, cycle % s.II, out ) ] = inport
+      elif action[0] == 'fu_in':
+        _, dst, operand, chan = action
+        s.fu_in[ ( dst, operand ) ] = chan
+      elif action[0] == 'pred':
+        _, ptile, cycle, inport = action
+        s.pred_in.setdefault( ( ptile, cycle % s.II ), set() ).add( inport )
+
+  def _route( s, e, src_tile, tp, dst_tile, tc, claims ):
+    # Routes the result of e.src issued at cycle tp on src_tile to e.dst
+    # issued at (the possibly loop-carried) cycle tc on dst_tile.
+    II = s.II
+    if tc < tp + 1:
+      return False
+
+    if e.operand == None:
+      # Predicate pushed by the FU output of the same tile.
+      if src_tile != dst_tile or tc > tp + II:
+        return False
+      keys = [ s._slot( 'p', dst_tile, c ) for c in range( tp + 1, tc + 1 ) ]
+      if not all( [ s._free( k, e.dst, claims ) for k in keys ] ):
+        return False
+      for k in keys:
+        s._claim( claims, k, e.dst )
+      s._claim( claims, ( 'pred', e.dst ), None,
+                ( 'pred', src_tile, tp, num_mesh_ports + e.port ) )
+      return True
+
+    # Search over the cycles. A state is a value that the crossbar of a
+    # tile can take from an inport in a given cycle. A value sent by the
+    # FU to a neighbour is bypassed and has to be taken in the same cycle,
+    # while a value in a mesh channel can wait there for the next tile.
+    # upstream is ( tile, outport, cycle ) of the channel holding it.
+    value = ( e.src, e.port, tp )
+    level = [ ( src_tile, num_mesh_ports + e.port, None, None ) ]
+    seen  = set()
+    for cycle in range( tp, tc ):
+      nxt = []
+      i   = 0
+      while i < len( level ):
+        tile, inport, upstream, base = level[i]
+        i += 1
+        s.budget -= 1
+        if s.budget < 0:
+          return False
+        hold = s._hold( value, upstream, cycle, claims )
+        if hold == None:
+          continue
+        hops = ( base, hold )
+        if tile == dst_tile and tc <= cycle + II:
+          path = mk_path( hops )
+          if path != None and \
+             s._enter_fu( e, value, tile, inport, cycle, tc, path, claims ):
+            return True
+        for d in range( num_mesh_ports ):
+          ntile, nport = s.nbr[ tile ][ d ]
+          arrive = cycle if inport >= num_mesh_ports else cycle + 1
+          if ntile == None or ( ntile, nport, arrive ) in seen:
+            continue
+          bypass = inport >= num_mesh_ports
+          # The value has to reach dst_tile before tc.
+          if s.dist[ ntile ][ dst_tile ] > tc - cycle - ( 1 if bypass else 2 ):
+            continue
+          hop = [ ( s._slot( 'x', tile, d, cycle ), value + ( inport, ),
+                    ( 'x', tile, cycle, d, inport ) ) ]
+          if bypass:
+            hop.append( ( s._slot( 'q', tile, d, cycle ), value + ( cycle, ),
+                          None ) )
+          if not all( [ s._free( k, o, claims ) for k, o, _ in hop ] ):
+            continue
+          seen.add( ( ntile, nport, arrive ) )
+          if bypass:
+            level.append( ( ntile, nport, None, ( hops, hop ) ) )
+          else:
+            nxt.append( ( ntile, nport, ( tile, d, cycle ), ( hops, hop ) ) )
+        # Waits in the channel for one more cycle.
+        if upstream != None and cycle + 1 - upstream[2] < II and \
+           s.dist[ tile ][ dst_tile ] <= tc - cycle - 2 and \
+           ( tile, inport, cycle + 1 ) not in seen:
+          seen.add( ( tile, inport, cycle + 1 ) )
+          nxt.append( ( tile, inport, upstream, base ) )
+      level = nxt
+    return False
+
+  def _hold( s, value, upstream, cycle, claims ):
+    # The channel of upstream holds the value until it is taken in cycle.
+    if upstream == None:
+      return []
+    tile, d, enq = upstream
+    hold = [ ( s._slot( 'q', tile, d, c ), value + ( cycle, ), None )
+             for c in range( enq + 1, cycle + 1 ) ]
+    if not all( [ s._free( k, o, claims ) for k, o, _ in hold ] ):
+      return None
+    return hold
+
+  def _enter_fu( s, e, value, tile, inport, cycle, tc, path, claims ):
+    for chan in range( num_fu_inports ):
+      out  = num_mesh_ports + chan
+      keys = [ s._slot( 'q', tile, out, c ) for c in range( cycle + 1, tc + 1 ) ]
+      if not s._free( s._slot( 'x', tile, out, cycle ), value + ( inport, ),
+                      claims, path ):
+        continue
+      if not all( [ s._free( k, ( e.dst, e.operand ), claims, path )
+                    for k in keys ] ):
+        continue
+      claims.extend( path )
+      s._claim( claims, s._slot( 'x', tile, out, cycle ), value + ( inport, ),
+                ( 'x', tile, cycle, out, inport ) )
+      for k in keys:
+        s._claim( claims, k, ( e.dst, e.operand ) )
+      s._claim( claims, ( 'fu_in', e.dst, e.operand ), None,
+                ( 'fu_in', e.dst, e.operand, chan ) )
+      return True
+    return False
+
+  #-----------------------------------------------------------------------
+  # Control signals
+  #-----------------------------------------------------------------------
+
+  def _emit( s ):
+    II     = s.II
+    ops    = { ( tile, t % II ) : node_id
+               for node_id, ( tile, t ) in s.place.items() }
+    words  = set( ops.keys() ) | set( [ ( t, c ) for t, c, _ in s.xbar ] ) | \
+             set( s.pred_in.keys() )
+    ctrls  = []
+    for tile, cycle in sorted( words, key = lambda w: ( w[1], w[0] ) ):
+      x, y = s._xy( tile )
+      ctrl = { 'x' : x, 'y' : y, 'cycle' : cycle, 'opt' : 'OPT_NAH',
+               'predicate' : 0 }
+      for i in range( num_mesh_ports + num_fu_inports ):
+        inport = s.xbar.get( ( tile, cycle, i ) )
+        ctrl[ 'out_'+str(i) ] = 'none' if inport == None else str( inport )
+      if ( tile, cycle ) in ops:
+        node_id = ops[ ( tile, cycle ) ]
+        node    = s.dfg.get_node( node_id )
+        ctrl['opt'] = s.opt[ node_id ]
+        ctrl['predicate'] = int( any( [ e.operand == None
+                                        for e in s.in_edges[ node_id ] ] ) )
+        for i in range( num_fu_inports ):
+          chan = s.fu_in.get( ( node_id, i ) )
+          ctrl[ 'fu_in_'+str(i) ] = 0 if chan == None else chan + 1
+        # MemUnitRTL dequeues the second operand of a load as well (the
+        # first FU inport when fu_in_1 is not set), so it points to the
+        # address channel.
+        if ctrl['opt'] == 'OPT_LD':
+          ctrl['fu_in_1'] = ctrl['fu_in_0']
+      if ( tile, cycle ) in s.pred_in:
+        ctrl['predicate_in'] = sorted( s.pred_in[ ( tile, cycle ) ] )
+      ctrls.append( ctrl )
+
+    placement = {}
+    consts    = {}
+    live_out  = None
+    for node_id, ( tile, t ) in s.place.items():
+      x, y = s._xy( tile )
+      placement[ node_id ] = ( x, y, t )
+      if node_id in s.const:
+        consts[ ( x, y ) ] = s._const_list( tile )
+        # Two consts of the tile need the same entry of its queue, the
+        # schedule is rejected.
+        if consts[ ( x, y ) ] == None:
+          return None
+      if s.dfg.get_node( node_id ).live_out_val:
+        live_out = ( x, y )
+    return Mapping( II, s.width, s.height, placement, ctrls, consts,
+                    live_out, list( s.unpredicated ) )
+
+  def _const_list( s, tile ):
+    # The queue starts advancing in the first cycle that routes an output
+    # of the FU, and then holds the entry ( cycle - first ) % II. If no
+    # output is ever routed, the queue stays on its first entry. None if
+    # two consts of the tile fall on the same entry.
+    II     = s.II
+    routed = [ c for ( t, c, out ), inport in s.xbar.items()
+               if t == tile and inport >= num_mesh_ports ]
+    first  = min( routed ) if len( routed ) > 0 else None
+    values = [ None ] * II
+    for node_id, ( t, cycle ) in s.place.items():
+      if t == tile and node_id in s.const:
+        i = 0 if first == None else ( cycle - first ) % II
+        if values[i] != None and values[i] != s.const[ node_id ]:
+          return None
+        values[i] = s.const[ node_id ]
+    return [ 0 if v == None else v for v in values ]
+
+def map_dfg( json_file_name, src_const, width, height, fu_list = None,
+             max_ii = None, mem_tiles = None ):
+  return Mapper( json_file_name, src_const, width, height, fu_list,
+                 mem_tiles ).map( max_ii )
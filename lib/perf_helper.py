@@ -0,0 +1,145 @@
+"""
+==========================================================================
+perf_helper.py
+==========================================================================
+Performance counters for CGRARTL and CGRACL. After every tick of the
+simulation, sample() accumulates the perf_snapshot() of the CGRA: the
+cycles each tile is busy per opcode or idle, the cycles a pending
+operation is held back by rdy, the occupancy of the channels, the use of
+the crossbar outports and the requests on each data memory port (and
+the bank conflicts of a BankedDataMemRTL, or the events of the levels
+of a HierDataMemCL).
+report() turns them into a dict per tile, and format_report() into a
+table.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from . import opt_type
+
+opt_names = { int( value ) : name for name, value in vars( opt_type ).items()
+              if name.startswith( 'OPT_' ) and name != 'OPT_SYMBOL_DICT' }
+
+def get_opt_name( opt ):
+  return opt_names.get( opt, str( opt ) )
+
+class TileCounters:
+
+  def __init__( s, num_channels, num_xbar_outports ):
+    s.busy          = {}
+    s.idle          = 0
+    s.stall         = 0
+    s.channel_total = [ 0 ] * num_channels
+    s.channel_max   = [ 0 ] * num_channels
+    s.xbar          = [ 0 ] * num_xbar_outports
+
+  def sample( s, snapshot ):
+    opt = snapshot['opt']
+    if opt == None or opt == int( opt_type.OPT_NAH ):
+      s.idle += 1
+    else:
+      s.busy[ opt ] = s.busy.get( opt, 0 ) + 1
+    if snapshot['stall']:
+      s.stall += 1
+    for i, count in enumerate( snapshot['channel'] ):
+      s.channel_total[i] += count
+      s.channel_max[i]    = max( s.channel_max[i], count )
+    for i, en in enumerate( snapshot['xbar'] ):
+      s.xbar[i] += en
+
+class PerfCounters:
+
+  def __init__( s ):
+    s.ncycles = 0
+    s.tiles   = None
+    s.reads   = None
+    s.writes  = None
+    s.conflicts = None
+    s.hierarchy = None
+
+  def sample( s, cgra ):
+    snapshot = cgra.perf_snapshot()
+    if s.tiles == None:
+      s.tiles  = [ TileCounters( len( t['channel'] ), len( t['xbar'] ) )
+                   for t in snapshot['tiles'] ]
+      s.reads  = [ 0 ] * len( snapshot['data_mem']['read'] )
+      s.writes = [ 0 ] * len( snapshot['data_mem']['write'] )
+      if 'conflict' in snapshot['data_mem']:
+        s.conflicts = [ 0 ] * len( snapshot['data_mem']['conflict'] )
+      if 'hierarchy' in snapshot['data_mem']:
+        s.hierarchy = { name : 0 for name in snapshot['data_mem']['hierarchy'] }
+    s.ncycles += 1
+    for counters, t in zip( s.tiles, snapshot['tiles'] ):
+      counters.sample( t )
+    for i, en in enumerate( snapshot['data_mem']['read'] ):
+      s.reads[i] += en
+    for i, en in enumerate( snapshot['data_mem']['write'] ):
+      s.writes[i] += en
+    for i, blocked in enumerate( snapshot['data_mem'].get( 'conflict', [] ) ):
+      s.conflicts[i] += blocked
+    for name, n in snapshot['data_mem'].get( 'hierarchy', {} ).items():
+      s.hierarchy[ name ] += n
+
+  def report( s ):
+    ncycles = max( s.ncycles, 1 )
+    tiles   = []
+    for t in ( s.tiles or [] ):
+      busy = sum( t.busy.values() )
+      tiles.append( {
+        'busy'            : { get_opt_name( opt ) : n
+                              for opt, n in sorted( t.busy.items() ) },
+        'busy_cycles'     : busy,
+        'idle_cycles'     : t.idle,
+        'stall_cycles'    : t.stall,
+        'utilization'     : busy / ncycles,
+        'channel_avg'     : [ n / ncycles for n in t.channel_total ],
+        'channel_max'     : list( t.channel_max ),
+        'xbar_out_cycles' : list( t.xbar ),
+      } )
+    data_mem = { 'reads'  : list( s.reads or [] ),
+                 'writes' : list( s.writes or [] ) }
+    if s.conflicts != None:
+      # Read ports, then write ports.
+      data_mem['conflicts'] = list( s.conflicts )
+    if s.hierarchy != None:
+      hierarchy = dict( s.hierarchy )
+      cache_accesses = hierarchy['cache_hits'] + hierarchy['cache_misses']
+      hierarchy['hit_rate']      = hierarchy['cache_hits'] / \
+                                   max( cache_accesses, 1 )
+      hierarchy['mem_bandwidth'] = ( hierarchy['mem_reads'] +
+                                     hierarchy['mem_writes'] ) / ncycles
+      data_mem['hierarchy'] = hierarchy
+    return { 'ncycles'  : s.ncycles,
+             'tiles'    : tiles,
+             'data_mem' : data_mem }
+
+def format_report( report ):
+  header = [ "tile", "util", "busy", "idle", "stall", "xbar", "chan max",
+             "opcodes" ]
+  rows   = [ header ]
+  for i, t in enumerate( report['tiles'] ):
+    rows.append( [ str( i ), f"{t['utilization']:.2f}",
+                   str( t['busy_cycles'] ), str( t['idle_cycles'] ),
+                   str( t['stall_cycles'] ),
+                   str( sum( t['xbar_out_cycles'] ) ),
+                   str( max( t['channel_max'] + [ 0 ] ) ),
+                   " ".join( [ f"{name}:{n}" for name, n in t['busy'].items() ] ) ] )
+  widths = [ max( [ len( row[i] ) for row in rows ] )
+             for i in range( len( header ) ) ]
+  lines  = [ " | ".join( [ cell.ljust( w )
+                           for cell, w in zip( row, widths ) ] ).rstrip()
+             for row in rows ]
+  lines.append( f"ncycles: {report['ncycles']}, data_mem reads: "
+                f"{report['data_mem']['reads']}, writes: "
+                f"{report['data_mem']['writes']}" +
+                ( f", conflicts: {report['data_mem']['conflicts']}"
+                  if 'conflicts' in report['data_mem'] else "" ) )
+  if 'hierarchy' in report['data_mem']:
+    h = report['data_mem']['hierarchy']
+    lines.append( f"spm: {h['spm_accesses']}, cache hits: {h['cache_hits']}, "
+                  f"misses: {h['cache_misses']} ({h['hit_rate']:.2f}), "
+                  f"mem words: {h['mem_reads']}/{h['mem_writes']} "
+                  f"({h['mem_bandwidth']:.2f}/cycle)" )
+  return "\n".join( lines )
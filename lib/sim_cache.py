@@ -0,0 +1,228 @@
+"""
+==========================================================================
+sim_cache.py
+==========================================================================
+Cache of elaborated simulators. Elaborating a CGRA and applying the
+SimulationPass costs far more than simulating a few tens of cycles, so
+the simulator is built once per set of construct parameters and the
+state right after sim_reset() is snapshotted. Asking again for the same
+parameters restores that snapshot and hands back a ready-to-tick model.
+
+The key is a hash of the construct parameters (types are described by
+their fields and bitwidths) and of the source of every module in this
+package, so editing any component invalidates the cached entries. The
+sources are hashed once per process.
+
+Note that the PyMTL simulator can not be written to disk (the message
+types and the update blocks are generated at elaboration time), so the
+cache lives in the process; only the builds of translated models
+persist across runs (see verilator_cache.py). sim_cache is shared by
+all the simulations of a run, e.g., the tests that simulate the FIR
+harness of CGRARTL. A model can not be copied either, so it is handed
+out to one caller at a time: release() gives it back to the cache, and
+asking for the same parameters while every cached model is still out
+elaborates one more. Two callers thus never share a model, and one of
+them can not reset the other.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                      import *
+from pymtl3.datatypes            import is_bitstruct_class, is_bitstruct_inst
+from pymtl3.datatypes.PythonBits import Bits
+from pymtl3.dsl.NamedObject      import NamedObject
+from .bits_helper                import clone_bits
+
+from collections                 import deque
+
+import hashlib
+import numpy as np
+import os
+
+#-------------------------------------------------------------------------
+# Keys
+#-------------------------------------------------------------------------
+
+def describe( x, seen = None ):
+  # A structural description of a construct parameter that does not
+  # depend on object identity. Messages that are passed more than once
+  # (e.g., [ DataType( 5, 1 ) ] * data_mem_size) are shared by the model,
+  # so the repeated ones are described as a reference to the first one.
+  if seen == None:
+    seen = {}
+  if isinstance( x, Bits ):
+    return ( 'Bits', x.nbits, int( x ) )
+  if is_bitstruct_inst( x ):
+    if id( x ) in seen:
+      return ( 'ref', seen[ id( x ) ] )
+    seen[ id( x ) ] = len( seen )
+    return ( type( x ).__name__,
+             tuple( ( name, describe( getattr( x, name ), seen ) )
+                    for name in type( x ).__bitstruct_fields__ ) )
+  if isinstance( x, type ):
+    if issubclass( x, Bits ):
+      return ( 'Bits', x.nbits )
+    if is_bitstruct_class( x ):
+      return ( x.__name__,
+               tuple( ( name, describe( t, seen ) )
+                      for name, t in x.__bitstruct_fields__.items() ) )
+    return ( x.__module__, x.__qualname__ )
+  if isinstance( x, ( list, tuple ) ):
+    return tuple( describe( y, seen ) for y in x )
+  if isinstance( x, dict ):
+    return tuple( ( str( k ), describe( x[k], seen ) )
+                  for k in sorted( x, key = str ) )
+  if x is None or isinstance( x, ( bool, int, float, str ) ):
+    return x
+  return repr( x )
+
+fingerprint = None
+
+def source_fingerprint():
+  # Hash of the source of every module in this package. The sources are
+  # read once per process: the modules that are already imported do not
+  # change until the next run, and the ones imported later are covered
+  # too, so the keys do not depend on the import order.
+  global fingerprint
+  if fingerprint == None:
+    root = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+    h = hashlib.sha1()
+    for dirpath, _, filenames in sorted( os.walk( root ) ):
+      for name in sorted( filenames ):
+        if name.endswith( '.py' ):
+          path = os.path.join( dirpath, name )
+          h.update( os.path.relpath( path, root ).encode() )
+          with open( path, 'rb' ) as f:
+            h.update( f.read() )
+    fingerprint = h.hexdigest()
+  return fingerprint
+
+def elab_key( *args, **kwargs ):
+  h = hashlib.sha1()
+  h.update( repr( describe( [ args, kwargs ] ) ).encode() )
+  h.update( source_fingerprint().encode() )
+  return h.hexdigest()
+
+#-------------------------------------------------------------------------
+# Snapshots
+#-------------------------------------------------------------------------
+
+def _clone( x, memo ):
+  # Copies the simulation state. Objects shared by several signals stay
+  # shared in the copy, and Bits keep their class.
+  if id( x ) in memo:
+    return memo[ id( x ) ]
+  if isinstance( x, Bits ):
+    y = clone_bits( x )
+  elif is_bitstruct_inst( x ):
+    y = object.__new__( type( x ) )
+    memo[ id( x ) ] = y
+    for name, value in x.__dict__.items():
+      setattr( y, name, _clone( value, memo ) )
+    return y
+  elif isinstance( x, list ):
+    y = []
+    memo[ id( x ) ] = y
+    y.extend( [ _clone( v, memo ) for v in x ] )
+    return y
+  elif isinstance( x, np.ndarray ):
+    # Arrays backing the CL memories (e.g., NumpyDataMemCL).
+    y = x.copy()
+  elif isinstance( x, deque ):
+    y = deque( [ _clone( v, memo ) for v in x ] )
+  elif isinstance( x, tuple ):
+    y = tuple( [ _clone( v, memo ) for v in x ] )
+  elif isinstance( x, dict ):
+    y = { k : _clone( v, memo ) for k, v in x.items() }
+  elif _is_native( x ):
+    # Python state of the CL models (e.g., the queues of TileNativeCL).
+    y = object.__new__( type( x ) )
+    memo[ id( x ) ] = y
+    for name, value in x.__dict__.items():
+      setattr( y, name, _clone( value, memo ) )
+    return y
+  else:
+    # Components, interfaces, types and other constants.
+    return x
+  memo[ id( x ) ] = y
+  return y
+
+def _is_native( x ):
+  # Plain objects defined in this package.
+  root = __name__.rsplit( '.', 2 )[0]
+  return hasattr( x, '__dict__' ) and not isinstance( x, ( NamedObject, type ) ) \
+         and not callable( x ) and \
+         type( x ).__module__.startswith( root + '.' )
+
+def _stateful( x ):
+  return isinstance( x, ( Bits, list, deque, tuple, dict ) ) or \
+         is_bitstruct_inst( x ) or not callable( x )
+
+def snapshot( top ):
+  # Takes a copy of all the attributes of the components and interfaces.
+  objs = list( top.get_all_object_filter(
+                 lambda x: isinstance( x, NamedObject ) ) ) + [ top ]
+  attrs = [ ( obj, name, value ) for obj in objs
+            for name, value in obj.__dict__.items()
+            if not name.startswith( '_' ) and _stateful( value ) ]
+  return _clone( attrs, {} )
+
+def restore( snap ):
+  for obj, name, value in _clone( snap, {} ):
+    setattr( obj, name, value )
+
+#-------------------------------------------------------------------------
+# SimCache
+#-------------------------------------------------------------------------
+
+class SimCache:
+
+  def __init__( s ):
+    s.entries = {} # key -> [ ( top, snapshot ) ] of the released models
+    s.lent    = {} # id( top ) -> ( key, top, snapshot )
+    s.hits    = 0
+    s.misses  = 0
+
+  def get_sim( s, Top, *args, params = None, **kwargs ):
+    # Returns Top( *args, **kwargs ) elaborated, simulated and reset,
+    # for the caller only until it is given back with release(). params
+    # maps the paths given to set_param() to their arguments.
+    if params == None:
+      params = {}
+    key = elab_key( Top, args, kwargs, params )
+    if s.entries.get( key ):
+      s.hits += 1
+      top, snap = s.entries[ key ].pop()
+      restore( snap )
+    else:
+      # The model is built from a copy of the parameters, since it
+      # writes into the messages it is given (e.g., the preloaded data
+      # memory).
+      s.misses += 1
+      args, kwargs = _clone( ( args, kwargs ), {} )
+      top = Top( *args, **kwargs )
+      for path, kw in params.items():
+        top.set_param( path, **kw )
+      top.elaborate()
+      top.apply( SimulationPass() )
+      top.sim_reset()
+      snap = snapshot( top )
+    s.lent[ id( top ) ] = ( key, top, snap )
+    return top
+
+  def release( s, top ):
+    # The caller is done with top, the next get_sim() with the same
+    # parameters may hand it out again.
+    if id( top ) not in s.lent:
+      raise Exception( f"{top} was not handed out by this cache!" )
+    key, top, snap = s.lent.pop( id( top ) )
+    s.entries.setdefault( key, [] ).append( ( top, snap ) )
+
+  def clear( s ):
+    # The models still handed out are not cached again.
+    s.entries = {}
+    s.lent    = {}
+
+sim_cache = SimCache()
@@ -0,0 +1,66 @@
+"""
+==========================================================================
+bitstream_test.py
+==========================================================================
+Test cases for the packed control bitstream.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3       import *
+
+from ..messages    import *
+from ..ctrl_helper import *
+from ..bitstream   import *
+
+import os
+
+num_fu_in         = 4
+num_xbar_inports  = 6
+num_xbar_outports = 8
+
+def test_word_layout():
+  CtrlType  = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+  FuInType  = mk_bits( clog2( num_fu_in + 1 ) )
+  RouteType = mk_bits( clog2( num_xbar_inports + 1 ) )
+  layout    = mk_layout( num_fu_in, num_xbar_inports, num_xbar_outports )
+  ctrl      = CtrlType( 5, b1( 1 ),
+                        [ FuInType( x ) for x in [ 1, 2, 0, 0 ] ],
+                        [ RouteType( 7 ) ] + [ RouteType( 0 ) ] * 7,
+                        [ b1( 1 ) ] + [ b1( 0 ) ] * 5 )
+  word      = pack_ctrl( ctrl, layout )
+  assert get_word_nbits( layout ) == 49
+  # ctrl in the most significant bits, predicate_in[0] in the least one.
+  assert word >> 43 == 5
+  assert word & 0x3f == 0x01
+  assert unpack_ctrl( word, CtrlType, layout ) == ctrl
+
+def test_fir_bitstream( tmpdir ):
+  script_dir = os.path.dirname(__file__)
+  json_file  = os.path.join( script_dir, "..", "..", "cgra", "test",
+                             "config_fir.json" )
+  bin_file   = str( tmpdir.join( "config_fir.bin" ) )
+  II         = 4
+  CtrlType   = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+  RouteType  = mk_bits( clog2( num_xbar_inports + 1 ) )
+  cgra_ctrl  = CGRACtrl( json_file, CtrlType, RouteType, 4, 4, num_fu_in,
+                         num_xbar_inports, num_xbar_outports, II )
+
+  encode_json( json_file, bin_file, 4, 4, num_fu_in, num_xbar_inports,
+               num_xbar_outports, II )
+  bitstream = Bitstream( bin_file )
+  assert ( bitstream.width, bitstream.height, bitstream.II ) == ( 4, 4, II )
+  assert os.path.getsize( bin_file ) == header_size + 16 * II * 7
+
+  expected = cgra_ctrl.get_ctrl()
+  loaded   = bitstream.get_ctrl()
+  for i in range( 16 ):
+    assert bitstream.get_words( i ) == \
+           [ pack_ctrl( ctrl, bitstream.layout ) for ctrl in expected[i] ]
+    for ctrl, ref in zip( loaded[i], expected[i] ):
+      assert pack_ctrl( ctrl, bitstream.layout ) == \
+             pack_ctrl( ref, bitstream.layout )
+  assert [ int( a ) for a in bitstream.get_waddr()[0] ] == [ 0, 1, 2, 3 ]
+  bitstream.close()
@@ -0,0 +1,80 @@
+"""
+==========================================================================
+checkpoint_test.py
+==========================================================================
+Test cases for the checkpoints of simulated CGRAs.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                            import *
+
+from ..messages                        import *
+from ..checkpoint                      import *
+from ...fu.flexible.FlexibleFuRTL      import FlexibleFuRTL
+from ...cgra.CGRARTL                   import CGRARTL
+from ...cgra.CGRACL                    import CGRACL
+from ...cgra.test.CGRARTL_FIR_test     import TestHarness
+from ...cgra.test.CGRANumpy_test       import fir_params
+from ...tile.TileCL                    import TileCL
+from ...tile.TileNativeCL              import TileNativeCL, NativeQueue
+
+def test_get_queue():
+  DataType = mk_data( 16, 1 )
+  queue    = NativeQueue( DataType )
+  queue.update( DataType( 1, 1 ), 0 )
+  queue.update( DataType( 2, 0 ), 0 )
+  queue.update( DataType( 3, 1 ), 1 )
+  assert get_queue( queue ) == [ ( 2, 0, 0 ), ( 3, 1, 0 ) ]
+
+def get_cgra( top ):
+  return top.dut if hasattr( top, 'dut' ) else top
+
+def run( top, ncycles ):
+  trace = []
+  for _ in range( ncycles ):
+    top.tick()
+    trace.append( ( top.line_trace(), get_state( get_cgra( top ) ) ) )
+  return trace
+
+def check_restart( top, warmup ):
+  top.elaborate()
+  top.apply( SimulationPass() )
+  top.sim_reset()
+  run( top, warmup )
+  ckpt  = save_checkpoint( top )
+  state = get_state( get_cgra( top ) )
+  trace = run( top, 20 )
+  # Every restart from the checkpoint replays the same cycles.
+  for _ in range( 2 ):
+    restore_checkpoint( ckpt )
+    assert get_state( get_cgra( top ) ) == state
+    assert run( top, 20 ) == trace
+
+def test_fir_rtl():
+  p = fir_params()
+  DataType = p['DataType']
+  th = TestHarness( CGRARTL, FlexibleFuRTL, p['FuList'], DataType,
+                    p['PredicateType'], p['CtrlType'], p['width'],
+                    p['height'], p['ctrl_mem_size'], p['data_mem_size'],
+                    p['src_opt'], p['ctrl_waddr'],
+                    [ DataType( 5, 1 ) ] * p['data_mem_size'],
+                    p['preload_const'] )
+  # The configuration is loaded through recv_wopt during the warm-up.
+  check_restart( th, 8 )
+  # The FIR does not store, the words are still those of preload_data.
+  assert get_state( th.dut )['data_mem'] == \
+         [ ( 5, 1, 0 ) ] * p['data_mem_size']
+
+def test_fir_cl():
+  p = fir_params()
+  DataType = p['DataType']
+  for Tile in [ TileCL, TileNativeCL ]:
+    cgra = CGRACL( FlexibleFuRTL, p['FuList'], DataType, p['PredicateType'],
+                   p['CtrlType'], p['width'], p['height'],
+                   p['ctrl_mem_size'], p['data_mem_size'], 100, p['src_opt'],
+                   [ DataType( 5, 1 ) ] * p['data_mem_size'],
+                   p['preload_const'], Tile = Tile )
+    check_restart( cgra, 6 )
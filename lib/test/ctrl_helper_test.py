@@ -0,0 +1,67 @@
+"""
+==========================================================================
+ctrl_helper_test.py
+==========================================================================
+Test cases for the multicast configuration of the tiles.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3        import *
+
+from ..messages    import *
+from ..ctrl_helper import *
+
+import os
+import pytest
+
+def test_fir_multicast_ctrl():
+  II         = 4
+  width      = 4
+  height     = 4
+  num_tiles  = width * height
+  CtrlType   = mk_ctrl( 4, 6, 8 )
+  RouteType  = mk_bits( clog2( 6 + 1 ) )
+  AddrType   = mk_bits( clog2( II ) )
+  file_path  = os.path.join( os.path.dirname( __file__ ), '..', '..',
+                             'cgra', 'test', 'config_fir.json' )
+  src_opt    = CGRACtrl( file_path, CtrlType, RouteType, width, height,
+                         4, 6, 8, II ).get_ctrl()
+  ctrl_waddr = [ [ AddrType( i ) for i in range( II ) ]
+                 for _ in range( num_tiles ) ]
+
+  # The idle tiles share their words, and the ports send them together:
+  # fewer cycles than as many ports writing one tile each.
+  for num_ports in [ 1, 4, 8 ]:
+    waddrs, opts, masks = mk_multicast_ctrl( src_opt, ctrl_waddr,
+                                             num_ports = num_ports )
+    assert len( masks ) == num_ports
+    num_rounds = len( masks[0] )
+    assert num_rounds * num_ports < num_tiles * II
+
+    # Every tile sees its own program, written once, and the words at
+    # address 0 come after all the others.
+    programs = [ [ None ] * II for _ in range( num_tiles ) ]
+    starting = False
+    for r in range( num_rounds ):
+      used = 0
+      for p in range( num_ports ):
+        mask = int( masks[p][r] )
+        # The masks of a cycle are disjoint.
+        assert mask & used == 0
+        used |= mask
+        for i in range( num_tiles ):
+          if mask & ( 1 << i ):
+            waddr = int( waddrs[p][r] )
+            assert programs[i][ waddr ] == None
+            assert starting <= ( waddr == 0 )
+            starting = waddr == 0
+            programs[i][ waddr ] = opts[p][r]
+    assert programs == [ list( x ) for x in src_opt ]
+
+  # A tile without a word 0 would never start.
+  with pytest.raises( Exception, match = r"tiles \[3\] have none" ):
+    mk_multicast_ctrl( src_opt, ctrl_waddr[:3] + [ ctrl_waddr[3][1:] ] +
+                       ctrl_waddr[4:], num_ports = num_ports )
@@ -0,0 +1,62 @@
+"""
+==========================================================================
+data_helper_test.py
+==========================================================================
+Test cases for the bulk transfers of memory images.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3         import *
+
+from ..messages     import *
+from ..data_helper  import *
+
+import numpy as np
+
+class FakeDataMem:
+
+  def __init__( s, DataType, size ):
+    s.DataType = DataType
+    s.sram     = [ DataType( 0, 0 ) for _ in range( size ) ]
+
+  def load_array( s, payload, predicate = None, base = 0 ):
+    for start, msgs in iter_msgs( s.DataType, payload, predicate ):
+      s.sram[ base + start : base + start + len( msgs ) ] = msgs
+
+  def dump_array( s, base = 0, size = None ):
+    if size == None:
+      size = len( s.sram ) - base
+    return msgs_to_array( s.DataType, s.sram[ base : base + size ] )
+
+def test_iter_msgs():
+  DataType = mk_data( 16, 1 )
+  payload  = np.arange( chunk_size + 3 )
+  chunks   = list( iter_msgs( DataType, payload ) )
+  assert [ start for start, _ in chunks ] == [ 0, chunk_size ]
+  assert chunks[1][1] == [ DataType( chunk_size + i, 1 ) for i in range( 3 ) ]
+
+def test_msgs_to_array():
+  DataType = mk_data( 16, 1 )
+  payload, predicate = msgs_to_array( DataType, [ DataType( 7, 1 ),
+                                                  DataType( 9, 0 ) ] )
+  assert payload.dtype == np.uint16 and predicate.dtype == np.uint8
+  assert payload.tolist() == [ 7, 9 ]
+  assert predicate.tolist() == [ 1, 0 ]
+
+def test_npy( tmpdir ):
+  DataType  = mk_data( 16, 1 )
+  mem       = FakeDataMem( DataType, 8 )
+  payload   = str( tmpdir.join( 'payload.npy' ) )
+  predicate = str( tmpdir.join( 'predicate.npy' ) )
+  np.save( payload,   np.array( [ 3, 4, 5 ], dtype = np.int32 ) )
+  np.save( predicate, np.array( [ 1, 0, 1 ], dtype = np.uint8 ) )
+  load_npy( mem, payload, predicate, base = 2 )
+  assert mem.sram[2:6] == [ DataType( 3, 1 ), DataType( 4, 0 ),
+                            DataType( 5, 1 ), DataType( 0, 0 ) ]
+
+  dump_npy( mem, payload, predicate, 1, 4 )
+  assert np.load( payload ).tolist()   == [ 0, 3, 4, 5 ]
+  assert np.load( predicate ).tolist() == [ 0, 1, 0, 1 ]
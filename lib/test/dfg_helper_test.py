@@ -0,0 +1,50 @@
+"""
+==========================================================================
+dfg_helper_test.py
+==========================================================================
+Test cases for the DFG helper.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from ..messages   import *
+from ..dfg_helper import *
+
+import os
+
+def mk_fir_dfg():
+  script_dir = os.path.dirname(__file__)
+  file_path  = os.path.join( script_dir, "..", "..", "cgra", "test",
+                             "dfg_fir.json" )
+  DataType   = mk_data( 16, 1 )
+  const_data = [ DataType( i, 1 ) for i in range( 6 ) ]
+  return DFG( file_path, const_data, [ 5 for _ in range( 100 ) ] )
+
+def test_get_node():
+  dfg = mk_fir_dfg()
+  for node in dfg.nodes:
+    assert dfg.get_node( node.id ) is node
+    assert get_node( node.id, dfg.nodes ) is node
+    assert get_node( node.id, dfg.node_index ) is node
+  assert dfg.get_node( -1 ) == None
+
+def test_adjacency():
+  dfg = mk_fir_dfg()
+  for node in dfg.nodes:
+    for succ in dfg.get_successors( node.id ):
+      assert node.id in succ.input_node + succ.input_predicate_node
+      assert node in dfg.get_predecessors( succ.id )
+
+def test_topo_order():
+  dfg = mk_fir_dfg()
+  assert sorted( [ node.id for node in dfg.topo_order ] ) == \
+         sorted( [ node.id for node in dfg.nodes ] )
+  position = { node.id : i for i, node in enumerate( dfg.nodes ) }
+  order    = { node.id : i for i, node in enumerate( dfg.topo_order ) }
+  for node in dfg.nodes:
+    for pred in dfg.get_predecessors( node.id ):
+      # Back edges come from nodes listed later in the DFG.
+      if position[ pred.id ] < position[ node.id ]:
+        assert order[ pred.id ] < order[ node.id ]
@@ -0,0 +1,59 @@
+"""
+==========================================================================
+dse_helper_test.py
+==========================================================================
+Test cases for the design-space exploration runner.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from ..dse_helper import *
+
+import os
+import pytest
+
+def mk_fir_kernel():
+  script_dir = os.path.dirname(__file__)
+  file_path  = os.path.join( script_dir, "..", "..", "cgra", "test",
+                             "config_fir.json" )
+  return Kernel( file_path, 4, [ 5 ] * 100,
+                 { ( 1, 1 ) : [ 10 ], ( 2, 1 ) : [ 0, 1 ], ( 2, 2 ) : [ 0, 3 ] },
+                 ( 1, 2 ), expected = 0x4b )
+
+def test_mk_grid():
+  grid = mk_grid( width = [ 2, 4 ], channel_latency = [ 1, 2, 3 ] )
+  assert len( grid ) == 6
+  assert [ ( p['width'], p['channel_latency'] ) for p in grid[:3] ] == \
+         [ ( 2, 1 ), ( 2, 2 ), ( 2, 3 ) ]
+  assert all( [ p['ctrl_mem_size'] == default_point['ctrl_mem_size']
+                for p in grid ] )
+
+def test_fir_dse():
+  # The FIR mapping does not fit on a 1x4 CGRA.
+  grid    = mk_grid( width = [ 4, 1 ] )
+  results = run_dse( grid, mk_fir_kernel(), max_cycles = 24, num_workers = 2 )
+
+  assert results[0]['error'] == None
+  assert results[0]['ncycles'] == 18
+  assert results[0]['ii'] == 4
+  assert results[0]['live_out'] == 0x4b
+  assert results[1]['error'].startswith( 'DesignPointError' )
+
+  table = format_table( results ).split( "\n" )
+  assert len( table ) == 3
+  assert table[0].startswith( "width" )
+
+def test_point_errors():
+  kernel = mk_fir_kernel()
+  point  = dict( default_point, ctrl_mem_size = 2 )
+  assert run_point( point, kernel )['error'].startswith( 'DesignPointError' )
+  # Errors that are not caused by the design point are raised.
+  kernel.config = "missing.json"
+  with pytest.raises( FileNotFoundError ):
+    run_point( default_point, kernel )
+  kernel = mk_fir_kernel()
+  kernel.live_out_port = 2
+  with pytest.raises( IndexError ):
+    run_point( default_point, kernel )
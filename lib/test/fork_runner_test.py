@@ -0,0 +1,148 @@
+"""
+==========================================================================
+fork_runner_test.py
+==========================================================================
+Test cases for the fan-out of simulations from a warm simulator.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                            import *
+
+from ..messages                        import *
+from ..fork_runner                     import *
+from ...fu.flexible.FlexibleFuRTL      import FlexibleFuRTL
+from ...cgra.CGRACL                    import CGRACL
+from ..sim_cache                       import sim_cache
+from ...cgra.test.CGRANumpy_test       import fir_params, get_fir_sim
+
+import os
+import pytest
+
+class FakeDataMem:
+
+  def __init__( s, size ):
+    s.sram = [ 0 ] * size
+
+class FakeCGRA:
+
+  def __init__( s ):
+    s.data_mem = FakeDataMem( 4 )
+    s.tile     = []
+
+  def load_data( s, data, base = 0 ):
+    for i, x in enumerate( data ):
+      s.data_mem.sram[ base + i ] = x
+
+def test_fork_run():
+  cgra = FakeCGRA()
+  variants = [ { 'data' : [ i, i + 1 ] } for i in range( 6 ) ]
+  results  = fork_run( cgra, variants,
+                       lambda top: ( os.getpid(), sum( top.data_mem.sram ) ),
+                       max_workers = 2 )
+  assert [ x[1] for x in results ] == [ 2 * i + 1 for i in range( 6 ) ]
+  assert os.getpid() not in [ x[0] for x in results ]
+  # The parent is left untouched.
+  assert cgra.data_mem.sram == [ 0 ] * 4
+
+def test_fork_run_error():
+  def setup( top ):
+    raise Exception( "bad variant" )
+  with pytest.raises( Exception, match = "bad variant" ):
+    fork_run( FakeCGRA(), [ {}, { 'setup' : setup } ], lambda top: 0 )
+
+def check_fir_variants( p, mk_top, release = None ):
+  DataType = p['DataType']
+
+  def run( top ):
+    for _ in range( 18 ):
+      top.tick()
+    return int( get_cgra( top ).tile[9].element.send_out[0].msg.payload )
+
+  variants = [ { 'data' : [ DataType( i, 1 ) ] * p['data_mem_size'] }
+               for i in range( 1, 5 ) ]
+  top      = mk_top()
+  results  = fork_run( top, variants, run )
+  if release:
+    release( top )
+
+  # Same as simulating each variant from scratch.
+  for variant, result in zip( variants, results ):
+    top = mk_top()
+    apply_variant( top, variant )
+    assert run( top ) == result
+    if release:
+      release( top )
+  return results
+
+def check_const_variants( p, mk_top, release = None ):
+  # The const queue of tile 10 is replaced right after reset, which must
+  # give the same result as preloading the constants.
+  DataType = p['DataType']
+
+  def run( top ):
+    for _ in range( 18 ):
+      top.tick()
+    return int( get_cgra( top ).tile[9].element.send_out[0].msg.payload )
+
+  consts   = [ [ DataType( 0, 1 ), DataType( i, 1 ) ] for i in [ 3, 1 ] ]
+  variants = [ { 'const' : { 10 : x } } for x in consts ]
+  top      = mk_top( p['preload_const'] )
+  results  = fork_run( top, variants, run )
+  if release:
+    release( top )
+
+  for x, result in zip( consts, results ):
+    preload_const     = list( p['preload_const'] )
+    preload_const[10] = x
+    top = mk_top( preload_const )
+    assert run( top ) == result
+    if release:
+      release( top )
+  assert len( set( results ) ) == len( results )
+
+def mk_fir_cgra( p, preload_const = None ):
+  DataType = p['DataType']
+  if preload_const == None:
+    preload_const = p['preload_const']
+  cgra = CGRACL( FlexibleFuRTL, p['FuList'], DataType, p['PredicateType'],
+                 p['CtrlType'], p['width'], p['height'],
+                 p['ctrl_mem_size'], p['data_mem_size'], 100, p['src_opt'],
+                 [ DataType( 5, 1 ) ] * p['data_mem_size'], preload_const )
+  cgra.elaborate()
+  cgra.apply( SimulationPass() )
+  cgra.sim_reset()
+  return cgra
+
+def test_fir_variants():
+  p = fir_params()
+  check_fir_variants( p, lambda: mk_fir_cgra( p ) )
+
+def test_const_variants():
+  p = fir_params()
+  check_const_variants( p, lambda consts: mk_fir_cgra( p, consts ) )
+
+def test_fir_variants_rtl():
+  # The preloaded words of DataMemRTL are replaced through load_data(),
+  # which also clears their initWrites.
+  p = fir_params()
+  DataType = p['DataType']
+
+  def mk_th():
+    return get_fir_sim( p, [ DataType( 5, 1 ) ] * p['data_mem_size'] )
+
+  results = check_fir_variants( p, mk_th, sim_cache.release )
+  # The variants differ in their data, so do the results.
+  assert len( set( results ) ) == len( results )
+
+def test_const_variants_rtl():
+  p = fir_params()
+  DataType = p['DataType']
+
+  def mk_th( preload_const ):
+    return get_fir_sim( dict( p, preload_const = preload_const ),
+                        [ DataType( 5, 1 ) ] * p['data_mem_size'] )
+
+  check_const_variants( p, mk_th, sim_cache.release )
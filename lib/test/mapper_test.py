@@ -0,0 +1,171 @@
+"""
+==========================================================================
+mapper_test.py
+==========================================================================
+Test cases for the modulo-scheduling mapper.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ..messages                   import *
+from ..ctrl_helper                import *
+from ..dfg_helper                 import *
+from ..mapper                     import *
+from ...cgra.CGRAFL               import CGRAFastFL
+from ...cgra.CGRANumpy            import CGRANumpy
+from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
+
+import json
+import os
+import time
+
+num_xbar_inports  = 6
+num_xbar_outports = 8
+
+def fir_file_path():
+  script_dir = os.path.dirname(__file__)
+  return os.path.join( script_dir, "..", "..", "cgra", "test",
+                       "dfg_fir.json" )
+
+def mk_const_data( DataType ):
+  return [ DataType( i, 1 ) for i in range( 6 ) ]
+
+def test_mii():
+  DataType = mk_data( 16, 1 )
+  mapper   = Mapper( fir_file_path(), mk_const_data( DataType ), 4, 4 )
+  assert mapper.res_mii() == 1
+  # The loop of the FIR goes through phi, add and cmp/branch.
+  assert mapper.rec_mii() == 4
+  assert mapper.mii() == 4
+
+def test_map_fir():
+  DataType = mk_data( 16, 1 )
+  mapping  = map_dfg( fir_file_path(), mk_const_data( DataType ), 4, 4 )
+  assert mapping.II == 4
+
+  dfg = DFG( fir_file_path(), mk_const_data( DataType ), None )
+  assert sorted( mapping.placement.keys() ) == \
+         sorted( [ node.id for node in dfg.nodes ] )
+  slots = set()
+  for node_id, ( x, y, t ) in mapping.placement.items():
+    assert ( x, y, t % mapping.II ) not in slots
+    slots.add( ( x, y, t % mapping.II ) )
+    if dfg.get_node( node_id ).fu_type == MemUnitRTL:
+      assert x == 0
+
+def test_map_mem_tiles():
+  # Memory operations only go to the tiles connected to the data memory.
+  DataType  = mk_data( 16, 1 )
+  mem_tiles = [ i * 4 + 3 for i in range( 4 ) ]
+  mapping   = map_dfg( fir_file_path(), mk_const_data( DataType ), 4, 4,
+                       mem_tiles = mem_tiles )
+  dfg = DFG( fir_file_path(), mk_const_data( DataType ), None )
+  for node_id, ( x, y, t ) in mapping.placement.items():
+    if dfg.get_node( node_id ).fu_type == MemUnitRTL:
+      assert y * 4 + x in mem_tiles
+
+def test_const_conflict():
+  # Two consts on the same entry of a const queue reject the schedule.
+  DataType = mk_data( 16, 1 )
+  mapper   = Mapper( fir_file_path(), mk_const_data( DataType ), 4, 4 )
+  mapper.II    = 2
+  mapper.xbar  = {}
+  mapper.place = { 0 : ( 5, 0 ), 1 : ( 5, 2 ) }
+  mapper.const = { 0 : 3, 1 : 3 }
+  assert mapper._const_list( 5 ) == [ 3, 0 ]
+  mapper.const = { 0 : 3, 1 : 4 }
+  assert mapper._const_list( 5 ) == None
+
+def mk_kernels_dfg( file_path, num_kernels ):
+  # num_kernels independent kernels of five operations: a load and two
+  # additions and multiplications, each one on the two values before it.
+  nodes = []
+  for k in range( num_kernels ):
+    b = len( nodes )
+    body = [ ( "MemUnit", "OPT_LD",  [],             [ k % 6 ] ),
+             ( "Adder",   "OPT_ADD", [ b, b ],         [] ),
+             ( "Mul",     "OPT_MUL", [ b + 1, b ],     [] ),
+             ( "Adder",   "OPT_ADD", [ b + 2, b + 1 ], [] ),
+             ( "Mul",     "OPT_MUL", [ b + 3, b + 2 ], [] ) ]
+    for i, ( fu, opt, ins, consts ) in enumerate( body ):
+      nodes.append( { "fu" : fu, "id" : b + i, "opt" : opt,
+                      "opt_predicate" : 0, "in_const" : consts, "in" : ins,
+                      "in_predicate" : [], "out" : [ [] ] } )
+  for node in nodes:
+    for src in sorted( set( node["in"] ) ):
+      nodes[ src ]["out"][0].append( node["id"] )
+  with open( file_path, 'w' ) as f:
+    json.dump( nodes, f )
+
+def test_map_scale( tmpdir ):
+  # 250 nodes on an 8x8 array, see the docstring of mapper.py.
+  DataType  = mk_data( 16, 1 )
+  file_path = str( tmpdir.join( "dfg_kernels.json" ) )
+  mk_kernels_dfg( file_path, 50 )
+  mapper = Mapper( file_path, mk_const_data( DataType ), 8, 8 )
+  assert mapper.mii() == 7
+  # CPU time, the tests may run in parallel.
+  start   = time.process_time()
+  mapping = mapper.map()
+  assert time.process_time() - start < 60
+  assert len( mapping.placement ) == 250
+  assert mapping.II <= 3 * mapper.mii()
+
+def test_simulate_fir( tmpdir ):
+  width         = 4
+  height        = 4
+  num_tiles     = width * height
+  num_fu_in     = 4
+  data_mem_size = 100
+  DataType      = mk_data( 16, 1 )
+  PredicateType = mk_predicate( 1, 1 )
+  CtrlType      = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+  RouteType     = mk_bits( clog2( num_xbar_inports + 1 ) )
+  const_data    = mk_const_data( DataType )
+
+  mapping   = map_dfg( fir_file_path(), const_data, width, height )
+  II        = mapping.II
+  AddrType  = mk_bits( clog2( II ) )
+  file_path = str( tmpdir.join( "config_fir.json" ) )
+  mapping.write( file_path )
+
+  cgra_ctrl  = CGRACtrl( file_path, CtrlType, RouteType, width, height,
+                         num_fu_in, num_xbar_inports, num_xbar_outports, II )
+  ctrl_waddr = [ [ AddrType( i ) for i in range( II ) ]
+                 for _ in range( num_tiles ) ]
+  engine = CGRANumpy( DataType, PredicateType, CtrlType, width, height, II,
+                      data_mem_size, 100, FlexibleFuRTL, default_fu_list,
+                      [ DataType( 5, 1 ) ] * data_mem_size,
+                      mapping.get_preload_const( DataType ) )
+  engine.set_ctrl_stream( cgra_ctrl.get_ctrl(), ctrl_waddr )
+  engine.sim_reset()
+
+  # The result of each iteration of the FL reference.
+  def run_fl( max_iterations = None ):
+    fu_dfg = DFG( fir_file_path(), const_data,
+                  [ 5 for _ in range( data_mem_size ) ] )
+    return CGRAFastFL( fu_dfg, DataType, mk_ctrl(), const_data,
+                       max_iterations = max_iterations )[0]
+  expected = [ run_fl( 1 ) ]
+  while expected[-1] != run_fl():
+    expected.append( run_fl( len( expected ) + 1 ) )
+
+  # The live-out node is issued in cycle t + i * II of iteration i and
+  # its result is sent out in the next tick (the control memory starts
+  # a cycle after reset).
+  live_out = [ node.id for node in DFG( fir_file_path(), const_data, None ).nodes
+               if node.live_out_val ][0]
+  x, y, t = mapping.placement[ live_out ]
+  assert mapping.live_out == ( x, y )
+  tile = y * width + x
+  outs = {}
+  for i in range( t + 2 + len( expected ) * II ):
+    engine.tick()
+    if engine.el_out_en[0][tile][0]:
+      outs[i] = engine.get_fu_out( tile ).payload
+  assert [ outs.get( t + 1 + i * II ) for i in range( len( expected ) ) ] \
+         == expected
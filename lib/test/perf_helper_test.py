@@ -0,0 +1,90 @@
+"""
+==========================================================================
+perf_helper_test.py
+==========================================================================
+Test cases for the performance counters.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from ..opt_type    import *
+from ..perf_helper import *
+
+class FakeCGRA:
+
+  def __init__( s, snapshots ):
+    s.snapshots = snapshots
+    s.cycle     = 0
+
+  def perf_snapshot( s ):
+    snapshot = s.snapshots[ s.cycle ]
+    s.cycle += 1
+    return snapshot
+
+def mk_snapshot( opt, stall, channel, xbar, read, write ):
+  return { 'tiles'    : [ { 'opt' : opt, 'stall' : stall,
+                            'channel' : channel, 'xbar' : xbar } ],
+           'data_mem' : { 'read' : read, 'write' : write } }
+
+def test_report():
+  cgra = FakeCGRA( [
+    mk_snapshot( int( OPT_ADD ), False, [ 1, 0 ], [ 1, 0 ], [ 1 ], [ 0 ] ),
+    mk_snapshot( int( OPT_ADD ), False, [ 2, 0 ], [ 1, 1 ], [ 0 ], [ 1 ] ),
+    mk_snapshot( int( OPT_NAH ), False, [ 1, 0 ], [ 0, 0 ], [ 0 ], [ 0 ] ),
+    mk_snapshot( None,           True,  [ 0, 0 ], [ 0, 0 ], [ 1 ], [ 0 ] ),
+  ] )
+  counters = PerfCounters()
+  for _ in range( 4 ):
+    counters.sample( cgra )
+  report = counters.report()
+
+  assert report['ncycles'] == 4
+  tile = report['tiles'][0]
+  assert tile['busy'] == { 'OPT_ADD' : 2 }
+  assert tile['busy_cycles'] == 2
+  assert tile['idle_cycles'] == 2
+  assert tile['stall_cycles'] == 1
+  assert tile['utilization'] == 0.5
+  assert tile['channel_avg'] == [ 1.0, 0.0 ]
+  assert tile['channel_max'] == [ 2, 0 ]
+  assert tile['xbar_out_cycles'] == [ 2, 1 ]
+  assert report['data_mem'] == { 'reads' : [ 2 ], 'writes' : [ 1 ] }
+
+  table = format_report( report ).split( "\n" )
+  assert table[0].startswith( "tile" )
+  assert "OPT_ADD:2" in table[1]
+
+def test_report_conflicts():
+  snapshots = [ mk_snapshot( None, False, [ 0 ], [ 0 ], [ 1, 1 ], [ 0 ] )
+                for _ in range( 3 ) ]
+  for snapshot, conflict in zip( snapshots, [ [ 0, 1, 0 ], [ 0, 0, 0 ],
+                                              [ 1, 0, 0 ] ] ):
+    snapshot['data_mem']['conflict'] = conflict
+  cgra     = FakeCGRA( snapshots )
+  counters = PerfCounters()
+  for _ in range( 3 ):
+    counters.sample( cgra )
+  report = counters.report()
+  assert report['data_mem']['conflicts'] == [ 1, 1, 0 ]
+  assert "conflicts: [1, 1, 0]" in format_report( report )
+
+def test_report_hierarchy():
+  snapshots = [ mk_snapshot( None, False, [ 0 ], [ 0 ], [ 1 ], [ 0 ] )
+                for _ in range( 4 ) ]
+  for snapshot, ( hits, misses ) in zip( snapshots, [ ( 0, 1 ), ( 1, 0 ),
+                                                      ( 1, 0 ), ( 0, 0 ) ] ):
+    snapshot['data_mem']['hierarchy'] = {
+      'spm_accesses' : 0, 'cache_hits' : hits, 'cache_misses' : misses,
+      'mem_reads' : 4 * misses, 'mem_writes' : 0 }
+  cgra     = FakeCGRA( snapshots )
+  counters = PerfCounters()
+  for _ in range( 4 ):
+    counters.sample( cgra )
+  hierarchy = counters.report()['data_mem']['hierarchy']
+  assert hierarchy['cache_hits'] == 2
+  assert hierarchy['cache_misses'] == 1
+  assert hierarchy['hit_rate'] == 2 / 3
+  assert hierarchy['mem_bandwidth'] == 1.0
+  assert "cache hits: 2, misses: 1" in format_report( counters.report() )
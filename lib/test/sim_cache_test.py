@@ -0,0 +1,73 @@
+"""
+==========================================================================
+sim_cache_test.py
+==========================================================================
+Test cases for the cache of elaborated simulators.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                            import *
+
+from ..messages                        import *
+from ..sim_cache                       import SimCache, elab_key
+from ...fu.flexible.FlexibleFuRTL      import FlexibleFuRTL
+from ...cgra.CGRARTL                   import CGRARTL
+from ...cgra.test.CGRARTL_FIR_test     import TestHarness, run_CGRAFL
+from ...cgra.test.CGRANumpy_test       import fir_params
+
+import pytest
+
+def test_elab_key():
+  DataType = mk_data( 16, 1 )
+  shared   = [ DataType( 5, 1 ) ] * 4
+  distinct = [ DataType( 5, 1 ) for _ in range( 4 ) ]
+  assert elab_key( DataType, 4, distinct ) == \
+         elab_key( mk_data( 16, 1 ), 4, [ DataType( 5, 1 ) for _ in range( 4 ) ] )
+  assert elab_key( DataType, 4, distinct ) != elab_key( DataType, 8, distinct )
+  assert elab_key( DataType, 4, distinct ) != \
+         elab_key( mk_data( 32, 1 ), 4, distinct )
+  assert elab_key( DataType, 4, distinct ) != elab_key( DataType, 4, shared )
+
+def run( th, ncycles ):
+  trace = []
+  for i in range( ncycles ):
+    th.tick()
+    trace.append( th.line_trace() )
+  return trace, th.output_target_value()
+
+def test_fir_cache_hit():
+  p = fir_params()
+  DataType  = p['DataType']
+  num_tiles = p['width'] * p['height']
+  args = ( CGRARTL, FlexibleFuRTL, p['FuList'], DataType, p['PredicateType'],
+           p['CtrlType'], p['width'], p['height'], p['ctrl_mem_size'],
+           p['data_mem_size'], p['src_opt'], p['ctrl_waddr'],
+           [ DataType( 5, 1 ) ] * p['data_mem_size'], p['preload_const'] )
+  params = { "top.dut.tile["+str(i)+"].construct" : { 'FuList' : p['FuList'] }
+             for i in range( num_tiles ) }
+
+  cache = SimCache()
+  th = cache.get_sim( TestHarness, *args, params = params )
+  trace, target = run( th, 18 )
+  assert target == run_CGRAFL()[0]
+
+  # A model still in use is not handed out again, nor reset: the second
+  # request elaborates another one. Its update blocks may be scheduled in
+  # another order, which changes the leftover messages of idle ports in
+  # the line trace, so only the result is compared.
+  th2 = cache.get_sim( TestHarness, *args, params = params )
+  assert th2 is not th
+  assert cache.hits == 0 and cache.misses == 2
+  assert run( th2, 18 )[1] == target
+
+  # Once released, a request restores the reset state of the same
+  # simulator.
+  cache.release( th )
+  assert cache.get_sim( TestHarness, *args, params = params ) is th
+  assert cache.hits == 1 and cache.misses == 2
+  assert run( th, 18 ) == ( trace, target )
+  with pytest.raises( Exception ):
+    cache.release( object() )
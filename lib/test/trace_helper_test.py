@@ -0,0 +1,93 @@
+"""
+==========================================================================
+trace_helper_test.py
+==========================================================================
+Test cases for the structured tracing.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from types          import SimpleNamespace
+
+from ..opt_type     import *
+from ..trace_helper import *
+
+num_xbar_outports = 8
+
+def mk_port( en, payload = 0, predicate = 0 ):
+  return SimpleNamespace( en = en, msg = SimpleNamespace(
+                          payload = payload, predicate = predicate ) )
+
+class FakeTile:
+
+  def __init__( s ):
+    s.ctrl_mem = SimpleNamespace( send_ctrl = mk_port( 0 ) )
+    s.crossbar = SimpleNamespace( send_data = [ mk_port( 0 ) for _ in
+                                                range( num_xbar_outports ) ] )
+
+  def set( s, opt, routes, value ):
+    # routes maps crossbar outports to the ( 1-based ) inports.
+    ctrl = s.ctrl_mem.send_ctrl
+    ctrl.en          = opt != None
+    ctrl.msg.ctrl    = opt if opt != None else OPT_NAH
+    ctrl.msg.outport = [ routes.get( j, 0 ) for j in range( num_xbar_outports ) ]
+    for j, out in enumerate( s.crossbar.send_data ):
+      out.en            = j in routes
+      out.msg.payload   = value
+      out.msg.predicate = 1
+
+def mk_cgra():
+  return SimpleNamespace( tile = [ FakeTile() for _ in range( 4 ) ] )
+
+def test_off():
+  tracer = Tracer( mk_cgra(), TRACE_OFF )
+  tracer.sample()
+  assert len( tracer.events() ) == 0
+
+def test_ring_buffer():
+  cgra   = mk_cgra()
+  tracer = Tracer( cgra, TRACE_DATA, capacity = 2 )
+  for cycle in range( 3 ):
+    cgra.tile[0].set( OPT_ADD, { EAST : 5 }, cycle )
+    cgra.tile[1].set( None, {}, 0 )
+    tracer.sample()
+  events = tracer.events()
+  # Only the last two cycles are kept.
+  assert list( events['cycle'] ) == [ 1, 1, 1, 1, 2, 2, 2, 2 ]
+  assert events[4]['opt'] == int( OPT_ADD )
+  assert events[4]['routes'][EAST] == 5
+  assert events[4]['values'][EAST] == 2
+  assert events[5]['opt'] == no_opt
+  assert "[tile0] OPT_ADD 3<4:(2,1)" in format_events( events )
+
+def test_opt_level():
+  cgra   = mk_cgra()
+  tracer = Tracer( cgra, TRACE_OPT )
+  cgra.tile[0].set( OPT_ADD, { EAST : 5 }, 7 )
+  tracer.sample()
+  event = tracer.events()[0]
+  assert event['opt'] == int( OPT_ADD )
+  assert event['routes'][EAST] == 0
+  assert event['values'][EAST] == 0
+
+def test_file( tmpdir ):
+  cgra      = mk_cgra()
+  file_name = str( tmpdir.join( "trace.bin" ) )
+  tracer    = Tracer( cgra, TRACE_ROUTE, capacity = 2, file_name = file_name )
+  for cycle in range( 5 ):
+    cgra.tile[0].set( OPT_MUL, { NORTH : 5, EAST : 6 }, cycle )
+    cgra.tile[3].set( OPT_INC, { SOUTH : 5, WEST : 5 }, cycle )
+    tracer.sample()
+  tracer.close()
+  events = load_trace( file_name )
+  assert len( events ) == 5 * 4
+  assert list( events['cycle'][::4] ) == [ 0, 1, 2, 3, 4 ]
+
+  schedule = format_schedule( events[ events['cycle'] == 0 ], 2, 2 )
+  assert schedule.split( "\n" ) == [
+    "------------- cycle:0 ---------------",
+    "[       ] ← [  INC  ]",
+    "    ↑           ↓",
+    "[  MUL  ] → [       ]" ]
@@ -0,0 +1,82 @@
+"""
+==========================================================================
+verilator_cache_test.py
+==========================================================================
+Test cases for the key and the lookup of the Verilator build cache. The
+build itself is replaced by writing a fake shared library, so these run
+without Verilator.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3.passes.backends.verilog import VerilatorImportConfigs
+
+from ..verilator_cache              import CachedVerilatorImportPass
+
+import os
+
+class FakeBuildPass( CachedVerilatorImportPass ):
+
+  def __init__( s ):
+    super().__init__()
+    s.nbuilds = 0
+
+  def create_verilator_model( s, m, ph_cfg, ip_cfg, cached ):
+    pass
+
+  def create_shared_lib( s, m, ph_cfg, ip_cfg, cached ):
+    s.nbuilds += 1
+    with open( ip_cfg.get_shared_lib_path(), 'w' ) as f:
+      f.write( f"build {s.nbuilds}" )
+
+def mk_cfg( top, verilog ):
+  ip_cfg = VerilatorImportConfigs()
+  ip_cfg.translated_top_module  = top
+  ip_cfg.translated_source_file = f"{top}.v"
+  with open( ip_cfg.translated_source_file, 'w' ) as f:
+    f.write( verilog )
+  with open( ip_cfg.get_c_wrapper_path(), 'w' ) as f:
+    f.write( f"// wrapper of {top}" )
+  return ip_cfg
+
+def read( path ):
+  with open( path ) as f:
+    return f.read()
+
+def test_cache_key( tmpdir, monkeypatch ):
+  monkeypatch.chdir( str( tmpdir ) )
+  p   = CachedVerilatorImportPass()
+  key = p.get_cache_key( mk_cfg( 'Top', "module Top; endmodule" ) )
+  assert key == p.get_cache_key( mk_cfg( 'Top', "module Top; endmodule" ) )
+
+  # The Verilog, the top module and the import configs are all part of it.
+  assert key != p.get_cache_key( mk_cfg( 'Top', "module Top(); endmodule" ) )
+  assert key != p.get_cache_key( mk_cfg( 'Top2', "module Top; endmodule" ) )
+  ip_cfg = mk_cfg( 'Top', "module Top; endmodule" )
+  ip_cfg.vl_Wno_list = ip_cfg.vl_Wno_list + [ 'ALWCOMBORDER' ]
+  assert key != p.get_cache_key( ip_cfg )
+
+def test_hit_miss( tmpdir, monkeypatch ):
+  monkeypatch.chdir( str( tmpdir.mkdir( 'work' ) ) )
+  monkeypatch.setenv( 'OPENCGRA_VERILATOR_CACHE', str( tmpdir.join( 'cache' ) ) )
+  p = FakeBuildPass()
+
+  ip_cfg = mk_cfg( 'Top', "module Top; endmodule" )
+  assert not p.get_shared_lib( None, None, ip_cfg )
+  assert p.nbuilds == 1
+
+  # A fresh directory with the same design copies the library back.
+  monkeypatch.chdir( str( tmpdir.mkdir( 'checkout' ) ) )
+  ip_cfg = mk_cfg( 'Top', "module Top; endmodule" )
+  assert p.get_shared_lib( None, None, ip_cfg )
+  assert p.nbuilds == 1
+  assert read( ip_cfg.get_shared_lib_path() ) == "build 1"
+
+  # Another design is built again.
+  ip_cfg = mk_cfg( 'Top', "module Top(); endmodule" )
+  assert not p.get_shared_lib( None, None, ip_cfg )
+  assert p.nbuilds == 2
+  assert read( ip_cfg.get_shared_lib_path() ) == "build 2"
+  assert len( os.listdir( str( tmpdir.join( 'cache' ) ) ) ) == 2
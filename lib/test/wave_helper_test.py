@@ -0,0 +1,120 @@
+"""
+==========================================================================
+wave_helper_test.py
+==========================================================================
+Test cases for the waveform dump.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                         import *
+from types                          import SimpleNamespace
+
+from ..opt_type                     import *
+from ..wave_helper                  import *
+from ..sim_cache                    import sim_cache
+from ...cgra.test.CGRANumpy_test    import fir_params, get_fir_sim
+from ...cgra.test.CGRARTL_FIR_test  import run_CGRAFL
+
+import os
+
+def mk_port( payload ):
+  return SimpleNamespace( en = 1, rdy = 0, msg = SimpleNamespace(
+                          payload = b16( payload ), predicate = b1( 1 ) ) )
+
+class FakeTile:
+
+  def __init__( s, id ):
+    s.recv_data = [ mk_port( 0 ) for _ in range( 4 ) ]
+    s.send_data = [ mk_port( 0 ) for _ in range( 4 ) ]
+    s.channel   = [ SimpleNamespace( count = 0 ) for _ in range( 8 ) ]
+    s.ctrl_mem  = SimpleNamespace(
+      send_ctrl  = SimpleNamespace( en = 1, rdy = 1,
+                                    msg = SimpleNamespace( ctrl = OPT_ADD ) ),
+      recv_waddr = SimpleNamespace( en = 0, msg = b2( 0 ) ),
+      recv_ctrl  = SimpleNamespace( en = 0 ),
+      cur        = b2( 0 ) )
+    s.id = id
+
+  def tick( s, cycle ):
+    for j, port in enumerate( s.send_data ):
+      port.msg.payload = b16( 1000 * s.id + 10 * cycle + j )
+    s.channel[5].count = cycle % 3
+    s.ctrl_mem.cur     = b2( cycle % 4 )
+
+def test_record( tmpdir ):
+  cgra      = SimpleNamespace( tile = [ FakeTile( i ) for i in range( 4 ) ] )
+  file_name = str( tmpdir.join( "wave.bin" ) )
+  recorder  = WaveRecorder( cgra, file_name, chunk_size = 7 )
+  for cycle in range( 20 ):
+    for tile in cgra.tile:
+      tile.tick( cycle )
+    recorder.sample()
+  recorder.close()
+  assert os.listdir( str( tmpdir ) ) == [ "wave.bin" ]
+
+  wave = Waveform( file_name )
+  assert wave.ncycles == 20
+  assert wave.num_tiles == 4
+  assert "channel_count" in wave.get_signals()
+
+  payload = wave.get( "send_data.payload", 5, 10, tile = 2 )
+  assert payload.shape == ( 5, 4 )
+  assert payload.dtype == np.uint16
+  assert list( payload[ :, 3 ] ) == [ 2053, 2063, 2073, 2083, 2093 ]
+  assert list( wave.get( "channel_count", 0, 4, tile = 1 )[ :, 5 ] ) == \
+         [ 0, 1, 2, 0 ]
+  assert list( wave.get( "ctrl_addr.raddr", tile = 0 )[ :5, 0 ] ) == \
+         [ 0, 1, 2, 3, 0 ]
+  assert ( wave.get( "ctrl.opt" ) == int( OPT_ADD ) ).all()
+  assert ( wave.get( "recv_data.en" ) == 1 ).all()
+  assert ( wave.get( "recv_data.rdy" ) == 0 ).all()
+
+def test_groups( tmpdir ):
+  cgra      = SimpleNamespace( tile = [ FakeTile( 0 ) ] )
+  file_name = str( tmpdir.join( "wave.bin" ) )
+  recorder  = WaveRecorder( cgra, file_name, groups = [ 'channel_count' ] )
+  recorder.close()
+  wave = Waveform( file_name )
+  assert wave.get_signals() == [ "channel_count" ]
+  assert wave.get( "channel_count" ).shape == ( 0, 1, 8 )
+
+def test_record_cgra_rtl( tmpdir ):
+  # Records the FIR on CGRARTL, every signal is checked against the
+  # model sampled directly after each tick.
+  p = fir_params()
+  DataType = p['DataType']
+  th = get_fir_sim( p, [ DataType( 5, 1 ) ] * p['data_mem_size'] )
+
+  file_name = str( tmpdir.join( "fir.bin" ) )
+  recorder  = WaveRecorder( th.dut, file_name, chunk_size = 5 )
+  payload, en, opt, raddr, count = [], [], [], [], []
+  for cycle in range( 18 ):
+    th.tick()
+    recorder.sample()
+    tiles = th.dut.tile
+    payload.append( [ [ int( x.msg.payload ) for x in tile.send_data ]
+                      for tile in tiles ] )
+    en     .append( [ [ int( x.en ) for x in tile.send_data ]
+                      for tile in tiles ] )
+    opt    .append( [ [ int( tile.ctrl_mem.send_ctrl.msg.ctrl ) ]
+                      for tile in tiles ] )
+    raddr  .append( [ [ int( tile.ctrl_mem.reg_file.raddr[0] ) ]
+                      for tile in tiles ] )
+    count  .append( [ [ int( x.count ) for x in tile.channel ]
+                      for tile in tiles ] )
+  recorder.close()
+
+  wave = Waveform( file_name )
+  assert wave.ncycles == 18
+  assert wave.num_tiles == 16
+  assert wave.get( "send_data.payload" ).tolist() == payload
+  assert wave.get( "send_data.en" ).tolist() == en
+  assert wave.get( "ctrl.opt" ).tolist() == opt
+  assert wave.get( "ctrl_addr.raddr" ).tolist() == raddr
+  assert wave.get( "channel_count" ).tolist() == count
+  assert wave.get( "send_data.en" ).any()
+  assert th.output_target_value() == run_CGRAFL()[0]
+  sim_cache.release( th )
@@ -0,0 +1,214 @@
+"""
+==========================================================================
+trace_helper.py
+==========================================================================
+Structured tracing for CGRARTL and CGRACL. Instead of building the
+line_trace strings of every tile each cycle, a Tracer records one typed
+event per tile and cycle into a preallocated ring buffer:
+
+  cycle, tile, opcode issued to the FU (no_opt if none), the inport
+  routed to each crossbar outport, and the value/predicate on each
+  crossbar outport
+
+How much of an event is filled depends on the trace level (the rest is
+left zero). Tracing is off by default; the level is taken from the
+CGRA_TRACE environment variable unless given explicitly. When a file is
+given, the buffer is appended to it every time it fills up, otherwise
+only the last `capacity` cycles are kept. Strings are only rendered on
+demand by format_events() and format_schedule().
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from .perf_helper import get_opt_name
+
+import numpy as np
+
+import os
+import struct
+
+# Trace levels.
+TRACE_OFF   = 0
+TRACE_OPT   = 1 # opcode of each tile
+TRACE_ROUTE = 2 # + routes taken by the crossbar
+TRACE_DATA  = 3 # + values sent by the crossbar
+TRACE_LINE  = 4 # + the eager line_trace of the test harness
+
+# Opcode recorded when the FU gets no operation in a cycle.
+no_opt = 0xff
+
+magic       = b'CGTR'
+header_fmt  = '<4sHH'
+header_size = struct.calcsize( header_fmt )
+
+# Same directions as CGRARTL.
+NORTH = 0
+SOUTH = 1
+WEST  = 2
+EAST  = 3
+
+def get_trace_level():
+  return int( os.environ.get( 'CGRA_TRACE', TRACE_OFF ) )
+
+def mk_event_dtype( num_xbar_outports ):
+  return np.dtype( [ ( 'cycle',     '<u4' ),
+                     ( 'tile',      '<u2' ),
+                     ( 'opt',       'u1'  ),
+                     ( 'routes',    'u1',  ( num_xbar_outports, ) ),
+                     ( 'values',    '<i8', ( num_xbar_outports, ) ),
+                     ( 'predicate', 'u1',  ( num_xbar_outports, ) ) ] )
+
+def get_num_xbar_outports( tile ):
+  if hasattr( tile, 'trace_snapshot' ):
+    return tile.num_xbar_outports
+  return len( tile.crossbar.send_data )
+
+def get_trace_snapshot( tile ):
+  # The opcode issued to the FU (None if none) and the inport routed to,
+  # and the message on, each crossbar outport in use. TileNativeCL keeps
+  # no crossbar signals and provides its own.
+  if hasattr( tile, 'trace_snapshot' ):
+    return tile.trace_snapshot()
+  ctrl = tile.ctrl_mem.send_ctrl
+  outs = tile.crossbar.send_data
+  return { 'opt'    : int( ctrl.msg.ctrl ) if ctrl.en else None,
+           'routes' : [ int( ctrl.msg.outport[j] ) if outs[j].en else 0
+                        for j in range( len( outs ) ) ],
+           'msgs'   : [ x.msg if x.en else None for x in outs ] }
+
+#-------------------------------------------------------------------------
+# Tracer
+#-------------------------------------------------------------------------
+
+class Tracer:
+
+  def __init__( s, cgra, level = None, capacity = 1024, file_name = None ):
+    s.cgra      = cgra
+    s.level     = get_trace_level() if level == None else level
+    s.num_tiles = len( cgra.tile )
+    s.num_xbar_outports = get_num_xbar_outports( cgra.tile[0] )
+    s.dtype     = mk_event_dtype( s.num_xbar_outports )
+    s.capacity  = capacity
+    s.buf       = np.zeros( capacity * s.num_tiles, dtype = s.dtype )
+    s.head      = 0
+    s.count     = 0
+    s.ncycles   = 0
+    s.file      = None
+    if s.level > TRACE_OFF and file_name != None:
+      s.file = open( file_name, 'wb' )
+      s.file.write( struct.pack( header_fmt, magic, s.num_tiles,
+                                 s.num_xbar_outports ) )
+
+  def sample( s ):
+    # Call once after every tick.
+    if s.level == TRACE_OFF:
+      return
+    if s.count == s.capacity and s.file != None:
+      s.flush()
+    # Overwrites the oldest cycle once the buffer is full.
+    base = ( ( s.head + s.count ) % s.capacity ) * s.num_tiles
+    for i, tile in enumerate( s.cgra.tile ):
+      event    = s.buf[ base + i ]
+      snapshot = get_trace_snapshot( tile )
+      event['cycle'] = s.ncycles
+      event['tile']  = i
+      event['opt']   = no_opt if snapshot['opt'] == None else snapshot['opt']
+      if s.level < TRACE_ROUTE:
+        continue
+      event['routes']    = 0
+      event['values']    = 0
+      event['predicate'] = 0
+      for j, msg in enumerate( snapshot['msgs'] ):
+        if msg is None:
+          continue
+        event['routes'][j] = snapshot['routes'][j]
+        if s.level >= TRACE_DATA:
+          event['values'][j]    = int( msg.payload )
+          event['predicate'][j] = int( msg.predicate )
+    if s.count < s.capacity:
+      s.count += 1
+    else:
+      s.head = ( s.head + 1 ) % s.capacity
+    s.ncycles += 1
+
+  def events( s ):
+    # The buffered events in cycle order.
+    order = [ ( s.head + i ) % s.capacity for i in range( s.count ) ]
+    return np.concatenate( [ s.buf[ c * s.num_tiles : ( c + 1 ) * s.num_tiles ]
+                             for c in order ] ) if order else s.buf[ :0 ]
+
+  def flush( s ):
+    s.events().tofile( s.file )
+    s.head  = 0
+    s.count = 0
+
+  def close( s ):
+    if s.file != None:
+      s.flush()
+      s.file.close()
+      s.file = None
+
+def load_trace( file_name ):
+  # The events written by a Tracer, mapped from the file.
+  with open( file_name, 'rb' ) as f:
+    tag, _, num_xbar_outports = struct.unpack( header_fmt,
+                                               f.read( header_size ) )
+  if tag != magic:
+    raise Exception( f"{file_name} is not a CGRA trace!" )
+  return np.memmap( file_name, dtype = mk_event_dtype( num_xbar_outports ),
+                    mode = 'r', offset = header_size )
+
+#-------------------------------------------------------------------------
+# Rendering
+#-------------------------------------------------------------------------
+
+def format_events( events ):
+  lines = []
+  for event in events:
+    opt  = "-" if event['opt'] == no_opt else get_opt_name( event['opt'] )
+    outs = [ f"{j}<{r-1}:({v},{p})"
+             for j, ( r, v, p ) in enumerate( zip( event['routes'],
+                                                   event['values'],
+                                                   event['predicate'] ) )
+             if r > 0 ]
+    lines.append( f"{event['cycle']}:[tile{event['tile']}] {opt} "
+                  f"{' '.join( outs )}".rstrip() )
+  return "\n".join( lines )
+
+def format_schedule( events, width, height ):
+  # The same view as cgra/test/mapping.out, with the opcodes in the
+  # tiles and arrows for the data sent to the neighbours.
+  lines = []
+  for cycle in sorted( set( int( c ) for c in events['cycle'] ) ):
+    tiles = { int( e['tile'] ) : e for e in events[ events['cycle'] == cycle ] }
+    def opt( x, y ):
+      e = tiles.get( y * width + x )
+      if e is None or e['opt'] == no_opt:
+        return ""
+      return get_opt_name( e['opt'] ).replace( "OPT_", "" )
+    def sends( x, y, port ):
+      e = tiles.get( y * width + x )
+      return e is not None and e['routes'][port] > 0
+    lines.append( f"------------- cycle:{cycle} ---------------" )
+    for y in reversed( range( height ) ):
+      row = ""
+      for x in range( width ):
+        row += f"[{opt( x, y ):^7}]"
+        if x < width - 1:
+          east = sends( x, y, EAST )
+          west = sends( x + 1, y, WEST )
+          row += " ⇄ " if east and west else " → " if east else \
+                 " ← " if west else "   "
+      lines.append( row.rstrip() )
+      if y > 0:
+        row = ""
+        for x in range( width ):
+          up   = sends( x, y - 1, NORTH )
+          down = sends( x, y, SOUTH )
+          arrow = "↕" if up and down else "↑" if up else \
+                  "↓" if down else " "
+          row += f"    {arrow}    " + "   "
+        lines.append( row.rstrip() )
+  return "\n".join( lines )
@@ -0,0 +1,113 @@
+"""
+==========================================================================
+verilator_cache.py
+==========================================================================
+Content-addressed build cache for translated and imported models. The
+VerilatorImportPass of PyMTL only reuses a build left in the current
+directory by a model with the same name, so every fresh checkout (or
+test directory) verilates and compiles the whole design again. Here the
+compiled shared library is stored in a cache directory under a hash of
+the generated Verilog, the generated C wrapper, the import configs and
+the Verilator version, and copied back whenever the same design is
+imported again.
+
+The cache directory is $OPENCGRA_VERILATOR_CACHE if set, otherwise
+~/.cache/opencgra/verilator.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3.passes.rtlir            import get_component_ifc_rtlir
+from pymtl3.passes.backends.verilog import TranslationImportPass
+from pymtl3.passes.backends.verilog import VerilatorImportPass
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+
+def get_cache_dir():
+  return os.path.expanduser( os.environ.get( 'OPENCGRA_VERILATOR_CACHE',
+                             os.path.join( '~', '.cache', 'opencgra',
+                                           'verilator' ) ) )
+
+verilator_version = None
+
+def get_verilator_version():
+  global verilator_version
+  if verilator_version == None:
+    try:
+      verilator_version = subprocess.check_output(
+          [ 'verilator', '--version' ], stderr = subprocess.STDOUT,
+          universal_newlines = True ).strip()
+    except ( OSError, subprocess.CalledProcessError ):
+      verilator_version = ''
+  return verilator_version
+
+def copy_lib( src, dst ):
+  # Copied under a temporary name and then renamed, so that neither a
+  # concurrent build nor a process that has the old library loaded ever
+  # sees a partially written file.
+  tmp = f'{dst}.{os.getpid()}.tmp'
+  shutil.copyfile( src, tmp )
+  os.replace( tmp, dst )
+
+class CachedVerilatorImportPass( VerilatorImportPass ):
+
+  def get_cache_key( s, ip_cfg ):
+    h = hashlib.sha1()
+    for path in [ ip_cfg.translated_source_file, ip_cfg.get_c_wrapper_path() ]:
+      with open( path, 'rb' ) as f:
+        h.update( f.read() )
+    cfg = s.serialize_cfg( ip_cfg )
+    cfg['translated_top_module'] = ip_cfg.translated_top_module
+    h.update( json.dumps( cfg, sort_keys = True, default = str ).encode() )
+    h.update( get_verilator_version().encode() )
+    return h.hexdigest()
+
+  def get_shared_lib( s, m, ph_cfg, ip_cfg ):
+    # Copies the shared library out of the cache, or builds it and stores
+    # it in the cache. Returns whether it was found in the cache.
+    shared_lib = ip_cfg.get_shared_lib_path()
+    entry      = os.path.join( get_cache_dir(), s.get_cache_key( ip_cfg ) )
+    cached_lib = os.path.join( entry, os.path.basename( shared_lib ) )
+    cached     = os.path.exists( cached_lib )
+
+    if cached:
+      ip_cfg.vprint( f"Reusing {cached_lib} from the build cache!", 2 )
+      copy_lib( cached_lib, shared_lib )
+    else:
+      s.create_verilator_model( m, ph_cfg, ip_cfg, False )
+      s.create_shared_lib( m, ph_cfg, ip_cfg, False )
+      os.makedirs( entry, exist_ok = True )
+      copy_lib( shared_lib, cached_lib )
+    return cached
+
+  def get_imported_object( s, m ):
+    ph_cfg = s.get_placeholder_config( m )
+    ip_cfg = s.get_config( m )
+    ip_cfg.setup_configs( m, s.get_translation_namespace(m) )
+
+    rtype = get_component_ifc_rtlir( m )
+    ports = s.get_gen_mapped_port()( m, ph_cfg.port_map, ph_cfg.has_clk,
+                                     ph_cfg.has_reset )
+
+    # The C wrapper only depends on the ports, so it is generated first
+    # and becomes part of the key.
+    port_cdefs = s.create_verilator_c_wrapper( m, ph_cfg, ip_cfg, ports,
+                                               False )
+    s.get_shared_lib( m, ph_cfg, ip_cfg )
+
+    # The Python wrapper records the path of the shared library, so it is
+    # always generated for the current directory.
+    symbols = s.create_py_wrapper( m, ph_cfg, ip_cfg, rtype, ports,
+                                   port_cdefs, False )
+    return s.import_component( m, ph_cfg, ip_cfg, symbols )
+
+class CachedTranslationImportPass( TranslationImportPass ):
+
+  def get_import_pass( s ):
+    return CachedVerilatorImportPass()
@@ -0,0 +1,206 @@
+"""
+==========================================================================
+wave_helper.py
+==========================================================================
+Compact waveform dump for CGRARTL (and CGRACL). A WaveRecorder samples a
+selection of signal groups of every tile after each tick and writes them
+column by column: each signal is one array of shape
+( ncycles, num_tiles, num_ports ) with the smallest dtype that holds it.
+While recording, the columns are appended to side files chunk by chunk;
+close() packs them into a single file
+
+  magic ( b'CGWV' ), version, length of the JSON index, JSON index,
+  column data (aligned to 64 bytes)
+
+where the index gives the number of cycles and tiles and the dtype,
+width and offset of each column. Waveform maps the file back with
+np.memmap, so a range of cycles or a tile of a million-cycle run is
+sliced without reading the rest of the file.
+
+Signal groups:
+
+  recv_data / send_data : payload, predicate, en and rdy of the mesh ports
+  ctrl                  : opcode, en and rdy of the control word issued
+  ctrl_addr             : read address of the control memory, write
+                          address and write enable
+  channel_count         : occupancy of the channels
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+import numpy as np
+
+import json
+import os
+import struct
+
+magic       = b'CGWV'
+version     = 1
+header_fmt  = '<4sHI'
+header_size = struct.calcsize( header_fmt )
+alignment   = 64
+
+all_groups  = [ 'recv_data', 'send_data', 'ctrl', 'ctrl_addr',
+                'channel_count' ]
+
+def get_uint_dtype( nbits ):
+  for dtype in [ 'u1', '<u2', '<u4', '<u8' ]:
+    if nbits <= np.dtype( dtype ).itemsize * 8:
+      return dtype
+  raise Exception( f"{nbits}-bit signals are not supported!" )
+
+def get_ctrl_raddr( ctrl_mem ):
+  # CtrlMemRTL reads through its register file, CtrlMemCL keeps a cursor
+  # and CtrlMemShadowRTL drives the read address of both its contexts.
+  if hasattr( ctrl_mem, 'raddr' ):
+    return ctrl_mem.raddr
+  if hasattr( ctrl_mem, 'reg_file' ):
+    return ctrl_mem.reg_file.raddr[0]
+  return ctrl_mem.cur
+
+def mk_columns( tile, groups ):
+  # ( name, dtype, width, function returning the values of a tile )
+  columns = []
+  for group in groups:
+    if group in [ 'recv_data', 'send_data' ]:
+      ports  = getattr( tile, group )
+      nbits  = ports[0].msg.payload.nbits
+      columns += [
+        ( f"{group}.payload", get_uint_dtype( nbits ), len( ports ),
+          lambda t, g=group: [ int( x.msg.payload ) for x in getattr( t, g ) ] ),
+        ( f"{group}.predicate", 'u1', len( ports ),
+          lambda t, g=group: [ int( x.msg.predicate ) for x in getattr( t, g ) ] ),
+        ( f"{group}.en", 'u1', len( ports ),
+          lambda t, g=group: [ int( x.en ) for x in getattr( t, g ) ] ),
+        ( f"{group}.rdy", 'u1', len( ports ),
+          lambda t, g=group: [ int( x.rdy ) for x in getattr( t, g ) ] ) ]
+    elif group == 'ctrl':
+      columns += [
+        ( "ctrl.opt", 'u1', 1,
+          lambda t: [ int( t.ctrl_mem.send_ctrl.msg.ctrl ) ] ),
+        ( "ctrl.en", 'u1', 1, lambda t: [ int( t.ctrl_mem.send_ctrl.en ) ] ),
+        ( "ctrl.rdy", 'u1', 1, lambda t: [ int( t.ctrl_mem.send_ctrl.rdy ) ] ) ]
+    elif group == 'ctrl_addr':
+      nbits = tile.ctrl_mem.recv_waddr.msg.nbits
+      columns += [
+        ( "ctrl_addr.raddr", get_uint_dtype( nbits ), 1,
+          lambda t: [ int( get_ctrl_raddr( t.ctrl_mem ) ) ] ),
+        ( "ctrl_addr.waddr", get_uint_dtype( nbits ), 1,
+          lambda t: [ int( t.ctrl_mem.recv_waddr.msg ) ] ),
+        ( "ctrl_addr.wen", 'u1', 1,
+          lambda t: [ int( t.ctrl_mem.recv_waddr.en and
+                           t.ctrl_mem.recv_ctrl.en ) ] ) ]
+    elif group == 'channel_count':
+      columns += [
+        ( "channel_count", 'u1', len( tile.channel ),
+          lambda t: [ int( x.count ) for x in t.channel ] ) ]
+    else:
+      raise Exception( f"Unknown signal group {group}!" )
+  return columns
+
+#-------------------------------------------------------------------------
+# Recorder
+#-------------------------------------------------------------------------
+
+class WaveRecorder:
+
+  def __init__( s, cgra, file_name, groups = None, chunk_size = 4096 ):
+    s.cgra       = cgra
+    s.file_name  = file_name
+    s.num_tiles  = len( cgra.tile )
+    s.chunk_size = chunk_size
+    s.columns    = mk_columns( cgra.tile[0],
+                               all_groups if groups == None else groups )
+    s.bufs       = [ np.zeros( ( chunk_size, s.num_tiles, width ), dtype )
+                     for _, dtype, width, _ in s.columns ]
+    s.parts      = [ open( s.get_part_name( name ), 'wb' )
+                     for name, _, _, _ in s.columns ]
+    s.count      = 0
+    s.ncycles    = 0
+
+  def get_part_name( s, name ):
+    return f"{s.file_name}.{name}.part"
+
+  def sample( s ):
+    # Call once after every tick.
+    for buf, ( _, _, _, get ) in zip( s.bufs, s.columns ):
+      row = buf[ s.count ]
+      for i, tile in enumerate( s.cgra.tile ):
+        row[i] = get( tile )
+    s.count   += 1
+    s.ncycles += 1
+    if s.count == s.chunk_size:
+      s.flush()
+
+  def flush( s ):
+    for buf, part in zip( s.bufs, s.parts ):
+      buf[ :s.count ].tofile( part )
+    s.count = 0
+
+  def close( s ):
+    s.flush()
+    for part in s.parts:
+      part.close()
+
+    index  = { 'ncycles' : s.ncycles, 'num_tiles' : s.num_tiles,
+               'columns' : [] }
+    offset = 0
+    for name, dtype, width, _ in s.columns:
+      index['columns'].append( { 'name' : name, 'dtype' : dtype,
+                                 'width' : width, 'offset' : offset } )
+      nbytes  = s.ncycles * s.num_tiles * width * np.dtype( dtype ).itemsize
+      offset += ( nbytes + alignment - 1 ) // alignment * alignment
+    index_str = json.dumps( index ).encode()
+    data_base = ( header_size + len( index_str ) + alignment - 1 ) \
+                // alignment * alignment
+
+    with open( s.file_name, 'wb' ) as f:
+      f.write( struct.pack( header_fmt, magic, version, len( index_str ) ) )
+      f.write( index_str )
+      for column, ( name, _, _, _ ) in zip( index['columns'], s.columns ):
+        f.seek( data_base + column['offset'] )
+        with open( s.get_part_name( name ), 'rb' ) as part:
+          while True:
+            data = part.read( 1 << 20 )
+            if not data:
+              break
+            f.write( data )
+        os.remove( s.get_part_name( name ) )
+      f.truncate( data_base + offset )
+
+#-------------------------------------------------------------------------
+# Reader
+#-------------------------------------------------------------------------
+
+class Waveform:
+
+  def __init__( s, file_name ):
+    with open( file_name, 'rb' ) as f:
+      tag, ver, index_len = struct.unpack( header_fmt, f.read( header_size ) )
+      if tag != magic or ver != version:
+        raise Exception( f"{file_name} is not a CGRA waveform!" )
+      index = json.loads( f.read( index_len ) )
+    s.ncycles   = index['ncycles']
+    s.num_tiles = index['num_tiles']
+    data_base   = ( header_size + index_len + alignment - 1 ) \
+                  // alignment * alignment
+    s.columns   = {}
+    for column in index['columns']:
+      shape = ( s.ncycles, s.num_tiles, column['width'] )
+      if s.ncycles == 0:
+        s.columns[ column['name'] ] = np.zeros( shape, column['dtype'] )
+        continue
+      s.columns[ column['name'] ] = np.memmap( file_name,
+        dtype = column['dtype'], mode = 'r',
+        offset = data_base + column['offset'], shape = shape )
+
+  def get_signals( s ):
+    return list( s.columns.keys() )
+
+  def get( s, name, start = 0, stop = None, tile = None ):
+    # The values of a signal in cycles [ start, stop ), for all the tiles
+    # ( cycles x tiles x ports ) or for one tile ( cycles x ports ).
+    column = s.columns[ name ][ start : stop ]
+    return column if tile == None else column[ :, tile ]
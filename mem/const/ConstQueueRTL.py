@@ -2,7 +2,8 @@
 ==========================================================================
 ConstQueueRTL.py
 ==========================================================================
-Constant queue used for simulation.
+Constant queue used for simulation. The constants can be rewritten
+through recv_waddr/recv_const, or between two ticks with load_consts().
 
 Author : Cheng Tan
   Date : Jan 20, 2020
@@ -13,6 +14,7 @@ from pymtl3             import *
 from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
 from ...lib.opt_type    import *
 from pymtl3.stdlib.rtl  import RegisterFile
+from ...lib.bits_helper import replace_bits
 
 class ConstQueueRTL( Component ):
 
@@ -26,13 +28,18 @@ class ConstQueueRTL( Component ):
     # Interface
 
     s.send_const = SendIfcRTL( DataType )
+    s.recv_waddr = RecvIfcRTL( AddrType )
+    s.recv_const = RecvIfcRTL( DataType )
 
     # Component
 
-    s.const_queue = [ DataType( 0 ) for _ in range( num_const ) ]
+    # The constants are registers, loaded with const_list on reset.
+    s.const_init = [ DataType( 0 ) for _ in range( num_const ) ]
     for i in range( len( const_list ) ):
-      s.const_queue[ i ] = const_list[i]
+      s.const_init[ i ] = const_list[i]
+    s.const_queue = [ Wire( DataType ) for _ in range( num_const ) ]
     s.cur  = Wire( AddrType )
+    s.num_const = num_const
 
     @s.update
     def load():
@@ -41,6 +48,8 @@ class ConstQueueRTL( Component ):
     @s.update
     def update_en():
       s.send_const.en = s.send_const.rdy
+      s.recv_waddr.rdy = b1( 1 )
+      s.recv_const.rdy = b1( 1 )
 
     @s.update_ff
     def update_raddr():
@@ -50,6 +59,28 @@ class ConstQueueRTL( Component ):
         else:
           s.cur <<= s.cur + AddrType( 1 )
 
+    @s.update_ff
+    def update_const():
+      if s.reset:
+        for i in range( num_const ):
+          s.const_queue[i] <<= s.const_init[i]
+      elif s.recv_waddr.en and s.recv_const.en:
+        if s.recv_waddr.msg < AddrType( num_const ):
+          s.const_queue[ s.recv_waddr.msg ] <<= s.recv_const.msg
+
+  # Replaces the constants between two ticks and restarts from the first
+  # one. The number of constants is fixed by the hardware. The constants
+  # loaded on reset are replaced as well, since the reset of the queue
+  # can still be high in the tick after sim_reset().
+  def load_consts( s, const_list ):
+    if len( const_list ) != s.num_const:
+      raise Exception( f"{s} holds {s.num_const} constants, "
+                       f"{len( const_list )} given!" )
+    for i in range( s.num_const ):
+      s.const_init[i]  = const_list[i]
+      s.const_queue[i] = replace_bits( s.const_queue[i], const_list[i] )
+    s.cur = replace_bits( s.cur, 0 )
+
   def line_trace( s ):
     out_str  = "||".join([ str(data) for data in s.const_queue ])
     return f'[{out_str}] : {s.send_const.msg}({s.send_const.en})'
@@ -38,6 +38,11 @@ class TestHarness( Component ):
     s.alu.recv_in_count[0] //= 1
     s.alu.recv_in_count[1] //= 1
 
+    s.const_queue.recv_waddr.en  //= 0
+    s.const_queue.recv_waddr.msg //= 0
+    s.const_queue.recv_const.en  //= 0
+    s.const_queue.recv_const.msg //= DataType( 0, 0 )
+
     connect( s.src_in0.send,    s.alu.recv_in[0]         )
     connect( s.alu.recv_in[1],  s.const_queue.send_const )
     connect( s.src_opt.send,    s.alu.recv_opt           )
@@ -2,7 +2,9 @@
 ==========================================================================
 CtrlMemCL.py
 ==========================================================================
-CL control memory used for simulation.
+CL control memory used for simulation. The control words can be
+rewritten through recv_waddr/recv_ctrl like CtrlMemRTL, or between two
+ticks with load_ctrl().
 
 Author : Cheng Tan
   Date : Dec 27, 2019
@@ -13,6 +15,7 @@ from pymtl3             import *
 from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
 from ...lib.opt_type    import *
 from pymtl3.stdlib.rtl  import RegisterFile
+from ...lib.bits_helper import replace_bits
 
 class CtrlMemCL( Component ):
 
@@ -25,6 +28,8 @@ class CtrlMemCL( Component ):
 
     # Interface
     s.send_ctrl  = SendIfcRTL( CtrlType )
+    s.recv_waddr = RecvIfcRTL( AddrType )
+    s.recv_ctrl  = RecvIfcRTL( CtrlType )
 
     # Component
     s.sram = [ CtrlType( 0 ) for _ in range( ctrl_mem_size ) ]
@@ -43,6 +48,8 @@ class CtrlMemCL( Component ):
         s.send_ctrl.en = b1( 0 )
       else:
         s.send_ctrl.en  = s.send_ctrl.rdy
+      s.recv_waddr.rdy = b1( 1 )
+      s.recv_ctrl.rdy  = b1( 1 )
       # if s.id == 6:
       #   print("[update] tile[", s.id, "] check ctrl out: ", s.send_ctrl.msg, "; send_ctrl.en: ", s.send_ctrl.en, "; send_ctrl.rdy: ", s.send_ctrl.rdy, "; cur: ", s.cur, "; times: ", s.times)
 
@@ -58,7 +65,24 @@ class CtrlMemCL( Component ):
 #      if s.id == 6 or s.id == 5:
 #        print("[update_ff] tile [", s.id, "] check ctrl out: ", s.send_ctrl.msg, "; send_ctrl.en: ", s.send_ctrl.en, "; send_ctrl.rdy: ", s.send_ctrl.rdy, "; cur: ", s.cur, "; times: ", s.times)
 
+    # The word is written at the clock edge, as in CtrlMemRTL. sram is
+    # not a signal, so the write goes through write_ctrl().
+    @s.update_ff
+    def update_ctrl():
+      if s.recv_waddr.en and s.recv_ctrl.en:
+        s.write_ctrl( int( s.recv_waddr.msg ), s.recv_ctrl.msg )
+
+  def write_ctrl( s, addr, msg ):
+    s.sram[ addr ] = msg
 
+  # Replaces the control words between two ticks and restarts from the
+  # first one. num_ctrl is fixed at construction.
+  def load_ctrl( s, opt_list ):
+    assert len( opt_list ) <= len( s.sram )
+    for i in range( len( opt_list ) ):
+      s.sram[i] = opt_list[i]
+    s.cur   = replace_bits( s.cur,   0 )
+    s.times = replace_bits( s.times, 0 )
 
   def line_trace( s ):
     out_str  = "||".join([ str(data) for data in s.sram ])
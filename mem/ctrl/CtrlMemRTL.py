@@ -13,6 +13,7 @@ from pymtl3             import *
 from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
 from ...lib.opt_type    import *
 from pymtl3.stdlib.rtl  import RegisterFile
+from ...lib.bits_helper import replace_bits
 
 class CtrlMemRTL( Component ):
 
@@ -28,6 +29,8 @@ class CtrlMemRTL( Component ):
     s.send_ctrl  = SendIfcRTL( CtrlType )
     s.recv_waddr = RecvIfcRTL( AddrType )
     s.recv_ctrl  = RecvIfcRTL( CtrlType )
+    # The word is kept while the FU holds it, see MemUnitRTL.
+    s.hold       = InPort( b1 )
 
     # Component
     s.reg_file   = RegisterFile( CtrlType, ctrl_mem_size, 1, 1 )
@@ -50,7 +53,7 @@ class CtrlMemRTL( Component ):
 
     @s.update_ff
     def update_raddr():
-      if s.reg_file.rdata[0].ctrl != OPT_START:
+      if ( s.reg_file.rdata[0].ctrl != OPT_START ) & ~s.hold:
         if s.times < TimeType( num_ctrl ):
           s.times <<= s.times + TimeType( 1 )
         if s.reg_file.raddr[0] < last_item:
@@ -58,6 +61,16 @@ class CtrlMemRTL( Component ):
         else:
           s.reg_file.raddr[0] <<= AddrType( 0 )
 
+  # Replaces the control words between two ticks and restarts from the
+  # first one, without going through recv_waddr/recv_ctrl.
+  def load_ctrl( s, opt_list ):
+    regs = s.reg_file.regs
+    assert len( opt_list ) <= len( regs )
+    for i in range( len( opt_list ) ):
+      regs[i] = replace_bits( regs[i], opt_list[i] )
+    s.reg_file.raddr[0] = replace_bits( s.reg_file.raddr[0], 0 )
+    s.times = replace_bits( s.times, 0 )
+
   def line_trace( s ):
     out_str  = "||".join([ str(data) for data in s.reg_file.regs ])
     return f'{s.recv_ctrl.msg} : [{out_str}] : {s.send_ctrl.msg}'
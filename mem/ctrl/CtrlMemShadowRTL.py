@@ -0,0 +1,121 @@
+"""
+==========================================================================
+CtrlMemShadowRTL.py
+==========================================================================
+Double-buffered control memory for CGRA. It has the interface of
+CtrlMemRTL plus recv_swap, with two contexts: the active one is read
+for execution while recv_waddr/recv_ctrl write the shadow one, so the
+control words of the next kernel stream in while the current kernel
+runs. A swap request switches the contexts at the end of the current
+iteration (the last word of the memory), or at once if the active
+context is idle (OPT_START) or done (num_ctrl words issued); the new
+kernel then starts from its first word. As in CtrlMemRTL, the current
+word is kept while hold is high.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3             import *
+from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
+from ...lib.opt_type    import *
+from ...lib.bits_helper import replace_bits
+from pymtl3.stdlib.rtl  import RegisterFile
+
+class CtrlMemShadowRTL( Component ):
+
+  def construct( s, CtrlType, ctrl_mem_size, num_ctrl=4 ):
+
+    # Constant
+    AddrType = mk_bits( clog2( ctrl_mem_size ) )
+    TimeType = mk_bits( clog2( num_ctrl+1 ) )
+    last_item = AddrType( ctrl_mem_size - 1 )
+
+    # Interface
+    s.send_ctrl  = SendIfcRTL( CtrlType )
+    s.recv_waddr = RecvIfcRTL( AddrType )
+    s.recv_ctrl  = RecvIfcRTL( CtrlType )
+    s.recv_swap  = RecvIfcRTL( b1 )
+    s.hold       = InPort( b1 )
+
+    # Component
+    s.reg_file = [ RegisterFile( CtrlType, ctrl_mem_size, 1, 1 )
+                   for _ in range( 2 ) ]
+    s.times    = Wire( TimeType )
+    s.raddr    = Wire( AddrType )
+    s.active   = Wire( b1 )
+    s.pending  = Wire( b1 )
+    s.rdata    = Wire( CtrlType )
+
+    # Connections
+    for i in range( 2 ):
+      s.reg_file[i].raddr[0] //= s.raddr
+      s.reg_file[i].waddr[0] //= s.recv_waddr.msg
+      s.reg_file[i].wdata[0] //= s.recv_ctrl.msg
+
+    @s.update
+    def update_read():
+      if s.active == b1( 0 ):
+        s.rdata = s.reg_file[0].rdata[0]
+      else:
+        s.rdata = s.reg_file[1].rdata[0]
+      s.send_ctrl.msg = s.rdata
+
+    @s.update
+    def update_signal():
+      if s.times == TimeType( num_ctrl ) or s.rdata.ctrl == OPT_START:
+        s.send_ctrl.en = b1( 0 )
+      else:
+        s.send_ctrl.en  = s.send_ctrl.rdy
+      s.recv_waddr.rdy = b1( 1 )
+      s.recv_ctrl.rdy  = b1( 1 )
+      s.recv_swap.rdy  = b1( 1 )
+
+    # Only the shadow context is written. The enables only depend on the
+    # inputs and on active, which flips at the same clock edge as the
+    # write: a word written in the cycle of a swap goes to the context
+    # being swapped in.
+    @s.update
+    def update_wen():
+      s.reg_file[0].wen[0] = s.recv_ctrl.en & s.recv_waddr.en & s.active
+      s.reg_file[1].wen[0] = s.recv_ctrl.en & s.recv_waddr.en & ~s.active
+
+    @s.update_ff
+    def update_raddr():
+      swap = s.pending | s.recv_swap.en
+      if swap and ( s.rdata.ctrl == OPT_START or s.times == TimeType( num_ctrl )
+                    or ( s.raddr == last_item ) & ~s.hold ):
+        s.active  <<= ~s.active
+        s.pending <<= b1( 0 )
+        s.times   <<= TimeType( 0 )
+        s.raddr   <<= AddrType( 0 )
+      else:
+        s.pending <<= swap
+        if ( s.rdata.ctrl != OPT_START ) & ~s.hold:
+          if s.times < TimeType( num_ctrl ):
+            s.times <<= s.times + TimeType( 1 )
+          if s.raddr < last_item:
+            s.raddr <<= s.raddr + AddrType( 1 )
+          else:
+            s.raddr <<= AddrType( 0 )
+
+  # Same as CtrlMemRTL.load_ctrl(), on the active context.
+  def load_ctrl( s, opt_list ):
+    regs = s.reg_file[ int( s.active ) ].regs
+    assert len( opt_list ) <= len( regs )
+    for i in range( len( opt_list ) ):
+      regs[i] = replace_bits( regs[i], opt_list[i] )
+    s.raddr = replace_bits( s.raddr, 0 )
+    s.times = replace_bits( s.times, 0 )
+
+  # Writes the shadow context between two ticks, to be swapped in later.
+  def load_shadow( s, opt_list ):
+    regs = s.reg_file[ 1 - int( s.active ) ].regs
+    assert len( opt_list ) <= len( regs )
+    for i in range( len( opt_list ) ):
+      regs[i] = replace_bits( regs[i], opt_list[i] )
+
+  def line_trace( s ):
+    out_str  = "||".join([ str(data) for data in s.reg_file[ int( s.active ) ].regs ])
+    return f'{s.recv_ctrl.msg} : [{out_str}]({s.active}) : {s.send_ctrl.msg}'
@@ -0,0 +1,91 @@
+"""
+==========================================================================
+CtrlShadowRTL_test.py
+==========================================================================
+Test cases for the double-buffered control memory.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ..CtrlMemShadowRTL           import CtrlMemShadowRTL
+from ....lib.opt_type             import *
+from ....lib.messages             import *
+
+def mk_kernel( CtrlType, opts ):
+  FuInType     = mk_bits( clog2( 2 + 1 ) )
+  pickRegister = [ FuInType( x+1 ) for x in range( 2 ) ]
+  return [ CtrlType( opt, b1( 0 ), pickRegister ) for opt in opts ]
+
+def tick( dut, waddr = None, ctrl = None, swap = 0 ):
+  # Returns the control word issued in the cycle, None if none. The
+  # inputs are settled before the clock edge, and the messages are
+  # copied since the registers update their values in place.
+  dut.recv_waddr.en  = b1( waddr != None )
+  dut.recv_ctrl.en   = b1( waddr != None )
+  if waddr != None:
+    dut.recv_waddr.msg = waddr
+    dut.recv_ctrl.msg  = ctrl.clone()
+  dut.recv_swap.en   = b1( swap )
+  dut.eval_combinational()
+  issued = dut.send_ctrl.msg.clone() if dut.send_ctrl.en else None
+  dut.tick()
+  return issued
+
+def test_overlapped_reconfiguration():
+  ctrl_mem_size = 4
+  CtrlType      = mk_ctrl( 2 )
+  AddrType      = mk_bits( clog2( ctrl_mem_size ) )
+  kernel_a      = mk_kernel( CtrlType, [ OPT_ADD, OPT_SUB, OPT_MUL, OPT_ADD ] )
+  kernel_b      = mk_kernel( CtrlType, [ OPT_SUB, OPT_SUB, OPT_ADD, OPT_MUL ] )
+  kernel_c      = mk_kernel( CtrlType, [ OPT_MUL, OPT_ADD, OPT_ADD, OPT_SUB ] )
+
+  dut = CtrlMemShadowRTL( CtrlType, ctrl_mem_size, 100 )
+  dut.elaborate()
+  dut.apply( SimulationPass() )
+  dut.sim_reset()
+  dut.send_ctrl.rdy = b1( 1 )
+
+  # Nothing runs until the first kernel is swapped in.
+  for i in range( ctrl_mem_size ):
+    assert tick( dut, AddrType( i ), kernel_a[i] ) == None
+  assert tick( dut, swap = 1 ) == None
+
+  # Kernel b streams in while kernel a runs, the swap comes at the end
+  # of the iteration.
+  issued = []
+  for i in range( ctrl_mem_size ):
+    issued.append( tick( dut, AddrType( i ), kernel_b[i], swap = i == 3 ) )
+  # Kernel c streams in, the swap is requested early and held until the
+  # end of the iteration.
+  for i in range( ctrl_mem_size ):
+    issued.append( tick( dut, AddrType( i ), kernel_c[i], swap = i == 1 ) )
+  for i in range( ctrl_mem_size ):
+    issued.append( tick( dut ) )
+
+  # No gap between the kernels.
+  assert issued == kernel_a + kernel_b + kernel_c
+
+def test_load_between_ticks():
+  ctrl_mem_size = 4
+  CtrlType      = mk_ctrl( 2 )
+  kernel_a      = mk_kernel( CtrlType, [ OPT_ADD, OPT_SUB, OPT_MUL, OPT_ADD ] )
+  kernel_b      = mk_kernel( CtrlType, [ OPT_SUB, OPT_SUB, OPT_ADD, OPT_MUL ] )
+
+  dut = CtrlMemShadowRTL( CtrlType, ctrl_mem_size, 100 )
+  dut.elaborate()
+  dut.apply( SimulationPass() )
+  dut.sim_reset()
+  dut.send_ctrl.rdy = b1( 1 )
+
+  dut.load_ctrl( kernel_a )
+  dut.load_shadow( kernel_b )
+  issued = []
+  for i in range( ctrl_mem_size ):
+    issued.append( tick( dut, swap = i == 3 ) )
+  for i in range( ctrl_mem_size ):
+    issued.append( tick( dut ) )
+  assert issued == kernel_a + kernel_b
@@ -0,0 +1,250 @@
+"""
+==========================================================================
+BankedDataMemRTL.py
+==========================================================================
+Banked data memory for CGRA. It has the ports of DataMemRTL, for any
+number of memory-attached tiles, in front of num_banks register files
+that each serve one read and one write per cycle. Word addr lives in
+bank
+
+  ( addr // interleave ) % num_banks
+
+so interleave = 1 spreads consecutive words over the banks and
+interleave = data_mem_size // num_banks gives each bank a contiguous
+block. num_banks and interleave are powers of two, the bank and the row
+of a word are bit fields of its address.
+
+Requests to the same bank in a cycle are arbitrated: the ports are
+visited in a priority order that rotates every cycle, and a port whose
+bank is already taken by a request of a port before it sees rdy low, so
+the requester keeps its address (and data) for a later cycle: the
+MemUnitRTL of a tile holds its control word (opt_hold) and the tile
+stalls. Only the ports that win the arbitration read and write the
+banks. A port is counted as a bank conflict in the cycles it is held
+back this way, see perf_snapshot().
+
+As in DataMemRTL, a word is read from the preloaded data until it is
+written.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3             import *
+from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
+from ...lib.opt_type    import *
+from pymtl3.stdlib.rtl  import RegisterFile
+from ...lib.bits_helper import replace_bits
+from ...lib.data_helper import iter_msgs, msgs_to_array
+
+class BankedDataMemRTL( Component ):
+
+  def construct( s, DataType, data_mem_size, rd_ports = 1, wr_ports = 1,
+                 preload_data = None, num_banks = 4, interleave = 1 ):
+
+    # Constant
+
+    AddrType   = mk_bits( clog2( data_mem_size ) )
+    RdPortType = mk_bits( clog2( rd_ports + 1 ) )
+    WrPortType = mk_bits( clog2( wr_ports + 1 ) )
+    bank_lo    = clog2( interleave )
+    bank_hi    = bank_lo + clog2( num_banks )
+    addr_nbits = AddrType.nbits
+    assert interleave == 1 << bank_lo and num_banks == 1 << clog2( num_banks )
+    assert bank_hi <= addr_nbits and bank_hi - bank_lo < addr_nbits
+    BankType   = mk_bits( max( 1, bank_hi - bank_lo ) )
+    RowType    = mk_bits( addr_nbits - ( bank_hi - bank_lo ) )
+    bank_size  = 1 << RowType.nbits
+
+    s.DataType      = DataType
+    s.data_mem_size = data_mem_size
+    s.num_banks     = num_banks
+    s.interleave    = interleave
+    s.bank_size     = bank_size
+
+    # Port i goes before port j in the cycles in which both of them are
+    # at or after the priority port, or both before it, if i < j.
+    rd_order = [ [ b1( i < j ) for j in range( rd_ports ) ]
+                 for i in range( rd_ports ) ]
+    wr_order = [ [ b1( i < j ) for j in range( wr_ports ) ]
+                 for i in range( wr_ports ) ]
+
+    # Interface
+
+    s.recv_raddr = [ RecvIfcRTL( AddrType ) for _ in range( rd_ports ) ]
+    s.send_rdata = [ SendIfcRTL( DataType ) for _ in range( rd_ports ) ]
+    s.recv_waddr = [ RecvIfcRTL( AddrType ) for _ in range( wr_ports ) ]
+    s.recv_wdata = [ RecvIfcRTL( DataType ) for _ in range( wr_ports ) ]
+
+    # Component
+
+    s.bank       = [ RegisterFile( DataType, bank_size, 1, 1 )
+                     for _ in range( num_banks ) ]
+    s.bank_raddr = [ Wire( RowType )  for _ in range( num_banks ) ]
+    s.bank_rdata = [ Wire( DataType ) for _ in range( num_banks ) ]
+    s.bank_waddr = [ Wire( RowType )  for _ in range( num_banks ) ]
+    s.bank_wdata = [ Wire( DataType ) for _ in range( num_banks ) ]
+    s.bank_wen   = [ Wire( b1 )       for _ in range( num_banks ) ]
+
+    s.rd_bank    = [ Wire( BankType ) for _ in range( rd_ports ) ]
+    s.rd_row     = [ Wire( RowType )  for _ in range( rd_ports ) ]
+    s.wr_bank    = [ Wire( BankType ) for _ in range( wr_ports ) ]
+    s.wr_row     = [ Wire( RowType )  for _ in range( wr_ports ) ]
+
+    s.rd_prio    = Wire( RdPortType )
+    s.wr_prio    = Wire( WrPortType )
+    s.rd_first   = [ Wire( b1 ) for _ in range( rd_ports ) ]
+    s.wr_first   = [ Wire( b1 ) for _ in range( wr_ports ) ]
+    s.rd_blocked = [ Wire( b1 ) for _ in range( rd_ports ) ]
+    s.wr_blocked = [ Wire( b1 ) for _ in range( wr_ports ) ]
+
+    s.preloadData = [ DataType( 0, 0 ) for _ in range( 1 << addr_nbits ) ]
+    for i in range( len( preload_data or [] ) ):
+      s.preloadData[i] = preload_data[i]
+    s.written     = [ Wire( b1 ) for _ in range( 1 << addr_nbits ) ]
+
+    # Connections
+
+    for b in range( num_banks ):
+      s.bank[b].raddr[0] //= s.bank_raddr[b]
+      s.bank[b].rdata[0] //= s.bank_rdata[b]
+      s.bank[b].waddr[0] //= s.bank_waddr[b]
+      s.bank[b].wdata[0] //= s.bank_wdata[b]
+      s.bank[b].wen[0]   //= s.bank_wen[b]
+
+    # The bank of a word is the field [bank_lo, bank_hi) of its address,
+    # the row is made of the bits below and above.
+    def connect_addr( addr, bank, row ):
+      if bank_hi > bank_lo:
+        bank //= addr[ bank_lo : bank_hi ]
+      else:
+        bank //= 0
+      if bank_lo > 0:
+        row[ 0 : bank_lo ] //= addr[ 0 : bank_lo ]
+      if bank_hi < addr_nbits:
+        row[ bank_lo : RowType.nbits ] //= addr[ bank_hi : addr_nbits ]
+
+    for i in range( rd_ports ):
+      connect_addr( s.recv_raddr[i].msg, s.rd_bank[i], s.rd_row[i] )
+    for i in range( wr_ports ):
+      connect_addr( s.recv_waddr[i].msg, s.wr_bank[i], s.wr_row[i] )
+
+    @s.update
+    def update_read_arbiter():
+      for i in range( rd_ports ):
+        s.rd_first[i] = RdPortType( i ) >= s.rd_prio
+      for i in range( rd_ports ):
+        s.rd_blocked[i] = b1( 0 )
+        for j in range( rd_ports ):
+          if s.recv_raddr[j].en & ( s.rd_bank[j] == s.rd_bank[i] ) & \
+             ( ( s.rd_first[j] & ~s.rd_first[i] ) |
+               ( ( s.rd_first[j] == s.rd_first[i] ) & rd_order[j][i] ) ):
+            s.rd_blocked[i] = b1( 1 )
+        s.recv_raddr[i].rdy = s.send_rdata[i].rdy & ~s.rd_blocked[i]
+        s.send_rdata[i].en  = s.recv_raddr[i].en
+
+      # A bank is read at the row of the port that won it, or else at the
+      # row of a port not requesting, which then sees its word as in
+      # DataMemRTL.
+      for b in range( num_banks ):
+        s.bank_raddr[b] = RowType( 0 )
+      for i in range( rd_ports ):
+        s.bank_raddr[ s.rd_bank[i] ] = s.rd_row[i]
+      for i in range( rd_ports ):
+        if s.recv_raddr[i].en & ~s.rd_blocked[i]:
+          s.bank_raddr[ s.rd_bank[i] ] = s.rd_row[i]
+
+    @s.update
+    def update_rdata():
+      for i in range( rd_ports ):
+        if s.written[ s.recv_raddr[i].msg ]:
+          s.send_rdata[i].msg = s.bank_rdata[ s.rd_bank[i] ]
+        else:
+          s.send_rdata[i].msg = s.preloadData[ s.recv_raddr[i].msg ]
+
+    @s.update
+    def update_write_arbiter():
+      for i in range( wr_ports ):
+        s.wr_first[i] = WrPortType( i ) >= s.wr_prio
+      for b in range( num_banks ):
+        s.bank_wen[b]   = b1( 0 )
+        s.bank_waddr[b] = RowType( 0 )
+        s.bank_wdata[b] = DataType( 0, 0 )
+      for i in range( wr_ports ):
+        s.wr_blocked[i] = b1( 0 )
+        for j in range( wr_ports ):
+          if s.recv_waddr[j].en & s.recv_wdata[j].en & \
+             ( s.wr_bank[j] == s.wr_bank[i] ) & \
+             ( ( s.wr_first[j] & ~s.wr_first[i] ) |
+               ( ( s.wr_first[j] == s.wr_first[i] ) & wr_order[j][i] ) ):
+            s.wr_blocked[i] = b1( 1 )
+        s.recv_waddr[i].rdy = ~s.wr_blocked[i]
+        s.recv_wdata[i].rdy = ~s.wr_blocked[i]
+        if s.recv_waddr[i].en & s.recv_wdata[i].en & ~s.wr_blocked[i]:
+          s.bank_wen[ s.wr_bank[i] ]   = b1( 1 )
+          s.bank_waddr[ s.wr_bank[i] ] = s.wr_row[i]
+          s.bank_wdata[ s.wr_bank[i] ] = s.recv_wdata[i].msg
+
+    @s.update_ff
+    def update_state():
+      for i in range( wr_ports ):
+        if s.recv_waddr[i].en & s.recv_wdata[i].en & ~s.wr_blocked[i]:
+          s.written[ s.recv_waddr[i].msg ] <<= b1( 1 )
+      if s.reset | ( s.rd_prio == RdPortType( rd_ports - 1 ) ):
+        s.rd_prio <<= RdPortType( 0 )
+      else:
+        s.rd_prio <<= s.rd_prio + RdPortType( 1 )
+      if s.reset | ( s.wr_prio == WrPortType( wr_ports - 1 ) ):
+        s.wr_prio <<= WrPortType( 0 )
+      else:
+        s.wr_prio <<= s.wr_prio + WrPortType( 1 )
+
+  # The bank and the row of the word at addr.
+  def locate( s, addr ):
+    bank = ( addr // s.interleave ) % s.num_banks
+    row  = addr // ( s.interleave * s.num_banks ) * s.interleave + \
+           addr % s.interleave
+    return bank, row
+
+  # Same as DataMemRTL.load_data(): the words are rewritten as preloaded
+  # data and marked as not written.
+  def load_data( s, data, base = 0 ):
+    assert base + len( data ) <= s.data_mem_size
+    for i in range( len( data ) ):
+      addr = base + i
+      s.preloadData[ addr ] = data[i]
+      s.written[ addr ]     = replace_bits( s.written[ addr ], 0 )
+
+  # The word at addr, from the preloaded data if it has not been written.
+  def get_word( s, addr ):
+    if s.written[ addr ] == b1( 0 ):
+      return s.preloadData[ addr ]
+    bank, row = s.locate( addr )
+    return s.bank[ bank ].regs[ row ]
+
+  # Bulk images as NumPy arrays, see data_helper.py.
+  def load_array( s, payload, predicate = None, base = 0 ):
+    for start, msgs in iter_msgs( s.DataType, payload, predicate ):
+      s.load_data( msgs, base + start )
+
+  def dump_array( s, base = 0, size = None ):
+    if size == None:
+      size = s.data_mem_size - base
+    return msgs_to_array( s.DataType, [ s.get_word( base + i )
+                                        for i in range( size ) ] )
+
+  def line_trace( s ):
+    recv_str = "|".join([ str(data.msg) for data in s.recv_wdata ])
+    out_str  = "|".join([ str(s.get_word(i))
+                          for i in range( s.data_mem_size ) ])
+    send_str = "|".join([ str(data.msg) for data in s.send_rdata ])
+    return f'{recv_str} : [{out_str}] : {send_str}'
+
+  def perf_snapshot( s ):
+    # The read and write requests of each port in the current cycle, and
+    # the ports held back by a bank conflict.
+    return { 'read'     : [ int( x.en ) for x in s.recv_raddr ],
+             'write'    : [ int( s.recv_waddr[i].en and s.recv_wdata[i].en )
+                            for i in range( len( s.recv_waddr ) ) ],
+             'conflict' : [ int( x ) for x in s.rd_blocked + s.wr_blocked ] }
@@ -13,6 +13,7 @@ from pymtl3             import *
 from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
 from ...lib.opt_type    import *
 from pymtl3.stdlib.rtl  import RegisterFile
+from ...lib.data_helper import iter_msgs, msgs_to_array
 
 class DataMemCL( Component ):
 
@@ -22,6 +23,7 @@ class DataMemCL( Component ):
     # Constant
 
     AddrType = mk_bits( clog2( data_mem_size ) )
+    s.DataType = DataType
 
     # Interface
 
@@ -58,9 +60,30 @@ class DataMemCL( Component ):
         s.recv_waddr[i].rdy = Bits1( 1 )
         s.recv_wdata[i].rdy = Bits1( 1 )
 
+  # Writes data from address base between two ticks.
+  def load_data( s, data, base = 0 ):
+    assert base + len( data ) <= len( s.sram )
+    for i in range( len( data ) ):
+      s.sram[ base + i ] = data[i]
+
+  # Bulk images as NumPy arrays, see data_helper.py.
+  def load_array( s, payload, predicate = None, base = 0 ):
+    for start, msgs in iter_msgs( s.DataType, payload, predicate ):
+      s.load_data( msgs, base + start )
+
+  def dump_array( s, base = 0, size = None ):
+    if size == None:
+      size = len( s.sram ) - base
+    return msgs_to_array( s.DataType, s.sram[ base : base + size ] )
+
   def line_trace( s ):
     recv_str = "|".join([ str(data.msg) for data in s.recv_wdata    ])
     out_str  = "|".join([ str(data)     for data in s.sram ])
     send_str = "|".join([ str(data.msg) for data in s.send_rdata    ])
     return f'{recv_str} : [{out_str}] : {send_str}'
 
+  def perf_snapshot( s ):
+    # The read and write requests of each port in the current cycle.
+    return { 'read'  : [ int( x.en ) for x in s.recv_raddr ],
+             'write' : [ int( s.recv_waddr[i].en and s.recv_wdata[i].en )
+                         for i in range( len( s.recv_waddr ) ) ] }
@@ -13,6 +13,8 @@ from pymtl3             import *
 from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
 from ...lib.opt_type    import *
 from pymtl3.stdlib.rtl  import RegisterFile
+from ...lib.bits_helper import replace_bits
+from ...lib.data_helper import iter_msgs, msgs_to_array
 
 class DataMemRTL( Component ):
 
@@ -22,6 +24,8 @@ class DataMemRTL( Component ):
     # Constant
 
     AddrType = mk_bits( clog2( data_mem_size ) )
+    s.DataType      = DataType
+    s.data_mem_size = data_mem_size
 
     # Interface
 
@@ -44,6 +48,7 @@ class DataMemRTL( Component ):
           s.send_rdata[i].msg = s.reg_file.rdata[i]
 
         for i in range( wr_ports ):
+          s.reg_file.wen[i] = b1(0)
           if s.recv_waddr[i].en == b1(1):
             s.reg_file.waddr[i] = s.recv_waddr[i].msg
             s.reg_file.wdata[i] = s.recv_wdata[i].msg
@@ -69,6 +74,7 @@ class DataMemRTL( Component ):
             s.send_rdata[i].msg = s.reg_file.rdata[i]
 
         for i in range( wr_ports ):
+          s.reg_file.wen[i] = b1(0)
           if s.recv_waddr[i].en == b1(1):
             s.reg_file.waddr[i] = s.recv_waddr[i].msg
             s.reg_file.wdata[i] = s.recv_wdata[i].msg
@@ -96,9 +102,45 @@ class DataMemRTL( Component ):
         s.recv_waddr[i].rdy = Bits1( 1 )
         s.recv_wdata[i].rdy = Bits1( 1 )
 
+  # Writes data from address base between two ticks, bypassing the
+  # ports. A word is read from preloadData until it is accessed once, so
+  # the preloaded words are rewritten and marked as not accessed.
+  def load_data( s, data, base = 0 ):
+    regs = s.reg_file.regs
+    assert base + len( data ) <= len( regs )
+    for i in range( len( data ) ):
+      addr = base + i
+      if hasattr( s, 'preloadData' ):
+        s.preloadData[ addr ] = data[i]
+        s.initWrites[ addr ]  = replace_bits( s.initWrites[ addr ], 0 )
+      else:
+        regs[ addr ] = replace_bits( regs[ addr ], data[i] )
+
+  # The word at addr, from preloadData if it has not been accessed yet.
+  def get_word( s, addr ):
+    if hasattr( s, 'preloadData' ) and s.initWrites[ addr ] == b1( 0 ):
+      return s.preloadData[ addr ]
+    return s.reg_file.regs[ addr ]
+
+  # Bulk images as NumPy arrays, see data_helper.py.
+  def load_array( s, payload, predicate = None, base = 0 ):
+    for start, msgs in iter_msgs( s.DataType, payload, predicate ):
+      s.load_data( msgs, base + start )
+
+  def dump_array( s, base = 0, size = None ):
+    if size == None:
+      size = len( s.reg_file.regs ) - base
+    return msgs_to_array( s.DataType, [ s.get_word( base + i )
+                                        for i in range( size ) ] )
+
   def line_trace( s ):
     recv_str = "|".join([ str(data.msg) for data in s.recv_wdata    ])
     out_str  = "|".join([ str(data)     for data in s.reg_file.regs ])
     send_str = "|".join([ str(data.msg) for data in s.send_rdata    ])
     return f'{recv_str} : [{out_str}] : {send_str} initWrites: {s.initWrites}'
 
+  def perf_snapshot( s ):
+    # The read and write requests of each port in the current cycle.
+    return { 'read'  : [ int( x.en ) for x in s.recv_raddr ],
+             'write' : [ int( s.recv_waddr[i].en and s.recv_wdata[i].en )
+                         for i in range( len( s.recv_waddr ) ) ] }
@@ -0,0 +1,227 @@
+"""
+==========================================================================
+HierDataMemCL.py
+==========================================================================
+CL data memory with the timing of a memory hierarchy. It has the ports
+of DataMemCL: words [ 0, spm_size ) are in a scratchpad of spm_latency
+cycles, the others in a larger backing memory of mem_latency cycles
+that transfers mem_bandwidth words per cycle, optionally behind a small
+direct-mapped cache (cache_lines lines of line_words words, hits in
+cache_latency cycles). A transfer of the backing memory starts once the
+earlier ones are done, so a burst of requests queues behind the
+bandwidth instead of being refused.
+
+The hierarchy only models the timing, the words are kept in one array:
+a read takes the word at the time of its request and returns it on
+send_rdata in order, once its latency is over; a write takes effect at
+the end of its cycle and goes through the cache to the backing memory
+(a missing line is not allocated). All the latencies are at least one
+cycle. MemUnitRTL expects the word in the cycle of its request, so the
+tiles take MemUnitLsqRTL, whose loads hold the array of CGRARTL until
+their words are back. On reset, the reads in flight and the cache are
+dropped; the words and the statistics are kept.
+
+The statistics of the run (since the construction or reset_stats())
+are returned by get_stats(): the accesses to each level, the cache
+hits and misses, the words moved by the backing memory and the cycles
+it is busy. perf_snapshot() also gives the events of the last cycle to
+perf_helper.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3             import *
+from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
+from ...lib.opt_type    import *
+from ...lib.data_helper import iter_msgs, msgs_to_array
+
+stat_names = [ 'reads', 'writes', 'spm_accesses', 'cache_hits',
+               'cache_misses', 'mem_reads', 'mem_writes', 'mem_busy_cycles',
+               'cycles' ]
+
+class HierDataMemCL( Component ):
+
+  def construct( s, DataType, data_mem_size, rd_ports = 1, wr_ports = 1,
+                 preload_data = None, spm_size = None, spm_latency = 1,
+                 mem_latency = 10, mem_bandwidth = 1, cache_lines = 0,
+                 line_words = 4, cache_latency = 1 ):
+
+    # Constant
+
+    AddrType = mk_bits( clog2( data_mem_size ) )
+    assert spm_latency >= 1 and mem_latency >= 1 and cache_latency >= 1
+    s.DataType      = DataType
+    s.spm_size      = data_mem_size // 4 if spm_size == None else spm_size
+    s.spm_latency   = spm_latency
+    s.mem_latency   = mem_latency
+    s.mem_bandwidth = mem_bandwidth
+    s.cache_lines   = cache_lines
+    s.line_words    = line_words
+    s.cache_latency = cache_latency
+
+    # Interface
+
+    s.recv_raddr = [ RecvIfcRTL( AddrType ) for _ in range( rd_ports ) ]
+    s.send_rdata = [ SendIfcRTL( DataType ) for _ in range( rd_ports ) ]
+    s.recv_waddr = [ RecvIfcRTL( AddrType ) for _ in range( wr_ports ) ]
+    s.recv_wdata = [ RecvIfcRTL( DataType ) for _ in range( wr_ports ) ]
+
+    # Component
+
+    s.sram = [ DataType( 0, 0 ) for _ in range( data_mem_size ) ]
+    for i in range( len( preload_data or [] ) ):
+      s.sram[i] = preload_data[i]
+
+    s.rd_ports = rd_ports
+    s.reset_state()
+    s.reset_stats()
+
+    @s.update
+    def update_signal():
+      for i in range( rd_ports ):
+        s.recv_raddr[i].rdy = Bits1( 1 )
+        if len( s.resp[i] ) > 0 and s.resp[i][0][0] <= s.cycle:
+          s.send_rdata[i].msg = s.resp[i][0][1]
+          s.send_rdata[i].en  = s.send_rdata[i].rdy
+        else:
+          s.send_rdata[i].en  = b1( 0 )
+      for i in range( wr_ports ):
+        s.recv_waddr[i].rdy = Bits1( 1 )
+        s.recv_wdata[i].rdy = Bits1( 1 )
+
+    @s.update_ff
+    def update_sram():
+      s.clear_events()
+      # The words are kept on reset, the reads in flight and the cache
+      # are dropped.
+      if s.reset:
+        s.reset_state()
+        return
+      # Reads first, they do not see the writes of the same cycle.
+      for i in range( rd_ports ):
+        if s.send_rdata[i].en:
+          s.resp[i].pop( 0 )
+        if s.recv_raddr[i].en:
+          addr  = int( s.recv_raddr[i].msg )
+          ready = s.access( addr, False )
+          if len( s.resp[i] ) > 0:
+            ready = max( ready, s.resp[i][-1][0] )
+          s.resp[i].append( [ ready, s.sram[ addr ] ] )
+      for i in range( wr_ports ):
+        if s.recv_waddr[i].en and s.recv_wdata[i].en:
+          s.access( int( s.recv_waddr[i].msg ), True )
+          s.write_word( int( s.recv_waddr[i].msg ), s.recv_wdata[i].msg )
+      s.next_cycle()
+
+  def reset_state( s ):
+    # The reads in flight of each port, in order: [ ready cycle, word ].
+    s.resp       = [ [] for _ in range( s.rd_ports ) ]
+    s.cycle      = 0
+    s.bus_free   = 0
+    # The line held by each cache entry and the cycle its fill is done.
+    s.tags       = [ None ] * s.cache_lines
+    s.line_ready = [ 0 ] * s.cache_lines
+
+  # sram is not a signal, so the words are written at the clock edge
+  # through write_word(), as in PipelinedDataMemCL.
+  def write_word( s, addr, msg ):
+    s.sram[ addr ] = msg
+
+  def clear_events( s ):
+    s.events = { name : 0 for name in stat_names }
+
+  def next_cycle( s ):
+    s.count( 'cycles' )
+    s.cycle += 1
+
+  def count( s, name, n = 1 ):
+    s.stats[ name ]  += n
+    s.events[ name ] += n
+
+  def access( s, addr, write ):
+    # Returns the cycle the access is done.
+    s.count( 'writes' if write else 'reads' )
+    if addr < s.spm_size:
+      s.count( 'spm_accesses' )
+      return s.cycle + s.spm_latency
+    if write:
+      s.count( 'mem_writes' )
+      return s.transfer( 1 )
+    if s.cache_lines > 0:
+      line  = addr // s.line_words
+      index = line % s.cache_lines
+      if s.tags[ index ] == line:
+        s.count( 'cache_hits' )
+        return max( s.cycle + s.cache_latency, s.line_ready[ index ] )
+      s.count( 'cache_misses' )
+      s.count( 'mem_reads', s.line_words )
+      s.tags[ index ]       = line
+      s.line_ready[ index ] = s.transfer( s.line_words )
+      return s.line_ready[ index ]
+    s.count( 'mem_reads' )
+    return s.transfer( 1 )
+
+  def transfer( s, nwords ):
+    # A transfer of the backing memory starts after the earlier ones.
+    start      = max( s.cycle, s.bus_free )
+    ncycles    = -( -nwords // s.mem_bandwidth )
+    s.bus_free = start + ncycles
+    s.count( 'mem_busy_cycles', ncycles )
+    return start + ncycles - 1 + s.mem_latency
+
+  def reset_stats( s ):
+    s.stats = { name : 0 for name in stat_names }
+    s.clear_events()
+
+  def get_stats( s ):
+    stats          = dict( s.stats )
+    cycles         = max( stats['cycles'], 1 )
+    cache_accesses = stats['cache_hits'] + stats['cache_misses']
+    stats['hit_rate']        = stats['cache_hits'] / max( cache_accesses, 1 )
+    # Words per cycle moved by the backing memory.
+    stats['mem_bandwidth']   = ( stats['mem_reads'] + stats['mem_writes'] ) / cycles
+    stats['mem_utilization'] = stats['mem_busy_cycles'] / cycles
+    return stats
+
+  # Same as DataMemCL.load_data().
+  def load_data( s, data, base = 0 ):
+    assert base + len( data ) <= len( s.sram )
+    for i in range( len( data ) ):
+      s.sram[ base + i ] = data[i]
+
+  # Bulk images as NumPy arrays, same as DataMemCL.
+  def load_array( s, payload, predicate = None, base = 0 ):
+    for start, msgs in iter_msgs( s.DataType, payload, predicate ):
+      s.load_data( msgs, base + start )
+
+  def dump_array( s, base = 0, size = None ):
+    if size == None:
+      size = len( s.sram ) - base
+    return msgs_to_array( s.DataType, s.sram[ base : base + size ] )
+
+  def line_trace( s ):
+    recv_str = "|".join([ str(data.msg) for data in s.recv_wdata    ])
+    send_str = "|".join([ str(data.msg) for data in s.send_rdata    ])
+    pend_str = ",".join([ str( len( x ) ) for x in s.resp ])
+    return f'{recv_str} : [in flight: {pend_str}] : {send_str}'
+
+  def perf_snapshot( s ):
+    # The read and write requests of each port in the current cycle, and
+    # the events of the hierarchy in the last cycle.
+    return { 'read'      : [ int( x.en ) for x in s.recv_raddr ],
+             'write'     : [ int( s.recv_waddr[i].en and s.recv_wdata[i].en )
+                             for i in range( len( s.recv_waddr ) ) ],
+             'hierarchy' : dict( s.events ) }
+
+def mk_hier_data_mem( **params ):
+  # A HierDataMemCL with the given parameters (spm_size, mem_latency,
+  # cache_lines, ...) and the constructor of DataMemCL, e.g., for the
+  # DataMem of CGRACL and CGRARTL.
+  class HierDataMem( HierDataMemCL ):
+    def construct( s, DataType, data_mem_size, rd_ports = 1, wr_ports = 1,
+                   preload_data = None ):
+      super().construct( DataType, data_mem_size, rd_ports, wr_ports,
+                         preload_data, **params )
+  return HierDataMem
@@ -0,0 +1,127 @@
+"""
+==========================================================================
+NumpyDataMemCL.py
+==========================================================================
+CL data memory backed by NumPy arrays, for simulating large memories.
+DataMemRTL holds a RegisterFile and an initWrites wire per word, and
+DataMemCL a message object per word, so their elaboration time and
+footprint grow with data_mem_size. This memory has the same ports and
+constructor, but keeps one array per field of DataType (e.g., payload,
+predicate and bypass) and builds the message of a word only when it is
+read. The arrays are allocated zeroed, so the pages of a large memory
+that are never touched are not even backed by the OS; hundreds of
+thousands of words elaborate as fast as a few.
+
+The timing is the one of DataMemRTL: a read returns its word in the
+cycle of its request and sees the writes of the earlier cycles, since
+a write only takes effect at the clock edge at the end of its cycle
+(store() is an update_ff, which runs before any update block of the
+next cycle). The arrays are not signals, so the read data is evaluated
+again at each tick; after load_data() between two ticks it is only up
+to date once the model is ticked or eval_combinational() is called.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3             import *
+from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
+from ...lib.opt_type    import *
+from ...lib.data_helper import get_field_dtype, get_predicate
+
+import numpy as np
+
+class NumpyDataMemCL( Component ):
+
+  def construct( s, DataType, data_mem_size, rd_ports = 1, wr_ports = 1,
+                 preload_data = None ):
+
+    # Constant
+
+    AddrType = mk_bits( clog2( data_mem_size ) )
+    s.DataType      = DataType
+    s.data_mem_size = data_mem_size
+
+    # Interface
+
+    s.recv_raddr = [ RecvIfcRTL( AddrType ) for _ in range( rd_ports ) ]
+    s.send_rdata = [ SendIfcRTL( DataType ) for _ in range( rd_ports ) ]
+    s.recv_waddr = [ RecvIfcRTL( AddrType ) for _ in range( wr_ports ) ]
+    s.recv_wdata = [ RecvIfcRTL( DataType ) for _ in range( wr_ports ) ]
+
+    # Component
+
+    s.field_names = list( DataType.__bitstruct_fields__ )
+    s.field_types = list( DataType.__bitstruct_fields__.values() )
+    s.arrays      = [ np.zeros( data_mem_size, dtype = get_field_dtype( t.nbits ) )
+                      for t in s.field_types ]
+    s.load_data( preload_data or [] )
+
+    @s.update
+    def load():
+      for i in range( rd_ports ):
+        s.send_rdata[i].msg = s.read_msg( s.recv_raddr[i].msg )
+
+    @s.update_ff
+    def store():
+      for i in range( wr_ports ):
+        if s.recv_wdata[i].en and s.recv_waddr[i].en:
+          s.write_msg( s.recv_waddr[i].msg, s.recv_wdata[i].msg )
+
+    @s.update
+    def update_signal():
+      for i in range( rd_ports ):
+        s.recv_raddr[i].rdy = s.send_rdata[i].rdy
+        s.send_rdata[i].en  = s.recv_raddr[i].en
+      for i in range( wr_ports ):
+        s.recv_waddr[i].rdy = Bits1( 1 )
+        s.recv_wdata[i].rdy = Bits1( 1 )
+
+  def read_msg( s, addr ):
+    addr = int( addr )
+    return s.DataType( *[ t( int( a[ addr ] ) )
+                          for t, a in zip( s.field_types, s.arrays ) ] )
+
+  def write_msg( s, addr, msg ):
+    addr = int( addr )
+    for name, a in zip( s.field_names, s.arrays ):
+      a[ addr ] = int( getattr( msg, name ) )
+
+  # Same as DataMemCL.load_data().
+  def load_data( s, data, base = 0 ):
+    assert base + len( data ) <= s.data_mem_size
+    for i in range( len( data ) ):
+      s.write_msg( base + i, data[i] )
+
+  # Bulk images as NumPy arrays, copied without building any message.
+  # The other fields of the loaded words are cleared.
+  def load_array( s, payload, predicate = None, base = 0 ):
+    predicate = get_predicate( payload, predicate )
+    end = base + len( payload )
+    assert end <= s.data_mem_size
+    for name, a in zip( s.field_names, s.arrays ):
+      if name == 'payload':
+        a[ base : end ] = payload
+      elif name == 'predicate':
+        a[ base : end ] = predicate
+      else:
+        a[ base : end ] = 0
+
+  def dump_array( s, base = 0, size = None ):
+    if size == None:
+      size = s.data_mem_size - base
+    arrays = dict( zip( s.field_names, s.arrays ) )
+    return arrays['payload'][ base : base + size ].copy(), \
+           arrays['predicate'][ base : base + size ].copy()
+
+  def line_trace( s ):
+    recv_str = "|".join([ str(data.msg) for data in s.recv_wdata    ])
+    send_str = "|".join([ str(data.msg) for data in s.send_rdata    ])
+    return f'{recv_str} : [{s.data_mem_size} words] : {send_str}'
+
+  def perf_snapshot( s ):
+    # The read and write requests of each port in the current cycle.
+    return { 'read'  : [ int( x.en ) for x in s.recv_raddr ],
+             'write' : [ int( s.recv_waddr[i].en and s.recv_wdata[i].en )
+                         for i in range( len( s.recv_waddr ) ) ] }
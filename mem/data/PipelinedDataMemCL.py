@@ -0,0 +1,134 @@
+"""
+==========================================================================
+PipelinedDataMemCL.py
+==========================================================================
+CL data memory with a multi-cycle read latency. It has the ports and
+the constructor of DataMemCL plus latency: a read accepted in cycle t
+returns its word on send_rdata in cycle t + latency, and each read
+port accepts a new request every cycle, so up to latency reads of a
+port are in flight. The responses of a port come back in order. A
+response that is not taken (send_rdata.rdy low) holds the pipeline of
+its port, and so recv_raddr.rdy. A read sees the writes of the earlier
+cycles; a write takes effect at the end of its cycle, as in DataMemRTL.
+
+With latency = 0, the word is returned in the same cycle, as with
+DataMemCL. MemUnitRTL expects that, a memory with latency > 0 has to be
+used with MemUnitLsqRTL.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3             import *
+from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
+from ...lib.opt_type    import *
+from ...lib.data_helper import iter_msgs, msgs_to_array
+
+class PipelinedDataMemCL( Component ):
+
+  def construct( s, DataType, data_mem_size, rd_ports = 1, wr_ports = 1,
+                 preload_data = None, latency = 2 ):
+
+    # Constant
+
+    AddrType = mk_bits( clog2( data_mem_size ) )
+    s.DataType = DataType
+    s.latency  = latency
+
+    # Interface
+
+    s.recv_raddr = [ RecvIfcRTL( AddrType ) for _ in range( rd_ports ) ]
+    s.send_rdata = [ SendIfcRTL( DataType ) for _ in range( rd_ports ) ]
+    s.recv_waddr = [ RecvIfcRTL( AddrType ) for _ in range( wr_ports ) ]
+    s.recv_wdata = [ RecvIfcRTL( DataType ) for _ in range( wr_ports ) ]
+
+    # Component
+
+    s.sram = [ DataType( 0, 0 ) for _ in range( data_mem_size ) ]
+    for i in range( len( preload_data or [] ) ):
+      s.sram[i] = preload_data[i]
+
+    # The words read by each port, the oldest last (None for a cycle
+    # without read).
+    s.pipe = [ [ None ] * latency for _ in range( rd_ports ) ]
+
+    @s.update
+    def load():
+      for i in range( rd_ports ):
+        if latency == 0:
+          s.send_rdata[i].msg = s.sram[ s.recv_raddr[i].msg ]
+          s.send_rdata[i].en  = s.recv_raddr[i].en
+          s.recv_raddr[i].rdy = s.send_rdata[i].rdy
+        elif s.pipe[i][-1] != None:
+          s.send_rdata[i].msg = s.pipe[i][-1]
+          s.send_rdata[i].en  = s.send_rdata[i].rdy
+          s.recv_raddr[i].rdy = s.send_rdata[i].rdy
+        else:
+          s.send_rdata[i].en  = b1( 0 )
+          s.recv_raddr[i].rdy = b1( 1 )
+
+    @s.update
+    def update_signal():
+      for i in range( wr_ports ):
+        s.recv_waddr[i].rdy = Bits1( 1 )
+        s.recv_wdata[i].rdy = Bits1( 1 )
+
+    # The pipelines and sram are not signals, so they are updated at the
+    # clock edge through read_words() and write_word().
+    @s.update_ff
+    def update_sram():
+      # Reads first, they do not see the writes of the same cycle.
+      s.read_words()
+      for i in range( wr_ports ):
+        if s.recv_waddr[i].en and s.recv_wdata[i].en:
+          s.write_word( int( s.recv_waddr[i].msg ), s.recv_wdata[i].msg )
+
+  def read_words( s ):
+    for i in range( len( s.pipe ) ):
+      if s.latency > 0 and s.recv_raddr[i].rdy:
+        word = None
+        if s.recv_raddr[i].en:
+          word = s.sram[ s.recv_raddr[i].msg ]
+        s.pipe[i] = [ word ] + s.pipe[i][:-1]
+
+  def write_word( s, addr, msg ):
+    s.sram[ addr ] = msg
+
+  # Same as DataMemCL.load_data().
+  def load_data( s, data, base = 0 ):
+    assert base + len( data ) <= len( s.sram )
+    for i in range( len( data ) ):
+      s.sram[ base + i ] = data[i]
+
+  # Bulk images as NumPy arrays, same as DataMemCL.
+  def load_array( s, payload, predicate = None, base = 0 ):
+    for start, msgs in iter_msgs( s.DataType, payload, predicate ):
+      s.load_data( msgs, base + start )
+
+  def dump_array( s, base = 0, size = None ):
+    if size == None:
+      size = len( s.sram ) - base
+    return msgs_to_array( s.DataType, s.sram[ base : base + size ] )
+
+  def line_trace( s ):
+    recv_str = "|".join([ str(data.msg) for data in s.recv_wdata    ])
+    out_str  = "|".join([ str(data)     for data in s.sram ])
+    send_str = "|".join([ str(data.msg) for data in s.send_rdata    ])
+    return f'{recv_str} : [{out_str}] : {send_str}'
+
+  def perf_snapshot( s ):
+    # The read and write requests of each port in the current cycle.
+    return { 'read'  : [ int( x.en ) for x in s.recv_raddr ],
+             'write' : [ int( s.recv_waddr[i].en and s.recv_wdata[i].en )
+                         for i in range( len( s.recv_waddr ) ) ] }
+
+def mk_pipelined_data_mem( latency ):
+  # A PipelinedDataMemCL of the given latency with the constructor of
+  # DataMemCL, e.g., for the DataMem of CGRACL and CGRARTL.
+  class PipelinedDataMem( PipelinedDataMemCL ):
+    def construct( s, DataType, data_mem_size, rd_ports = 1, wr_ports = 1,
+                   preload_data = None ):
+      super().construct( DataType, data_mem_size, rd_ports, wr_ports,
+                         preload_data, latency )
+  return PipelinedDataMem
@@ -0,0 +1,89 @@
+"""
+==========================================================================
+HierDataMemCL_test.py
+==========================================================================
+Test cases for the data memory with the timing of a memory hierarchy.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ..HierDataMemCL              import HierDataMemCL
+from ....lib.opt_type             import *
+from ....lib.messages             import *
+
+def test_hierarchy():
+  DataType      = mk_data( 16, 1 )
+  data_mem_size = 16
+  AddrType      = mk_bits( clog2( data_mem_size ) )
+  preload_data  = [ DataType( i + 10, 1 ) for i in range( data_mem_size ) ]
+  dut = HierDataMemCL( DataType, data_mem_size, 1, 1, preload_data,
+                       spm_size = 4, spm_latency = 1, mem_latency = 4,
+                       mem_bandwidth = 1, cache_lines = 2, line_words = 2 )
+  dut.elaborate()
+  dut.apply( SimulationPass() )
+  dut.sim_reset()
+  dut.reset_stats()
+  dut.send_rdata[0].rdy = b1( 1 )
+
+  # A scratchpad word, a miss filling the line of words 8 and 9 in two
+  # cycles, a hit on that line and a scratchpad word again. The last two
+  # wait for the fill, as the words are returned in order.
+  resps = []
+  reads = [ 1, 8, 9, 1 ]
+  for k in range( 10 ):
+    dut.recv_raddr[0].en = b1( k < len( reads ) )
+    if k < len( reads ):
+      dut.recv_raddr[0].msg = AddrType( reads[k] )
+    dut.tick()
+    if dut.send_rdata[0].en:
+      resps.append( ( k + 1, int( dut.send_rdata[0].msg.payload ) ) )
+  assert resps == [ ( 1, 11 ), ( 6, 18 ), ( 7, 19 ), ( 8, 11 ) ]
+
+  stats = dut.get_stats()
+  assert stats['reads'] == 4
+  assert stats['spm_accesses'] == 2
+  assert stats['cache_hits'] == 1
+  assert stats['cache_misses'] == 1
+  assert stats['mem_reads'] == 2
+  assert stats['hit_rate'] == 0.5
+  assert stats['cycles'] == 10
+  assert stats['mem_bandwidth'] == 0.2
+
+def test_reset():
+  DataType      = mk_data( 16, 1 )
+  data_mem_size = 16
+  AddrType      = mk_bits( clog2( data_mem_size ) )
+  preload_data  = [ DataType( i + 10, 1 ) for i in range( data_mem_size ) ]
+  dut = HierDataMemCL( DataType, data_mem_size, 1, 1, preload_data,
+                       spm_size = 4, mem_latency = 4, cache_lines = 2,
+                       line_words = 2 )
+  dut.elaborate()
+  dut.apply( SimulationPass() )
+  dut.sim_reset()
+  dut.send_rdata[0].rdy = b1( 1 )
+
+  # A miss in flight, then a reset: the read is dropped and the line is
+  # not in the cache any more, the words are kept.
+  dut.recv_raddr[0].en  = b1( 1 )
+  dut.recv_raddr[0].msg = AddrType( 8 )
+  dut.tick()
+  dut.recv_raddr[0].en  = b1( 0 )
+  dut.sim_reset()
+  assert dut.resp == [ [] ]
+  assert dut.tags == [ None, None ]
+  assert dut.cycle == 0 and dut.bus_free == 0
+  dut.reset_stats()
+  dut.recv_raddr[0].en  = b1( 1 )
+  dut.tick()
+  dut.recv_raddr[0].en  = b1( 0 )
+  assert dut.get_stats()['cache_misses'] == 1
+  resps = []
+  for k in range( 8 ):
+    if dut.send_rdata[0].en:
+      resps.append( int( dut.send_rdata[0].msg.payload ) )
+    dut.tick()
+  assert resps == [ 18 ]
@@ -0,0 +1,62 @@
+"""
+==========================================================================
+NumpyDataMemCL_test.py
+==========================================================================
+Test cases for the NumPy-backed data memory.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ..NumpyDataMemCL             import NumpyDataMemCL, get_field_dtype
+from ....lib.opt_type             import *
+from ....lib.messages             import *
+
+import numpy as np
+
+def test_field_dtype():
+  assert get_field_dtype( 1  ) == np.uint8
+  assert get_field_dtype( 16 ) == np.uint16
+  assert get_field_dtype( 64 ) == np.uint64
+  assert get_field_dtype( 65 ) == object
+
+def test_large_mem():
+  DataType      = mk_data( 32, 1 )
+  data_mem_size = 1 << 18
+  AddrType      = mk_bits( clog2( data_mem_size ) )
+  dut = NumpyDataMemCL( DataType, data_mem_size, 1, 1,
+                        [ DataType( 7, 1 ), DataType( 8, 0 ) ] )
+  dut.elaborate()
+  dut.apply( SimulationPass() )
+  dut.sim_reset()
+  dut.send_rdata[0].rdy = b1( 1 )
+
+  # Write the last word: the read of the same cycle still returns the
+  # old word, the one of the next cycle the new word.
+  last = data_mem_size - 1
+  dut.recv_waddr[0].msg = AddrType( last )
+  dut.recv_wdata[0].msg = DataType( 123456, 1 )
+  dut.recv_waddr[0].en  = b1( 1 )
+  dut.recv_wdata[0].en  = b1( 1 )
+  dut.recv_raddr[0].msg = AddrType( last )
+  dut.recv_raddr[0].en  = b1( 1 )
+  dut.eval_combinational()
+  assert dut.send_rdata[0].msg == DataType( 0, 0 )
+  dut.tick()
+  dut.recv_waddr[0].en  = b1( 0 )
+  dut.recv_wdata[0].en  = b1( 0 )
+  dut.eval_combinational()
+  assert dut.send_rdata[0].msg == DataType( 123456, 1 )
+  dut.tick()
+
+  dut.recv_raddr[0].msg = AddrType( 1 )
+  dut.eval_combinational()
+  assert dut.send_rdata[0].msg == DataType( 8, 0 )
+  dut.tick()
+
+  dut.load_data( [ DataType( 5, 1 ) ] * 3, 1000 )
+  assert dut.read_msg( 1002 ) == DataType( 5, 1 )
+  assert dut.read_msg( 1003 ) == DataType( 0, 0 )
@@ -0,0 +1,47 @@
+"""
+==========================================================================
+PipelinedDataMemCL_test.py
+==========================================================================
+Test cases for the data memory with a multi-cycle read latency.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+
+from ..PipelinedDataMemCL         import PipelinedDataMemCL
+from ....lib.opt_type             import *
+from ....lib.messages             import *
+
+def test_latency():
+  DataType      = mk_data( 16, 1 )
+  data_mem_size = 8
+  AddrType      = mk_bits( clog2( data_mem_size ) )
+  preload_data  = [ DataType( i + 10, 1 ) for i in range( data_mem_size ) ]
+  dut = PipelinedDataMemCL( DataType, data_mem_size, 1, 1, preload_data, 2 )
+  dut.elaborate()
+  dut.apply( SimulationPass() )
+  dut.sim_reset()
+  dut.send_rdata[0].rdy = b1( 1 )
+
+  # One read per cycle, each returned two cycles later. The write of
+  # word 1 in the first cycle is not seen by the read in the same cycle.
+  dut.recv_waddr[0].msg = AddrType( 1 )
+  dut.recv_wdata[0].msg = DataType( 99, 1 )
+  dut.recv_waddr[0].en  = b1( 1 )
+  dut.recv_wdata[0].en  = b1( 1 )
+  dut.recv_raddr[0].en  = b1( 1 )
+  resps = []
+  for addr in [ 1, 2, 1, 3, 3, 3 ]:
+    dut.recv_raddr[0].msg = AddrType( addr )
+    dut.tick()
+    dut.recv_waddr[0].en  = b1( 0 )
+    dut.recv_wdata[0].en  = b1( 0 )
+    if addr == 3:
+      dut.recv_raddr[0].en = b1( 0 )
+    if dut.send_rdata[0].en:
+      resps.append( dut.send_rdata[0].msg )
+  assert resps == [ DataType( 11, 1 ), DataType( 12, 1 ), DataType( 99, 1 ),
+                    DataType( 13, 1 ) ]
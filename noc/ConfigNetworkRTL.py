@@ -0,0 +1,126 @@
+"""
+=========================================================================
+ConfigNetworkRTL.py
+=========================================================================
+Configuration network that multicasts control words to the control
+memories of a CGRA. It has num_ports ports, each taking an address, a
+control word and a mask of the tiles to write in a cycle. The address
+and the control word of each port are broadcast through MulticasterRTLs
+and only the tiles in the mask see en. A word shared by a group of tiles
+is thus loaded in one cycle, and num_ports words for disjoint groups of
+tiles in parallel (see mk_multicast_ctrl() in ctrl_helper.py). A tile is
+written by at most one port in a cycle, i.e., the masks of the messages
+sent together must be disjoint.
+
+A control memory starts running once its word 0 is no longer OPT_START.
+The words at address 0 are therefore held in the network, one register
+per tile, and written to all the tiles in the cycle the last of them
+arrives, so that the tiles start together whatever the number of ports.
+Every tile must be given a word 0.
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from pymtl3             import *
+from pymtl3.stdlib.ifcs import SendIfcRTL, RecvIfcRTL
+
+from .MulticasterRTL    import MulticasterRTL
+from ..lib.opt_type     import *
+
+class ConfigNetworkRTL( Component ):
+
+  def construct( s, CtrlType, AddrType, num_tiles, num_ports = 1 ):
+
+    # Constant
+    MaskType = mk_bits( num_tiles )
+
+    # Interface
+
+    s.recv_waddr = [ RecvIfcRTL( AddrType ) for _ in range( num_ports ) ]
+    s.recv_wopt  = [ RecvIfcRTL( CtrlType ) for _ in range( num_ports ) ]
+    s.recv_mask  = [ RecvIfcRTL( MaskType ) for _ in range( num_ports ) ]
+    s.send_waddr = [ SendIfcRTL( AddrType ) for _ in range( num_tiles ) ]
+    s.send_wopt  = [ SendIfcRTL( CtrlType ) for _ in range( num_tiles ) ]
+
+    # Component
+
+    s.waddr_cast = [ MulticasterRTL( AddrType, num_tiles )
+                     for _ in range( num_ports ) ]
+    s.wopt_cast  = [ MulticasterRTL( CtrlType, num_tiles )
+                     for _ in range( num_ports ) ]
+
+    s.rdy        = Wire( b1 )
+    s.release    = Wire( b1 )
+    s.start_en   = [ Wire( b1 ) for _ in range( num_tiles ) ]
+    s.start_wopt = [ Wire( CtrlType ) for _ in range( num_tiles ) ]
+    s.held       = [ Wire( b1 ) for _ in range( num_tiles ) ]
+    s.held_wopt  = [ Wire( CtrlType ) for _ in range( num_tiles ) ]
+
+    # Connections
+
+    for p in range( num_ports ):
+      s.recv_waddr[p] //= s.waddr_cast[p].recv
+      s.recv_wopt[p]  //= s.wopt_cast[p].recv
+
+    # The ports move together, so that the messages of a cycle stay
+    # together. The tiles out of the masks do not hold them back.
+    @s.update
+    def update_rdy():
+      s.rdy = b1( 1 )
+      for i in range( num_tiles ):
+        for p in range( num_ports ):
+          if s.recv_mask[p].msg[i]:
+            s.rdy = s.rdy & s.send_waddr[i].rdy & s.send_wopt[i].rdy
+        if s.held[i]:
+          s.rdy = s.rdy & s.send_waddr[i].rdy & s.send_wopt[i].rdy
+      for p in range( num_ports ):
+        s.recv_mask[p].rdy = s.rdy
+        for i in range( num_tiles ):
+          s.waddr_cast[p].send[i].rdy = s.rdy
+          s.wopt_cast[p].send[i].rdy  = s.rdy
+
+    @s.update
+    def update_send():
+      s.release = b1( 1 )
+      for i in range( num_tiles ):
+        s.send_waddr[i].en  = b1( 0 )
+        s.send_wopt[i].en   = b1( 0 )
+        s.send_waddr[i].msg = s.waddr_cast[0].send[i].msg
+        s.send_wopt[i].msg  = s.wopt_cast[0].send[i].msg
+        s.start_en[i]       = b1( 0 )
+        s.start_wopt[i]     = s.held_wopt[i]
+        for p in range( num_ports ):
+          if s.recv_mask[p].en & s.recv_mask[p].msg[i]:
+            if s.waddr_cast[p].send[i].msg == AddrType( 0 ):
+              s.start_en[i]   = s.wopt_cast[p].send[i].en
+              s.start_wopt[i] = s.wopt_cast[p].send[i].msg
+            else:
+              s.send_waddr[i].msg = s.waddr_cast[p].send[i].msg
+              s.send_wopt[i].msg  = s.wopt_cast[p].send[i].msg
+              s.send_waddr[i].en  = s.waddr_cast[p].send[i].en
+              s.send_wopt[i].en   = s.wopt_cast[p].send[i].en
+        s.release = s.release & ( s.held[i] | s.start_en[i] )
+
+      # The words 0 are all written once every tile has one.
+      if s.release:
+        for i in range( num_tiles ):
+          s.send_waddr[i].msg = AddrType( 0 )
+          s.send_wopt[i].msg  = s.start_wopt[i]
+          s.send_waddr[i].en  = b1( 1 )
+          s.send_wopt[i].en   = b1( 1 )
+
+    @s.update_ff
+    def update_held():
+      for i in range( num_tiles ):
+        if s.reset | s.release:
+          s.held[i] <<= b1( 0 )
+        elif s.start_en[i]:
+          s.held[i]      <<= b1( 1 )
+          s.held_wopt[i] <<= s.start_wopt[i]
+
+  # Line trace
+  def line_trace( s ):
+    return " | ".join([ f"{s.recv_waddr[p].msg}:{s.recv_wopt[p].msg}"
+                        f"({s.recv_mask[p].msg})"
+                        for p in range( len( s.recv_mask ) ) ])
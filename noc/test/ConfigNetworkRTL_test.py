@@ -0,0 +1,149 @@
+"""
+==========================================================================
+ConfigNetworkRTL_test.py
+==========================================================================
+Test cases for the multicast configuration network.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                       import *
+from pymtl3.stdlib.test           import TestSinkCL
+from pymtl3.stdlib.test.test_srcs import TestSrcRTL
+
+from ..ConfigNetworkRTL           import ConfigNetworkRTL
+from ...lib.opt_type              import *
+from ...lib.messages              import *
+
+#-------------------------------------------------------------------------
+# Test harness
+#-------------------------------------------------------------------------
+
+class TestHarness( Component ):
+
+  def construct( s, CtrlType, AddrType, num_tiles, src_waddr, src_opt,
+                 src_mask, sink_waddr, sink_opt ):
+
+    # One stream per port.
+    s.num_tiles  = num_tiles
+    s.num_ports  = len( src_mask )
+    s.src_waddr  = [ TestSrcRTL( AddrType, x ) for x in src_waddr ]
+    s.src_opt    = [ TestSrcRTL( CtrlType, x ) for x in src_opt   ]
+    s.src_mask   = [ TestSrcRTL( mk_bits( num_tiles ), x )
+                     for x in src_mask ]
+    s.sink_waddr = [ TestSinkCL( AddrType, sink_waddr[i] )
+                     for i in range( num_tiles ) ]
+    s.sink_opt   = [ TestSinkCL( CtrlType, sink_opt[i] )
+                     for i in range( num_tiles ) ]
+
+    s.dut = ConfigNetworkRTL( CtrlType, AddrType, num_tiles, s.num_ports )
+
+    for p in range( s.num_ports ):
+      connect( s.src_waddr[p].send, s.dut.recv_waddr[p] )
+      connect( s.src_opt[p].send,   s.dut.recv_wopt[p]  )
+      connect( s.src_mask[p].send,  s.dut.recv_mask[p]  )
+    for i in range( num_tiles ):
+      connect( s.dut.send_waddr[i], s.sink_waddr[i].recv )
+      connect( s.dut.send_wopt[i],  s.sink_opt[i].recv   )
+
+  def done( s ):
+    return all( x.done() for x in s.src_mask ) and \
+           all( x.done() for x in s.sink_waddr + s.sink_opt )
+
+  def line_trace( s ):
+    return s.dut.line_trace()
+
+def run_sim( test_harness, max_cycles=100 ):
+  test_harness.elaborate()
+  test_harness.apply( SimulationPass() )
+  test_harness.sim_reset()
+
+  # Run simulation
+
+  ncycles = 0
+  print()
+  print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+  while not test_harness.done() and ncycles < max_cycles:
+    test_harness.tick()
+    ncycles += 1
+    print( "{}:{}".format( ncycles, test_harness.line_trace() ))
+
+  # Check timeout
+
+  assert ncycles < max_cycles
+
+  test_harness.tick()
+  test_harness.tick()
+  test_harness.tick()
+
+def test_multicast():
+  num_tiles = 3
+  CtrlType  = mk_ctrl()
+  AddrType  = mk_bits( 2 )
+  MaskType  = mk_bits( num_tiles )
+  src_waddr = [ AddrType( 0 ), AddrType( 0 ), AddrType( 1 ) ]
+  src_opt   = [ CtrlType( OPT_ADD ), CtrlType( OPT_SUB ),
+                CtrlType( OPT_MUL ) ]
+  src_mask  = [ MaskType( 0b011 ), MaskType( 0b100 ), MaskType( 0b111 ) ]
+  # Each tile only sees the words of its mask.
+  sink_waddr = [ [ AddrType( 0 ), AddrType( 1 ) ],
+                 [ AddrType( 0 ), AddrType( 1 ) ],
+                 [ AddrType( 0 ), AddrType( 1 ) ] ]
+  sink_opt   = [ [ CtrlType( OPT_ADD ), CtrlType( OPT_MUL ) ],
+                 [ CtrlType( OPT_ADD ), CtrlType( OPT_MUL ) ],
+                 [ CtrlType( OPT_SUB ), CtrlType( OPT_MUL ) ] ]
+  th = TestHarness( CtrlType, AddrType, num_tiles, [ src_waddr ],
+                    [ src_opt ], [ src_mask ], sink_waddr, sink_opt )
+  run_sim( th )
+
+def test_multicast_ports():
+  num_tiles = 3
+  CtrlType  = mk_ctrl()
+  AddrType  = mk_bits( 2 )
+  MaskType  = mk_bits( num_tiles )
+  # The masks of a cycle are disjoint, an empty mask writes nothing.
+  src_waddr = [ [ AddrType( 1 ), AddrType( 0 ) ],
+                [ AddrType( 1 ), AddrType( 0 ) ] ]
+  src_opt   = [ [ CtrlType( OPT_ADD ), CtrlType( OPT_SUB ) ],
+                [ CtrlType( OPT_MUL ), CtrlType( 0 ) ] ]
+  src_mask  = [ [ MaskType( 0b011 ), MaskType( 0b111 ) ],
+                [ MaskType( 0b100 ), MaskType( 0b000 ) ] ]
+  sink_waddr = [ [ AddrType( 1 ), AddrType( 0 ) ] for _ in range( 3 ) ]
+  sink_opt   = [ [ CtrlType( OPT_ADD ), CtrlType( OPT_SUB ) ],
+                 [ CtrlType( OPT_ADD ), CtrlType( OPT_SUB ) ],
+                 [ CtrlType( OPT_MUL ), CtrlType( OPT_SUB ) ] ]
+  th = TestHarness( CtrlType, AddrType, num_tiles, src_waddr, src_opt,
+                    src_mask, sink_waddr, sink_opt )
+  run_sim( th )
+
+def test_start_held():
+  num_tiles = 3
+  CtrlType  = mk_ctrl()
+  AddrType  = mk_bits( 2 )
+  MaskType  = mk_bits( num_tiles )
+  # The words 0 are held until every tile has one, then written in the
+  # same cycle, after the word 1 sent in between.
+  src_waddr = [ AddrType( 0 ), AddrType( 1 ), AddrType( 0 ) ]
+  src_opt   = [ CtrlType( OPT_ADD ), CtrlType( OPT_MUL ),
+                CtrlType( OPT_SUB ) ]
+  src_mask  = [ MaskType( 0b011 ), MaskType( 0b111 ), MaskType( 0b100 ) ]
+  sink_waddr = [ [ AddrType( 1 ), AddrType( 0 ) ] for _ in range( 3 ) ]
+  sink_opt   = [ [ CtrlType( OPT_MUL ), CtrlType( OPT_ADD ) ],
+                 [ CtrlType( OPT_MUL ), CtrlType( OPT_ADD ) ],
+                 [ CtrlType( OPT_MUL ), CtrlType( OPT_SUB ) ] ]
+  th = TestHarness( CtrlType, AddrType, num_tiles, [ src_waddr ],
+                    [ src_opt ], [ src_mask ], sink_waddr, sink_opt )
+  th.elaborate()
+  th.apply( SimulationPass() )
+  th.sim_reset()
+  starts = []
+  for cycle in range( 6 ):
+    th.tick()
+    for i in range( num_tiles ):
+      if th.dut.send_wopt[i].en and th.dut.send_waddr[i].msg == AddrType( 0 ):
+        starts.append( ( cycle, i ) )
+  assert [ i for _, i in starts ] == [ 0, 1, 2 ]
+  assert len( set( [ cycle for cycle, _ in starts ] ) ) == 1
+  assert th.done()
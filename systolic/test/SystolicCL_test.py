@@ -21,9 +21,12 @@ from ...fu.flexible.FlexibleFuRTL import FlexibleFuRTL
 from ...fu.single.AdderRTL        import AdderRTL
 from ...fu.single.MemUnitRTL      import MemUnitRTL
 from ...fu.double.SeqMulAdderRTL  import SeqMulAdderRTL
+from ...tile.TileCL               import TileCL
+from ...tile.TileNativeCL         import TileNativeCL
 from ..SystolicCL                 import SystolicCL
 
 import os
+import pytest
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -33,7 +36,8 @@ class TestHarness( Component ):
 
   def construct( s, DUT, FunctionUnit, FuList, DataType, PredicateType,
                  CtrlType, width, height, ctrl_mem_size, data_mem_size,
-                 src_opt, preload_data, preload_const, sink_out ):
+                 src_opt, preload_data, preload_const, sink_out,
+                 Tile = TileCL ):
 
     s.num_tiles = width * height
     AddrType = mk_bits( clog2( ctrl_mem_size ) )
@@ -43,7 +47,7 @@ class TestHarness( Component ):
 
     s.dut = DUT( FunctionUnit, FuList, DataType, PredicateType, CtrlType,
                  width, height, ctrl_mem_size, data_mem_size, ctrl_mem_size,
-                 src_opt, preload_data, preload_const )
+                 src_opt, preload_data, preload_const, Tile = Tile )
 
     for i in range( height-1 ):
       connect( s.dut.send_data[i],  s.sink_out[i].recv )
@@ -72,6 +76,7 @@ def run_sim( test_harness, max_cycles=6 ):
   test_harness.tick()
   test_harness.tick()
   test_harness.tick()
+  assert all( [ sink.done() for sink in test_harness.sink_out ] )
 
 # ------------------------------------------------------------------
 # To emulate systolic array
@@ -80,7 +85,8 @@ def run_sim( test_harness, max_cycles=6 ):
 # 1: North, 2: South, 3: West, 4: East
 # 5 - 8: registers
 # ------------------------------------------------------------------
-def test_systolic_2x2():
+@pytest.mark.parametrize( "Tile", [ TileCL, TileNativeCL ] )
+def test_systolic_2x2( Tile ):
   num_tile_inports  = 4
   num_tile_outports = 4
   num_xbar_inports  = 6
@@ -222,7 +228,7 @@ def test_systolic_2x2():
   sink_out = [[DataType(14, 1), DataType(20, 1)], [DataType(30, 1), DataType(44, 1)]]
   th = TestHarness( DUT, FunctionUnit, FuList, DataType, PredicateType,
                     CtrlType, width, height, ctrl_mem_size, len(preload_mem),
-                    src_opt, preload_mem, preload_const, sink_out )
+                    src_opt, preload_mem, preload_const, sink_out, Tile )
   run_sim( th )
 
 
@@ -16,6 +16,7 @@ from ..mem.ctrl.CtrlMemCL        import CtrlMemCL
 from ..fu.flexible.FlexibleFuRTL import FlexibleFuRTL
 from ..mem.const.ConstQueueRTL   import ConstQueueRTL
 from ..fu.single.MemUnitRTL      import MemUnitRTL
+from ..lib.opt_type              import *
 
 class TileCL( Component ):
 
@@ -24,6 +25,7 @@ class TileCL( Component ):
                  const_list, opt_list, id=0 ):
 
     # Constant
+    s.num_ctrl        = num_ctrl
     num_xbar_inports  = 6
     num_xbar_outports = 8
     num_fu_inports    = 4
@@ -32,11 +34,18 @@ class TileCL( Component ):
     bypass_point      = 4
     CtrlAddrType      = mk_bits( clog2( ctrl_mem_size ) )
     DataAddrType      = mk_bits( clog2( data_mem_size ) )
+    ConstAddrType     = mk_bits( clog2( len( const_list ) + 1 ) )
 
     # Interfaces
     s.recv_data    = [ RecvIfcRTL( DataType ) for _ in range ( num_mesh_ports ) ]
     s.send_data    = [ SendIfcRTL( DataType ) for _ in range ( num_mesh_ports ) ]
 
+    # Ctrl and const
+    s.recv_waddr       = RecvIfcRTL( CtrlAddrType )
+    s.recv_wopt        = RecvIfcRTL( CtrlType )
+    s.recv_const_waddr = RecvIfcRTL( ConstAddrType )
+    s.recv_const       = RecvIfcRTL( DataType )
+
     # Data
     s.to_mem_raddr   = SendIfcRTL( DataAddrType )
     s.from_mem_rdata = RecvIfcRTL( DataType )
@@ -44,8 +53,8 @@ class TileCL( Component ):
     s.to_mem_wdata   = SendIfcRTL( DataType )
 
     # Components
-    s.element     = FlexibleFuRTL( DataType, PredicateType, CtrlType, num_fu_inports,
-                                   num_fu_outports, data_mem_size, FuList )
+    s.element     = Fu( DataType, PredicateType, CtrlType, num_fu_inports,
+                        num_fu_outports, data_mem_size, FuList )
     s.const_queue = ConstQueueRTL( DataType, const_list )
     s.crossbar    = CrossbarRTL( DataType, PredicateType, CtrlType, num_xbar_inports,
                                  num_xbar_outports, bypass_point, id )
@@ -57,11 +66,25 @@ class TileCL( Component ):
 
     # Connections
 
+    # Ctrl and const
+    s.ctrl_mem.recv_waddr    //= s.recv_waddr
+    s.ctrl_mem.recv_ctrl     //= s.recv_wopt
+
+    # A memory unit holds its control word, see MemUnitRTL.
+    s.opt_hold = Wire( b1 )
+    if hasattr( s.element, 'opt_hold' ):
+      s.opt_hold //= s.element.opt_hold
+    else:
+      s.opt_hold //= 0
+
+    s.const_queue.recv_waddr //= s.recv_const_waddr
+    s.const_queue.recv_const //= s.recv_const
+
     # Data
     s.element.recv_const //=  s.const_queue.send_const
 
     for i in range( len( FuList ) ):
-      if FuList[i] == MemUnitRTL:
+      if issubclass( FuList[i], MemUnitRTL ):
         s.to_mem_raddr   //= s.element.to_mem_raddr[i]
         s.from_mem_rdata //= s.element.from_mem_rdata[i]
         s.to_mem_waddr   //= s.element.to_mem_waddr[i]
@@ -100,6 +123,16 @@ class TileCL( Component ):
       s.element.recv_opt.en    = s.ctrl_mem.send_ctrl.en
       s.crossbar.recv_opt.en   = s.ctrl_mem.send_ctrl.en
       s.ctrl_mem.send_ctrl.rdy = s.element.recv_opt.rdy or s.crossbar.recv_opt.rdy
+      # The control word stays while the memory unit holds it.
+      if s.opt_hold:
+        s.ctrl_mem.send_ctrl.rdy = b1( 0 )
+
+  # Reload between two ticks, see ConstQueueRTL and CtrlMemCL.
+  def load_consts( s, const_list ):
+    s.const_queue.load_consts( const_list )
+
+  def load_ctrl( s, opt_list ):
+    s.ctrl_mem.load_ctrl( opt_list )
 
   # Line trace
   def line_trace( s ):
@@ -110,3 +143,17 @@ class TileCL( Component ):
     out_str  = "|".join([ "("+str(x.msg.payload)+","+str(x.msg.predicate)+")" for x in s.send_data ])
     return f"\n{recv_str} => [crossbar: {s.crossbar.line_trace()}] (element: {s.element.line_trace()}) => {channel_str} => {out_str} |||"
 
+  # Performance counters
+  def perf_snapshot( s ):
+    # The events of the current cycle: the opcode issued to the FU (None
+    # if none), whether a pending operation is held back by rdy, the
+    # occupancy of the channels and the crossbar outports in use.
+    ctrl  = s.ctrl_mem.send_ctrl
+    opt   = int( ctrl.msg.ctrl ) if ctrl.en else None
+    stall = not ctrl.en and s.ctrl_mem.times < s.num_ctrl and \
+            ctrl.msg.ctrl != OPT_START and ctrl.msg.ctrl != OPT_NAH
+    return { 'opt'     : opt,
+             'stall'   : bool( stall ),
+             'channel' : [ int( x.count ) for x in s.channel ],
+             'xbar'    : [ int( x.en ) for x in s.crossbar.send_data ] }
+
@@ -0,0 +1,518 @@
+"""
+=========================================================================
+TileNativeCL.py
+=========================================================================
+Cycle-level tile for fast simulation. TileCL still instantiates the
+crossbar, channels, predicate register, const queue and FU of TileRTL,
+so it runs at RTL speed. This tile has the same interface but keeps its
+state in plain Python objects: the control words are decoded into lists
+of ints once, the channels and the predicate register are two-entry
+queues, and the FU is evaluated through the dispatch table of
+FlexibleFuCL. Three update blocks per tile compute the rdy of the mesh
+inports, the outputs (FU, memory requests and outgoing data) and the
+data received by the crossbar; the state is committed in update_ff.
+
+The cycle behavior follows TileRTL, including the rdy of the crossbar
+and FU ports that stay high once set, the routing that goes on after
+the last control word and the data bypassed from the FU to the
+neighbours. A channel whose bypass flag is still set forwards the rdy
+of the neighbour to its mesh inport, so the rdy of the mesh inports
+depends on the neighbours like in TileCL and the simulator settles
+them together. The control words and the constants are written through
+the same ports as in TileCL, or between two ticks with load_ctrl() and
+load_consts().
+
+Author : agent
+  Date : Oct 18, 2026
+"""
+
+from pymtl3                      import *
+from pymtl3.stdlib.ifcs          import SendIfcRTL, RecvIfcRTL
+from ..fu.flexible.FlexibleFuCL  import FlexibleFuCL, FuIO, mk_dispatch, \
+                                        execute, fu_kinds, out_rdy_of
+from ..fu.flexible.FlexibleFuRTL import FlexibleFuRTL
+from ..fu.single.MemUnitRTL      import MemUnitRTL
+from ..lib.opt_type              import *
+
+#-------------------------------------------------------------------------
+# Two-entry queue with the behavior of NormalQueueRTL
+#-------------------------------------------------------------------------
+
+class NativeQueue:
+
+  def __init__( s, DataType, num_entries = 2 ):
+    s.num_entries = num_entries
+    # The entries are not cleared on reset, the head is read even if the
+    # queue is empty.
+    s.entries     = [ DataType( 0, 0 ) for _ in range( num_entries ) ]
+    s.head        = 0
+    s.tail        = 0
+    s.count       = 0
+
+  def front( s ):
+    return s.entries[ s.head ]
+
+  def update( s, enq_msg, deq ):
+    # Applies the transfers of a cycle, enq_msg is None if none.
+    if deq:
+      s.head = ( s.head + 1 ) % s.num_entries
+      s.count -= 1
+    if enq_msg is not None:
+      s.entries[ s.tail ] = enq_msg
+      s.tail = ( s.tail + 1 ) % s.num_entries
+      s.count += 1
+
+  def reset( s ):
+    s.head  = 0
+    s.tail  = 0
+    s.count = 0
+
+#-------------------------------------------------------------------------
+# TileNativeCL
+#-------------------------------------------------------------------------
+
+class TileNativeCL( Component ):
+
+  def construct( s, Fu, FuList, DataType, PredicateType, CtrlType,
+                 ctrl_mem_size, data_mem_size, num_ctrl,
+                 const_list, opt_list, id=0 ):
+
+    # Constant
+    s.num_ctrl          = num_ctrl
+    num_xbar_inports    = 6
+    num_xbar_outports   = 8
+    num_fu_inports      = 4
+    num_fu_outports     = 2
+    num_mesh_ports      = 4
+    bypass_point        = 4
+    s.num_xbar_inports  = num_xbar_inports
+    s.num_xbar_outports = num_xbar_outports
+    CtrlAddrType        = mk_bits( clog2( ctrl_mem_size ) )
+    DataAddrType        = mk_bits( clog2( data_mem_size ) )
+    if not const_list:
+      const_list = [ DataType( 0, 0 ) ]
+    ConstAddrType       = mk_bits( clog2( len( const_list ) + 1 ) )
+
+    # The FUs in FuList are evaluated in Python as FlexibleFuCL does,
+    # which behaves as FlexibleFuRTL.
+    if Fu not in [ FlexibleFuRTL, FlexibleFuCL ]:
+      raise Exception( f"TileNativeCL only models FlexibleFuRTL and "
+                       f"FlexibleFuCL, use TileCL for {Fu.__name__}!" )
+    assert FuList.count( MemUnitRTL ) <= 1
+    s.has_mem   = MemUnitRTL in FuList
+    s.dispatch  = mk_dispatch( FuList )
+    s.io        = FuIO( DataType, num_fu_inports, num_fu_outports )
+    s.fu_kinds  = fu_kinds( FuList )
+
+    # Interfaces
+    s.recv_data    = [ RecvIfcRTL( DataType ) for _ in range ( num_mesh_ports ) ]
+    s.send_data    = [ SendIfcRTL( DataType ) for _ in range ( num_mesh_ports ) ]
+
+    # Ctrl and const
+    s.recv_waddr       = RecvIfcRTL( CtrlAddrType )
+    s.recv_wopt        = RecvIfcRTL( CtrlType )
+    s.recv_const_waddr = RecvIfcRTL( ConstAddrType )
+    s.recv_const       = RecvIfcRTL( DataType )
+
+    # Data
+    s.to_mem_raddr   = SendIfcRTL( DataAddrType )
+    s.from_mem_rdata = RecvIfcRTL( DataType )
+    s.to_mem_waddr   = SendIfcRTL( DataAddrType )
+    s.to_mem_wdata   = SendIfcRTL( DataType )
+
+    # Outputs of the FU, from update_send to update_recv.
+    s.fu_out    = [ Wire( DataType ) for _ in range( num_fu_outports ) ]
+    s.fu_out_en = [ Wire( b1 ) for _ in range( num_fu_outports ) ]
+
+    # Control memory, decoded once.
+    s.ctrl_msgs  = [ None ] * ctrl_mem_size
+    s.opts       = [ None ] * ctrl_mem_size
+    s.routes     = [ None ] * ctrl_mem_size
+    s.pred_ins   = [ None ] * ctrl_mem_size
+    for i in range( ctrl_mem_size ):
+      s.decode( i, opt_list[i] if i < len( opt_list ) else CtrlType( 0 ) )
+    s.ctrl_cur   = 0
+    s.ctrl_times = 0
+    # The control pointer wraps as in CtrlMemCL, on the width of its
+    # address.
+    s.ctrl_addr_range = 1 << CtrlAddrType.nbits
+
+    # Const queue.
+    s.consts    = list( const_list )
+    s.const_cur = 0
+
+    # Channels ( mesh outports, then FU inports ) and predicate register.
+    s.channel    = [ NativeQueue( DataType ) for _ in range( num_xbar_outports ) ]
+    s.reg_predicate = NativeQueue( PredicateType )
+
+    # Signals that keep their value until they are set again.
+    s.bypass     = [ 0 ] * num_xbar_outports
+    s.xbar_rdy   = [ 0 ] * num_xbar_inports
+    s.in_rdy     = [ 0 ] * num_fu_inports
+    s.opt_rdy    = 0
+    s.const_rdy  = 0
+    s.pred_rdy   = 0
+    s.pred_msg   = PredicateType( 0, 0 )
+    s.out_msg    = [ DataType( 0, 0 ) for _ in range( num_fu_outports ) ]
+    s.mem_out_en = [ 0 ] * num_fu_outports
+    s.first      = 0
+
+    # Transfers of the current cycle, committed by update_state.
+    s.next_bypass   = list( s.bypass )
+    s.next_xbar_rdy = list( s.xbar_rdy )
+    s.open          = [ 0 ] * num_xbar_outports
+    s.deq           = [ 0 ] * num_xbar_outports
+    s.enq           = [ None ] * num_xbar_outports
+    s.xbar_en       = [ 0 ] * num_xbar_outports
+    s.xbar_msg      = [ DataType( 0, 0 ) for _ in range( num_xbar_outports ) ]
+    s.ctrl_en       = 0
+    s.ctrl_rdy      = 0
+    s.pred_deq      = 0
+    s.pred_enq      = None
+    s.next_pred_msg = s.pred_msg
+    s.next_opt_rdy  = 0
+    s.next_const_rdy = 0
+    s.next_pred_rdy = 0
+
+    # Crossbar inports connected to the mesh, ready when a channel routed
+    # from them has room.
+    @s.update
+    def update_rdy():
+      nbr_rdy = [ 0 ] * num_mesh_ports
+      for i in range( num_mesh_ports ):
+        nbr_rdy[i] = int( s.send_data[i].rdy )
+      rdy = s.mesh_rdy( int( s.reset ), nbr_rdy )
+      for i in range( num_mesh_ports ):
+        s.recv_data[i].rdy = b1( rdy[i] )
+      s.recv_waddr.rdy       = b1( 1 )
+      s.recv_wopt.rdy        = b1( 1 )
+      s.recv_const_waddr.rdy = b1( 1 )
+      s.recv_const.rdy       = b1( 1 )
+
+    # Control, crossbar rdy, FU, memory requests and data sent out.
+    @s.update
+    def update_send():
+      reset   = int( s.reset )
+      nbr_rdy = [ 0 ] * num_mesh_ports
+      for i in range( num_mesh_ports ):
+        nbr_rdy[i] = int( s.send_data[i].rdy )
+      xbar_opt_rdy = s.route( reset, nbr_rdy )
+
+      io = s.io
+      if s.has_mem:
+        io.rdata     = s.from_mem_rdata.msg
+        io.rdata_rdy = int( s.from_mem_rdata.rdy )
+        io.raddr_rdy = int( s.to_mem_raddr.rdy )
+        io.waddr_rdy = int( s.to_mem_waddr.rdy )
+        io.wdata_rdy = int( s.to_mem_wdata.rdy )
+      s.evaluate( reset, xbar_opt_rdy )
+
+      if s.has_mem:
+        s.to_mem_waddr.en = b1( 0 )
+        s.to_mem_wdata.en = b1( 0 )
+        if io.raddr != None:
+          s.to_mem_raddr.msg   = DataAddrType( io.raddr[0] )
+          s.to_mem_raddr.en    = b1( io.raddr[1] )
+          s.from_mem_rdata.rdy = b1( io.rdata_rdy )
+        if io.waddr != None:
+          s.to_mem_waddr.msg = DataAddrType( io.waddr[0] )
+          s.to_mem_waddr.en  = b1( io.waddr[1] )
+          s.to_mem_wdata.msg = io.wdata[0]
+          s.to_mem_wdata.en  = b1( io.wdata[1] )
+
+      for j in range( num_fu_outports ):
+        s.fu_out[j]    = s.out_msg_of( j )
+        s.fu_out_en[j] = b1( io.out_en[j] )
+
+      for k in range( num_mesh_ports ):
+        en, msg = s.send_of( k, reset, nbr_rdy[k] )
+        s.send_data[k].en = b1( en )
+        if en:
+          s.send_data[k].msg = msg
+
+    # Data and predicates received by the crossbar.
+    @s.update
+    def update_recv():
+      src_en  = [ 0 ] * num_xbar_inports
+      src_msg = [ None ] * num_xbar_inports
+      for i in range( num_mesh_ports ):
+        src_en[i]  = int( s.recv_data[i].en )
+        src_msg[i] = s.recv_data[i].msg
+      for j in range( num_fu_outports ):
+        src_en[num_mesh_ports+j]  = int( s.fu_out_en[j] )
+        src_msg[num_mesh_ports+j] = s.fu_out[j]
+      s.receive( int( s.reset ), src_en, src_msg )
+
+    @s.update_ff
+    def update_state():
+      s.commit( int( s.reset ) )
+      if s.recv_waddr.en and s.recv_wopt.en:
+        s.decode( int( s.recv_waddr.msg ), s.recv_wopt.msg )
+      if s.recv_const_waddr.en and s.recv_const.en:
+        s.write_const( int( s.recv_const_waddr.msg ), s.recv_const.msg )
+
+  #-----------------------------------------------------------------------
+  # Control and constants
+  #-----------------------------------------------------------------------
+
+  def decode( s, i, msg ):
+    s.ctrl_msgs[i] = msg
+    s.opts[i]      = int( msg.ctrl )
+    s.routes[i]    = [ int( r ) for r in msg.outport ]
+    s.pred_ins[i]  = [ j for j in range( s.num_xbar_inports )
+                       if msg.predicate_in[j] ]
+
+  def write_const( s, i, msg ):
+    if i < len( s.consts ):
+      s.consts[i] = msg
+
+  # Reload between two ticks, same as TileCL.
+  def load_ctrl( s, opt_list ):
+    assert len( opt_list ) <= len( s.ctrl_msgs )
+    for i in range( len( opt_list ) ):
+      s.decode( i, opt_list[i] )
+    s.ctrl_cur   = 0
+    s.ctrl_times = 0
+
+  def load_consts( s, const_list ):
+    if len( const_list ) != len( s.consts ):
+      raise Exception( f"{s} holds {len( s.consts )} constants, "
+                       f"{len( const_list )} given!" )
+    s.consts    = list( const_list )
+    s.const_cur = 0
+
+  #-----------------------------------------------------------------------
+  # Crossbar
+  #-----------------------------------------------------------------------
+
+  def enq_rdy( s, k, reset ):
+    return int( not reset and s.channel[k].count < s.channel[k].num_entries )
+
+  def mesh_rdy( s, reset, nbr_rdy ):
+    # The rdy of the mesh inports, same as the first four of route().
+    rdy = s.xbar_rdy[ :4 ]
+    cur = s.ctrl_cur
+    if s.opts[ cur ] != OPT_START:
+      for k, r in enumerate( s.routes[ cur ] ):
+        if 0 < r <= 4:
+          if s.bypass[k]:
+            if nbr_rdy[k]:
+              rdy[ r - 1 ] = 1
+          elif s.enq_rdy( k, reset ):
+            rdy[ r - 1 ] = 1
+    return rdy
+
+  def route( s, reset, nbr_rdy ):
+    # Decides which channels take data in this cycle and returns the rdy
+    # of the crossbar for the control word. A channel fed by the FU
+    # towards a neighbour is bypassed: it forwards the data in the same
+    # cycle if the neighbour is ready.
+    cur      = s.ctrl_cur
+    start    = s.opts[ cur ] == OPT_START
+    xbar_rdy = list( s.xbar_rdy )
+    opt_rdy  = 0
+    for k, r in enumerate( s.routes[ cur ] ):
+      bypass  = s.bypass[k]
+      enq_rdy = s.enq_rdy( k, reset )
+      s.open[k] = 0
+      if not start and r > 0:
+        if r > 4 and k < 4:
+          if not bypass and enq_rdy:
+            xbar_rdy[ r - 1 ] = 1
+            bypass = 1
+        elif bypass and nbr_rdy[k]:
+          # The bypassed channel is ready as long as the neighbour is,
+          # so the crossbar raises the rdy of the inport and clears the
+          # flag. The data is then only taken if the queue has room.
+          xbar_rdy[ r - 1 ] = 1
+          bypass = 0
+      rdy = nbr_rdy[k] if bypass else enq_rdy
+      if not start and r > 0 and rdy:
+        s.open[k] = 1
+        xbar_rdy[ r - 1 ] = 1
+      opt_rdy = opt_rdy or rdy
+      s.next_bypass[k] = bypass
+    s.next_xbar_rdy = xbar_rdy
+    return int( not start and opt_rdy )
+
+  def send_of( s, k, reset, nbr_rdy ):
+    # en and message of mesh outport k; a channel that is not bypassed
+    # sends its head.
+    s.deq[k] = 0
+    if s.next_bypass[k]:
+      r = s.routes[ s.ctrl_cur ][k]
+      if s.open[k] and r > 4 and s.io.out_en[ r - 5 ]:
+        msg = s.out_msg_of( r - 5 )
+        return 1, type( msg )( msg.payload, msg.predicate, 0 )
+      return 0, None
+    if nbr_rdy and s.channel[k].count > 0 and not reset:
+      s.deq[k] = 1
+      return 1, s.channel[k].front()
+    return 0, None
+
+  def receive( s, reset, src_en, src_msg ):
+    cur    = s.ctrl_cur
+    routes = s.routes[ cur ]
+    for k in range( s.num_xbar_outports ):
+      s.enq[k]     = None
+      s.xbar_en[k] = 0
+      r = routes[k]
+      if s.open[k] and src_en[ r - 1 ]:
+        msg = src_msg[ r - 1 ]
+        s.xbar_en[k]  = 1
+        s.xbar_msg[k] = msg
+        if not s.next_bypass[k]:
+          s.enq[k] = type( msg )( msg.payload, msg.predicate, 0 )
+
+    # The predicate register accumulates the predicates of the inports
+    # selected by predicate_in.
+    pred_msg = s.pred_msg
+    if s.ctrl_msgs[ cur ].predicate:
+      pred_msg = type( pred_msg )( 0, 0 )
+    s.pred_enq = None
+    if s.opts[ cur ] != OPT_START:
+      predicate = int( pred_msg.predicate )
+      en        = 0
+      for i in s.pred_ins[ cur ]:
+        if src_en[i]:
+          en        = 1
+          predicate = predicate | int( src_msg[i].predicate )
+      if en:
+        pred_msg = type( pred_msg )( 1, predicate )
+        if not reset and s.reg_predicate.count < s.reg_predicate.num_entries:
+          s.pred_enq = pred_msg
+    s.next_pred_msg = pred_msg
+
+  #-----------------------------------------------------------------------
+  # Control and FU
+  #-----------------------------------------------------------------------
+
+  def out_msg_of( s, j ):
+    # The outport of the FU keeps its last message when not enabled.
+    return s.io.out[j] if s.io.out_en[j] else s.out_msg[j]
+
+  def evaluate( s, reset, xbar_opt_rdy ):
+    io      = s.io
+    cur     = s.ctrl_cur
+    out_rdy = s.next_xbar_rdy[ 4: ]
+    opt_out_rdy, const_out_rdy = out_rdy_of( s.fu_kinds, out_rdy )
+    s.next_opt_rdy = int( s.opt_rdy or opt_out_rdy )
+    s.ctrl_rdy = int( s.next_opt_rdy or xbar_opt_rdy )
+    if s.ctrl_times == s.num_ctrl or s.opts[ cur ] == OPT_START:
+      s.ctrl_en = 0
+    else:
+      s.ctrl_en = s.ctrl_rdy
+
+    io.opt      = s.ctrl_msgs[ cur ]
+    io.const    = s.consts[ s.const_cur ]
+    io.pred     = s.reg_predicate.front()
+    io.first    = s.first
+    in_rdy      = list( s.in_rdy )
+    const_rdy   = s.const_rdy
+    # The operands are only taken when the FU is ready for them, which
+    # depends on the operands: iterate as the RTL settles.
+    for _ in range( 4 ):
+      io.opt_en = s.ctrl_en
+      for i in range( len( io.ins ) ):
+        channel      = s.channel[ 4 + i ]
+        io.ins[i]    = channel.front()
+        io.counts[i] = channel.count
+        io.in_en[i]  = int( in_rdy[i] and channel.count > 0 and not reset )
+        io.in_rdy[i] = 0
+      for j in range( len( io.out ) ):
+        io.out_rdy[j] = out_rdy[j]
+        io.out_en[j]  = 0
+      io.const_en   = const_rdy
+      io.const_rdy  = 0
+      io.pred_rdy   = 0
+      io.last_mem_out_en = list( s.mem_out_en )
+      io.raddr      = None
+      io.waddr      = None
+      io.wdata      = None
+      io.opt_hold   = 0
+      execute( io, s.dispatch )
+      # The control word stays while the memory unit holds it, as in
+      # TileCL.
+      if io.opt_hold:
+        s.ctrl_rdy = s.ctrl_en = 0
+      next_const_rdy = int( s.const_rdy or const_out_rdy or io.const_rdy )
+      if io.in_rdy == in_rdy and next_const_rdy == const_rdy and \
+         io.opt_en == s.ctrl_en:
+        break
+      in_rdy    = list( io.in_rdy )
+      const_rdy = next_const_rdy
+    s.next_const_rdy = next_const_rdy
+    s.next_pred_rdy  = int( s.pred_rdy or io.pred_rdy )
+    s.pred_deq = int( s.next_pred_rdy and s.reg_predicate.count > 0
+                      and not reset )
+    for i in range( len( io.ins ) ):
+      s.deq[ 4 + i ] = io.in_en[i]
+
+  def commit( s, reset ):
+    io = s.io
+    for k in range( s.num_xbar_outports ):
+      if reset:
+        s.channel[k].reset()
+      else:
+        s.channel[k].update( s.enq[k], s.deq[k] )
+    if reset:
+      s.reg_predicate.reset()
+    else:
+      s.reg_predicate.update( s.pred_enq, s.pred_deq )
+
+    s.bypass    = list( s.next_bypass )
+    s.xbar_rdy  = list( s.next_xbar_rdy )
+    s.in_rdy    = list( io.in_rdy )
+    s.opt_rdy   = s.next_opt_rdy
+    s.const_rdy = s.next_const_rdy
+    s.pred_rdy  = s.next_pred_rdy
+    s.pred_msg  = s.next_pred_msg
+    for j in range( len( io.out ) ):
+      s.out_msg[j] = s.out_msg_of( j )
+    s.mem_out_en = list( io.next_mem_out_en )
+
+    opt = s.opts[ s.ctrl_cur ]
+    if reset:
+      s.first = 1
+    if opt == OPT_BRH_START:
+      s.first = 0
+    if s.ctrl_rdy:
+      if s.ctrl_times < s.num_ctrl:
+        s.ctrl_times += 1
+      cur = ( s.ctrl_cur + 1 ) % s.ctrl_addr_range
+      if cur == s.num_ctrl % s.ctrl_addr_range:
+        cur = 0
+      s.ctrl_cur = cur
+    if s.const_rdy:
+      s.const_cur = ( s.const_cur + 1 ) % len( s.consts )
+
+  # Line trace
+  def line_trace( s ):
+    recv_str = "|".join([ str(x.msg) for x in s.recv_data ])
+    opt_str  = OPT_SYMBOL_DICT[ s.ctrl_msgs[ s.ctrl_cur ].ctrl ] \
+               if s.ctrl_en else " #"
+    channel_str = "|".join([ str(x.count) for x in s.channel ])
+    out_str  = "|".join([ "("+str(x.msg.payload)+","+str(x.msg.predicate)+")" for x in s.send_data ])
+    return f"\n{recv_str} => [ctrl: {s.ctrl_msgs[ s.ctrl_cur ]}] (element: {opt_str}) => {channel_str} => {out_str} |||"
+
+  # Performance counters
+  def perf_snapshot( s ):
+    # Same events as TileCL.perf_snapshot().
+    opt   = s.opts[ s.ctrl_cur ]
+    stall = not s.ctrl_en and s.ctrl_times < s.num_ctrl and \
+            opt != OPT_START and opt != OPT_NAH
+    return { 'opt'     : opt if s.ctrl_en else None,
+             'stall'   : bool( stall ),
+             'channel' : [ x.count for x in s.channel ],
+             'xbar'    : list( s.xbar_en ) }
+
+  # Tracing
+  def trace_snapshot( s ):
+    # The opcode issued to the FU (None if none) and the inport routed
+    # to, and the message on, each crossbar outport in use.
+    routes = s.routes[ s.ctrl_cur ]
+    return { 'opt'    : s.opts[ s.ctrl_cur ] if s.ctrl_en else None,
+             'routes' : [ routes[k] if s.xbar_en[k] else 0
+                          for k in range( s.num_xbar_outports ) ],
+             'msgs'   : [ s.xbar_msg[k] if s.xbar_en[k] else None
+                          for k in range( s.num_xbar_outports ) ] }
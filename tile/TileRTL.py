@@ -14,6 +14,7 @@ from ..noc.ChannelRTL            import ChannelRTL
 from ..rf.RegisterRTL            import RegisterRTL
 from ..mem.ctrl.CtrlMemRTL       import CtrlMemRTL
 from ..fu.single.MemUnitRTL      import MemUnitRTL
+from ..fu.single.MemUnitLsqRTL   import MemUnitLsqRTL
 from ..fu.flexible.FlexibleFuRTL import FlexibleFuRTL
 from ..mem.const.ConstQueueRTL   import ConstQueueRTL
 from ..fu.single.AdderRTL        import AdderRTL
@@ -21,6 +22,8 @@ from ..fu.single.PhiRTL          import PhiRTL
 from ..fu.single.CompRTL         import CompRTL
 from ..fu.single.MulRTL          import MulRTL
 from ..fu.single.BranchRTL       import BranchRTL
+from ..lib.opt_type              import *
+from ..lib.map_helper            import default_fu_list
 
 class TileRTL( Component ):
 
@@ -29,10 +32,11 @@ class TileRTL( Component ):
                  num_fu_inports, num_fu_outports,
                  num_connect_inports, num_connect_outports,
                  Fu=FlexibleFuRTL,
-                 FuList=[MemUnitRTL,AdderRTL,PhiRTL,CompRTL,MulRTL,BranchRTL],
-                 const_list = None ):
+                 FuList=default_fu_list,
+                 const_list = None, CtrlMem = CtrlMemRTL ):
 
     # Constant
+    s.num_ctrl        = num_ctrl
     num_xbar_inports  = num_fu_outports + num_connect_inports
     num_xbar_outports = num_fu_inports + num_connect_outports
 
@@ -47,20 +51,32 @@ class TileRTL( Component ):
     s.recv_waddr = RecvIfcRTL( CtrlAddrType )
     s.recv_wopt  = RecvIfcRTL( CtrlType )
 
+    # Const
+    if const_list == None:
+      const_list = [ DataType( 0 ) ]
+    ConstAddrType = mk_bits( clog2( len( const_list ) + 1 ) )
+    s.recv_const_waddr = RecvIfcRTL( ConstAddrType )
+    s.recv_const       = RecvIfcRTL( DataType )
+
     # Data
     s.to_mem_raddr   = SendIfcRTL( DataAddrType )
     s.from_mem_rdata = RecvIfcRTL( DataType )
     s.to_mem_waddr   = SendIfcRTL( DataAddrType )
     s.to_mem_wdata   = SendIfcRTL( DataType )
 
+    # A load of MemUnitLsqRTL holds the whole array (array_hold) until its
+    # word is back, see CGRARTL; the tile waits while stall is high.
+    s.array_hold = OutPort( b1 )
+    s.stall      = InPort( b1 )
+
     # Components
-    s.element  = FlexibleFuRTL( DataType, PredicateType, CtrlType,
-                                num_fu_inports, num_fu_outports,
-                                data_mem_size, FuList )
-    s.const_queue = ConstQueueRTL( DataType, const_list if const_list != None else [DataType(0)])
+    s.element  = Fu( DataType, PredicateType, CtrlType,
+                     num_fu_inports, num_fu_outports,
+                     data_mem_size, FuList )
+    s.const_queue = ConstQueueRTL( DataType, const_list )
     s.crossbar = CrossbarRTL( DataType, PredicateType, CtrlType,
                               num_xbar_inports, num_xbar_outports )
-    s.ctrl_mem = CtrlMemRTL( CtrlType, ctrl_mem_size, num_ctrl )
+    s.ctrl_mem = CtrlMem( CtrlType, ctrl_mem_size, num_ctrl )
     s.channel  = [ ChannelRTL( DataType ) for _ in range( num_xbar_outports ) ]
 
     # Additional one register for partial predication
@@ -72,12 +88,34 @@ class TileRTL( Component ):
     s.ctrl_mem.recv_waddr //= s.recv_waddr
     s.ctrl_mem.recv_ctrl  //= s.recv_wopt
 
+    # The control word stays while the memory unit holds it, or while
+    # the array is stalled.
+    s.fu_hold = Wire( b1 )
+    if hasattr( s.element, 'opt_hold' ):
+      s.fu_hold //= s.element.opt_hold
+    else:
+      s.fu_hold //= 0
+    if any([ issubclass( x, MemUnitLsqRTL ) for x in FuList ]):
+      s.array_hold //= s.fu_hold
+    else:
+      s.array_hold //= 0
+
+    # A double-buffered control memory (CtrlMemShadowRTL) switches to the
+    # control words written in its shadow context on recv_swap.
+    if hasattr( s.ctrl_mem, 'recv_swap' ):
+      s.recv_swap = RecvIfcRTL( b1 )
+      s.ctrl_mem.recv_swap //= s.recv_swap
+    s.const_queue.recv_waddr //= s.recv_const_waddr
+    s.const_queue.recv_const //= s.recv_const
+
     # Data
 
-    s.element.recv_const //= s.const_queue.send_const
+    s.element.recv_const.msg //= s.const_queue.send_const.msg
+    s.element.recv_const.en  //= s.const_queue.send_const.en
 
+    # The memory unit is MemUnitRTL or a variant, e.g., MemUnitLsqRTL.
     for i in range( len( FuList ) ):
-      if FuList[i] == MemUnitRTL:
+      if issubclass( FuList[i], MemUnitRTL ):
         s.to_mem_raddr   //= s.element.to_mem_raddr[i]
         s.from_mem_rdata //= s.element.from_mem_rdata[i]
         s.to_mem_waddr   //= s.element.to_mem_waddr[i]
@@ -116,7 +154,18 @@ class TileRTL( Component ):
       s.crossbar.recv_opt.msg = s.ctrl_mem.send_ctrl.msg
       s.element.recv_opt.en  = s.ctrl_mem.send_ctrl.en
       s.crossbar.recv_opt.en = s.ctrl_mem.send_ctrl.en
-      s.ctrl_mem.send_ctrl.rdy = s.element.recv_opt.rdy and s.crossbar.recv_opt.rdy
+      s.ctrl_mem.send_ctrl.rdy = s.element.recv_opt.rdy & \
+                                 s.crossbar.recv_opt.rdy & ~s.stall
+      s.ctrl_mem.hold = s.fu_hold | s.stall
+      # The constants keep pace with the control words.
+      s.const_queue.send_const.rdy = s.element.recv_const.rdy & ~s.stall
+
+  # Reload between two ticks, see ConstQueueRTL and CtrlMemRTL.
+  def load_consts( s, const_list ):
+    s.const_queue.load_consts( const_list )
+
+  def load_ctrl( s, opt_list ):
+    s.ctrl_mem.load_ctrl( opt_list )
 
   # Line trace
   def line_trace( s ):
@@ -127,3 +176,17 @@ class TileRTL( Component ):
     out_str  = "|".join([ "("+str(x.msg.payload)+","+str(x.msg.predicate)+")" for x in s.send_data ])
     return f"{recv_str} => [{s.crossbar.recv_opt.msg}] ({s.element.line_trace()}) => {channel_recv_str} => {channel_send_str} => {out_str}"
 
+  # Performance counters
+  def perf_snapshot( s ):
+    # The events of the current cycle: the opcode issued to the FU (None
+    # if none), whether a pending operation is held back by rdy, the
+    # occupancy of the channels and the crossbar outports in use.
+    ctrl  = s.ctrl_mem.send_ctrl
+    opt   = int( ctrl.msg.ctrl ) if ctrl.en else None
+    stall = not ctrl.en and s.ctrl_mem.times < s.num_ctrl and \
+            ctrl.msg.ctrl != OPT_START and ctrl.msg.ctrl != OPT_NAH
+    return { 'opt'     : opt,
+             'stall'   : bool( stall ),
+             'channel' : [ int( x.count ) for x in s.channel ],
+             'xbar'    : [ int( x.en ) for x in s.crossbar.send_data ] }
+
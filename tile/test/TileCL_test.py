@@ -20,8 +20,11 @@ from ...fu.single.AdderRTL                import AdderRTL
 from ...fu.single.MemUnitRTL              import MemUnitRTL
 from ...fu.triple.ThreeMulAdderShifterRTL import ThreeMulAdderShifterRTL
 from ...fu.flexible.FlexibleFuRTL         import FlexibleFuRTL
+from ...fu.flexible.FlexibleFuCL          import FlexibleFuCL
 from ...mem.ctrl.CtrlMemCL                import CtrlMemCL
 
+import pytest
+
 #-------------------------------------------------------------------------
 # Test harness
 #-------------------------------------------------------------------------
@@ -52,6 +55,16 @@ class TestHarness( Component ):
     for i in range( num_tile_outports ):
       connect( s.dut.send_data[i],  s.sink_out[i].recv )
 
+    # The control words and constants are not rewritten.
+    s.dut.recv_waddr.en        //= 0
+    s.dut.recv_waddr.msg       //= 0
+    s.dut.recv_wopt.en         //= 0
+    s.dut.recv_wopt.msg        //= CtrlType( 0 )
+    s.dut.recv_const_waddr.en  //= 0
+    s.dut.recv_const_waddr.msg //= 0
+    s.dut.recv_const.en        //= 0
+    s.dut.recv_const.msg       //= DataType( 0, 0 )
+
     if MemUnitRTL in FuList:
       s.dut.to_mem_raddr.rdy   //= 0
       s.dut.from_mem_rdata.en  //= 0
@@ -91,7 +104,8 @@ def run_sim( test_harness, max_cycles=100 ):
   test_harness.tick()
   test_harness.tick()
 
-def test_tile_alu():
+@pytest.mark.parametrize( "FunctionUnit", [ FlexibleFuRTL, FlexibleFuCL ] )
+def test_tile_alu( FunctionUnit ):
   num_tile_inports  = 4
   num_tile_outports = 4
   num_xbar_inports  = 6
@@ -104,7 +118,6 @@ def test_tile_alu():
   FuInType          = mk_bits( clog2( num_fu_in + 1 ) )
   pickRegister      = [ FuInType( x+1 ) for x in range( num_fu_in ) ]
   DUT               = TileCL
-  FunctionUnit      = FlexibleFuRTL
   FuList            = [AdderRTL, MemUnitRTL]
   DataType          = mk_data( 16, 1 )
   PredicateType     = mk_predicate( 1, 1 )
@@ -0,0 +1,89 @@
+"""
+==========================================================================
+TileNativeCL_test.py
+==========================================================================
+Test cases for the tile with native Python state, which is also run in
+lockstep with TileCL.
+
+Author : agent
+  Date : Oct 18, 2026
+
+"""
+
+from pymtl3                               import *
+
+from ..TileCL                             import TileCL
+from ..TileNativeCL                       import TileNativeCL
+from ...lib.opt_type                      import *
+from ...lib.messages                      import *
+from ...fu.single.AdderRTL                import AdderRTL
+from ...fu.single.MemUnitRTL              import MemUnitRTL
+from ...fu.flexible.FlexibleFuRTL         import FlexibleFuRTL
+
+from .TileCL_test                         import TestHarness, run_sim
+
+import pytest
+
+def mk_tile_alu( DUT, FunctionUnit = FlexibleFuRTL ):
+  num_tile_inports  = 4
+  num_tile_outports = 4
+  num_xbar_inports  = 6
+  num_xbar_outports = 8
+  ctrl_mem_size     = 8
+  data_mem_size     = 8
+  num_fu_in         = 4 # number of inputs of FU is fixed inside the tile
+  RouteType         = mk_bits( clog2( num_xbar_inports + 1 ) )
+  FuInType          = mk_bits( clog2( num_fu_in + 1 ) )
+  pickRegister      = [ FuInType( x+1 ) for x in range( num_fu_in ) ]
+  FuList            = [AdderRTL, MemUnitRTL]
+  DataType          = mk_data( 16, 1 )
+  PredicateType     = mk_predicate( 1, 1 )
+  CtrlType          = mk_ctrl( num_fu_in, num_xbar_inports, num_xbar_outports )
+  src_opt           = [ CtrlType( OPT_NAH, b1( 0 ), pickRegister, [
+                        RouteType(0), RouteType(0), RouteType(0), RouteType(0),
+                        RouteType(4), RouteType(3), RouteType(0), RouteType(0)] ),
+                        CtrlType( OPT_ADD, b1( 0 ), pickRegister, [
+                        RouteType(0), RouteType(0), RouteType(0), RouteType(5),
+                        RouteType(4), RouteType(1), RouteType(0), RouteType(0)] ),
+                        CtrlType( OPT_SUB, b1( 0 ), pickRegister, [
+                        RouteType(5), RouteType(0), RouteType(0), RouteType(5),
+                        RouteType(0), RouteType(0), RouteType(0), RouteType(0)] ) ]
+  src_data          = [ [DataType(2, 1)],
+                        [],
+                        [DataType(4, 1)],
+                        [DataType(5, 1), DataType( 7, 1)] ]
+  src_const         = [ DataType(5, 1), DataType(0, 0), DataType(7, 1) ]
+  sink_out          = [ [DataType(5, 1, 0)],
+                        [],
+                        [],
+                        [DataType(9, 1, 0), DataType( 5, 1, 0)]]
+  return TestHarness( DUT, FunctionUnit, FuList, DataType,
+                      PredicateType, CtrlType,
+                      ctrl_mem_size, data_mem_size,
+                      num_tile_inports, num_tile_outports,
+                      src_data, src_opt, src_const, sink_out )
+
+def test_tile_alu():
+  run_sim( mk_tile_alu( TileNativeCL ) )
+
+def test_unsupported_fu():
+  # The FU of the tile is not modelled by TileNativeCL.
+  th = mk_tile_alu( TileNativeCL, AdderRTL )
+  with pytest.raises( Exception, match = "use TileCL for AdderRTL" ):
+    th.elaborate()
+
+def test_tile_lockstep():
+  # Both tiles send the same messages in the same cycles.
+  ths = [ mk_tile_alu( TileCL ), mk_tile_alu( TileNativeCL ) ]
+  for th in ths:
+    th.elaborate()
+    th.apply( SimulationPass() )
+    th.sim_reset()
+  for _ in range( 10 ):
+    sent = []
+    for th in ths:
+      th.tick()
+      sent.append( [ ( int( x.en ), int( x.msg.payload ),
+                       int( x.msg.predicate ) ) if x.en else ( 0, )
+                     for x in th.dut.send_data ] )
+    assert sent[0] == sent[1]
@@ -21,8 +21,11 @@ from ...fu.single.MulRTL                  import MulRTL
 from ...fu.single.MemUnitRTL              import MemUnitRTL
 from ...fu.triple.ThreeMulAdderShifterRTL import ThreeMulAdderShifterRTL
 from ...fu.flexible.FlexibleFuRTL         import FlexibleFuRTL
+from ...fu.flexible.FlexibleFuCL          import FlexibleFuCL
 from ...mem.ctrl.CtrlMemRTL               import CtrlMemRTL
 
+import pytest
+
 #-------------------------------------------------------------------------
 # Test harness
 #-------------------------------------------------------------------------
@@ -53,6 +56,12 @@ class TestHarness( Component ):
     connect( s.src_opt.send,       s.dut.recv_wopt     )
     connect( s.opt_waddr.send,     s.dut.recv_waddr    )
 
+    # The constants are not rewritten.
+    s.dut.recv_const_waddr.en  //= 0
+    s.dut.recv_const_waddr.msg //= 0
+    s.dut.recv_const.en        //= 0
+    s.dut.recv_const.msg       //= DataType( 0, 0 )
+
     for i in range( 4 ):#num_tile_inports ):
       connect( s.src_data[i].send, s.dut.recv_data[i] )
     for i in range( 4 ):#num_tile_outports ):
@@ -97,7 +106,8 @@ def run_sim( test_harness, max_cycles=100 ):
   test_harness.tick()
   test_harness.tick()
 
-def test_tile_alu():
+@pytest.mark.parametrize( "FunctionUnit", [ FlexibleFuRTL, FlexibleFuCL ] )
+def test_tile_alu( FunctionUnit ):
   num_connect_inports  = 4
   num_connect_outports = 4
   num_fu_inports    = 2
@@ -113,7 +123,6 @@ def test_tile_alu():
   FuInType          = mk_bits( clog2( num_fu_in + 1 ) )
   pickRegister      = [ FuInType( x+1 ) for x in range( num_fu_in ) ]
   DUT               = TileRTL
-  FunctionUnit      = FlexibleFuRTL
   FuList            = [AdderRTL, MulRTL, MemUnitRTL]
   DataType          = mk_data( 16, 1 )
   PredicateType     = mk_predicate( 1, 1 )
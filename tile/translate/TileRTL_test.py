@@ -30,7 +30,7 @@ from ...fu.single.BranchRTL               import BranchRTL
 from ...fu.triple.ThreeMulAdderShifterRTL import ThreeMulAdderShifterRTL
 from ...mem.ctrl.CtrlMemRTL               import CtrlMemRTL
 
-from pymtl3.passes.backends.verilog       import TranslationImportPass
+from ...lib.verilator_cache               import CachedTranslationImportPass
 
 #-------------------------------------------------------------------------
 # Test harness
@@ -62,6 +62,12 @@ class TestHarness( Component ):
     connect( s.src_opt.send,   s.dut.recv_wopt  )
     connect( s.opt_waddr.send, s.dut.recv_waddr )
 
+    # The constants are not rewritten.
+    s.dut.recv_const_waddr.en  //= 0
+    s.dut.recv_const_waddr.msg //= 0
+    s.dut.recv_const.en        //= 0
+    s.dut.recv_const.msg       //= DataType( 0, 0 )
+
     for i in range( 4 ):
       connect( s.src_data[i].send, s.dut.recv_data[i] )
     for i in range( 4 ):
@@ -88,7 +94,7 @@ def run_sim( test_harness, max_cycles=100 ):
   test_harness.elaborate()
   test_harness.dut.verilog_translate_import = True
   test_harness.dut.config_verilog_import = VerilatorImportConfigs(vl_Wno_list =         ['UNSIGNED', 'UNOPTFLAT', 'WIDTH', 'WIDTHCONCAT', 'ALWCOMBORDER'])
-  test_harness = TranslationImportPass()(test_harness)
+  test_harness = CachedTranslationImportPass()(test_harness)
   test_harness.apply( SimulationPass() )
   test_harness.sim_reset()
 